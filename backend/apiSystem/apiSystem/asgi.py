@@ -52,6 +52,7 @@ except Exception:
 
 from apps.core.http.httpx_clients import aclose_http_clients
 from apps.core.infrastructure.asgi_lifespan import LifespanApp
+from apps.core.llm.backends.client_pool import aclose_llm_client_pool
 
 
 async def _on_startup() -> None:  # pragma: no cover
@@ -64,7 +65,7 @@ websocket_urlpatterns: list[object] = []
 
 application = ProtocolTypeRouter(
     {
-        "lifespan": LifespanApp(on_startup=_on_startup, on_shutdown=aclose_http_clients),
+        "lifespan": LifespanApp(on_startup=_on_startup, on_shutdown=(aclose_http_clients, aclose_llm_client_pool)),
         "http": django_asgi_app,
         "websocket": AuthMiddlewareStack(URLRouter(websocket_urlpatterns)),
     }
@@ -20,6 +20,10 @@ class OCRServiceAdapter(IOcrService):
             self._service = OCRService()
         return self._service
 
+    @property
+    def engine_version(self) -> str:
+        return self.service.engine_version
+
     def recognize(self, image_path: str) -> str:
         return self.service.recognize(image_path)
 
@@ -12,9 +12,11 @@ OCR 服务 - 统一路由层
 同时支持 PP-OCRv5 Server 模型，提供高精度的文字识别能力。
 """
 
+import functools
 import io
 import logging
 import re
+from importlib import metadata
 from typing import Any
 
 from PIL import Image
@@ -73,6 +75,21 @@ def get_ocr_engine(use_v5: bool = True) -> Any:  # 内部实现，外部请通
     return _ocr_engine_cache[use_v5]
 
 
+@functools.cache
+def _rapidocr_version() -> str:
+    try:
+        return metadata.version("rapidocr")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def ocr_engine_version(*, use_v5: bool, provider: str) -> str:
+    """OCR 引擎版本标识（用于 OCR 结果缓存键：引擎或模型变化后旧结果自动失效）"""
+    if provider == "paddleocr_api":
+        return "paddleocr_api"
+    return f"rapidocr-{_rapidocr_version()}-{'v5_server' if use_v5 else 'v4_default'}"
+
+
 def _get_ocr_provider() -> str:  # pragma: no cover
     """从 SystemConfig 获取 OCR 提供者"""
     from apps.core.services.system_config_service import SystemConfigService
@@ -101,6 +118,10 @@ class OCRService:
         """获取当前 OCR 提供者"""
         return self._provider or _get_ocr_provider()
 
+    @property
+    def engine_version(self) -> str:
+        return ocr_engine_version(use_v5=self.use_v5, provider=self.provider)
+
     @property
     def ocr(self) -> Any:
         """懒加载本地 OCR 引擎"""
@@ -192,6 +213,27 @@ class OCRService:
             return "\n".join(result.txts)
         return ""
 
+    def recognize_array(self, pixels: Any) -> str:
+        """
+        识别已解码的 RGB 像素数组（H×W×3 uint8），省去 PNG 编码/解码
+
+        Args:
+            pixels: numpy 数组（如 PDF 渲染得到的 pixmap 样本）
+
+        Returns:
+            识别出的文字内容
+        """
+        if self.provider == "paddleocr_api":
+            buffer = io.BytesIO()
+            Image.fromarray(pixels).save(buffer, format="PNG")
+            return self._recognize_via_paddleocr_bytes(buffer.getvalue())
+
+        # RapidOCR 将 ndarray 输入视为 BGR
+        result = self.ocr(pixels[:, :, ::-1].copy())
+        if result and result.txts:
+            return "\n".join(result.txts)
+        return ""
+
     def _recognize_via_paddleocr_path(self, image_path: str) -> str:  # pragma: no cover
         """通过 PaddleOCR API 识别图片文件"""
         try:
@@ -4,6 +4,7 @@ import logging
 import shutil
 import tempfile
 from pathlib import Path
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
@@ -63,3 +64,56 @@ class PDFTextExtractor:
         except Exception as exc:
             logger.warning("PDFTextExtractor.pdf_to_images 失败: %s, 文件: %s", exc, pdf_path)
             return [], Path()
+
+    def ocr_pages(self, pdf_path: Path, ocr_service: Any) -> str:
+        """
+        逐页按共享渲染参数（SHARED_RENDER_DPI）渲染并 OCR，返回按页拼接的文本。
+        已识别过的页面直接读取共享 OCR 页面缓存，只渲染未命中的页面。
+        """
+        from apps.core.services.folder_scan_manifest import file_sha256
+        from apps.core.services.ocr_page_cache import (
+            SHARED_PROFILE,
+            SHARED_RENDER_DPI,
+            engine_version_of,
+            get_ocr_page_cache,
+        )
+
+        try:
+            import fitz
+
+            doc = fitz.open(str(pdf_path))
+        except Exception as exc:
+            logger.warning("PDFTextExtractor.ocr_pages 打开失败: %s, 文件: %s", exc, pdf_path)
+            return ""
+
+        engine_version = engine_version_of(ocr_service)
+        page_cache = get_ocr_page_cache() if engine_version else None
+        pdf_hash = file_sha256(pdf_path) if page_cache is not None else ""
+        parts: list[str] = []
+        tmp_dir = Path(tempfile.mkdtemp())
+        try:
+            for page_index in range(len(doc)):
+                if page_cache is not None:
+                    entry = page_cache.get(
+                        pdf_hash, page_index + 1, profile=SHARED_PROFILE, engine_version=engine_version
+                    )
+                    if entry is not None:
+                        parts.append(entry.text)
+                        continue
+                img_path = tmp_dir / f"page_{page_index}.png"
+                doc[page_index].get_pixmap(dpi=SHARED_RENDER_DPI).save(str(img_path))
+                text = ocr_service.recognize(str(img_path))
+                if page_cache is not None:
+                    page_cache.put(
+                        pdf_hash,
+                        page_index + 1,
+                        profile=SHARED_PROFILE,
+                        engine_version=engine_version,
+                        text=text or "",
+                        ocr_failed=not text,
+                    )
+                parts.append(text)
+            return "\n".join(parts)
+        finally:
+            doc.close()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
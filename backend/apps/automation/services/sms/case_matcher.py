@@ -318,14 +318,15 @@ class CaseMatcher:
     def _get_all_cases_by_numbers(self, case_numbers: list[str]) -> list[Any]:
         """根据案号列表获取所有匹配的案件（包括在办和已结案）"""
         normalized_numbers = [TextUtils.normalize_case_number(num) for num in case_numbers]
-        all_cases = []
+        if not normalized_numbers:
+            return []
 
-        for case_number in normalized_numbers:
-            try:
-                cases = self.case_service.search_cases_by_case_number_internal(case_number)
-                all_cases.extend(cases)
-            except Exception:
-                continue
+        try:
+            # 所有案号合并为一次查询
+            all_cases = self.case_service.search_cases_by_case_numbers_internal(normalized_numbers)
+        except Exception as e:
+            logger.warning(f"按案号查询案件失败: {e!s}")
+            return []
 
         # 去重
         return list({c.id: c for c in all_cases}.values())
@@ -352,8 +353,11 @@ class CaseMatcher:
         all_cases_dict = {case.id: case for case in all_cases}
         exactly_matched_cases = []
 
+        # 一次查询取回所有候选案件的当事人
+        party_names_by_case = self.case_service.get_case_party_names_by_case_ids_internal(list(all_cases_dict))
+
         for case_id, case in all_cases_dict.items():
-            case_party_names = self.case_service.get_case_party_names_internal(case_id)
+            case_party_names = party_names_by_case.get(case_id, [])
             case_party_set = set(name.strip() for name in case_party_names if name)
 
             # 双向匹配检查
@@ -511,15 +515,10 @@ class CaseMatcher:
 
         if not sms.case_numbers:
             return
-        normalized = [TextUtils.normalize_case_number(n) for n in sms.case_numbers]
-        for num in normalized:
-            try:
-                for case in self.case_service.search_cases_by_case_number_internal(num):
-                    if case.status == CaseStatus.CLOSED:
-                        closed_cases.add(case)
-                        logger.warning(f"发现已结案案件（案号匹配）: {case.name}")
-            except Exception:
-                continue
+        for case in self._get_all_cases_by_numbers(sms.case_numbers):
+            if case.status == CaseStatus.CLOSED:
+                closed_cases.add(case)
+                logger.warning(f"发现已结案案件（案号匹配）: {case.name}")
 
     def _collect_closed_cases_by_party(self, sms: Any, closed_cases: set[Any]) -> None:
         """通过当事人收集已结案案件"""
@@ -0,0 +1,362 @@
+"""
+客户名称索引
+
+短信当事人匹配原先对每条短信都加载全部客户，再做 客户数 × 当事人数 的子串比较。
+这里把规范化后的客户名称常驻在进程内：
+- Aho-Corasick 自动机：一次扫描当事人文本即可找出其中出现的所有客户名称（精确 + 客户名包含于当事人名）；
+- 二元组倒排：当事人名包含于客户名的反向包含匹配，只校验共享全部二元组的少量候选；
+- 客户增删改经信号增量更新本进程索引，并递增缓存中的版本号，其他进程在下次查询时发现版本变化后整体重建；
+- 另有最长存活时间兜底（覆盖 queryset.update 等不触发信号的批量修改）。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import unicodedata
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger("apps.automation")
+
+DEFAULT_MAX_AGE_SECONDS = 3600.0
+_MIN_CONTAINMENT_LENGTH = 2
+
+
+def normalize_name(name: str) -> str:
+    """名称规范化：全角转半角（NFKC）并去除首尾空白"""
+    return unicodedata.normalize("NFKC", name or "").strip()
+
+
+class _Automaton:
+    """Aho-Corasick 多模式匹配自动机"""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+        for pattern in patterns:
+            self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = (*self._out[state], pattern)
+
+    def _link(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = (*self._out[nxt], *self._out[self._fail[nxt]])
+
+    def find(self, text: str) -> set[str]:
+        """返回 text 中出现的全部模式"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+def _bigrams(text: str) -> set[str]:
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+class ClientNameIndex:
+    """
+    客户名称索引（线程安全）
+
+    Args:
+        loader: 全量加载客户（需有 id、name 属性），通常为 client_service.get_all_clients_internal
+        fetch_one: 按 ID 加载单个客户，用于增量更新；不存在时返回 None
+        version_source: 读取全局版本号，版本变化时整体重建；返回 None 表示不可用
+        max_age: 索引最长存活秒数，超过后整体重建
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Iterable[Any]],
+        *,
+        fetch_one: Callable[[int], Any | None] | None = None,
+        version_source: Callable[[], int | None] | None = None,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    ) -> None:
+        self._loader = loader
+        self._fetch_one = fetch_one
+        self._version_source = version_source
+        self._max_age = max_age
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._version: int | None = None
+        self._clients: dict[int, Any] = {}
+        self._names: dict[int, str] = {}
+        self._position: dict[int, int] = {}
+        self._next_position = 0
+        self._ids_by_name: dict[str, set[int]] = {}
+        self._names_by_bigram: dict[str, set[str]] = {}
+        self._automaton: _Automaton | None = None
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            self._ensure_fresh()
+            return len(self._clients)
+
+    def match_party_names(self, party_names: Iterable[str], *, exclude: Iterable[str] = ()) -> list[Any]:
+        """
+        查找与当事人名称匹配的客户（精确匹配，或长度 >= 2 的一方包含于另一方）
+
+        Args:
+            party_names: 当事人名称
+            exclude: 需排除的名称（律师姓名），同时作用于客户名与当事人名
+
+        Returns:
+            匹配的客户，按加载顺序排列且不重复
+        """
+        excluded = {normalize_name(name) for name in exclude}
+        with self._lock:
+            self._ensure_fresh()
+            automaton = self._get_automaton()
+            matched: set[int] = set()
+            for raw in party_names:
+                party = normalize_name(raw)
+                if not party or party in excluded:
+                    continue
+                for name in self._matching_names(party, automaton):
+                    if name not in excluded:
+                        matched.update(self._ids_by_name.get(name, ()))
+            return [self._clients[cid] for cid in sorted(matched, key=self._position.__getitem__)]
+
+    def similar_names(self, party_name: str) -> list[str]:
+        """与当事人名称互相包含的客户名称（调试用）"""
+        party = normalize_name(party_name)
+        if not party:
+            return []
+        with self._lock:
+            self._ensure_fresh()
+            names = self._matching_names(party, self._get_automaton())
+            names.update(name for name in self._ids_by_name if len(name) < _MIN_CONTAINMENT_LENGTH and name in party)
+            return sorted(names)
+
+    def upsert(self, client: Any) -> None:
+        """新增或更新单个客户"""
+        with self._lock:
+            if not self._loaded:
+                return
+            position = self._position.get(int(client.id))
+            self._remove_locked(int(client.id))
+            self._add_locked(client)
+            if position is not None:
+                self._position[int(client.id)] = position
+
+    def remove(self, client_id: int) -> None:
+        with self._lock:
+            if self._loaded:
+                self._remove_locked(int(client_id))
+
+    def refresh_client(self, client_id: int, *, version: int | None = None) -> None:
+        """
+        按 ID 重新加载单个客户（客户已删除时从索引移除）
+
+        Args:
+            version: 本次变更后的全局版本号；已同步到该版本的索引不必再整体重建
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            if self._fetch_one is None:
+                self._loaded = False
+                return
+            client = self._fetch_one(client_id)
+            if client is None:
+                self._remove_locked(client_id)
+            else:
+                self.upsert(client)
+            if version is not None and self._version is not None and version == self._version + 1:
+                self._version = version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+
+    def _matching_names(self, party: str, automaton: _Automaton) -> set[str]:
+        names = automaton.find(party)
+        if party in self._ids_by_name:
+            names.add(party)
+        if len(party) >= _MIN_CONTAINMENT_LENGTH:
+            names.update(self._names_containing(party))
+        return names
+
+    def _names_containing(self, party: str) -> set[str]:
+        candidates: set[str] | None = None
+        for gram in sorted(_bigrams(party), key=lambda g: len(self._names_by_bigram.get(g, ()))):
+            postings = self._names_by_bigram.get(gram)
+            if not postings:
+                return set()
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        return {name for name in candidates or () if party in name}
+
+    def _get_automaton(self) -> _Automaton:
+        if self._automaton is None:
+            self._automaton = _Automaton(name for name in self._ids_by_name if len(name) >= _MIN_CONTAINMENT_LENGTH)
+        return self._automaton
+
+    def _ensure_fresh(self) -> None:
+        version = self._read_version()
+        if self._loaded and version == self._version and time.monotonic() - self._loaded_at < self._max_age:
+            return
+        self._rebuild(version)
+
+    def _rebuild(self, version: int | None) -> None:
+        started = time.perf_counter()
+        self._clients.clear()
+        self._names.clear()
+        self._position.clear()
+        self._next_position = 0
+        self._ids_by_name.clear()
+        self._names_by_bigram.clear()
+        self._automaton = None
+        for client in self._loader():
+            self._add_locked(client)
+        self._loaded = True
+        self._loaded_at = time.monotonic()
+        self._version = version
+        logger.info(
+            "client_name_index_rebuilt",
+            extra={"clients": len(self._clients), "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)},
+        )
+
+    def _read_version(self) -> int | None:
+        if self._version_source is None:
+            return None
+        try:
+            return self._version_source()
+        except Exception:
+            logger.warning("client_name_index_version_unavailable", exc_info=True)
+            return None
+
+    def _add_locked(self, client: Any) -> None:
+        client_id = int(client.id)
+        name = normalize_name(str(client.name or ""))
+        self._clients[client_id] = client
+        self._names[client_id] = name
+        self._position[client_id] = self._next_position
+        self._next_position += 1
+        if not name:
+            return
+        ids = self._ids_by_name.setdefault(name, set())
+        if not ids:
+            for gram in _bigrams(name):
+                self._names_by_bigram.setdefault(gram, set()).add(name)
+            self._automaton = None
+        ids.add(client_id)
+
+    def _remove_locked(self, client_id: int) -> None:
+        if client_id not in self._clients:
+            return
+        del self._clients[client_id]
+        del self._position[client_id]
+        name = self._names.pop(client_id)
+        ids = self._ids_by_name.get(name)
+        if ids is None:
+            return
+        ids.discard(client_id)
+        if ids:
+            return
+        del self._ids_by_name[name]
+        for gram in _bigrams(name):
+            postings = self._names_by_bigram.get(gram)
+            if postings is not None:
+                postings.discard(name)
+                if not postings:
+                    del self._names_by_bigram[gram]
+        self._automaton = None
+
+
+def current_index_version() -> int | None:
+    """缓存中的客户名称索引版本号（跨进程共享）"""
+    from django.core.cache import cache
+
+    from apps.core.infrastructure import CacheKeys
+
+    value = cache.get(CacheKeys.automation_client_name_index_version())
+    return int(value) if value is not None else 0
+
+
+def bump_index_version() -> int | None:
+    """递增全局版本号，使其他进程的索引在下次查询时重建"""
+    from apps.core.infrastructure import CacheKeys, CacheTimeout, bump_cache_version
+
+    try:
+        return bump_cache_version(CacheKeys.automation_client_name_index_version(), timeout=CacheTimeout.get_day())
+    except Exception:
+        logger.warning("client_name_index_version_bump_failed", exc_info=True)
+        return None
+
+
+def build_client_name_index(client_service: Any) -> ClientNameIndex:
+    """基于客户服务构建索引（全量加载 + 按 ID 增量加载）"""
+    from django.conf import settings
+
+    return ClientNameIndex(
+        client_service.get_all_clients_internal,
+        fetch_one=client_service.get_client,
+        version_source=current_index_version,
+        max_age=float(getattr(settings, "SMS_CLIENT_NAME_INDEX_MAX_AGE", DEFAULT_MAX_AGE_SECONDS)),
+    )
+
+
+_shared_index: ClientNameIndex | None = None
+_shared_lock = threading.Lock()
+
+
+def get_client_name_index() -> ClientNameIndex:
+    """获取进程内共享的客户名称索引（客户信号会增量更新它）"""
+    global _shared_index
+    if _shared_index is None:
+        with _shared_lock:
+            if _shared_index is None:
+                from apps.core.dependencies.business_client import build_client_service
+
+                _shared_index = build_client_name_index(build_client_service())
+    return _shared_index
+
+
+def on_client_changed(client_id: int) -> None:
+    """客户新增/修改/删除后调用（事务提交后）：递增全局版本并增量更新本进程索引"""
+    version = bump_index_version()
+    index = _shared_index
+    if index is None:
+        return
+    try:
+        index.refresh_client(client_id, version=version)
+    except Exception:
+        logger.warning("client_name_index_refresh_failed", extra={"client_id": client_id}, exc_info=True)
+        index.invalidate()
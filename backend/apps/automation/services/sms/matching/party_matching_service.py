@@ -10,6 +10,8 @@ from typing import TYPE_CHECKING, Any, Optional
 if TYPE_CHECKING:
     from apps.core.interfaces import IClientService, ILawyerService
 
+    from .client_name_index import ClientNameIndex
+
 logger = logging.getLogger("apps.automation")
 
 
@@ -20,6 +22,7 @@ class PartyMatchingService:
         self,
         client_service: Optional["IClientService"] = None,
         lawyer_service: Optional["ILawyerService"] = None,
+        name_index: Optional["ClientNameIndex"] = None,
     ):
         """
         初始化当事人匹配服务
@@ -27,9 +30,11 @@ class PartyMatchingService:
         Args:
             client_service: 客户服务实例（可选，用于依赖注入）
             lawyer_service: 律师服务实例（可选，用于依赖注入）
+            name_index: 客户名称索引（可选，默认基于 client_service 构建）
         """
         self._client_service = client_service
         self._lawyer_service = lawyer_service
+        self._name_index = name_index
 
     @property
     def client_service(self) -> "IClientService":
@@ -49,6 +54,15 @@ class PartyMatchingService:
             self._lawyer_service = build_lawyer_service()
         return self._lawyer_service
 
+    @property
+    def name_index(self) -> "ClientNameIndex":
+        """延迟构建客户名称索引"""
+        if self._name_index is None:
+            from .client_name_index import build_client_name_index
+
+            self._name_index = build_client_name_index(self.client_service)
+        return self._name_index
+
     def find_existing_clients_in_sms(self, party_names: list[str]) -> list[Any]:
         """
         在现有客户数据中查找与短信内容匹配的当事人
@@ -64,51 +78,12 @@ class PartyMatchingService:
         if not party_names:
             return []
 
-        matched_clients = []
-
-        # 通过客户服务获取所有现有客户
-        all_clients = self.client_service.get_all_clients_internal()
-
         # 获取所有律师姓名，用于排除匹配
         lawyer_names = self.get_lawyer_names()
-
-        logger.info(f"开始在 {len(all_clients)} 个现有客户中查找匹配")
         logger.info(f"将排除 {len(lawyer_names)} 个律师姓名: {lawyer_names}")
 
-        # 遍历每个客户，检查其名称是否在短信提取的当事人中
-        for client in all_clients:
-            client_name = client.name.strip()
-
-            # 排除律师：如果客户姓名与律师姓名匹配，跳过
-            if client_name in lawyer_names:
-                logger.info(f"跳过律师: {client_name}")
-                continue
-
-            # 检查客户名称是否与短信中提取的当事人名称匹配
-            for party_name in party_names:
-                party_name = party_name.strip()
-
-                # 排除律师：如果当事人姓名是律师，跳过
-                if party_name in lawyer_names:
-                    logger.info(f"跳过律师当事人: {party_name}")
-                    continue
-
-                # 精确匹配
-                if client_name == party_name:
-                    matched_clients.append(client)
-                    logger.info(f"精确匹配找到客户: {client_name}")
-                    break
-
-                # 包含匹配（客户名称包含在当事人名称中，或反之）
-                elif (len(client_name) >= 2 and client_name in party_name) or (
-                    len(party_name) >= 2 and party_name in client_name
-                ):
-                    matched_clients.append(client)
-                    logger.info(f"包含匹配找到客户: {client_name} <-> {party_name}")
-                    break
-
-        # 去重（基于客户ID）
-        matched_clients = self._deduplicate_clients(matched_clients)
+        # 一次扫描当事人名称：精确匹配 + 双向包含匹配（见 ClientNameIndex）
+        matched_clients = self.name_index.match_party_names(party_names, exclude=lawyer_names)
 
         if matched_clients:
             logger.info(f"在现有客户中找到 {len(matched_clients)} 个匹配: {[c.name for c in matched_clients]}")
@@ -194,16 +169,11 @@ class PartyMatchingService:
             party_names: 当事人名称列表
         """
         try:
-            # 获取所有客户
-            all_clients = self.client_service.get_all_clients_internal()
-            logger.info(f"客户数据库总数: {len(all_clients)}")
+            logger.info(f"客户数据库总数: {self.name_index.size}")
 
             # 检查是否有包含关键词的客户
             for party_name in party_names:
-                matching_clients = []
-                for client in all_clients:
-                    if party_name in client.name or client.name in party_name:
-                        matching_clients.append(client.name)
+                matching_clients = self.name_index.similar_names(party_name)
 
                 if matching_clients:
                     logger.info(f"当事人 '{party_name}' 在客户库中找到相似记录: {matching_clients}")
@@ -233,5 +203,7 @@ class PartyMatchingService:
 
 
 def _get_party_matching_service() -> PartyMatchingService:
-    """工厂函数：获取当事人匹配服务实例"""
-    return PartyMatchingService()
+    """工厂函数：获取当事人匹配服务实例（使用进程内共享的客户名称索引）"""
+    from .client_name_index import get_client_name_index
+
+    return PartyMatchingService(name_index=get_client_name_index())
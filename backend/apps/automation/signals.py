@@ -3,6 +3,7 @@
 
 处理模型删除事件，自动触发文件清理。
 创建和更新事件已迁移至 django-lifecycle @hook 装饰器。
+客户增删改时同步短信当事人匹配使用的客户名称索引。
 """
 
 import logging
@@ -10,7 +11,7 @@ from pathlib import Path
 from typing import Any
 
 from django.db import transaction
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 logger = logging.getLogger("apps.automation")
@@ -74,3 +75,13 @@ def cleanup_gsxt_report_task_file(sender: type, **kwargs: Any) -> None:  # pragm
             logger.info("已清理企业信用报告文件", extra={"file_path": str(instance.report_file)})
         except Exception:
             logger.exception("清理企业信用报告失败")
+
+
+@receiver(post_save, sender="client.Client", dispatch_uid="sync_client_name_index_on_save")
+@receiver(post_delete, sender="client.Client", dispatch_uid="sync_client_name_index_on_delete")
+def sync_client_name_index(sender: type, **kwargs: Any) -> None:  # pragma: no cover
+    """客户新增/修改/删除后（事务提交时）增量更新客户名称索引"""
+    from .services.sms.matching.client_name_index import on_client_changed
+
+    client_id = kwargs["instance"].pk
+    transaction.on_commit(lambda cid=client_id: on_client_changed(cid))
@@ -4,8 +4,6 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import zipfile
-from io import BytesIO
 from pathlib import Path
 from typing import Any
 
@@ -13,7 +11,7 @@ from asgiref.sync import sync_to_async
 from django.http import HttpRequest, HttpResponse
 from ninja import Router
 
-from apps.documents.api.download_response_factory import build_download_response
+from apps.documents.api.download_response_factory import build_streaming_download_response
 
 logger = logging.getLogger("apps.cases.api")
 router = Router()
@@ -75,9 +73,6 @@ async def generate_case_folder(request: HttpRequest, case_id: int) -> Any:  # pr
     if case.contract and hasattr(case.contract, "folder_binding") and case.contract.folder_binding:
         contract_folder_path = case.contract.folder_binding.folder_path
 
-    zip_bytes = await sync_to_async(svc.generate_case_folder_with_documents)(
-        case, matched, root_name
-    )
     filename = f"{root_name}.zip"
 
     if contract_folder_path:
@@ -86,16 +81,14 @@ async def generate_case_folder(request: HttpRequest, case_id: int) -> Any:  # pr
         if not parent_exists:
             return {"success": False, "message": f"合同绑定文件夹不存在: {contract_folder_path}"}
         try:
-            def _extract() -> None:
-                with zipfile.ZipFile(BytesIO(zip_bytes), "r") as zf:
-                    zf.extractall(str(parent))
-
-            await asyncio.to_thread(_extract)
-        except (OSError, zipfile.BadZipFile) as e:
-            logger.error("ZIP 解压失败: %s", e, extra={"case_id": case_id})
-            return {"success": False, "message": f"ZIP 解压失败: {e}"}
-        logger.info("案件文件夹已解压到合同文件夹", extra={"case_id": case_id, "path": str(parent)})
+            # 直接按目录结构写入绑定文件夹，不再生成 ZIP 后解压
+            await sync_to_async(svc.write_case_folder_to_directory)(case, matched, root_name, parent)
+        except OSError as e:
+            logger.error("写入案件文件夹失败: %s", e, extra={"case_id": case_id})
+            return {"success": False, "message": f"写入案件文件夹失败: {e}"}
+        logger.info("案件文件夹已写入合同文件夹", extra={"case_id": case_id, "path": str(parent)})
         return {"success": True, "message": f"文件已保存到: {parent}", "folder_path": str(parent)}
 
-    # 无绑定 -> 下载 ZIP
-    return build_download_response(content=zip_bytes, filename=filename, content_type="application/zip")
+    # 无绑定 -> 流式下载 ZIP
+    zip_chunks = await sync_to_async(svc.stream_case_folder_with_documents)(case, matched, root_name)
+    return build_streaming_download_response(chunks=zip_chunks, filename=filename, content_type="application/zip")
@@ -0,0 +1,137 @@
+"""案件检索索引
+
+案号、案件名称、当事人名称的模糊检索原先都是 icontains 全表扫描：
+- PostgreSQL：启用 pg_trgm，按 Django icontains 生成的表达式 UPPER(col::text) 建 GIN trigram 索引，
+  既有的 icontains 查询（含短信匹配的当事人检索）无需改写即可走索引；
+- SQLite：建 FTS5 trigram 全文表 cases_case_search_fts（rowid = 案件 id），由触发器与案件、案号、
+  当事人、客户名称保持同步，并在迁移时回填。
+扩展或 FTS5 不可用时只记录日志并跳过，检索回退为 icontains。
+"""
+
+import logging
+from typing import Any
+
+from django.db import DatabaseError, migrations, transaction
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "cases_case_search_fts"
+
+# (索引名, 表, 列)
+PG_TRGM_INDEXES = [
+    ("cases_casenumber_number_trgm", "cases_casenumber", "number"),
+    ("cases_case_name_trgm", "cases_case", "name"),
+    ("cases_client_name_trgm", "cases_client", "name"),
+]
+
+_NUMBERS = "(SELECT group_concat(number, char(10)) FROM cases_casenumber WHERE case_id = {case_id})"
+_PARTIES = (
+    "(SELECT group_concat(cl.name, char(10)) FROM cases_caseparty p "
+    "JOIN cases_client cl ON cl.id = p.client_id WHERE p.case_id = {case_id})"
+)
+
+
+def _refresh(column: str, source: str, case_ids: str) -> str:
+    return (
+        f"UPDATE {FTS_TABLE} SET {column} = coalesce({source.format(case_id=f'{FTS_TABLE}.rowid')}, '') "
+        f"WHERE rowid IN ({case_ids});"
+    )
+
+
+SQLITE_CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(name, numbers, parties, tokenize='trigram')"
+)
+
+# (触发器名, 触发时机, 触发体)
+SQLITE_TRIGGERS = [
+    (
+        "cases_search_case_ai",
+        "AFTER INSERT ON cases_case",
+        f"INSERT INTO {FTS_TABLE}(rowid, name, numbers, parties) VALUES (new.id, new.name, '', '');",
+    ),
+    (
+        "cases_search_case_au",
+        "AFTER UPDATE OF name ON cases_case",
+        f"UPDATE {FTS_TABLE} SET name = new.name WHERE rowid = new.id;",
+    ),
+    ("cases_search_case_ad", "AFTER DELETE ON cases_case", f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id;"),
+    ("cases_search_number_ai", "AFTER INSERT ON cases_casenumber", _refresh("numbers", _NUMBERS, "new.case_id")),
+    (
+        "cases_search_number_au",
+        "AFTER UPDATE ON cases_casenumber",
+        _refresh("numbers", _NUMBERS, "old.case_id, new.case_id"),
+    ),
+    ("cases_search_number_ad", "AFTER DELETE ON cases_casenumber", _refresh("numbers", _NUMBERS, "old.case_id")),
+    ("cases_search_party_ai", "AFTER INSERT ON cases_caseparty", _refresh("parties", _PARTIES, "new.case_id")),
+    (
+        "cases_search_party_au",
+        "AFTER UPDATE ON cases_caseparty",
+        _refresh("parties", _PARTIES, "old.case_id, new.case_id"),
+    ),
+    ("cases_search_party_ad", "AFTER DELETE ON cases_caseparty", _refresh("parties", _PARTIES, "old.case_id")),
+    (
+        "cases_search_client_au",
+        "AFTER UPDATE OF name ON cases_client",
+        _refresh("parties", _PARTIES, "SELECT case_id FROM cases_caseparty WHERE client_id = new.id"),
+    ),
+]
+
+SQLITE_POPULATE = (
+    f"INSERT INTO {FTS_TABLE}(rowid, name, numbers, parties) "
+    f"SELECT c.id, c.name, coalesce({_NUMBERS.format(case_id='c.id')}, ''), "
+    f"coalesce({_PARTIES.format(case_id='c.id')}, '') FROM cases_case c"
+)
+
+
+def _create_postgresql(cursor: Any) -> None:
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table, column in PG_TRGM_INDEXES:
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def _create_sqlite(cursor: Any) -> None:
+    cursor.execute(SQLITE_CREATE_TABLE)
+    for trigger_name, timing, body in SQLITE_TRIGGERS:
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {trigger_name} {timing} BEGIN {body} END")
+    cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    cursor.execute(SQLITE_POPULATE)
+
+
+def create_search_indexes(apps: Any, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    connection = schema_editor.connection
+    creators = {"postgresql": _create_postgresql, "sqlite": _create_sqlite}
+    create = creators.get(connection.vendor)
+    if create is None:
+        return
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            create(cursor)
+    except DatabaseError:
+        logger.warning("案件检索索引创建失败，检索将回退为 icontains", exc_info=True)
+
+
+def drop_search_indexes(apps: Any, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for index_name, _, _ in PG_TRGM_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+        elif connection.vendor == "sqlite":
+            for trigger_name, _, _ in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0029_alter_historicalcase_created_at_and_more'),
+        ('client', '0011_alter_historicalclient_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -157,9 +157,15 @@ class CaseInternalQueryService:
     def get_case_party_names_internal(self, case_id: int) -> list[str]:
         return self.orchestrator.get_case_party_names(case_id)
 
+    def get_case_party_names_by_case_ids_internal(self, case_ids: list[int]) -> dict[int, list[str]]:
+        return self.orchestrator.get_case_party_names_by_case_ids(case_ids)
+
     def search_cases_by_case_number_internal(self, case_number: str) -> list[CaseDTO]:
         return self.orchestrator.search_cases_by_case_number(case_number)
 
+    def search_cases_by_case_numbers_internal(self, case_numbers: list[str]) -> list[CaseDTO]:
+        return self.orchestrator.search_cases_by_case_numbers(case_numbers)
+
     def list_cases_internal(
         self, status: str | None = None, limit: int | None = None, order_by: str = "-start_date"
     ) -> list[CaseDTO]:
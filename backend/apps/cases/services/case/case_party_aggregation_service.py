@@ -18,3 +18,13 @@ class CasePartyAggregationService:
     def get_case_party_names(self, case_id: int) -> list[str]:
         party_names = self.case_party_repo.list_party_names_by_case(case_id)
         return [name for name in party_names if name]
+
+    def get_case_party_names_by_case_ids(self, case_ids: list[int]) -> dict[int, list[str]]:
+        if not case_ids:
+            return {}
+
+        result: dict[int, list[str]] = {case_id: [] for case_id in case_ids}
+        for case_id, name in self.case_party_repo.list_party_names_by_case_ids(case_ids):
+            if name:
+                result.setdefault(case_id, []).append(name)
+        return result
@@ -40,6 +40,9 @@ class CaseNumberQueryOrchestrator:
     def search_cases_by_case_number(self, case_number: str) -> Any:
         return self.case_search_repo.search_cases_by_case_number(case_number)
 
+    def search_cases_by_case_numbers(self, case_numbers: list[str]) -> Any:
+        return self.case_search_repo.search_cases_by_case_numbers(case_numbers)
+
 
 class CasePartyQueryOrchestrator:
     def __init__(
@@ -58,6 +61,9 @@ class CasePartyQueryOrchestrator:
     def get_case_party_names(self, case_id: int) -> list[str]:
         return self.case_party_aggregation_service.get_case_party_names(case_id)
 
+    def get_case_party_names_by_case_ids(self, case_ids: list[int]) -> dict[int, list[str]]:
+        return self.case_party_aggregation_service.get_case_party_names_by_case_ids(case_ids)
+
 
 class CaseAccessQueryOrchestrator:
     def __init__(
@@ -151,10 +157,17 @@ class CaseQueryOrchestrator:
     def get_case_party_names(self, case_id: int) -> list[str]:
         return self.case_party_orchestrator.get_case_party_names(case_id)
 
+    def get_case_party_names_by_case_ids(self, case_ids: list[int]) -> dict[int, list[str]]:
+        return self.case_party_orchestrator.get_case_party_names_by_case_ids(case_ids)
+
     def search_cases_by_case_number(self, case_number: str) -> list[CaseDTO]:
         cases = self.case_number_orchestrator.search_cases_by_case_number(case_number)
         return self.assembler.to_dtos(cases, self._build_case_number_map(cases))
 
+    def search_cases_by_case_numbers(self, case_numbers: list[str]) -> list[CaseDTO]:
+        cases = self.case_number_orchestrator.search_cases_by_case_numbers(case_numbers)
+        return self.assembler.to_dtos(cases, self._build_case_number_map(cases))
+
     def list_cases(
         self, status: str | None = None, limit: int | None = None, order_by: str = "-start_date"
     ) -> list[CaseDTO]:
@@ -12,6 +12,10 @@ from apps.core.security.access_context import AccessContext
 
 from .case_access_policy import CaseAccessPolicy
 from .case_queryset import get_case_queryset
+from .repo.case_search_index import CaseSearchIndex
+
+# 索引排序的候选数：权限过滤后不足 limit 条且候选被截断时回退 icontains，保证不漏结果
+_RANKED_CANDIDATE_LIMIT = 200
 
 
 def normalize_case_number(number: str) -> str:
@@ -19,8 +23,11 @@ def normalize_case_number(number: str) -> str:
 
 
 class CaseSearchService:
-    def __init__(self, access_policy: CaseAccessPolicy | None = None) -> None:
+    def __init__(
+        self, access_policy: CaseAccessPolicy | None = None, search_index: CaseSearchIndex | None = None
+    ) -> None:
         self.access_policy = access_policy or CaseAccessPolicy()
+        self.search_index = search_index or CaseSearchIndex()
 
     def search_by_case_number(
         self,
@@ -34,11 +41,16 @@ class CaseSearchService:
         if not normalized:
             return Case.objects.none()
 
+        case_ids: Any
         if exact_match:
             case_ids = CaseNumber.objects.filter(number=normalized).values_list("case_id", flat=True)
         else:
             search_term = normalized.rstrip("号")
-            case_ids = CaseNumber.objects.filter(number__icontains=search_term).values_list("case_id", flat=True)
+            indexed_ids = self.search_index.match_case_ids({"numbers": [search_term]})
+            if indexed_ids is not None:
+                case_ids = indexed_ids
+            else:
+                case_ids = CaseNumber.objects.filter(number__icontains=search_term).values_list("case_id", flat=True)
 
         qs = get_case_queryset().filter(id__in=case_ids)
         return self.access_policy.filter_queryset(
@@ -68,13 +80,21 @@ class CaseSearchService:
             return []
 
         query_value = query.strip()
-        qs = get_case_queryset()
+        normalized_query = normalize_case_number(query_value)
+        search_term = normalized_query.rstrip("号") if normalized_query else ""
 
-        search_conditions = Q()
+        candidate_limit = max(limit, _RANKED_CANDIDATE_LIMIT)
+        ranked_ids = self.search_index.rank_case_ids(query_value, search_term, limit=candidate_limit)
+        if ranked_ids is not None:
+            cases = self._visible_ranked_cases(
+                ranked_ids, limit, user=user, org_access=org_access, perm_open_access=perm_open_access
+            )
+            if len(cases) >= limit or len(ranked_ids) < candidate_limit:
+                return cases
 
-        normalized_query = normalize_case_number(query_value)
-        if normalized_query:
-            search_term = normalized_query.rstrip("号")
+        qs = get_case_queryset()
+        search_conditions = Q()
+        if search_term:
             case_ids_by_number = CaseNumber.objects.filter(number__icontains=search_term).values_list(
                 "case_id", flat=True
             )
@@ -88,6 +108,23 @@ class CaseSearchService:
         qs = self.access_policy.filter_queryset(qs, user=user, org_access=org_access, perm_open_access=perm_open_access)
         return list(qs[:limit])
 
+    def _visible_ranked_cases(
+        self,
+        ranked_ids: list[int],
+        limit: int,
+        user: Any | None,
+        org_access: dict[str, Any] | None,
+        perm_open_access: bool,
+    ) -> list[Case]:
+        """按索引排序取前 limit 个有权限的案件（先只查 id 做权限过滤，再加载这几条的关联数据）"""
+        visible_qs = self.access_policy.filter_queryset(
+            Case.objects.filter(id__in=ranked_ids), user=user, org_access=org_access, perm_open_access=perm_open_access
+        )
+        visible = set(visible_qs.values_list("id", flat=True))
+        top_ids = [case_id for case_id in ranked_ids if case_id in visible][:limit]
+        cases = get_case_queryset().in_bulk(top_ids)
+        return [cases[case_id] for case_id in top_ids if case_id in cases]
+
     def search_cases_ctx(self, *, ctx: AccessContext, query: str, limit: int = 10) -> list[Case]:
         return self.search_cases(
             query=query,
@@ -96,9 +96,15 @@ class CaseServiceAdapter:
     def get_case_party_names_internal(self, case_id: int) -> Any:
         return self._internal_query.get_case_party_names_internal(case_id=case_id)
 
+    def get_case_party_names_by_case_ids_internal(self, case_ids: list[int]) -> Any:
+        return self._internal_query.get_case_party_names_by_case_ids_internal(case_ids=case_ids)
+
     def search_cases_by_case_number_internal(self, case_number: str) -> Any:
         return self._internal_query.search_cases_by_case_number_internal(case_number=case_number)
 
+    def search_cases_by_case_numbers_internal(self, case_numbers: list[str]) -> Any:
+        return self._internal_query.search_cases_by_case_numbers_internal(case_numbers=case_numbers)
+
     def list_cases_internal(
         self, status: str | None = None, limit: int | None = None, order_by: str = "-start_date"
     ) -> Any:
@@ -5,6 +5,7 @@ from .case_assignment_repo import CaseAssignmentRepo
 from .case_number_repo import CaseNumberRepo
 from .case_party_repo import CasePartyRepo
 from .case_repo import CaseRepo
+from .case_search_index import CaseSearchIndex
 from .case_search_query_builder import CaseSearchQueryBuilder
 from .case_search_repo import CaseSearchRepo
 
@@ -14,6 +15,7 @@ __all__ = [
     "CaseNumberRepo",
     "CasePartyRepo",
     "CaseRepo",
+    "CaseSearchIndex",
     "CaseSearchQueryBuilder",
     "CaseSearchRepo",
 ]
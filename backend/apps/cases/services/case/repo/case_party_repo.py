@@ -6,21 +6,37 @@ from django.db.models import Q
 
 from apps.cases.models import Case, CaseParty
 
+from .case_search_index import CaseSearchIndex
+
 
 class CasePartyRepo:
+    def __init__(self, search_index: CaseSearchIndex | None = None) -> None:
+        self.search_index = search_index or CaseSearchIndex()
+
     def list_party_names_by_case(self, case_id: int) -> list[str]:
         party_names = (
             CaseParty.objects.filter(case_id=case_id).select_related("client").values_list("client__name", flat=True)
         )
         return list(party_names)
 
+    def list_party_names_by_case_ids(self, case_ids: Iterable[int]) -> list[tuple[int, str]]:
+        if not case_ids:
+            return []
+        rows = CaseParty.objects.filter(case_id__in=case_ids).order_by("case_id", "id")
+        return list(rows.values_list("case_id", "client__name"))
+
     def search_cases_by_party(self, party_names: Iterable[str], status: str | None = None) -> list[Case]:
         if not party_names:
             return []
 
-        query = Q()
-        for name in party_names:
-            query |= Q(parties__client__name__icontains=name)
+        party_names = list(party_names)
+        indexed_ids = self.search_index.match_case_ids({"parties": party_names})
+        if indexed_ids is not None:
+            query = Q(id__in=indexed_ids)
+        else:
+            query = Q()
+            for name in party_names:
+                query |= Q(parties__client__name__icontains=name)
 
         qs = Case.objects.select_related("contract").prefetch_related("parties__client").filter(query).distinct()
 
@@ -0,0 +1,133 @@
+"""
+案件检索索引
+
+迁移 0030 为案号、案件名称、当事人名称建了索引：
+- PostgreSQL：pg_trgm GIN 索引（表达式与 icontains 一致），icontains 本身即走索引，这里再按 similarity 排序；
+- SQLite：FTS5 trigram 全文表，MATCH 做子串匹配、bm25 排序。
+trigram 至少需要 3 个字符；检索词更短、其他数据库或索引缺失时返回 None，调用方回退为 icontains。
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "cases_case_search_fts"
+MIN_TERM_LENGTH = 3
+FTS_COLUMNS = frozenset({"name", "numbers", "parties"})
+
+# 案号命中比名称、当事人命中更精确：PostgreSQL 加分、SQLite 加权
+_PG_NUMBER_BONUS = 1.0
+_FTS_WEIGHTS = (1.0, 2.0, 1.0)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _pg_rank_sql(query: str, number_term: str, limit: int) -> tuple[str, list[Any]]:
+    branches = [
+        "SELECT id AS case_id, similarity(UPPER(name::text), UPPER(%s)) AS score "
+        "FROM cases_case WHERE UPPER(name::text) LIKE UPPER(%s)",
+        "SELECT p.case_id, similarity(UPPER(cl.name::text), UPPER(%s)) "
+        "FROM cases_caseparty p JOIN cases_client cl ON cl.id = p.client_id "
+        "WHERE UPPER(cl.name::text) LIKE UPPER(%s)",
+    ]
+    params: list[Any] = [query, _like_pattern(query), query, _like_pattern(query)]
+    if number_term:
+        branches.append(
+            f"SELECT case_id, {_PG_NUMBER_BONUS} + similarity(UPPER(number::text), UPPER(%s)) "
+            "FROM cases_casenumber WHERE UPPER(number::text) LIKE UPPER(%s)"
+        )
+        params += [number_term, _like_pattern(number_term)]
+    sql = (
+        f"SELECT case_id FROM ({' UNION ALL '.join(branches)}) hits "
+        "GROUP BY case_id ORDER BY MAX(score) DESC, case_id DESC LIMIT %s"
+    )
+    return sql, [*params, limit]
+
+
+def _fetch_ids(sql: str, params: list[Any]) -> list[int] | None:
+    # 保存点隔离：索引缺失（未迁移、扩展不可用）时不影响外层事务
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [int(row[0]) for row in cursor.fetchall()]
+    except DatabaseError:
+        logger.warning("案件检索索引不可用，回退为 icontains", exc_info=True)
+        return None
+
+
+def _fts_available() -> bool:
+    # 只探测全文表是否可查，不取数据；子查询随外层查询执行时无法再回退
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SELECT 1 FROM {FTS_TABLE} LIMIT 0")
+            return True
+    except DatabaseError:
+        logger.warning("案件检索索引不可用，回退为 icontains", exc_info=True)
+        return False
+
+
+class CaseSearchIndex:
+    def rank_case_ids(self, query: str, number_term: str = "", *, limit: int) -> list[int] | None:
+        """
+        按相关度排序的案件 id（名称、当事人匹配 query，案号匹配 number_term）
+
+        Returns:
+            最多 limit 个案件 id；无法使用索引时返回 None
+        """
+        query = query.strip()
+        number_term = number_term.strip()
+        if len(query) < MIN_TERM_LENGTH or (number_term and len(number_term) < MIN_TERM_LENGTH):
+            return None
+        if connection.vendor == "postgresql":
+            sql, params = _pg_rank_sql(query, number_term, limit)
+        elif connection.vendor == "sqlite":
+            expression = "{name parties} : " + _fts_phrase(query)
+            if number_term:
+                expression += " OR numbers : " + _fts_phrase(number_term)
+            weights = ", ".join(str(weight) for weight in _FTS_WEIGHTS)
+            sql = (
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, {weights}), rowid DESC LIMIT %s"
+            )
+            params = [expression, limit]
+        else:
+            return None
+        return _fetch_ids(sql, params)
+
+    def match_case_ids(self, terms_by_column: Mapping[str, Iterable[str]]) -> RawSQL | None:
+        """
+        SQLite 下通过全文表匹配任一列包含其任一检索词的案件 id（不排序），列为 name / numbers / parties
+
+        返回 id 子查询，供调用方 filter(id__in=...) 在同一条 SQL 中使用，不把 id 取回 Python。
+        PostgreSQL 的 icontains 已由 GIN 索引支撑，直接返回 None 交给原查询。
+        """
+        unknown = set(terms_by_column) - FTS_COLUMNS
+        if unknown:
+            raise ValueError(f"未知的检索列: {sorted(unknown)}")
+        pairs = [
+            (column, term.strip())
+            for column, terms in terms_by_column.items()
+            for term in terms
+            if term and term.strip()
+        ]
+        if connection.vendor != "sqlite" or not pairs or any(len(term) < MIN_TERM_LENGTH for _, term in pairs):
+            return None
+        if not _fts_available():
+            return None
+        expression = " OR ".join(f"{column} : {_fts_phrase(term)}" for column, term in pairs)
+        # 表名为模块常量，检索表达式走参数绑定
+        return RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])  # noqa: S611
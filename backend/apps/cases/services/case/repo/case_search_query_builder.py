@@ -9,8 +9,13 @@ from django.db.models import Q, QuerySet
 from apps.cases.models import Case, CaseNumber
 from apps.cases.utils import normalize_case_number
 
+from .case_search_index import CaseSearchIndex
+
 
 class CaseSearchQueryBuilder:
+    def __init__(self, search_index: CaseSearchIndex | None = None) -> None:
+        self.search_index = search_index or CaseSearchIndex()
+
     def build_case_id_query_by_case_number(self, case_number: str) -> list[Any]:
         if not case_number:
             return []
@@ -23,6 +28,18 @@ class CaseSearchQueryBuilder:
             CaseNumber.objects.filter(number__icontains=normalized.rstrip("号")).values_list("case_id", flat=True)
         )
 
+    def build_case_id_query_by_case_numbers(self, case_numbers: list[str]) -> list[Any]:
+        """多个案号合并为一次查询（各案号条件取并集，与逐个调用 build_case_id_query_by_case_number 结果一致）"""
+        conditions = Q()
+        for case_number in case_numbers:
+            normalized = normalize_case_number(case_number) if case_number else ""
+            if normalized:
+                conditions |= Q(number__icontains=normalized.rstrip("号"))
+        if not conditions:
+            return []
+
+        return list(CaseNumber.objects.filter(conditions).values_list("case_id", flat=True).distinct())
+
     def build_case_search_queryset(
         self, qs: QuerySet[Case, Case], query: str, status: str | None = None, limit: int = 30
     ) -> QuerySet[Case, Case]:
@@ -30,15 +47,19 @@ class CaseSearchQueryBuilder:
             return qs.none()
 
         query = query.strip()
-
-        conditions = Q(name__icontains=query) | Q(parties__client__name__icontains=query)
-
         normalized = normalize_case_number(query)
-        if normalized:
-            search_term = normalized.rstrip("号")
-            conditions |= Q(case_numbers__number__icontains=search_term)
+        search_term = normalized.rstrip("号") if normalized else ""
 
-        qs = qs.filter(conditions).distinct()
+        indexed_ids = self.search_index.match_case_ids(
+            {"name": [query], "parties": [query], "numbers": [search_term] if search_term else []}
+        )
+        if indexed_ids is not None:
+            qs = qs.filter(id__in=indexed_ids)
+        else:
+            conditions = Q(name__icontains=query) | Q(parties__client__name__icontains=query)
+            if search_term:
+                conditions |= Q(case_numbers__number__icontains=search_term)
+            qs = qs.filter(conditions).distinct()
         if status:
             qs = qs.filter(status=status)
 
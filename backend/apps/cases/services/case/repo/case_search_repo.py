@@ -25,6 +25,13 @@ class CaseSearchRepo:
 
         return list(get_case_queryset().filter(id__in=case_ids))
 
+    def search_cases_by_case_numbers(self, case_numbers: list[str]) -> list[Case]:
+        case_ids = self.query_builder.build_case_id_query_by_case_numbers(case_numbers)
+        if not case_ids:
+            return []
+
+        return list(get_case_queryset().filter(id__in=case_ids))
+
     def search_cases(self, query: str, status: str | None = None, limit: int = 30) -> list[Case]:
         base_qs = get_case_queryset()
         qs = self.query_builder.build_case_search_queryset(base_qs, query=query, status=status, limit=limit)
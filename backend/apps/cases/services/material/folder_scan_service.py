@@ -443,6 +443,7 @@ class CaseFolderScanService:
                 classification_context=classification_context,
                 scan_subfolder=scan_scope["scan_subfolder"],
                 storage_provider=storage_provider,
+                manifest_key=f"case-binding-{binding.id}",
             )
             result["scan_scope"] = scan_scope
             result["scan_options"] = {"enable_recognition": enable_recognition}
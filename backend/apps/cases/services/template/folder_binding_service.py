@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any, ClassVar, cast
+from typing import IO, TYPE_CHECKING, Any, ClassVar, cast
 
 from django.db import transaction
 
@@ -351,7 +351,7 @@ class CaseFolderBindingService(FolderBindingCrudService):
     def extract_zip_to_bound_folder(  # type: ignore
         self,
         case_id: int,
-        zip_content: bytes,
+        zip_content: bytes | IO[bytes],
         user: Any | None = None,
         org_access: dict[str, Any] | None = None,
         perm_open_access: bool = False,
@@ -360,7 +360,7 @@ class CaseFolderBindingService(FolderBindingCrudService):
         将ZIP包解压到绑定的文件夹
 
             case_id: 案件ID
-            zip_content: ZIP文件内容
+            zip_content: ZIP文件内容(bytes 或二进制文件对象)
 
             解压的目标路径,如果未绑定则返回 None
         """
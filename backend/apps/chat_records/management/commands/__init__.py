@@ -0,0 +1 @@
+"""Chat records management commands."""
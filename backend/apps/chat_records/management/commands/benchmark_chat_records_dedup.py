@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+
+from apps.chat_records.services.extraction.frame_hash_kernels import FrameHistory, dhash_batch, thumb_batch, to_gray
+from apps.chat_records.services.extraction.frame_processing_service import STREAM_BATCH_SIZE
+
+_LANCZOS: Any = getattr(Image, "Resampling", Image).LANCZOS
+
+
+def _legacy_dhash_hex(pixels: np.ndarray, hash_size: int = 8) -> str:
+    """改造前的逐像素 Python 循环实现，作为基准对照。"""
+    img = Image.fromarray(pixels).convert("L").resize((hash_size + 1, hash_size), _LANCZOS)
+    values = list(img.getdata())
+    bits = 0
+    for row in range(hash_size):
+        row_start = row * (hash_size + 1)
+        for col in range(hash_size):
+            if values[row_start + col] > values[row_start + col + 1]:
+                bits |= 1 << (row * hash_size + col)
+    return f"{bits:0{(hash_size * hash_size) // 4}x}"
+
+
+def _legacy_thumb(pixels: np.ndarray, size: int = 48) -> bytes:
+    img = Image.fromarray(pixels).convert("L")
+    w, h = img.size
+    top = round(h * 0.12)
+    img = img.crop((0, top, w, max(top + 1, h - round(h * 0.12))))
+    return img.resize((size, size), _LANCZOS).tobytes()
+
+
+def _legacy_mean_abs_diff(a: bytes, b: bytes) -> float:
+    total = 0
+    for x, y in zip(a, b, strict=False):
+        total += x - y if x >= y else y - x
+    return total / float(len(a))
+
+
+class Command(BaseCommand):
+    help = "对比逐帧 Python 循环与批量向量化两种录屏帧去重实现（dHash + 缩略图像素差）的耗时与结果"
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--frames", type=int, default=240, help="合成帧数（默认240）")
+        parser.add_argument("--width", type=int, default=1280, help="帧宽（默认1280）")
+        parser.add_argument("--height", type=int, default=720, help="帧高（默认720）")
+        parser.add_argument(
+            "--threshold", type=int, default=8, help="dHash 汉明距离阈值（默认8，与 ExtractParams 一致）"
+        )
+        parser.add_argument("--pixel-threshold", type=float, default=2.8, help="缩略图平均像素差阈值（默认2.8）")
+        parser.add_argument("--window", type=int, default=12, help="改造前的比较窗口帧数（默认12）")
+        parser.add_argument("--history", type=int, default=5000, help="全历史查找：已保留帧数（默认5000）")
+        parser.add_argument("--queries", type=int, default=1000, help="全历史查找：查询帧数（默认1000）")
+        parser.add_argument("--repeat", type=int, default=3, help="重复轮数，取中位数（默认3）")
+        parser.add_argument("--seed", type=int, default=20240601, help="随机种子")
+        parser.add_argument("--output-json", type=str, default="", help="将报告输出到 JSON 文件")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        frame_count = int(options["frames"])
+        repeat = int(options["repeat"])
+        history_size = int(options["history"])
+        query_count = int(options["queries"])
+        if min(frame_count, repeat, history_size, query_count) <= 0:
+            raise CommandError("--frames、--repeat、--history 与 --queries 必须为正整数")
+        if int(options["width"]) < 16 or int(options["height"]) < 16:
+            raise CommandError("--width 与 --height 不能小于 16")
+
+        rng = np.random.default_rng(int(options["seed"]))
+        frames = self._synthetic_frames(rng, frame_count, int(options["width"]), int(options["height"]))
+        threshold = int(options["threshold"])
+        pixel_threshold = float(options["pixel_threshold"])
+        window = int(options["window"])
+
+        (legacy_hashes, legacy_kept), legacy_seconds = self._measure(
+            lambda: self._legacy(frames, threshold, pixel_threshold, window), repeat=repeat
+        )
+        (vectorized_hashes, vectorized_kept), vectorized_seconds = self._measure(
+            lambda: self._vectorized(frames, threshold, pixel_threshold, window), repeat=repeat
+        )
+        history_hashes, queries = self._synthetic_hashes(rng, history_size, query_count)
+        history = FrameHistory()
+        for value in history_hashes.tolist():
+            history.add_hash(value)
+        history_hex = [f"{value:016x}" for value in history_hashes.tolist()]
+        query_hex = [f"{value:016x}" for value in queries.tolist()]
+        (_, legacy_hits), legacy_lookup_seconds = self._measure(
+            lambda: self._legacy_lookup(history_hex, query_hex, threshold), repeat=repeat
+        )
+        (_, vectorized_hits), vectorized_lookup_seconds = self._measure(
+            lambda: self._vectorized_lookup(history, queries, threshold), repeat=repeat
+        )
+
+        report = self._build_report(
+            frames=frame_count,
+            repeat=repeat,
+            legacy_seconds=legacy_seconds,
+            vectorized_seconds=vectorized_seconds,
+            hash_mismatches=sum(a != b for a, b in zip(legacy_hashes, vectorized_hashes, strict=True)),
+            legacy_kept=legacy_kept,
+            vectorized_kept=vectorized_kept,
+        )
+        report.update(
+            self._build_lookup_report(
+                history=history_size,
+                queries=query_count,
+                legacy_seconds=legacy_lookup_seconds,
+                vectorized_seconds=vectorized_lookup_seconds,
+                legacy_hits=legacy_hits,
+                vectorized_hits=vectorized_hits,
+            )
+        )
+
+        self.stdout.write(
+            f"帧数={frame_count} 分辨率={options['width']}x{options['height']} 轮数={repeat}\n"
+            f"逐帧循环（最近 {window} 帧）: {report['legacy_ms']:.2f} ms ({report['legacy_fps']:.0f} 帧/秒)"
+            f" 保留 {legacy_kept} 帧\n"
+            f"批量向量化（全部历史）: {report['vectorized_ms']:.2f} ms ({report['vectorized_fps']:.0f} 帧/秒)"
+            f" 保留 {vectorized_kept} 帧\n"
+            f"加速比: {report['speedup']:.2f}x  dHash 不一致帧数: {report['hash_mismatches']}\n"
+            f"全历史查找（历史 {history_size} 帧 × 查询 {query_count} 帧）:"
+            f" 逐个比较 {report['lookup_legacy_ms']:.2f} ms, popcount {report['lookup_vectorized_ms']:.2f} ms,"
+            f" 加速比 {report['lookup_speedup']:.1f}x, 命中 {legacy_hits}/{vectorized_hits}"
+        )
+        output_json = str(options.get("output_json") or "").strip()
+        if output_json:
+            path = Path(output_json)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"已写入报告: {path}"))
+
+    @staticmethod
+    def _legacy(frames: list[np.ndarray], threshold: int, pixel_threshold: float, window: int) -> tuple[list[str], int]:
+        hashes: list[str] = []
+        kept_hashes: list[str] = []
+        kept_thumbs: list[bytes] = []
+        for pixels in frames:
+            dhash_hex = _legacy_dhash_hex(pixels)
+            hashes.append(dhash_hex)
+            value = int(dhash_hex, 16)
+            if any((int(prev, 16) ^ value).bit_count() <= threshold for prev in kept_hashes[-window:]):
+                continue
+            thumb = _legacy_thumb(pixels)
+            if any(_legacy_mean_abs_diff(prev, thumb) <= pixel_threshold for prev in kept_thumbs[-window:]):
+                continue
+            kept_hashes.append(dhash_hex)
+            kept_thumbs.append(thumb)
+        return hashes, len(kept_hashes)
+
+    @staticmethod
+    def _vectorized(
+        frames: list[np.ndarray], threshold: int, pixel_threshold: float, window: int
+    ) -> tuple[list[str], int]:
+        """与 FrameProcessingService.process_stream_batch 相同：整批 dHash，缩略图只算候选帧"""
+        hashes: list[str] = []
+        history = FrameHistory()
+        for start in range(0, len(frames), STREAM_BATCH_SIZE):
+            gray = to_gray(np.stack(frames[start : start + STREAM_BATCH_SIZE]))
+            batch_hashes = dhash_batch(gray)
+            candidates = np.flatnonzero(history.novel_mask(batch_hashes, threshold))
+            thumbs: dict[int, np.ndarray] = {}
+            if candidates.size:
+                thumbs = dict(zip(candidates.tolist(), thumb_batch(gray[candidates]), strict=True))
+            for i, value in enumerate(batch_hashes.tolist()):
+                hashes.append(f"{value:016x}")
+                distance = history.min_hash_distance(value)
+                if distance is not None and distance <= threshold:
+                    continue
+                if history.has_similar_thumb(thumbs[i], pixel_threshold, window):
+                    continue
+                history.add_hash(value)
+                history.add_thumb(thumbs[i])
+        return hashes, history.hash_count
+
+    @staticmethod
+    def _legacy_lookup(history: list[str], queries: list[str], threshold: int) -> tuple[list[str], int]:
+        """逐个十六进制串比较的全历史查找"""
+        hits = 0
+        for query in queries:
+            value = int(query, 16)
+            hits += any((int(prev, 16) ^ value).bit_count() <= threshold for prev in history)
+        return [], hits
+
+    @staticmethod
+    def _vectorized_lookup(history: FrameHistory, queries: np.ndarray, threshold: int) -> tuple[list[str], int]:
+        return [], int((~history.novel_mask(queries, threshold)).sum())
+
+    @staticmethod
+    def _measure(run: Callable[[], tuple[list[str], int]], *, repeat: int) -> tuple[tuple[list[str], int], float]:
+        timings: list[float] = []
+        result: tuple[list[str], int] = ([], 0)
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run()
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return result, timings[len(timings) // 2]
+
+    @staticmethod
+    def _synthetic_frames(rng: np.random.Generator, count: int, width: int, height: int) -> list[np.ndarray]:
+        """模拟聊天录屏：长画布上随机分布消息气泡，画面时而静止、时而滚动，偶尔滚回之前的位置"""
+        canvas = np.full((height * 4, width, 3), 236, dtype=np.uint8)
+        for _ in range(max(1, height // 20)):
+            top = int(rng.integers(0, canvas.shape[0] - 40))
+            left = int(rng.integers(0, max(1, width // 2)))
+            bubble_h = int(rng.integers(20, 80))
+            bubble_w = int(rng.integers(width // 6, max(width // 6 + 1, width // 2)))
+            canvas[top : top + bubble_h, left : left + bubble_w] = rng.integers(0, 200, size=3, dtype=np.uint8)
+        max_offset = canvas.shape[0] - height
+        offset = 0
+        frames: list[np.ndarray] = []
+        for _ in range(count):
+            roll = rng.random()
+            if roll < 0.05:
+                offset = int(rng.integers(0, max_offset + 1))
+            elif roll < 0.55:
+                offset = min(max_offset, offset + int(rng.integers(4, max(5, height // 6))))
+            frame = canvas[offset : offset + height].copy()
+            noise_row = int(rng.integers(0, height))
+            frame[noise_row, :, :] ^= 1  # 编码噪声
+            frames.append(frame)
+        return frames
+
+    @staticmethod
+    def _synthetic_hashes(rng: np.random.Generator, history: int, queries: int) -> tuple[np.ndarray, np.ndarray]:
+        """随机历史哈希；一半查询由历史哈希翻转少量比特得到（应命中），其余随机"""
+        history_hashes = rng.integers(0, 2**63, size=history, dtype=np.uint64) * np.uint64(2) + rng.integers(
+            0, 2, size=history, dtype=np.uint64
+        )
+        query_hashes = rng.integers(0, 2**63, size=queries, dtype=np.uint64) * np.uint64(2)
+        near = rng.random(queries) < 0.5
+        picked = history_hashes[rng.integers(0, history, size=queries)]
+        flips = np.left_shift(np.uint64(1), rng.integers(0, 64, size=queries, dtype=np.uint64))
+        query_hashes[near] = np.bitwise_xor(picked, flips)[near]
+        return history_hashes, query_hashes
+
+    @staticmethod
+    def _build_lookup_report(
+        *,
+        history: int,
+        queries: int,
+        legacy_seconds: float,
+        vectorized_seconds: float,
+        legacy_hits: int,
+        vectorized_hits: int,
+    ) -> dict[str, Any]:
+        return {
+            "lookup_history": history,
+            "lookup_queries": queries,
+            "lookup_legacy_ms": legacy_seconds * 1000,
+            "lookup_vectorized_ms": vectorized_seconds * 1000,
+            "lookup_speedup": legacy_seconds / vectorized_seconds if vectorized_seconds > 0 else 0.0,
+            "lookup_legacy_hits": legacy_hits,
+            "lookup_vectorized_hits": vectorized_hits,
+        }
+
+    @staticmethod
+    def _build_report(
+        *,
+        frames: int,
+        repeat: int,
+        legacy_seconds: float,
+        vectorized_seconds: float,
+        hash_mismatches: int,
+        legacy_kept: int,
+        vectorized_kept: int,
+    ) -> dict[str, Any]:
+        def _rate(seconds: float) -> float:
+            return frames / seconds if seconds > 0 else 0.0
+
+        return {
+            "frames": frames,
+            "repeat": repeat,
+            "legacy_ms": legacy_seconds * 1000,
+            "vectorized_ms": vectorized_seconds * 1000,
+            "legacy_fps": _rate(legacy_seconds),
+            "vectorized_fps": _rate(vectorized_seconds),
+            "speedup": legacy_seconds / vectorized_seconds if vectorized_seconds > 0 else 0.0,
+            "hash_mismatches": hash_mismatches,
+            "legacy_kept": legacy_kept,
+            "vectorized_kept": vectorized_kept,
+        }
@@ -5,7 +5,7 @@ from .frame_processing_service import FrameProcessingService
 from .frame_selection_service import FrameSelectionService
 from .recording_extract_facade import RecordingExtractFacade, RecordingExtractParams
 from .recording_service import RecordingService
-from .video_frame_extract_service import FFProbeInfo, VideoFrameExtractService
+from .video_frame_extract_service import FFProbeInfo, RawFrame, VideoFrameExtractService
 
 __all__ = [
     "DedupState",
@@ -13,6 +13,7 @@ __all__ = [
     "FFProbeInfo",
     "FrameProcessingService",
     "FrameSelectionService",
+    "RawFrame",
     "RecordingExtractFacade",
     "RecordingExtractParams",
     "RecordingService",
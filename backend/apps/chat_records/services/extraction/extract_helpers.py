@@ -6,6 +6,8 @@ import logging
 from dataclasses import dataclass, field
 from typing import Any
 
+from .frame_hash_kernels import FrameHistory
+
 logger = logging.getLogger("apps.chat_records")
 
 
@@ -111,8 +113,7 @@ class DedupState:
 
     existing_sha256: set[str] = field(default_factory=set)
     seen_sha256: set[str] = field(default_factory=set)
-    kept_dhashes: list[str] = field(default_factory=list)
-    kept_thumbs: list[bytes] = field(default_factory=list)
+    history: FrameHistory = field(default_factory=FrameHistory)
     kept_ocr_texts: list[str] = field(default_factory=list)
     kept_ocr_shingles: list[set[str]] = field(default_factory=list)
     created_count: int = 0
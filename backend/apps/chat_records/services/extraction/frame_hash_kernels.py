@@ -0,0 +1,249 @@
+"""
+帧去重向量化内核
+
+dHash 与灰度缩略图按批计算：Lanczos 缩放按 Pillow Resample.c 的定点算法构造每个轴的系数矩阵
+（系数用与 C 实现相同的 libm sin 和累加顺序求得），整批帧一次矩阵乘法，哈希与缩略图共用一次灰度转换
+和水平缩放；与 Image.resize(..., LANCZOS) 的一致性由单测覆盖放大、缩小、单轴不变、1 像素等尺寸组合。
+哈希以 uint64 保存，与历史帧的汉明距离用 popcount 一次算完。
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+# Pillow 8bpc 重采样的定点精度（Resample.c: PRECISION_BITS = 32 - 8 - 2）
+_PRECISION_BITS = 22
+_ONE = float(1 << _PRECISION_BITS)
+_HALF = float(1 << (_PRECISION_BITS - 1))
+_LANCZOS_SUPPORT = 3.0
+
+
+def _sinc(x: float) -> float:
+    if x == 0.0:
+        return 1.0
+    x = x * math.pi
+    return math.sin(x) / x
+
+
+def _lanczos(x: float) -> float:
+    if -_LANCZOS_SUPPORT <= x < _LANCZOS_SUPPORT:
+        return _sinc(x) * _sinc(x / 3.0)
+    return 0.0
+
+
+@lru_cache(maxsize=64)
+def _resample_matrix(in_size: int, out_size: int) -> np.ndarray:
+    """Pillow precompute_coeffs + normalize_coeffs_8bpc 的矩阵形式（out_size × in_size，值为定点整数）"""
+    scale = in_size / out_size
+    filterscale = max(scale, 1.0)
+    support = _LANCZOS_SUPPORT * filterscale
+    ss = 1.0 / filterscale
+    matrix = np.zeros((out_size, in_size), dtype=np.float64)
+    for xx in range(out_size):
+        center = (xx + 0.5) * scale
+        xmin = max(int(center - support + 0.5), 0)
+        xmax = min(int(center + support + 0.5), in_size)
+        # 与 C 实现相同的求值与累加顺序，保证系数逐位一致
+        weights = [_lanczos((x - center + 0.5) * ss) for x in range(xmin, xmax)]
+        total = 0.0
+        for w in weights:
+            total += w
+        if total != 0.0:
+            weights = [w / total for w in weights]
+        matrix[xx, xmin:xmax] = [float(int((-0.5 if w < 0 else 0.5) + w * _ONE)) for w in weights]
+    matrix.setflags(write=False)
+    return matrix
+
+
+def _clip8(acc: np.ndarray) -> np.ndarray:
+    # 定点系数与像素的乘积之和远小于 2**53，float64 矩阵乘法与 C 的整数累加结果一致
+    return np.clip(np.floor((acc + _HALF) / _ONE), 0, 255)
+
+
+def _horizontal(gray: np.ndarray, widths: tuple[int, ...]) -> list[np.ndarray]:
+    """水平缩放到多个目标宽度，共用一次矩阵乘法；宽度不变时原样返回"""
+    in_width = gray.shape[2]
+    needed = list(dict.fromkeys(width for width in widths if width != in_width))
+    scaled: dict[int, np.ndarray] = {}
+    if needed:
+        matrix = np.concatenate([_resample_matrix(in_width, width) for width in needed]).T
+        acc = _clip8(gray.astype(np.float64) @ matrix)
+        start = 0
+        for width in needed:
+            scaled[width] = acc[..., start : start + width]
+            start += width
+    return [scaled.get(width, gray) for width in widths]
+
+
+def _vertical(rows: np.ndarray, height: int) -> np.ndarray:
+    if height == rows.shape[1]:
+        return rows.astype(np.uint8)
+    return _clip8(_resample_matrix(rows.shape[1], height) @ rows.astype(np.float64)).astype(np.uint8)
+
+
+def resize_gray(gray: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    批量 Lanczos 缩放（与 PIL Image.resize(..., LANCZOS) 在 L 模式下结果一致）
+
+    Args:
+        gray: (N, H, W) uint8
+    """
+    return _vertical(_horizontal(gray, (width,))[0], height)
+
+
+def to_gray(frames: np.ndarray) -> np.ndarray:
+    """(N, H, W, 3|4) RGB(A) 转 (N, H, W) 灰度（逐帧走 Pillow 的 C 实现，比 NumPy 整数运算快）；已是灰度则原样返回"""
+    if frames.ndim == 3:
+        return frames.astype(np.uint8, copy=False)
+    return np.stack([np.asarray(Image.fromarray(frame[..., :3]).convert("L")) for frame in frames])
+
+
+def _thumb_rows(height: int, crop_top_ratio: float, crop_bottom_ratio: float) -> tuple[int, int]:
+    top = int(max(0, min(height - 1, round(height * float(crop_top_ratio)))))
+    bottom_cut = int(max(0, min(height - 1, round(height * float(crop_bottom_ratio)))))
+    return top, max(top + 1, height - bottom_cut)
+
+
+def _dhash_bits_of(small: np.ndarray) -> np.ndarray:
+    return (small[:, :, :-1] > small[:, :, 1:]).reshape(small.shape[0], -1)
+
+
+def dhash_bits(frames: np.ndarray, hash_size: int = 8) -> np.ndarray:
+    """批量 dHash 比特，(N, hash_size * hash_size) bool；第 row * hash_size + col 位表示左 > 右"""
+    return _dhash_bits_of(resize_gray(to_gray(frames), hash_size + 1, hash_size))
+
+
+def pack_hashes(bits: np.ndarray) -> np.ndarray:
+    """把不超过 64 位的比特矩阵打包为 uint64 数组"""
+    if bits.shape[1] > 64:
+        raise ValueError("哈希位数超过 64，无法打包为 uint64")
+    weights = np.left_shift(np.uint64(1), np.arange(bits.shape[1], dtype=np.uint64))
+    return (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+
+def dhash_batch(frames: np.ndarray, hash_size: int = 8) -> np.ndarray:
+    """批量 dHash，返回 (N,) uint64"""
+    return pack_hashes(dhash_bits(frames, hash_size))
+
+
+def fingerprint_batch(
+    frames: np.ndarray,
+    *,
+    hash_size: int = 8,
+    thumb_size: int = 48,
+    crop_top_ratio: float = 0.12,
+    crop_bottom_ratio: float = 0.12,
+) -> tuple[np.ndarray, np.ndarray]:
+    """同时计算 dHash (N,) uint64 与缩略图 (N, thumb_size²) uint8，共用灰度转换与水平缩放"""
+    gray = to_gray(frames)
+    top, bottom = _thumb_rows(gray.shape[1], crop_top_ratio, crop_bottom_ratio)
+    hash_rows, thumb_rows = _horizontal(gray, (hash_size + 1, thumb_size))
+    hashes = pack_hashes(_dhash_bits_of(_vertical(hash_rows, hash_size)))
+    thumbs = _vertical(thumb_rows[:, top:bottom], thumb_size).reshape(gray.shape[0], -1)
+    return hashes, thumbs
+
+
+def bits_to_hex(bits: np.ndarray) -> str:
+    """单帧 dHash 比特转十六进制串（与原 calc_dhash_hex 的位序、宽度一致）"""
+    value = 0
+    for i in np.flatnonzero(bits).tolist():
+        value |= 1 << i
+    return f"{value:0{bits.size // 4}x}"
+
+
+def thumb_batch(
+    frames: np.ndarray,
+    *,
+    size: int = 48,
+    crop_top_ratio: float = 0.12,
+    crop_bottom_ratio: float = 0.12,
+) -> np.ndarray:
+    """批量灰度缩略图（裁掉上下状态栏后缩放），返回 (N, size * size) uint8"""
+    gray = to_gray(frames)
+    top, bottom = _thumb_rows(gray.shape[1], crop_top_ratio, crop_bottom_ratio)
+    return resize_gray(gray[:, top:bottom, :], size, size).reshape(gray.shape[0], size * size)
+
+
+def hamming_distances(value: int, hashes: np.ndarray) -> np.ndarray:
+    """value 与每个历史哈希的汉明距离"""
+    distances: np.ndarray = np.bitwise_count(np.bitwise_xor(hashes, np.uint64(value)))
+    return distances
+
+
+def mean_abs_diffs(thumb: np.ndarray, thumbs: np.ndarray) -> np.ndarray:
+    """thumb 与每个历史缩略图的平均绝对像素差"""
+    return np.abs(thumbs.astype(np.int16) - thumb.astype(np.int16)).mean(axis=1)
+
+
+def parse_hash_hex(value: str) -> int | None:
+    """十六进制 dHash 转整数；为空、非法或超过 64 位时返回 None"""
+    try:
+        parsed = int(value, 16)
+    except (TypeError, ValueError):
+        return None
+    return parsed if 0 <= parsed < 1 << 64 else None
+
+
+class FrameHistory:
+    """已保留帧的 dHash / 缩略图历史（连续数组，按倍数扩容）"""
+
+    def __init__(self, capacity: int = 256) -> None:
+        self._hashes = np.zeros(max(1, capacity), dtype=np.uint64)
+        self._hash_count = 0
+        self._thumbs: np.ndarray | None = None
+        self._thumb_count = 0
+
+    @property
+    def hash_count(self) -> int:
+        return self._hash_count
+
+    @property
+    def thumb_count(self) -> int:
+        return self._thumb_count
+
+    def add_hash(self, value: int) -> None:
+        if self._hash_count == self._hashes.shape[0]:
+            self._hashes = np.concatenate([self._hashes, np.zeros_like(self._hashes)])
+        self._hashes[self._hash_count] = value
+        self._hash_count += 1
+
+    def add_thumb(self, thumb: np.ndarray | bytes) -> None:
+        """追加缩略图；长度与已有缩略图不一致时忽略"""
+        row = np.frombuffer(thumb, dtype=np.uint8) if isinstance(thumb, bytes) else thumb.reshape(-1)
+        if row.size == 0:
+            return
+        if self._thumbs is None:
+            self._thumbs = np.zeros((self._hashes.shape[0], row.size), dtype=np.uint8)
+        if row.size != self._thumbs.shape[1]:
+            return
+        if self._thumb_count == self._thumbs.shape[0]:
+            self._thumbs = np.concatenate([self._thumbs, np.zeros_like(self._thumbs)])
+        self._thumbs[self._thumb_count] = row
+        self._thumb_count += 1
+
+    def min_hash_distance(self, value: int) -> int | None:
+        """与全部历史哈希的最小汉明距离；无历史时返回 None"""
+        if not self._hash_count:
+            return None
+        return int(hamming_distances(value, self._hashes[: self._hash_count]).min())
+
+    def novel_mask(self, hashes: np.ndarray, threshold: int) -> np.ndarray:
+        """整批哈希与全部历史一次比较：最小汉明距离大于 threshold 的为 True"""
+        if not self._hash_count or not len(hashes):
+            return np.ones(len(hashes), dtype=bool)
+        xor = np.bitwise_xor(hashes.astype(np.uint64)[:, None], self._hashes[None, : self._hash_count])
+        return np.bitwise_count(xor).min(axis=1) > threshold
+
+    def has_similar_thumb(self, thumb: np.ndarray | bytes, threshold: float, window: int) -> bool:
+        """最近 window 张缩略图中是否存在平均像素差不超过 threshold 的"""
+        if self._thumbs is None or not self._thumb_count:
+            return False
+        row = np.frombuffer(thumb, dtype=np.uint8) if isinstance(thumb, bytes) else thumb.reshape(-1)
+        if row.size != self._thumbs.shape[1]:
+            return False
+        recent = self._thumbs[max(0, self._thumb_count - window) : self._thumb_count]
+        return bool((mean_abs_diffs(row, recent) <= threshold).any())
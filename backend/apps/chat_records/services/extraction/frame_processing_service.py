@@ -10,19 +10,25 @@ from difflib import SequenceMatcher
 from hashlib import sha256
 from pathlib import Path
 
+import numpy as np
+
 from apps.core.protocols.automation_protocols import IOcrService
 from apps.core.tasking.runtime import CancellationToken, ProgressReporter
 
 from ..core.protocols import ProgressUpdater, ScreenshotCreator
 from .extract_helpers import DedupState, ExtractParams, jaccard_sets, shingles
+from .frame_hash_kernels import dhash_batch, parse_hash_hex, thumb_batch, to_gray
 from .frame_selection_service import FrameSelectionService
-from .video_frame_extract_service import FFProbeInfo, VideoFrameExtractService
+from .video_frame_extract_service import FFProbeInfo, RawFrame, VideoFrameExtractService
 
 logger = logging.getLogger("apps.chat_records")
 
 # Type alias for the reorder callback
 ReorderCallback = Callable[[int], None]
 
+# 流式抽帧每批计算 dHash / 缩略图的帧数
+STREAM_BATCH_SIZE = 8
+
 
 class FrameProcessingService:
     """帧处理服务：封装抽帧流程中的去重、ffmpeg 调度、截图写入等逻辑。"""
@@ -31,35 +37,12 @@ class FrameProcessingService:
     # dhash / pixel 去重
     # ------------------------------------------------------------------
 
-    def is_dhash_duplicate(
-        self,
-        selection_service: FrameSelectionService,
-        dhash_hex: str,
-        kept_dhashes: list[str],
-        window: int,
-        threshold: int,
-    ) -> bool:
-        """检查 dhash 是否与最近帧重复。"""
-        for prev in kept_dhashes[-window:]:
-            dist: int | None = selection_service.hamming_distance_hex(prev, dhash_hex)
-            if dist is not None and dist <= threshold:
-                return True
-        return False
-
-    def is_pixel_duplicate(
-        self,
-        selection_service: FrameSelectionService,
-        thumb: bytes,
-        kept_thumbs: list[bytes],
-        window: int,
-        threshold: float,
-    ) -> bool:
-        """检查像素差异是否与最近帧重复。"""
-        for prev_thumb in kept_thumbs[-window:]:
-            diff: float | None = selection_service.mean_abs_diff(prev_thumb, thumb)
-            if diff is not None and diff <= threshold:
-                return True
-        return False
+    def is_history_dhash_duplicate(self, state: DedupState, dhash_value: int | None, threshold: int) -> bool:
+        """dHash 与全部已保留帧比较（向量化 popcount），不再只看最近几帧。"""
+        if not threshold or dhash_value is None:
+            return False
+        dist = state.history.min_hash_distance(dhash_value)
+        return dist is not None and dist <= threshold
 
     # ------------------------------------------------------------------
     # OCR 相似度
@@ -293,12 +276,14 @@ class FrameProcessingService:
         state.created_count += 1
         state.seen_sha256.add(digest)
         if dhash_hex:
-            state.kept_dhashes.append(dhash_hex)
+            dhash_value = parse_hash_hex(dhash_hex)
+            if dhash_value is not None:
+                state.history.add_hash(dhash_value)
         if pixel_diff_threshold:
             if not thumb:
                 thumb = selection_service.calc_thumb_bytes(content)
             if thumb:
-                state.kept_thumbs.append(thumb)
+                state.history.add_thumb(thumb)
         if ocr_service is not None and ocr_text:
             state.kept_ocr_texts.append(ocr_text)
             state.kept_ocr_shingles.append(shingles(ocr_text))
@@ -317,24 +302,12 @@ class FrameProcessingService:
         """检查帧是否重复，返回 (is_dup, thumb)。"""
         if digest in state.existing_sha256 or digest in state.seen_sha256:
             return True, b""
-        if (
-            params.dedup_threshold
-            and state.kept_dhashes
-            and self.is_dhash_duplicate(
-                selection_service,
-                dhash_hex,
-                state.kept_dhashes,
-                window,
-                params.dedup_threshold,
-            )
-        ):
+        if self.is_history_dhash_duplicate(state, parse_hash_hex(dhash_hex), params.dedup_threshold):
             return True, b""
         thumb = b""
-        if pixel_diff_threshold and state.kept_thumbs:
+        if pixel_diff_threshold and state.history.thumb_count:
             thumb = selection_service.calc_thumb_bytes(content)
-            if thumb and self.is_pixel_duplicate(
-                selection_service, thumb, state.kept_thumbs, window, pixel_diff_threshold
-            ):
+            if thumb and state.history.has_similar_thumb(thumb, pixel_diff_threshold, window):
                 return True, thumb
         return False, thumb
 
@@ -430,6 +403,224 @@ class FrameProcessingService:
         )
         return True
 
+    # ------------------------------------------------------------------
+    # 流式抽帧（ffmpeg 原始帧管道，不落盘）
+    # ------------------------------------------------------------------
+
+    def calc_stream_capture_time(self, frame: RawFrame, params: ExtractParams) -> float | None:
+        """流式帧的捕获时间：非间隔策略取 showinfo 的 pts，其余与文件模式一样按序号推算。"""
+        if not params.interval_based and frame.pts_seconds is not None:
+            return float(frame.pts_seconds)
+        return float(frame.index - 1) * float(params.interval_seconds)
+
+    def process_stream_frame(
+        self,
+        frame: RawFrame,
+        project_id: int,
+        params: ExtractParams,
+        state: DedupState,
+        selection_service: FrameSelectionService,
+        ocr_service: IOcrService | None,
+        soft_deadline: float,
+        base_ordering: int,
+        window: int,
+        pixel_diff_threshold: float,
+        screenshot_creator: ScreenshotCreator,
+        progress_updater: ProgressUpdater,
+        *,
+        dhash_value: int | None = None,
+        thumb_row: np.ndarray | None = None,
+    ) -> bool:
+        """
+        处理一帧原始像素：先在数组上做 dHash / 像素去重，留下的帧才编码 JPEG 并 OCR。
+
+        dhash_value / thumb_row 为批量内核预先算好的结果，缺省时按单帧计算。
+        """
+        if dhash_value is None:
+            dhash_value = int(dhash_batch(frame.pixels[None])[0])
+        dhash_hex = f"{dhash_value:016x}"
+        if self.is_history_dhash_duplicate(state, dhash_value, params.dedup_threshold):
+            return False
+        thumb = b""
+        if pixel_diff_threshold:
+            if thumb_row is None:
+                thumb_row = thumb_batch(frame.pixels[None])[0]
+            if state.history.has_similar_thumb(thumb_row, pixel_diff_threshold, window):
+                return False
+            thumb = thumb_row.tobytes()
+
+        content = selection_service.encode_jpeg(frame.pixels)
+        digest = sha256(content).hexdigest()
+        if digest in state.existing_sha256 or digest in state.seen_sha256:
+            return False
+
+        frame_score: float | None = None
+        ocr_text = ""
+        if ocr_service is not None:
+            ocr_text, frame_score, should_skip = self.process_ocr_for_frame(
+                content,
+                ocr_service,
+                selection_service,
+                state,
+                params,
+                soft_deadline,
+                progress_updater,
+            )
+            if should_skip:
+                return False
+
+        screenshot_creator.create_screenshot(
+            project_id=project_id,
+            ordering=base_ordering + state.created_count + 1,
+            sha256=digest,
+            dhash=dhash_hex,
+            capture_time_seconds=self.calc_stream_capture_time(frame, params),
+            source="extract",
+            frame_score=frame_score,
+            image_name=f"frame_{frame.index:06d}.jpg",
+            image_content=content,
+        )
+
+        self.update_dedup_state(
+            state,
+            digest,
+            dhash_hex,
+            thumb,
+            ocr_text,
+            ocr_service,
+            pixel_diff_threshold,
+            selection_service,
+            content,
+        )
+        return True
+
+    def run_streaming_phase(
+        self,
+        service: VideoFrameExtractService,
+        recording_video_path: str,
+        project_id: int,
+        info: FFProbeInfo,
+        params: ExtractParams,
+        state: DedupState,
+        selection_service: FrameSelectionService,
+        ocr_service: IOcrService | None,
+        cancel_token: CancellationToken,
+        reporter: ProgressReporter,
+        progress_updater: ProgressUpdater,
+        soft_deadline: float,
+        base_ordering: int,
+        window: int,
+        pixel_diff_threshold: float,
+        screenshot_creator: ScreenshotCreator,
+    ) -> None:
+        """边解码边去重写入截图；进度按已处理帧的时间位置计算，ffmpeg 结束前即可看到结果。"""
+        total_estimate: int = (
+            service.estimate_total_frames(info.duration_seconds, params.interval_seconds)
+            if params.interval_based
+            else 0
+        )
+        progress_updater.update_progress(
+            progress=0,
+            current=0,
+            total=total_estimate,
+            message="抽帧中",
+        )
+
+        ffmpeg_timeout = max(30.0, float(soft_deadline) - time.monotonic() - 5.0)
+        frames = service.iter_raw_frames(
+            video_path=recording_video_path,
+            width=info.width,
+            height=info.height,
+            interval_seconds=params.interval_seconds,
+            strategy=params.strategy,
+            should_cancel=cancel_token.is_cancelled,
+            timeout_seconds=ffmpeg_timeout,
+        )
+
+        def flush(batch: list[RawFrame]) -> None:
+            self.process_stream_batch(
+                batch,
+                project_id,
+                params,
+                state,
+                selection_service,
+                ocr_service,
+                soft_deadline,
+                base_ordering,
+                window,
+                pixel_diff_threshold,
+                screenshot_creator,
+                progress_updater,
+            )
+            capture_time = self.calc_stream_capture_time(batch[-1], params) or 0.0
+            progress = int(capture_time * 100 / info.duration_seconds) if info.duration_seconds else 0
+            reporter.report_extra(
+                progress=min(max(progress, 0), 99),
+                current=state.created_count,
+                total=max(total_estimate, state.processed_count),
+                message="抽帧中",
+            )
+
+        batch: list[RawFrame] = []
+        for frame in frames:
+            batch.append(frame)
+            if len(batch) >= STREAM_BATCH_SIZE:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+    def process_stream_batch(
+        self,
+        frames: list[RawFrame],
+        project_id: int,
+        params: ExtractParams,
+        state: DedupState,
+        selection_service: FrameSelectionService,
+        ocr_service: IOcrService | None,
+        soft_deadline: float,
+        base_ordering: int,
+        window: int,
+        pixel_diff_threshold: float,
+        screenshot_creator: ScreenshotCreator,
+        progress_updater: ProgressUpdater,
+    ) -> None:
+        """
+        整批计算 dHash（向量化内核），再按顺序逐帧判重写入。
+
+        缩略图只为与已保留帧 dHash 不重复的候选帧计算（批内后续帧只会更容易被判重，候选集合是超集），
+        与哈希共用同一次灰度转换。
+        """
+        gray = to_gray(np.stack([frame.pixels for frame in frames]))
+        hashes = dhash_batch(gray)
+        thumbs: dict[int, np.ndarray] = {}
+        if pixel_diff_threshold:
+            candidates = (
+                np.flatnonzero(state.history.novel_mask(hashes, params.dedup_threshold))
+                if params.dedup_threshold
+                else np.arange(len(frames))
+            )
+            if candidates.size:
+                thumbs = dict(zip(candidates.tolist(), thumb_batch(gray[candidates]), strict=True))
+        for i, frame in enumerate(frames):
+            state.processed_count += 1
+            self.process_stream_frame(
+                frame,
+                project_id,
+                params,
+                state,
+                selection_service,
+                ocr_service,
+                soft_deadline,
+                base_ordering,
+                window,
+                pixel_diff_threshold,
+                screenshot_creator,
+                progress_updater,
+                dhash_value=int(hashes[i]),
+                thumb_row=thumbs.get(i),
+            )
+
     # ------------------------------------------------------------------
     # 截图重排序
     # ------------------------------------------------------------------
@@ -6,8 +6,11 @@ import io
 import logging
 from typing import Any, cast
 
+import numpy as np
 from PIL import Image, ImageEnhance, ImageOps
 
+from .frame_hash_kernels import bits_to_hex, dhash_bits, thumb_batch
+
 logger = logging.getLogger(__name__)
 
 _LANCZOS: Any = getattr(Image, "Resampling", Image).LANCZOS
@@ -19,23 +22,14 @@ class FrameSelectionService:
             return ""
         if hash_size <= 0:
             return ""
+        gray = np.asarray(Image.open(io.BytesIO(image_bytes)).convert("L"))
+        return self.calc_dhash_hex_array(gray, hash_size=hash_size)
 
-        img = Image.open(io.BytesIO(image_bytes))
-        img = img.convert("L")
-        img = img.resize((hash_size + 1, hash_size), _LANCZOS)
-        pixels = list(img.getdata())
-
-        bits = 0
-        for row in range(hash_size):
-            row_start = row * (hash_size + 1)
-            for col in range(hash_size):
-                left = pixels[row_start + col]
-                right = pixels[row_start + col + 1]
-                if left > right:
-                    bits |= 1 << (row * hash_size + col)
-
-        hex_len = (hash_size * hash_size) // 4
-        return f"{bits:0{hex_len}x}"
+    def calc_dhash_hex_array(self, pixels: np.ndarray, *, hash_size: int = 8) -> str:
+        """对内存中的 RGB/灰度帧计算 dHash（与 calc_dhash_hex 结果一致，免去编解码）"""
+        if pixels.size == 0 or hash_size <= 0:
+            return ""
+        return bits_to_hex(dhash_bits(pixels[None], hash_size)[0])
 
     def hamming_distance_hex(self, a: str, b: str) -> int | None:
         if not a or not b:
@@ -63,30 +57,42 @@ class FrameSelectionService:
             return b""
         if size <= 0:
             return b""
+        gray = np.asarray(Image.open(io.BytesIO(image_bytes)).convert("L"))
+        return self.calc_thumb_array(
+            gray, size=size, crop_top_ratio=crop_top_ratio, crop_bottom_ratio=crop_bottom_ratio
+        )
 
-        img = Image.open(io.BytesIO(image_bytes))
-        img = img.convert("L")
-        w, h = img.size
-        if w <= 0 or h <= 0:
+    def calc_thumb_array(
+        self,
+        pixels: np.ndarray,
+        *,
+        size: int = 48,
+        crop_top_ratio: float = 0.12,
+        crop_bottom_ratio: float = 0.12,
+    ) -> bytes:
+        """对内存中的帧计算灰度缩略图（与 calc_thumb_bytes 一致）"""
+        if pixels.size == 0 or size <= 0:
             return b""
-
-        top = int(max(0, min(h - 1, round(h * float(crop_top_ratio)))))
-        bottom_cut = int(max(0, min(h - 1, round(h * float(crop_bottom_ratio)))))
-        bottom = max(top + 1, h - bottom_cut)
-        img = img.crop((0, top, w, bottom))
-
-        img = img.resize((size, size), _LANCZOS)
-        return img.tobytes()
+        thumbs = thumb_batch(
+            pixels[None], size=size, crop_top_ratio=crop_top_ratio, crop_bottom_ratio=crop_bottom_ratio
+        )
+        thumb: bytes = thumbs[0].tobytes()
+        return thumb
 
     def mean_abs_diff(self, a: bytes, b: bytes) -> float | None:
         if not a or not b:
             return None
         if len(a) != len(b):
             return None
-        total = 0
-        for x, y in zip(a, b, strict=False):
-            total += x - y if x >= y else y - x
-        return total / float(len(a))
+        x = np.frombuffer(a, dtype=np.uint8).astype(np.int16)
+        y = np.frombuffer(b, dtype=np.uint8).astype(np.int16)
+        return float(np.abs(x - y).sum()) / float(len(a))
+
+    def encode_jpeg(self, pixels: np.ndarray, *, quality: int = 85) -> bytes:
+        """把内存中的帧编码为 JPEG（画质与文件模式 ffmpeg -q:v 6 相近）"""
+        buf = io.BytesIO()
+        Image.fromarray(pixels).save(buf, format="JPEG", quality=int(quality))
+        return buf.getvalue()
 
     def crop_for_ocr_bytes(
         self,
@@ -6,16 +6,21 @@ import contextlib
 import json
 import logging
 import math
+import queue
 import re
 import select
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
+from collections import deque
 from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
+import numpy as np
 from django.conf import settings
 
 from apps.core.exceptions import ValidationException
@@ -24,10 +29,145 @@ from apps.core.infrastructure.subprocess_runner import SubprocessRunner
 logger = logging.getLogger(__name__)
 
 
+RAW_FRAME_MAX_SIDE = 1280
+_SHOWINFO_RE = re.compile(r"\bn:\s*(\d+)\b.*?\bpts_time:\s*(-?[\d.]+)")
+_PTS_WAIT_SECONDS = 10.0
+
+
 @dataclass(frozen=True)
 class FFProbeInfo:
     duration_seconds: float
     time_base_seconds: float | None = None
+    width: int = 0
+    height: int = 0
+
+
+@dataclass(frozen=True)
+class RawFrame:
+    """ffmpeg 管道输出的一帧（RGB，uint8，形状 (height, width, 3)）"""
+
+    index: int
+    pts_seconds: float | None
+    pixels: np.ndarray
+
+
+class RawFramePipe:
+    """
+    读取 ffmpeg rawvideo 管道
+
+    stdout 按固定帧长切分为帧，放入有界队列（队列满时 ffmpeg 被管道反压）；
+    stderr 中 showinfo 输出的 pts_time 按其帧序号 n 与 stdout 的第 n 帧配对，其余行保留末尾若干行用于报错。
+    """
+
+    def __init__(
+        self,
+        proc: subprocess.Popen[bytes],
+        *,
+        width: int,
+        height: int,
+        parse_pts: bool,
+        queue_size: int = 8,
+    ) -> None:
+        self._proc = proc
+        self._width = width
+        self._height = height
+        self._frame_bytes = width * height * 3
+        self._parse_pts = parse_pts
+        self._frames: queue.Queue[bytes | None] = queue.Queue(maxsize=max(1, queue_size))
+        self._pts: dict[int, float] = {}
+        self._pts_cond = threading.Condition()
+        self._stderr_done = False
+        self._stderr_tail: deque[str] = deque(maxlen=12)
+        self._threads = [
+            threading.Thread(target=self._read_stdout, name="ffmpeg-raw-stdout", daemon=True),
+            threading.Thread(target=self._read_stderr, name="ffmpeg-raw-stderr", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def stderr_tail(self) -> str:
+        return "\n".join(self._stderr_tail)
+
+    def next_frame(self, timeout: float) -> bytes | None:
+        """取下一帧原始数据；超时抛出 queue.Empty，管道结束返回 None"""
+        return self._frames.get(timeout=timeout)
+
+    def pts_for(self, frame_no: int, timeout: float = _PTS_WAIT_SECONDS) -> float | None:
+        """
+        取第 frame_no 帧（从 0 开始）的 pts_time
+
+        showinfo 在帧写入 stdout 之前输出，正常情况下立即可得；stderr 结束或等待超时仍缺失时
+        抛出异常，避免后续帧的捕获时间整体错位。
+        """
+        if not self._parse_pts:
+            return None
+        deadline = time.monotonic() + timeout
+        with self._pts_cond:
+            while frame_no not in self._pts:
+                remaining = deadline - time.monotonic()
+                if self._stderr_done or remaining <= 0:
+                    raise ValidationException(f"ffmpeg 第 {frame_no + 1} 帧缺少时间戳,无法对齐抽帧时间")
+                self._pts_cond.wait(timeout=remaining)
+            return self._pts.pop(frame_no)
+
+    def to_array(self, data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype=np.uint8).reshape(self._height, self._width, 3)
+
+    def join(self, timeout: float = 5.0) -> None:
+        """等待读取线程结束;提前终止时丢弃未消费的帧,避免读取线程阻塞在满队列上"""
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            while thread.is_alive() and time.monotonic() < deadline:
+                with contextlib.suppress(queue.Empty):
+                    while True:
+                        self._frames.get_nowait()
+                thread.join(timeout=0.05)
+
+    def _read_stdout(self) -> None:
+        stdout = self._proc.stdout
+        try:
+            while stdout is not None:
+                data = self._read_exact(stdout, self._frame_bytes)
+                if data is None:
+                    break
+                self._frames.put(data)
+        except (OSError, ValueError):
+            logger.info("ffmpeg 原始帧管道读取中断", exc_info=True)
+        finally:
+            self._frames.put(None)
+
+    def _read_exact(self, stream: Any, size: int) -> bytes | None:
+        chunks: list[bytes] = []
+        remaining = size
+        while remaining > 0:
+            chunk = stream.read(remaining)
+            if not chunk:
+                return None
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def _read_stderr(self) -> None:
+        stderr = self._proc.stderr
+        try:
+            for raw in iter(stderr.readline, b"") if stderr is not None else ():
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                match = _SHOWINFO_RE.search(line) if "showinfo" in line else None
+                if match is not None:
+                    with contextlib.suppress(ValueError), self._pts_cond:
+                        self._pts[int(match.group(1))] = float(match.group(2))
+                        self._pts_cond.notify_all()
+                    continue
+                self._stderr_tail.append(line)
+        except (OSError, ValueError):
+            logger.info("ffmpeg stderr 读取中断", exc_info=True)
+        finally:
+            with self._pts_cond:
+                self._stderr_done = True
+                self._pts_cond.notify_all()
 
 
 class VideoFrameExtractService:
@@ -88,6 +228,7 @@ class VideoFrameExtractService:
 
         duration = 0.0
         time_base_seconds: float | None = None
+        width = height = 0
         ffprobe = self._find_tool("ffprobe")
         if ffprobe:
             cmd = [
@@ -97,7 +238,7 @@ class VideoFrameExtractService:
                 "-select_streams",
                 "v:0",
                 "-show_entries",
-                "format=duration:stream=time_base",
+                "format=duration:stream=time_base,width,height",
                 "-of",
                 "json",
                 video_path,
@@ -110,10 +251,13 @@ class VideoFrameExtractService:
                 duration = float((data.get("format") or {}).get("duration") or 0.0)
                 streams = data.get("streams") or []
                 if streams:
-                    tb = str((streams[0] or {}).get("time_base") or "")
+                    stream = streams[0] or {}
+                    tb = str(stream.get("time_base") or "")
                     if "/" in tb:
                         n, d = tb.split("/", 1)
                         time_base_seconds = float(n) / float(d) if float(d) else None
+                    width = int(stream.get("width") or 0)
+                    height = int(stream.get("height") or 0)
             except Exception:
                 logger.exception(
                     "ffprobe 解析视频信息失败",
@@ -126,13 +270,13 @@ class VideoFrameExtractService:
         if duration <= 0:
             raise ValidationException("无法解析视频时长")
 
-        return FFProbeInfo(duration_seconds=duration, time_base_seconds=time_base_seconds)
+        return FFProbeInfo(duration_seconds=duration, time_base_seconds=time_base_seconds, width=width, height=height)
 
     def _build_ffmpeg_filter_args(
-        self, strategy: str, interval_seconds: float, scene_threshold: float
+        self, strategy: str, interval_seconds: float, scene_threshold: float, scale: str | None = None
     ) -> tuple[list[str], str, list[str]]:
         """根据策略构建 ffmpeg 滤镜参数,返回 (input_args, vf, extra_args)"""
-        scale = "scale='if(gt(iw,ih),min(1280,iw),-2)':'if(gt(iw,ih),-2,min(1280,ih))'"
+        scale = scale or "scale='if(gt(iw,ih),min(1280,iw),-2)':'if(gt(iw,ih),-2,min(1280,ih))'"
         vfr_args = ["-vsync", "vfr", "-frame_pts", "1"]
 
         strategy_map: dict[str, tuple[list[str], str, list[str]]] = {
@@ -147,7 +291,27 @@ class VideoFrameExtractService:
         fps = 1.0 / interval_seconds
         return [], f"fps={fps},{scale},mpdecimate", []
 
-    def _force_kill_proc(self, proc: subprocess.Popen[str]) -> None:
+    def raw_frame_size(self, width: int, height: int, max_side: int = RAW_FRAME_MAX_SIDE) -> tuple[int, int]:
+        """原始帧输出尺寸：与文件模式相同的长边上限，宽高取偶数以固定每帧字节数"""
+        if width <= 0 or height <= 0:
+            return (0, 0)
+        ratio = min(1.0, float(max_side) / float(max(width, height)))
+        return (max(2, round(width * ratio / 2) * 2), max(2, round(height * ratio / 2) * 2))
+
+    def _build_raw_frame_args(
+        self, strategy: str, interval_seconds: float, scene_threshold: float, width: int, height: int
+    ) -> tuple[list[str], str, list[str], bool]:
+        """构建原始帧管道参数,返回 (input_args, vf, extra_args, parse_pts)"""
+        input_args, vf, _ = self._build_ffmpeg_filter_args(
+            strategy, interval_seconds, scene_threshold, scale=f"scale={width}:{height}"
+        )
+        parse_pts = strategy in ("scene", "keyframe", "smart")
+        if parse_pts:
+            vf = f"{vf},showinfo"
+        # mpdecimate 丢弃的帧不能被 cfr 输出补齐,所有策略都按 vfr 输出
+        return input_args, vf, ["-vsync", "vfr"], parse_pts
+
+    def _force_kill_proc(self, proc: subprocess.Popen[Any]) -> None:
         """强制终止进程"""
         with contextlib.suppress(Exception):
             proc.terminate()
@@ -193,8 +357,8 @@ class VideoFrameExtractService:
             k, v = line.split("=", 1)
             yield {k: v}
 
-    def _check_ffmpeg_exit(self, proc: subprocess.Popen[str]) -> None:
-        """检查 ffmpeg 退出码,非零则抛出异常"""
+    def _check_ffmpeg_exit(self, proc: subprocess.Popen[Any], stderr_tail: str | None = None) -> None:
+        """检查 ffmpeg 退出码,非零则抛出异常（stderr 已被其他线程读取时传入 stderr_tail）"""
         try:
             rc = proc.wait(timeout=5)
         except Exception:
@@ -203,9 +367,9 @@ class VideoFrameExtractService:
                 proc.kill()
             rc = proc.wait()
         if rc != 0:
-            err = ""
+            err = stderr_tail or ""
             try:
-                if proc.stderr is not None:
+                if stderr_tail is None and proc.stderr is not None:
                     err = proc.stderr.read() or ""
             except Exception:
                 logger.exception("读取 ffmpeg stderr 失败")
@@ -277,6 +441,100 @@ class VideoFrameExtractService:
 
         self._check_ffmpeg_exit(proc)
 
+    def iter_raw_frames(
+        self,
+        *,
+        video_path: str,
+        width: int,
+        height: int,
+        interval_seconds: float,
+        strategy: str = "interval",
+        scene_threshold: float = 0.25,
+        should_cancel: Callable[[], bool] | None = None,
+        timeout_seconds: float | None = None,
+        queue_size: int = 8,
+    ) -> Iterator[RawFrame]:  # pragma: no cover
+        """
+        以 rawvideo 管道逐帧输出缩放后的 RGB 帧,不落盘
+
+        width/height 为源视频分辨率（probe 结果）;ffmpeg 解码与调用方的逐帧处理并行,
+        调用方提前结束迭代时 ffmpeg 进程会被终止。
+        timeout_seconds 与文件模式一致只约束 ffmpeg 产帧:只累计等待下一帧的时间,
+        调用方处理帧（去重、OCR）的耗时不计入。
+        """
+        self._ensure_ffmpeg()
+        strategy = str(strategy or "interval").strip().lower()
+        if interval_seconds <= 0 and strategy == "interval":
+            raise ValidationException("截帧间隔必须大于 0")
+        timeout_seconds = float(timeout_seconds) if timeout_seconds is not None else None
+        if timeout_seconds is not None and timeout_seconds <= 0:
+            raise ValidationException("超时时间必须大于 0")
+        out_w, out_h = self.raw_frame_size(width, height)
+        if not out_w:
+            raise ValidationException("无法解析视频分辨率")
+
+        input_args, vf, extra_args, parse_pts = self._build_raw_frame_args(
+            strategy, interval_seconds, scene_threshold, out_w, out_h
+        )
+
+        ffmpeg = self._find_tool("ffmpeg")
+        if not ffmpeg:
+            raise ValidationException("未检测到 ffmpeg,请先安装")
+
+        cmd = [
+            ffmpeg,
+            "-hide_banner",
+            "-nostats",
+            "-loglevel",
+            "info" if parse_pts else "error",
+            *input_args,
+            "-i",
+            video_path,
+            "-an",
+            "-vf",
+            vf,
+            *extra_args,
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "pipe:1",
+        ]
+        proc = SubprocessRunner(allowed_programs={ffmpeg}).popen(
+            args=cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        pipe = RawFramePipe(proc, width=out_w, height=out_h, parse_pts=parse_pts, queue_size=queue_size)
+        produce_seconds = 0.0
+        finished = False
+        try:
+            index = 0
+            while True:
+                if timeout_seconds is not None and produce_seconds > timeout_seconds:
+                    raise ValidationException("ffmpeg 抽帧超时")
+                if should_cancel and should_cancel():
+                    raise ValidationException("抽帧已取消")
+                wait_started = time.monotonic()
+                try:
+                    data = pipe.next_frame(timeout=0.2)
+                except queue.Empty:
+                    continue
+                finally:
+                    produce_seconds += time.monotonic() - wait_started
+                if data is None:
+                    break
+                pts_seconds = pipe.pts_for(index)
+                index += 1
+                yield RawFrame(index=index, pts_seconds=pts_seconds, pixels=pipe.to_array(data))
+            finished = True
+        finally:
+            if not finished:
+                self._force_kill_proc(proc)
+            pipe.join()
+
+        self._check_ffmpeg_exit(proc, stderr_tail=pipe.stderr_tail)
+
     def estimate_total_frames(self, duration_seconds: float, interval_seconds: float) -> int:
         if duration_seconds <= 0:
             return 0
@@ -115,6 +115,7 @@ def extract_recording_frames_task(  # pragma: no cover
 ) -> dict[str, Any]:
     import tempfile
 
+    from django.conf import settings
     from django.core.files.base import ContentFile
     from django.db.models import Max
 
@@ -232,28 +233,7 @@ def extract_recording_frames_task(  # pragma: no cover
         ffmpeg_reporter = ProgressReporter(update_fn=_update_progress, min_interval_seconds=0.5)
         write_reporter = ProgressReporter(update_fn=_update_progress, min_interval_seconds=0.5)
 
-        with tempfile.TemporaryDirectory(prefix="chat_records_frames_") as tmpdir:
-            total_estimate, should_cancel = fps.run_ffmpeg_phase(
-                service,
-                recording.video.path,
-                str(recording.id),
-                info,
-                params,
-                cancel_token,
-                ffmpeg_reporter,
-                progress_updater,
-                soft_deadline,
-                tmpdir,
-            )
-
-            frame_files = fps.collect_frame_files(tmpdir)
-            total_files = len(frame_files)
-            if total_files:
-                facade.update_extract_progress(
-                    recording_id=recording_id,
-                    total=total_files,
-                )
-
+        def _reset_extract_screenshots() -> tuple[int, DedupState]:
             ChatRecordScreenshot.objects.filter(
                 project_id=recording.project_id, source=ScreenshotSource.EXTRACT
             ).delete()
@@ -272,41 +252,91 @@ def extract_recording_frames_task(  # pragma: no cover
                     .values_list("sha256", flat=True)
                 ),
             )
-            window = 12 if params.dedup_threshold >= 20 else 6
-            pixel_diff_threshold = 2.8 if params.dedup_threshold >= 20 else 0.0
-
-            for index, path in enumerate(frame_files, start=1):
-                if should_cancel():
-                    raise ValidationException("抽帧已取消")
-                state.processed_count += 1
-
-                fps.process_single_frame(
-                    path,
-                    index,
-                    recording.project_id,
+            return base_ordering, state
+
+        window = 12 if params.dedup_threshold >= 20 else 6
+        pixel_diff_threshold = 2.8 if params.dedup_threshold >= 20 else 0.0
+        streaming_enabled = bool(getattr(settings, "CHAT_RECORDS_STREAMING_EXTRACT", True))
+
+        if streaming_enabled and info.width > 0 and info.height > 0:
+            # 原始帧经管道边解码边去重,只有保留下来的帧才编码/OCR,截图在 ffmpeg 结束前即陆续写入
+            base_ordering, state = _reset_extract_screenshots()
+            fps.run_streaming_phase(
+                service,
+                recording.video.path,
+                recording.project_id,
+                info,
+                params,
+                state,
+                selection_service,
+                ocr_service,
+                cancel_token,
+                write_reporter,
+                progress_updater,
+                soft_deadline,
+                base_ordering,
+                window,
+                pixel_diff_threshold,
+                screenshot_creator,
+            )
+            fps.reorder_screenshots(recording.project_id, _reorder_callback)
+        else:
+            with tempfile.TemporaryDirectory(prefix="chat_records_frames_") as tmpdir:
+                total_estimate, should_cancel = fps.run_ffmpeg_phase(
+                    service,
+                    recording.video.path,
+                    str(recording.id),
                     info,
                     params,
-                    state,
-                    selection_service,
-                    ocr_service,
-                    soft_deadline,
-                    base_ordering,
-                    window,
-                    pixel_diff_threshold,
-                    screenshot_creator,
+                    cancel_token,
+                    ffmpeg_reporter,
                     progress_updater,
+                    soft_deadline,
+                    tmpdir,
                 )
 
-                progress = int(state.processed_count * 100 / total_files) if total_files else 100
-                write_reporter.report_extra(
-                    progress=min(progress, 99),
-                    current=state.created_count,
-                    total=total_files,
-                    message="写入截图",
-                    force=(state.processed_count == total_files),
-                )
-
-            fps.reorder_screenshots(recording.project_id, _reorder_callback)
+                frame_files = fps.collect_frame_files(tmpdir)
+                total_files = len(frame_files)
+                if total_files:
+                    facade.update_extract_progress(
+                        recording_id=recording_id,
+                        total=total_files,
+                    )
+
+                base_ordering, state = _reset_extract_screenshots()
+
+                for index, path in enumerate(frame_files, start=1):
+                    if should_cancel():
+                        raise ValidationException("抽帧已取消")
+                    state.processed_count += 1
+
+                    fps.process_single_frame(
+                        path,
+                        index,
+                        recording.project_id,
+                        info,
+                        params,
+                        state,
+                        selection_service,
+                        ocr_service,
+                        soft_deadline,
+                        base_ordering,
+                        window,
+                        pixel_diff_threshold,
+                        screenshot_creator,
+                        progress_updater,
+                    )
+
+                    progress = int(state.processed_count * 100 / total_files) if total_files else 100
+                    write_reporter.report_extra(
+                        progress=min(progress, 99),
+                        current=state.created_count,
+                        total=total_files,
+                        message="写入截图",
+                        force=(state.processed_count == total_files),
+                    )
+
+                fps.reorder_screenshots(recording.project_id, _reorder_callback)
 
         if params.strategy == "ocr":
             logger.info(
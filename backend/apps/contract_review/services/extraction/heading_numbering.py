@@ -17,6 +17,15 @@ from apps.core.llm.service import LLMService
 
 logger = logging.getLogger(__name__)
 
+# 一级标题与附件标题的手动编号前缀（对应 LLM 识别中的 level 0 / -1），供按条款切分全文使用
+TOP_LEVEL_HEADING_PATTERN = re.compile(
+    r"^\s*(?:"
+    r"第[一二三四五六七八九十百零〇\d]+[条章]"
+    r"|[一二三四五六七八九十百]+[、．.]"
+    r"|附件[一二三四五六七八九十\d]*[：:、．.\-\s]"
+    r")"
+)
+
 
 class HeadingNumbering:  # pragma: no cover
     """通过 LLM 识别标题层级并设置 OOXML 多级自动编号"""
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..extraction.heading_numbering import TOP_LEVEL_HEADING_PATTERN
+
+# 单个分块的正文字数上限（按段落文本计），超过时在条款边界处切分
+DEFAULT_CHUNK_CHARS = 6000
+# 合同首部（首个一级条款之前的当事人信息等）作为共享上下文时的字数上限
+PREAMBLE_CONTEXT_CHARS = 1500
+
+
+@dataclass
+class ClauseChunk:
+    """按条款切分的一段合同正文，start 为首段在全文中的段落下标"""
+
+    start: int
+    paragraphs: list[str]
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.paragraphs)
+
+    def numbered_text(self) -> str:
+        """带全局段落编号的正文，与整篇审查时的 [段落N] 编号一致"""
+        return "\n".join(f"[段落{self.start + i}] {p}" for i, p in enumerate(self.paragraphs))
+
+
+def clause_starts(paragraphs: list[str]) -> list[int]:
+    """一级条款（及附件）标题所在的段落下标"""
+    return [i for i, p in enumerate(paragraphs) if TOP_LEVEL_HEADING_PATTERN.match(p)]
+
+
+def split_into_clause_chunks(paragraphs: list[str], max_chars: int = DEFAULT_CHUNK_CHARS) -> list[ClauseChunk]:
+    """
+    按一级条款切分合同，再把相邻条款合并到不超过 max_chars 的分块
+
+    单个条款超过上限时按段落继续切分；识别不到条款标题（如标题使用自动编号）时整体按段落切分。
+    全文不超过上限时只返回一个分块。
+    """
+    if not paragraphs:
+        return []
+    boundaries = sorted({0, *clause_starts(paragraphs), len(paragraphs)})
+    sections = [(boundaries[k], boundaries[k + 1]) for k in range(len(boundaries) - 1)]
+
+    chunks: list[ClauseChunk] = []
+    start = 0
+    size = 0
+    for section_start, section_end in sections:
+        section_size = sum(len(p) for p in paragraphs[section_start:section_end])
+        if size and size + section_size > max_chars:
+            chunks.append(ClauseChunk(start, paragraphs[start:section_start]))
+            start, size = section_start, 0
+        if section_size <= max_chars:
+            size += section_size
+            continue
+        # 超长条款：按段落切分，末尾不足上限的部分与后续条款继续合并
+        for i in range(section_start, section_end):
+            if size and size + len(paragraphs[i]) > max_chars:
+                chunks.append(ClauseChunk(start, paragraphs[start:i]))
+                start, size = i, 0
+            size += len(paragraphs[i])
+    chunks.append(ClauseChunk(start, paragraphs[start:]))
+    return chunks
+
+
+def preamble_context(paragraphs: list[str], max_chars: int = PREAMBLE_CONTEXT_CHARS) -> str:
+    """首个一级条款之前的合同首部（当事人名称、地址等），作为各分块共享的上下文"""
+    starts = clause_starts(paragraphs)
+    end = starts[0] if starts else 0
+    return "\n".join(paragraphs[:end])[:max_chars]
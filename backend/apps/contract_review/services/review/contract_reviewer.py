@@ -3,12 +3,19 @@ from __future__ import annotations
 import json
 import logging
 import re
-from dataclasses import dataclass
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from typing import TypeVar
 
 from apps.core.llm.service import LLMService
 
+from .clause_chunker import DEFAULT_CHUNK_CHARS, ClauseChunk, preamble_context, split_into_clause_chunks
+
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 _REVIEW_FRAMEWORK = """\
 ## 一、基础审查
 1. 文本准确性：
@@ -147,6 +154,11 @@ _REVIEW_FRAMEWORK = """\
 - 条款的独立性是否明确（部分无效不影响整体）
 """
 
+# 分块审查：并发数与单块输出上限（单块正文短，无需整篇审查的 32768）
+_CHUNK_MAX_WORKERS = 4
+_CHUNK_MAX_TOKENS = 8192
+_SUMMARY_MAX_TOKENS = 4096
+
 _PARTY_LABELS: dict[str, str] = {
     "party_a": "甲方",
     "party_b": "乙方",
@@ -166,8 +178,9 @@ class ReviewResult:  # pragma: no cover
 class ContractReviewer:  # pragma: no cover
     """基于用户代表方立场审查合同条款"""
 
-    def __init__(self, llm_service: LLMService) -> None:  # pragma: no cover
+    def __init__(self, llm_service: LLMService, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> None:  # pragma: no cover
         self._llm = llm_service
+        self._chunk_chars = chunk_chars
 
     def review_contract(  # pragma: no cover
         self,
@@ -177,7 +190,11 @@ class ContractReviewer:  # pragma: no cover
         party_b: str,
         model_name: str = "",
     ) -> list[ReviewResult]:
-        """将合同全文和代表方信息发送给 LLM，返回修改建议"""
+        """将合同全文和代表方信息发送给 LLM，返回修改建议；超过分块上限的长合同按条款分块并行审查"""
+        chunks = split_into_clause_chunks(paragraphs, self._chunk_chars)
+        if len(chunks) > 1:
+            return self._review_chunks(chunks, paragraphs, represented_party, party_a, party_b, model_name)
+
         text = "\n".join(f"[段落{i}] {p}" for i, p in enumerate(paragraphs))
         prompt = self._build_revision_prompt(text, represented_party, party_a, party_b)
         try:
@@ -201,7 +218,11 @@ class ContractReviewer:  # pragma: no cover
         party_b: str,
         model_name: str = "",
     ) -> str:
-        """生成合同评估报告（Markdown 格式）"""
+        """生成合同评估报告（Markdown 格式）；长合同按条款分块并行分析后再汇总总体评估"""
+        chunks = split_into_clause_chunks(paragraphs, self._chunk_chars)
+        if len(chunks) > 1:
+            return self._report_chunks(chunks, paragraphs, represented_party, party_a, party_b, model_name)
+
         text = "\n".join(f"[段落{i}] {p}" for i, p in enumerate(paragraphs))
         prompt = self._build_report_prompt(text, represented_party, party_a, party_b)
         try:
@@ -217,8 +238,111 @@ class ContractReviewer:  # pragma: no cover
             logger.exception("评估报告生成失败")
             return ""
 
+    def _review_chunks(  # pragma: no cover
+        self,
+        chunks: list[ClauseChunk],
+        paragraphs: list[str],
+        represented_party: str,
+        party_a: str,
+        party_b: str,
+        model_name: str,
+    ) -> list[ReviewResult]:
+        """各分块共享合同首部并行审查，按分块顺序合并并校正为全文段落编号"""
+        context = preamble_context(paragraphs)
+
+        def _review(chunk: ClauseChunk) -> list[ReviewResult]:
+            prompt = self._build_revision_prompt(
+                chunk.numbered_text(),
+                represented_party,
+                party_a,
+                party_b,
+                partial=True,
+                context=context if chunk.start else "",
+            )
+            resp = self._llm.complete(
+                prompt=prompt,
+                model=model_name or None,
+                temperature=0.3,
+                max_tokens=_CHUNK_MAX_TOKENS,
+                fallback=True,
+            )
+            return self._parse_revision_response(resp.content)
+
+        results_by_start = self._run_chunks(chunks, _review, "合同审查")
+        return merge_chunk_results(chunks, results_by_start)
+
+    def _report_chunks(  # pragma: no cover
+        self,
+        chunks: list[ClauseChunk],
+        paragraphs: list[str],
+        represented_party: str,
+        party_a: str,
+        party_b: str,
+        model_name: str,
+    ) -> str:
+        """各分块并行逐条分析，再用一次短调用基于分块结论生成总体评估"""
+        context = preamble_context(paragraphs)
+
+        def _analyze(chunk: ClauseChunk) -> str:
+            prompt = self._build_report_prompt(
+                chunk.numbered_text(),
+                represented_party,
+                party_a,
+                party_b,
+                partial=True,
+                context=context if chunk.start else "",
+            )
+            resp = self._llm.complete(
+                prompt=prompt,
+                model=model_name or None,
+                temperature=0.3,
+                max_tokens=_CHUNK_MAX_TOKENS,
+                fallback=True,
+            )
+            return resp.content.strip()
+
+        parts_by_start = self._run_chunks(chunks, _analyze, "评估报告")
+        sections = [
+            f"## 段落 {chunk.start}-{chunk.end - 1}\n\n{parts_by_start[chunk.start]}"
+            for chunk in chunks
+            if parts_by_start.get(chunk.start)
+        ]
+        if not sections:
+            return ""
+        findings = "\n\n".join(sections)
+        try:
+            resp = self._llm.complete(
+                prompt=self._build_summary_prompt(findings, represented_party, party_a, party_b),
+                model=model_name or None,
+                temperature=0.3,
+                max_tokens=_SUMMARY_MAX_TOKENS,
+                fallback=True,
+            )
+            summary = resp.content.strip()
+        except Exception:
+            logger.exception("评估报告总体评估生成失败")
+            summary = ""
+        return f"{findings}\n\n## 总体评估\n\n{summary}" if summary else findings
+
+    def _run_chunks(  # pragma: no cover
+        self, chunks: list[ClauseChunk], run: Callable[[ClauseChunk], _T], label: str
+    ) -> dict[int, _T]:
+        """并行执行各分块，返回 {分块起始段落: 结果}；失败的分块记录日志后跳过"""
+        results: dict[int, _T] = {}
+        with ThreadPoolExecutor(max_workers=min(len(chunks), _CHUNK_MAX_WORKERS)) as pool:
+            futures = {pool.submit(run, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    results[chunk.start] = future.result()
+                except Exception:
+                    logger.exception("%s分块失败 (段落 %d-%d)", label, chunk.start, chunk.end - 1)
+        return results
+
     @staticmethod
-    def _build_revision_prompt(text: str, represented_party: str, party_a: str, party_b: str) -> str:  # pragma: no cover
+    def _build_revision_prompt(  # pragma: no cover
+        text: str, represented_party: str, party_a: str, party_b: str, partial: bool = False, context: str = ""
+    ) -> str:
         party_label = _PARTY_LABELS.get(represented_party, "甲方")
         party_name = party_a if represented_party == "party_a" else party_b
         return (
@@ -238,11 +362,14 @@ class ContractReviewer:  # pragma: no cover
             '"reason": "【高/中/低】修改理由", "paragraph_index": 段落编号}]\n'
             "如果没有需要修改的条款，返回空数组 []。\n"
             "不要返回任何其他内容。\n\n"
+            f"{_chunk_scope(partial, context)}"
             f"{text}"
         )
 
     @staticmethod
-    def _build_report_prompt(text: str, represented_party: str, party_a: str, party_b: str) -> str:  # pragma: no cover
+    def _build_report_prompt(  # pragma: no cover
+        text: str, represented_party: str, party_a: str, party_b: str, partial: bool = False, context: str = ""
+    ) -> str:
         party_label = _PARTY_LABELS.get(represented_party, "甲方")
         party_name = party_a if represented_party == "party_a" else party_b
         return (
@@ -256,9 +383,24 @@ class ContractReviewer:  # pragma: no cover
             "2. 为什么这构成风险或问题\n"
             "3. 风险等级（高/中/低）\n"
             "4. 修改建议\n\n"
-            "最后，请提供一个总体评估，指出最严重的三个问题和最需要优先修改的内容。\n\n"
-            "合同全文如下：\n\n"
-            f"{text}"
+            + (
+                f"不需要总体评估。\n\n{_chunk_scope(partial, context)}"
+                if partial
+                else "最后，请提供一个总体评估，指出最严重的三个问题和最需要优先修改的内容。\n\n合同全文如下：\n\n"
+            )
+            + text
+        )
+
+    def _build_summary_prompt(  # pragma: no cover
+        self, findings: str, represented_party: str, party_a: str, party_b: str
+    ) -> str:
+        party_label = _PARTY_LABELS.get(represented_party, "甲方")
+        party_name = party_a if represented_party == "party_a" else party_b
+        return (
+            f"你是代表{party_label}（{party_name}）的合同法律顾问。甲方：{party_a}，乙方：{party_b}。\n"
+            "以下是对一份合同各部分条款的逐条审查意见。请据此给出总体评估，"
+            "指出最严重的三个问题和最需要优先修改的内容，不要重复逐条意见。\n\n"
+            f"{findings}"
         )
 
     @staticmethod
@@ -296,6 +438,47 @@ class ContractReviewer:  # pragma: no cover
         return results
 
 
+def _chunk_scope(partial: bool, context: str) -> str:  # pragma: no cover
+    """分块审查时附加的范围说明（及共享的合同首部）；整篇审查时为空"""
+    if not partial:
+        return ""
+    header = f"## 合同首部（仅供了解当事人信息，不在本次审查范围）\n{context}\n\n" if context else ""
+    return f"{header}以下仅为合同的部分条款，只针对这些条款输出意见，段落编号沿用全文编号。\n\n"
+
+
+def merge_chunk_results(  # pragma: no cover
+    chunks: list[ClauseChunk], results_by_start: dict[int, list[ReviewResult]]
+) -> list[ReviewResult]:
+    """按分块顺序合并审查结果：段落编号校正到所在分块的全文编号，同一段落同一原文只保留首条"""
+    merged: list[ReviewResult] = []
+    seen: set[tuple[int, str]] = set()
+    for chunk in chunks:
+        for result in results_by_start.get(chunk.start, []):
+            original = result.original.strip()
+            if not original:
+                continue
+            index = _locate_paragraph(chunk, result)
+            key = (index, original)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(replace(result, paragraph_index=index))
+    return merged
+
+
+def _locate_paragraph(chunk: ClauseChunk, result: ReviewResult) -> int:  # pragma: no cover
+    """确定修改建议所在的全文段落：优先按全文编号，其次兼容分块内编号，最后按原文在分块内查找"""
+    for index in (result.paragraph_index, chunk.start + result.paragraph_index):
+        if chunk.start <= index < chunk.end and result.original in chunk.paragraphs[index - chunk.start]:
+            return index
+    for offset, paragraph in enumerate(chunk.paragraphs):
+        if result.original in paragraph:
+            return chunk.start + offset
+    if chunk.start <= result.paragraph_index < chunk.end:
+        return result.paragraph_index
+    return chunk.start
+
+
 def _parse_int(val: object) -> int:  # pragma: no cover
     if isinstance(val, int):
         return val
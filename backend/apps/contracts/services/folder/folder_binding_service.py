@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, ClassVar, cast
+from typing import IO, Any, ClassVar, cast
 
 from apps.contracts.models import Contract, ContractFolderBinding
 from apps.core.filesystem import (
@@ -105,7 +105,7 @@ class FolderBindingService(FolderBindingCrudService):
             subdir_key=subdir_key,
         )
 
-    def extract_zip_for_contract(self, contract_id: int, zip_content: bytes) -> str | None:
+    def extract_zip_for_contract(self, contract_id: int, zip_content: bytes | IO[bytes]) -> str | None:
         """为合同解压 ZIP 到绑定文件夹(便捷方法)"""
         return self.extract_zip_to_bound_folder(contract_id=contract_id, zip_content=zip_content)
 
@@ -126,6 +126,8 @@ class FolderBindingService(FolderBindingCrudService):
             ),
         )
 
-    def extract_zip_to_bound_folder(self, contract_id: int, zip_content: bytes) -> str | None:  # type: ignore[override]
+    def extract_zip_to_bound_folder(  # type: ignore[override]
+        self, contract_id: int, zip_content: bytes | IO[bytes]
+    ) -> str | None:
         """解压 ZIP 到绑定文件夹（实现 IContractFolderBindingService 协议）"""
         return super().extract_zip_to_bound_folder(owner_id=contract_id, zip_content=zip_content)
@@ -251,6 +251,8 @@ def resolve_q_cluster() -> dict[str, object]:
         "bulk": int(os.environ.get("DJANGO_Q_BULK", "10") or "10"),
         "max_attempts": int(os.environ.get("DJANGO_Q_MAX_ATTEMPTS", "3") or "3"),
         "catch_up": (os.environ.get("DJANGO_Q_CATCH_UP", "False") or "").lower() in _TRUE_VALUES,
+        # 非守护 worker 才能创建子进程（OCR / 文本提取进程池）
+        "daemonize_workers": _env_bool("DJANGO_Q_DAEMONIZE_WORKERS", False),
     }
 
     redis_url = resolve_redis_url()
@@ -33,12 +33,14 @@ def build_court_sms_service_with_deps(
     from apps.automation.services.sms.court_sms_service import CourtSMSService
     from apps.automation.services.sms.document_attachment_service import DocumentAttachmentService
     from apps.automation.services.sms.matching import DocumentParserService, PartyMatchingService
+    from apps.automation.services.sms.matching.client_name_index import get_client_name_index
     from apps.automation.services.sms.sms_notification_service import SMSNotificationService
     from apps.automation.services.sms.sms_parser_service import SMSParserService
 
     party_matching_service = PartyMatchingService(
         client_service=client_service,
         lawyer_service=lawyer_service,
+        name_index=get_client_name_index(),
     )
 
     document_parser_service = DocumentParserService(
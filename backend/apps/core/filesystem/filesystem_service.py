@@ -5,6 +5,7 @@ import logging
 import shutil
 import zipfile
 from collections.abc import Iterable
+from typing import IO
 
 from apps.core.exceptions import ValidationException
 from apps.core.utils.path import Path
@@ -14,6 +15,13 @@ from .path_validator import FolderPathValidator
 logger = logging.getLogger("apps")
 
 
+def as_zip_source(zip_content: bytes | IO[bytes]) -> IO[bytes]:
+    """bytes 包装为 BytesIO,文件对象原样返回,供 zipfile.ZipFile 读取"""
+    if isinstance(zip_content, (bytes, bytearray, memoryview)):
+        return io.BytesIO(zip_content)
+    return zip_content
+
+
 class FolderFilesystemService:
     def __init__(self, validator: FolderPathValidator | None = None) -> None:
         self._validator = validator
@@ -69,12 +77,13 @@ class FolderFilesystemService:
                 return candidate  # type: ignore[no-any-return]
             counter += 1
 
-    def extract_zip_bytes(self, base_path: str, zip_content: bytes) -> str:
+    def extract_zip_bytes(self, base_path: str, zip_content: bytes | IO[bytes]) -> str:
+        """解压 ZIP 到 base_path;zip_content 可为 bytes 或可 seek 的二进制文件对象(如临时文件)"""
         base_dir = Path(base_path)
         self.validator.mkdirs(base_dir)
 
         try:
-            with zipfile.ZipFile(io.BytesIO(zip_content), "r") as zip_file:
+            with zipfile.ZipFile(as_zip_source(zip_content), "r") as zip_file:
                 for info in zip_file.infolist():
                     member_name = info.filename
                     relative_path = self.validator.sanitize_zip_member_path(member_name)
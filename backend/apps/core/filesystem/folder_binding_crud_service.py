@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import IO, Any
 
 from apps.core.exceptions import NotFoundError, ValidationException
 
@@ -237,7 +237,9 @@ class FolderBindingCrudService(BaseFolderBindingService):
         )
         return str(abs_file_path)
 
-    def extract_zip_to_bound_folder(self, *, owner_id: int, zip_content: bytes, **kwargs: Any) -> str | None:
+    def extract_zip_to_bound_folder(
+        self, *, owner_id: int, zip_content: bytes | IO[bytes], **kwargs: Any
+    ) -> str | None:
         binding = self.get_binding(owner_id=owner_id, **kwargs)
         if not binding:
             return None
@@ -248,10 +250,11 @@ class FolderBindingCrudService(BaseFolderBindingService):
         if self._is_cloud_storage(binding):
             provider = self._get_provider_for_binding(binding)
             try:
-                import io
                 import zipfile
 
-                with zipfile.ZipFile(io.BytesIO(zip_content)) as zf:
+                from .filesystem_service import as_zip_source
+
+                with zipfile.ZipFile(as_zip_source(zip_content)) as zf:
                     for member in zf.infolist():
                         # 防止 ZipSlip：验证所有路径组件，拒绝 ..
                         member_parts = [p for p in member.filename.split("/") if p]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Sequence
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -12,9 +12,27 @@ Hook = Callable[[], Awaitable[None]]
 
 
 class LifespanApp:
-    def __init__(self, *, on_startup: Hook | None = None, on_shutdown: Hook | None = None) -> None:
+    def __init__(self, *, on_startup: Hook | None = None, on_shutdown: Hook | Sequence[Hook] | None = None) -> None:
         self._on_startup = on_startup
-        self._on_shutdown = on_shutdown
+        if on_shutdown is None:
+            self._on_shutdown: tuple[Hook, ...] = ()
+        elif callable(on_shutdown):
+            self._on_shutdown = (on_shutdown,)
+        else:
+            self._on_shutdown = tuple(on_shutdown)
+
+    async def _run_shutdown_hooks(self) -> None:
+        # 逐个执行关闭钩子,单个钩子失败不影响其余资源释放,最后统一抛出首个异常
+        first_error: Exception | None = None
+        for hook in self._on_shutdown:
+            try:
+                await hook()
+            except Exception as e:
+                logger.exception("关闭钩子执行失败")
+                if first_error is None:
+                    first_error = e
+        if first_error is not None:
+            raise first_error
 
     async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
         while True:
@@ -32,10 +50,8 @@ class LifespanApp:
                 continue
             if msg_type == "lifespan.shutdown":
                 try:
-                    if self._on_shutdown:
-                        await self._on_shutdown()
+                    await self._run_shutdown_hooks()
                 except Exception as e:
-                    logger.exception("操作失败")
                     await send({"type": "lifespan.shutdown.failed", "message": str(e)})
                     return
                 await send({"type": "lifespan.shutdown.complete"})
@@ -104,6 +104,7 @@ class CacheKeys:
 
     # 自动化相关
     AUTOMATION_COURT_SMS_RECOVERY_SCHEDULED = "automation:court_sms_recovery_scheduled"
+    AUTOMATION_CLIENT_NAME_INDEX_VERSION = "automation:client_name_index:version"  # 客户名称索引版本号
 
     # 配置相关
     CASE_STAGES_CONFIG = "config:case_stages"  # 案件阶段配置
@@ -208,6 +209,10 @@ class CacheKeys:
     def documents_matching_version_folder_templates(cls) -> str:
         return cls.DOCUMENTS_MATCHING_VERSION_FOLDER_TEMPLATES
 
+    @classmethod
+    def automation_client_name_index_version(cls) -> str:
+        return cls.AUTOMATION_CLIENT_NAME_INDEX_VERSION
+
 
 # 缓存超时时间(秒)
 _DEFAULT_TIMEOUTS: dict[str, int] = {
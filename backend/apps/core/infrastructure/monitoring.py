@@ -5,7 +5,7 @@ from __future__ import annotations
 """
 性能监控模块
 
-提供 API 响应时间监控和数据库查询次数监控
+提供 API 响应时间监控、数据库查询次数监控和连接池指标
 """
 
 import logging
@@ -179,6 +179,18 @@ class PerformanceMonitor:
             if collect_queries and not prev_force_debug_cursor:
                 connection.force_debug_cursor = prev_force_debug_cursor
 
+    @classmethod
+    def get_connection_pool_metrics(cls) -> dict[str, Any]:
+        """
+        获取进程内 HTTP 连接池指标
+
+        Returns:
+            各连接池的客户端数、打开连接数与复用率
+        """
+        from apps.core.llm.backends.client_pool import get_llm_client_pool_stats
+
+        return {"llm": get_llm_client_pool_stats()}
+
     @classmethod
     def _log_performance(
         cls,
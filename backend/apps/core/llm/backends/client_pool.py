@@ -0,0 +1,327 @@
+"""
+LLM 后端 HTTP 客户端池
+
+按 (base_url, api_key, ssl_verify, 超时档位) 在进程内复用 httpx / openai 客户端,
+避免每次 chat/stream/embed 调用都重新建立 TCP+TLS 连接.
+
+- 同步客户端进程内共享,启用 HTTP/2(h2 可用时)与 keep-alive
+- 异步客户端与事件循环绑定,按事件循环分别缓存;每个事件循环挂一个守护任务,
+  asyncio.run / asgiref / uvicorn 退出前取消剩余任务时,在该循环上 aclose 其客户端
+- ASGI lifespan shutdown 调用 aclose_llm_client_pool();django-q worker 等子进程
+  退出时通过 multiprocessing Finalize 关闭同步客户端
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing import util as mp_util
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from apps.core.http.httpx_clients import _httpx_event_hooks
+
+if TYPE_CHECKING:
+    import openai
+
+logger = logging.getLogger("apps.core.llm.backends.client_pool")
+
+# 超时档位(秒):请求超时向上取整到档位,具体超时通过 with_options/请求参数覆盖
+TIMEOUT_CLASSES: tuple[int, ...] = (30, 60, 120, 300, 600)
+
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+
+def resolve_ssl_verify() -> bool:
+    """SSL 验证可通过环境变量 LLM_SSL_VERIFY=false 关闭(仅用于特殊 CDN/代理环境)"""
+    return os.environ.get("LLM_SSL_VERIFY", "true").lower() not in ("false", "0", "no")
+
+
+def resolve_timeout_class(timeout_seconds: float | None) -> int:
+    """将请求超时映射到档位,同档位请求共享同一个客户端"""
+    value = float(timeout_seconds or 0)
+    for bucket in TIMEOUT_CLASSES:
+        if value <= bucket:
+            return bucket
+    return int(value) + (0 if value.is_integer() else 1)
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _async_event_hooks() -> dict[str, list[Callable[..., Any]]] | None:
+    """AsyncClient 要求事件钩子可 await,将同步指标钩子包装为协程"""
+    hooks = _httpx_event_hooks()
+    if hooks is None:
+        return None
+
+    def _wrap(hook: Callable[..., Any]) -> Callable[..., Any]:
+        async def _async_hook(obj: Any) -> None:
+            hook(obj)
+
+        return _async_hook
+
+    return {event: [_wrap(hook) for hook in event_hooks] for event, event_hooks in hooks.items()}
+
+
+@dataclass(frozen=True)
+class LLMClientKey:
+    """客户端池键"""
+
+    base_url: str
+    api_key: str
+    ssl_verify: bool
+    timeout_class: int
+
+    @classmethod
+    def build(cls, *, base_url: str, api_key: str = "", timeout_seconds: float | None = None) -> LLMClientKey:
+        return cls(
+            base_url=(base_url or "").rstrip("/"),
+            api_key=api_key or "",
+            ssl_verify=resolve_ssl_verify(),
+            timeout_class=resolve_timeout_class(timeout_seconds),
+        )
+
+
+class LLMClientPool:
+    """进程内 LLM 客户端池"""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = _http2_available()
+        self._lock = threading.Lock()
+        self._sync_http: dict[LLMClientKey, httpx.Client] = {}
+        self._sync_openai: dict[LLMClientKey, openai.OpenAI] = {}
+        # 异步客户端按事件循环隔离:(id(loop), key) -> (loop 弱引用, 客户端)
+        self._async_http: dict[tuple[int, LLMClientKey], tuple[weakref.ref[Any], httpx.AsyncClient]] = {}
+        self._async_openai: dict[tuple[int, LLMClientKey], tuple[weakref.ref[Any], openai.AsyncOpenAI]] = {}
+        self._loop_watchers: dict[int, asyncio.Task[None]] = {}
+        self._acquires = 0
+        self._reuses = 0
+        self._finalizer_pid: int | None = None
+
+    # ── 同步客户端 ──────────────────────────────────────────────────────────
+
+    def get_sync_http_client(self, key: LLMClientKey) -> httpx.Client:
+        with self._lock:
+            client = self._sync_http.get(key)
+            self._record_acquire(reused=client is not None and not client.is_closed)
+            if client is None or client.is_closed:
+                client = httpx.Client(
+                    transport=httpx.HTTPTransport(verify=key.ssl_verify, http2=self._http2, limits=self._limits),
+                    timeout=httpx.Timeout(float(key.timeout_class)),
+                    follow_redirects=True,
+                    event_hooks=_httpx_event_hooks(),
+                )
+                self._sync_http[key] = client
+                self._sync_openai.pop(key, None)
+                self._ensure_process_finalizer()
+            return client
+
+    def get_openai_client(self, key: LLMClientKey) -> openai.OpenAI:
+        import openai
+
+        http_client = self.get_sync_http_client(key)
+        with self._lock:
+            client = self._sync_openai.get(key)
+            if client is None:
+                client = openai.OpenAI(
+                    api_key=key.api_key,
+                    base_url=key.base_url,
+                    timeout=float(key.timeout_class),
+                    http_client=http_client,
+                )
+                self._sync_openai[key] = client
+            return client
+
+    # ── 异步客户端 ──────────────────────────────────────────────────────────
+
+    def get_async_http_client(self, key: LLMClientKey) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        with self._lock:
+            self._prune_closed_loops()
+            entry = self._async_http.get(slot)
+            client = entry[1] if entry is not None and entry[0]() is loop else None
+            self._record_acquire(reused=client is not None and not client.is_closed)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    transport=httpx.AsyncHTTPTransport(verify=key.ssl_verify, http2=self._http2, limits=self._limits),
+                    timeout=httpx.Timeout(float(key.timeout_class)),
+                    follow_redirects=True,
+                    event_hooks=_async_event_hooks(),
+                )
+                self._async_http[slot] = (weakref.ref(loop), client)
+                self._async_openai.pop(slot, None)
+                self._ensure_loop_watcher(loop)
+            return client
+
+    def get_async_openai_client(self, key: LLMClientKey) -> openai.AsyncOpenAI:
+        import openai
+
+        http_client = self.get_async_http_client(key)
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        with self._lock:
+            entry = self._async_openai.get(slot)
+            if entry is not None and entry[0]() is loop:
+                return entry[1]
+            client = openai.AsyncOpenAI(
+                api_key=key.api_key,
+                base_url=key.base_url,
+                timeout=float(key.timeout_class),
+                http_client=http_client,
+            )
+            self._async_openai[slot] = (weakref.ref(loop), client)
+            return client
+
+    # ── 生命周期 ────────────────────────────────────────────────────────────
+
+    def close(self) -> None:
+        """关闭全部同步客户端;异步客户端留给各自事件循环的守护任务关闭"""
+        with self._lock:
+            sync_clients = list(self._sync_http.values())
+            self._sync_http.clear()
+            self._sync_openai.clear()
+        for client in sync_clients:
+            try:
+                client.close()
+            except (RuntimeError, OSError) as e:
+                logger.debug("关闭 LLM 同步客户端失败", extra={"error": str(e), "error_type": type(e).__name__})
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环上的异步客户端以及全部同步客户端"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            watcher = self._loop_watchers.pop(id(loop), None)
+        if watcher is not None:
+            watcher.cancel()
+        await self._aclose_loop_clients(id(loop))
+        self.close()
+
+    # ── 指标 ────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            http_clients: list[httpx.Client | httpx.AsyncClient] = [*self._sync_http.values()]
+            http_clients.extend(client for _, client in self._async_http.values())
+            acquires = self._acquires
+            reuses = self._reuses
+        return {
+            "clients": len(http_clients),
+            "open_connections": sum(_count_open_connections(client) for client in http_clients),
+            "acquires": acquires,
+            "reuses": reuses,
+            "reuse_ratio": round(reuses / acquires, 4) if acquires else 0.0,
+            "http2": self._http2,
+        }
+
+    # ── 内部方法 ────────────────────────────────────────────────────────────
+
+    def _record_acquire(self, *, reused: bool) -> None:
+        self._acquires += 1
+        if reused:
+            self._reuses += 1
+
+    def _prune_closed_loops(self) -> None:
+        # 正常退出的事件循环已由守护任务关闭客户端,这里只清理未经取消就被关闭的循环留下的引用
+        for store in (self._async_http, self._async_openai):
+            stale = [slot for slot, (loop_ref, _) in store.items() if _loop_is_gone(loop_ref)]
+            for slot in stale:
+                store.pop(slot, None)
+        for loop_id, watcher in list(self._loop_watchers.items()):
+            if watcher.done() or watcher.get_loop().is_closed():
+                self._loop_watchers.pop(loop_id, None)
+
+    def _ensure_loop_watcher(self, loop: asyncio.AbstractEventLoop) -> None:
+        if id(loop) not in self._loop_watchers:
+            self._loop_watchers[id(loop)] = loop.create_task(self._watch_loop(id(loop)))
+
+    async def _watch_loop(self, loop_id: int) -> None:
+        """挂起直到被取消(事件循环退出或 aclose),随后在本循环上关闭其异步客户端"""
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self._aclose_loop_clients(loop_id)
+
+    async def _aclose_loop_clients(self, loop_id: int) -> None:
+        with self._lock:
+            slots = [slot for slot in self._async_http if slot[0] == loop_id]
+            clients = [self._async_http.pop(slot)[1] for slot in slots]
+            for slot in [slot for slot in self._async_openai if slot[0] == loop_id]:
+                self._async_openai.pop(slot, None)
+            watcher = self._loop_watchers.get(loop_id)
+            if watcher is not None and watcher is asyncio.current_task():
+                self._loop_watchers.pop(loop_id, None)
+        for client in clients:
+            try:
+                await client.aclose()
+            except (RuntimeError, OSError) as e:
+                logger.debug("关闭 LLM 异步客户端失败", extra={"error": str(e), "error_type": type(e).__name__})
+
+    def _ensure_process_finalizer(self) -> None:
+        # fork 出的子进程会清空继承的 finalizer 注册表,因此按 pid 注册;
+        # 主进程退出(atexit)与 django-q worker 退出均会执行 exitpriority 非空的 Finalize
+        pid = os.getpid()
+        if self._finalizer_pid == pid:
+            return
+        mp_util.Finalize(None, self.close, exitpriority=10)
+        self._finalizer_pid = pid
+
+
+def _loop_is_gone(loop_ref: weakref.ref[Any]) -> bool:
+    loop = loop_ref()
+    return loop is None or loop.is_closed()
+
+
+def _count_open_connections(client: httpx.Client | httpx.AsyncClient) -> int:
+    if client.is_closed:
+        return 0
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None) or []
+    return sum(1 for conn in connections if not getattr(conn, "is_closed", lambda: False)())
+
+
+_pool: LLMClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = LLMClientPool()
+    return _pool
+
+
+async def aclose_llm_client_pool() -> None:
+    """关闭 LLM 客户端池(ASGI lifespan shutdown 钩子)"""
+    if _pool is not None:
+        await _pool.aclose()
+
+
+def get_llm_client_pool_stats() -> dict[str, Any]:
+    if _pool is None:
+        return {"clients": 0, "open_connections": 0, "acquires": 0, "reuses": 0, "reuse_ratio": 0.0, "http2": False}
+    return _pool.stats()
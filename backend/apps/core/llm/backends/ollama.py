@@ -19,11 +19,11 @@ from typing import TYPE_CHECKING, Any
 
 import httpx
 
-from apps.core.http.httpx_clients import get_async_http_client, get_sync_http_client
 from apps.core.llm.config import LLMConfig
 from apps.core.llm.exceptions import LLMAPIError
 
 from .base import BackendConfig, ILLMBackend, LLMResponse, LLMStreamChunk, LLMUsage
+from .client_pool import LLMClientKey, get_llm_client_pool
 from .http_error_summary import summarize_http_error_response
 from .httpx_errors import HttpxErrorMixin
 from .ollama_protocol import build_ollama_chat_payload, parse_ollama_chat_response
@@ -31,6 +31,21 @@ from .ollama_protocol import build_ollama_chat_payload, parse_ollama_chat_respon
 logger = logging.getLogger("apps.core.llm.backends.ollama")
 
 
+def _ollama_client_key() -> LLMClientKey:
+    # 请求使用绝对 URL 且逐次传入 timeout,客户端只需按 SSL 配置区分
+    return LLMClientKey.build(base_url="", timeout_seconds=OllamaBackend.DEFAULT_TIMEOUT)
+
+
+def get_sync_http_client() -> httpx.Client:
+    """获取进程内复用的 Ollama 同步客户端"""
+    return get_llm_client_pool().get_sync_http_client(_ollama_client_key())
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """获取当前事件循环内复用的 Ollama 异步客户端"""
+    return get_llm_client_pool().get_async_http_client(_ollama_client_key())
+
+
 class OllamaBackend(HttpxErrorMixin):
     """
     Ollama LLM 后端
@@ -14,6 +14,7 @@ from apps.core.llm.config import LLMConfig
 from apps.core.llm.exceptions import LLMAPIError, LLMAuthenticationError, LLMNetworkError, LLMTimeoutError
 
 from .base import BackendConfig, ILLMBackend, LLMResponse, LLMStreamChunk, LLMUsage
+from .client_pool import LLMClientKey, get_llm_client_pool
 
 logger = logging.getLogger("apps.core.llm.backends.openai_compatible")
 
@@ -121,18 +122,10 @@ class OpenAICompatibleBackend:
     # ── 客户端构建 ───────────────────────────────────────────────────────────
 
     def _build_sync_client(self, timeout_seconds: float | None = None) -> openai.OpenAI:
-        # SSL 验证可通过环境变量 LLM_SSL_VERIFY=false 关闭（仅用于特殊 CDN/代理环境）
-        import os
-
-        ssl_verify = os.environ.get("LLM_SSL_VERIFY", "true").lower() not in ("false", "0", "no")
-        transport = httpx.HTTPTransport(verify=ssl_verify)
-        http_client = httpx.Client(transport=transport, timeout=timeout_seconds or self.timeout)
-        return openai.OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-            timeout=timeout_seconds or self.timeout,
-            http_client=http_client,
-        )
+        timeout_val = float(timeout_seconds or self.timeout)
+        key = LLMClientKey.build(base_url=self.base_url, api_key=self.api_key, timeout_seconds=timeout_val)
+        client = get_llm_client_pool().get_openai_client(key)
+        return client.with_options(timeout=timeout_val)
 
     async def _build_async_client(self, timeout_seconds: float | None = None) -> openai.AsyncOpenAI:
         api_key = (
@@ -145,18 +138,10 @@ class OpenAICompatibleBackend:
             if self._config and self._config.base_url
             else await LLMConfig.get_openai_compatible_base_url_async()
         )
-        timeout_val = timeout_seconds or await LLMConfig.get_openai_compatible_timeout_async()
-        import os
-
-        ssl_verify = os.environ.get("LLM_SSL_VERIFY", "true").lower() not in ("false", "0", "no")
-        transport = httpx.AsyncHTTPTransport(verify=ssl_verify)
-        http_async_client = httpx.AsyncClient(transport=transport, timeout=timeout_val)
-        return openai.AsyncOpenAI(
-            api_key=api_key,
-            base_url=base_url,
-            timeout=timeout_val,
-            http_client=http_async_client,
-        )
+        timeout_val = float(timeout_seconds or await LLMConfig.get_openai_compatible_timeout_async())
+        key = LLMClientKey.build(base_url=base_url, api_key=api_key, timeout_seconds=timeout_val)
+        client = get_llm_client_pool().get_async_openai_client(key)
+        return client.with_options(timeout=timeout_val)
 
     # ── 错误映射 ─────────────────────────────────────────────────────────────
 
@@ -289,8 +274,6 @@ class OpenAICompatibleBackend:
                 else await LLMConfig.get_openai_compatible_base_url_async()
             )
             self._raise_mapped_error(error, request_timeout, base_url)
-        finally:
-            await async_client.close()
 
         duration_ms = (time.time() - start_time) * 1000
         usage = self._extract_usage(getattr(response, "usage", None))
@@ -394,8 +377,6 @@ class OpenAICompatibleBackend:
                 else await LLMConfig.get_openai_compatible_base_url_async()
             )
             self._raise_mapped_error(error, request_timeout, base_url)
-        finally:
-            await async_client.close()
 
     # ── 接口方法 ─────────────────────────────────────────────────────────────
 
@@ -442,8 +423,6 @@ class OpenAICompatibleBackend:
             response = await client.embeddings.create(model=used_model, input=texts)
         except Exception as error:
             self._raise_mapped_error(error, request_timeout, self.base_url)
-        finally:
-            await client.close()
 
         vectors: list[list[float]] = []
         for item in getattr(response, "data", None) or []:
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from mcp_server.manifest import BACKEND_DIR, EAGER_ENV
+
+# 子进程：加载 server 并完成一次 tools/list，随后对指定工具做首次解析（按需模式才有这一步开销）
+_CHILD_SCRIPT = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from mcp_server.lazy import LazyTool, load_server
+server = load_server()
+tools = asyncio.run(server.list_tools())
+ready = time.perf_counter()
+tool = server._tool_manager.get_tool(sys.argv[1])
+lazy = isinstance(tool, LazyTool)
+if lazy:
+    tool.resolve()
+print(json.dumps({
+    "lazy": lazy,
+    "tools": len(tools),
+    "ready_ms": (ready - started) * 1000,
+    "first_call_ms": (time.perf_counter() - ready) * 1000,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = "对比完整导入与按清单按需注册两种 MCP Server 冷启动耗时（每轮启动一个新解释器）"
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--repeat", type=int, default=5, help="每种模式的冷启动次数，取中位数（默认5）")
+        parser.add_argument("--tool", type=str, default="get_case", help="测量首次调用解析开销的工具名")
+        parser.add_argument("--timeout", type=float, default=120.0, help="单次冷启动超时秒数（默认120）")
+        parser.add_argument("--output-json", type=str, default="", help="将报告输出到 JSON 文件")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        repeat = int(options["repeat"])
+        timeout = float(options["timeout"])
+        tool = str(options["tool"]).strip()
+        if repeat <= 0 or timeout <= 0 or not tool:
+            raise CommandError("--repeat 与 --timeout 必须为正数，--tool 不能为空")
+
+        # 预热：按需模式在清单缺失或过期时会完整导入并重建清单，同时生成 .pyc，两种模式在同等条件下比较
+        self._start(lazy=True, tool=tool, timeout=timeout)
+        eager = [self._start(lazy=False, tool=tool, timeout=timeout) for _ in range(repeat)]
+        lazy = [self._start(lazy=True, tool=tool, timeout=timeout) for _ in range(repeat)]
+        if not all(run["lazy"] for run in lazy):
+            raise CommandError("按需模式未使用工具清单（清单写入失败？）")
+
+        report = self._build_report(repeat=repeat, tool=tool, eager=eager, lazy=lazy)
+        self.stdout.write(
+            f"工具数: 完整={report['eager_tools']} 按需={report['lazy_tools']}  轮数={repeat}\n"
+            f"完整导入: 冷启动 {report['eager_wall_ms']:.0f} ms（进程内就绪 {report['eager_ready_ms']:.0f} ms）\n"
+            f"按需注册: 冷启动 {report['lazy_wall_ms']:.0f} ms（进程内就绪 {report['lazy_ready_ms']:.0f} ms）"
+            f"  首次调用 {tool} 解析 {report['lazy_first_call_ms']:.0f} ms\n"
+            f"冷启动加速比: {report['speedup']:.2f}x"
+        )
+        output_json = str(options.get("output_json") or "").strip()
+        if output_json:
+            path = Path(output_json)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"已写入报告: {path}"))
+
+    def _start(self, *, lazy: bool, tool: str, timeout: float) -> dict[str, Any]:
+        env = {**os.environ, EAGER_ENV: "0" if lazy else "1"}
+        started = time.perf_counter()
+        try:
+            proc = subprocess.run(
+                [sys.executable, "-c", _CHILD_SCRIPT, tool],
+                cwd=BACKEND_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired as exc:
+            raise CommandError(f"MCP Server 冷启动超过 {timeout:g}s") from exc
+        wall_ms = (time.perf_counter() - started) * 1000
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode != 0 or not lines:
+            raise CommandError(f"MCP Server 启动失败（exit={proc.returncode}）: {proc.stderr.strip()[-2000:]}")
+        result: dict[str, Any] = json.loads(lines[-1])
+        result["wall_ms"] = wall_ms
+        return result
+
+    @staticmethod
+    def _median(runs: list[dict[str, Any]], key: str) -> float:
+        values = sorted(float(run[key]) for run in runs)
+        return values[len(values) // 2]
+
+    def _build_report(
+        self, *, repeat: int, tool: str, eager: list[dict[str, Any]], lazy: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        eager_wall = self._median(eager, "wall_ms")
+        lazy_wall = self._median(lazy, "wall_ms")
+        return {
+            "repeat": repeat,
+            "tool": tool,
+            "eager_tools": eager[0]["tools"],
+            "lazy_tools": lazy[0]["tools"],
+            "eager_wall_ms": eager_wall,
+            "eager_ready_ms": self._median(eager, "ready_ms"),
+            "lazy_wall_ms": lazy_wall,
+            "lazy_ready_ms": self._median(lazy, "ready_ms"),
+            "lazy_first_call_ms": self._median(lazy, "first_call_ms"),
+            "speedup": eager_wall / lazy_wall if lazy_wall > 0 else 0.0,
+        }
@@ -0,0 +1,35 @@
+"""
+进程池工作进程引导
+
+ProcessPoolExecutor 以 spawn 启动工作进程时，initializer 会在 Django 初始化之前被反序列化；
+业务包的 __init__ 往往会导入模型，直接把业务模块里的函数作为 initializer 会在子进程中抛出
+AppRegistryNotReady。本模块不依赖任何业务代码：先完成 django.setup()，再按路径导入并调用
+真正的初始化函数。任务函数在 initializer 之后才反序列化，可以直接放在业务模块中。
+
+守护进程（django-q 默认的 worker）不能再创建子进程，调用方应先用
+can_start_worker_processes() 判断，不满足时退回进程内执行。
+"""
+
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+from collections.abc import Callable
+from typing import Any
+
+
+def bootstrap_worker(initializer: str, *args: Any) -> None:
+    """工作进程入口：初始化 Django 后调用 initializer（"包.模块.函数" 形式的路径）"""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    module_name, _, attr = initializer.rpartition(".")
+    func: Callable[..., Any] = getattr(importlib.import_module(module_name), attr)
+    func(*args)
+
+
+def can_start_worker_processes() -> bool:
+    """当前进程能否创建子进程（守护进程不能）"""
+    return not multiprocessing.current_process().daemon
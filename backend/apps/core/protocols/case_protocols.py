@@ -196,6 +196,18 @@ class ICaseService(Protocol):
         """
         ...
 
+    def get_case_party_names_by_case_ids_internal(self, case_ids: list[int]) -> dict[int, list[str]]:
+        """
+        内部方法:批量获取多个案件的当事人名称(单次查询)
+
+        Args:
+            case_ids: 案件 ID 列表
+
+        Returns:
+            案件 ID -> 当事人名称列表(无当事人的案件为空列表)
+        """
+        ...
+
     def search_cases_by_case_number_internal(self, case_number: str) -> list[CaseDTO]:
         """
         内部方法:根据案号搜索案件
@@ -208,6 +220,18 @@ class ICaseService(Protocol):
         """
         ...
 
+    def search_cases_by_case_numbers_internal(self, case_numbers: list[str]) -> list[CaseDTO]:
+        """
+        内部方法:根据多个案号搜索案件(合并为单次查询)
+
+        Args:
+            case_numbers: 案号字符串列表
+
+        Returns:
+            匹配任一案号的案件 DTO 列表(不重复)
+        """
+        ...
+
     def create_case_log_internal(self, case_id: int, content: str, user_id: int | None = None) -> int:
         """
         内部方法:创建案件日志,返回日志ID
@@ -4,7 +4,7 @@
 包含:IContractService, IContractPaymentService
 """
 
-from typing import Any, Protocol
+from typing import IO, Any, Protocol
 
 from apps.core.dto import ContractDTO, LawyerDTO, PartyRoleDTO, SupplementaryAgreementDTO
 from apps.core.security.access_context import AccessContext
@@ -377,7 +377,7 @@ class IContractFolderBindingService(Protocol):
         subdir_key: str = "contract_documents",
     ) -> str | None: ...
 
-    def extract_zip_to_bound_folder(self, contract_id: int, zip_content: bytes) -> str | None: ...
+    def extract_zip_to_bound_folder(self, contract_id: int, zip_content: bytes | IO[bytes]) -> str | None: ...
 
     def check_and_repair_path(self, binding: Any) -> tuple[bool, bool]: ...
 
@@ -4,16 +4,26 @@ from __future__ import annotations
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
 
 from apps.core.exceptions import ValidationException
 
+from .folder_scan_manifest import (
+    FolderScanManifest,
+    bytes_sha256,
+    default_manifest_directory,
+    file_sha256,
+    manifest_file_path,
+)
 from .material_classification_service import MaterialClassificationService
 
 if TYPE_CHECKING:
+    from apps.document_recognition.services.text_extraction_pool import TextExtractionPool
     from apps.document_recognition.services.text_extraction_service import TextExtractionService
 
 logger = logging.getLogger(__name__)
@@ -61,16 +71,24 @@ class BoundFolderScanService:
         self,
         *,
         max_candidates: int = 0,
-        text_extraction_service: TextExtractionService | None = None,
+        text_extraction_service: TextExtractionService | TextExtractionPool | None = None,
         classification_service: MaterialClassificationService | None = None,
+        manifest_dir: Path | None = None,
     ) -> None:
         self._max_candidates = max_candidates  # 0 表示不限制数量
+        self._manifest_dir = manifest_dir
+        self._text_extraction_service: TextExtractionService | TextExtractionPool
         if text_extraction_service is not None:
             self._text_extraction_service = text_extraction_service
         else:
+            from apps.document_recognition.services.text_extraction_pool import get_text_extraction_pool
             from apps.document_recognition.services.text_extraction_service import TextExtractionService
 
-            self._text_extraction_service = TextExtractionService(
+            # 配置了多个工作进程时使用常驻进程池（接口与 TextExtractionService 一致）
+            self._text_extraction_service = get_text_extraction_pool(
+                text_limit=self._MAX_TEXT_EXCERPT,
+                max_pages=self._SCAN_MAX_PAGES,
+            ) or TextExtractionService(
                 text_limit=self._MAX_TEXT_EXCERPT,
                 max_pages=self._SCAN_MAX_PAGES,
             )
@@ -86,7 +104,18 @@ class BoundFolderScanService:
         classification_context: dict[str, Any] | None = None,
         scan_subfolder: str = "",
         storage_provider: Any | None = None,
+        manifest_key: str = "",
     ) -> dict[str, Any]:
+        """
+        扫描绑定目录。
+
+        manifest_key 非空时启用增量扫描：按绑定持久化扫描清单，
+        未变化（或内容哈希相同）的文件沿用上次的文本摘录，只提取新增/变更的文件。
+        """
+        manifest = None
+        if manifest_key and enable_recognition and domain != "contract":
+            manifest = self._load_manifest(manifest_key)
+
         # ── Cloud storage path ──
         if storage_provider is not None:
             return self._scan_cloud(
@@ -97,6 +126,7 @@ class BoundFolderScanService:
                 classification_context=classification_context,
                 scan_subfolder=scan_subfolder,
                 storage_provider=storage_provider,
+                manifest=manifest,
             )
 
         # ── Local filesystem path (existing logic) ──
@@ -120,21 +150,18 @@ class BoundFolderScanService:
         # 合同域：仅凭文件名分类，无需提取 PDF 内容
         is_contract_domain = domain == "contract"
 
+        extracted: dict[int, tuple[str, str]] = {}
+        if enable_recognition and not is_contract_domain:
+            extracted = self._run_extractions(
+                [(item["path"].name, partial(self._extract_local, item["path"], manifest)) for item in deduped],
+                progress_callback,
+            )
+
         total = len(deduped)
         for idx, item in enumerate(deduped, start=1):
             current_file = item["path"].name
-            progress = self._calc_progress(idx=idx, total=total)
-
-            extraction_method = "none"
-            text_excerpt = ""
-            if enable_recognition and not is_contract_domain:
-                self._notify(progress_callback, "extracting", progress, current_file)
-                try:
-                    extraction = self._text_extraction_service.extract_text(item["path"].as_posix())
-                    extraction_method = extraction.extraction_method if extraction.success else "none"
-                    text_excerpt = (extraction.text or "")[: self._MAX_TEXT_EXCERPT]
-                except Exception:
-                    logger.exception("scan_extract_failed", extra={"path": item["path"].as_posix()})
+            progress = self._classification_progress(idx=idx, total=total, after_extraction=bool(extracted))
+            extraction_method, text_excerpt = extracted.get(idx - 1, ("none", ""))
 
             self._notify(progress_callback, "classifying", progress, current_file)
 
@@ -158,6 +185,13 @@ class BoundFolderScanService:
             )
             candidates.append(candidate)
 
+        if manifest is not None:
+            self._finish_manifest(
+                manifest,
+                prefix=root.as_posix(),
+                seen={path.as_posix() for path in all_pdf_files},
+            )
+
         self._notify(progress_callback, "completed", 100, None)
 
         return {
@@ -169,6 +203,104 @@ class BoundFolderScanService:
             "candidates": candidates,
         }
 
+    def _extraction_threads(self) -> int:
+        """并发提交提取任务的线程数：进程池并发度的两倍，使下载/读取与提取重叠"""
+        concurrency = int(getattr(self._text_extraction_service, "concurrency", 1) or 1)
+        return 1 if concurrency <= 1 else concurrency * 2
+
+    def _run_extractions(
+        self,
+        tasks: list[tuple[str, Callable[[], tuple[str, str]]]],
+        progress_callback: ProgressCallback | None,
+    ) -> dict[int, tuple[str, str]]:
+        """
+        执行文本提取任务，返回 {任务下标: (extraction_method, text_excerpt)}。
+
+        进程池可用时并发执行，进度按完成顺序回报（占总进度的前半段）；否则逐个执行。
+        """
+        total = len(tasks)
+        results: dict[int, tuple[str, str]] = {}
+        threads = self._extraction_threads()
+
+        if threads <= 1 or total <= 1:
+            for idx, (name, task) in enumerate(tasks):
+                self._notify(progress_callback, "extracting", self._calc_progress(idx=idx + 1, total=total * 2), name)
+                results[idx] = task()
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(threads, total), thread_name_prefix="folder-scan-extract") as pool:
+            futures = {pool.submit(task): idx for idx, (_name, task) in enumerate(tasks)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                idx = futures[future]
+                results[idx] = future.result()
+                self._notify(
+                    progress_callback, "extracting", self._calc_progress(idx=done, total=total * 2), tasks[idx][0]
+                )
+        return results
+
+    def _classification_progress(self, *, idx: int, total: int, after_extraction: bool) -> int:
+        if not after_extraction:
+            return self._calc_progress(idx=idx, total=total)
+        return self._calc_progress(idx=total + idx, total=total * 2)
+
+    def _load_manifest(self, manifest_key: str) -> FolderScanManifest:
+        directory = self._manifest_dir or default_manifest_directory()
+        return FolderScanManifest.load(
+            manifest_file_path(directory, manifest_key),
+            extractor_signature=f"excerpt={self._MAX_TEXT_EXCERPT};pages={self._SCAN_MAX_PAGES}",
+        )
+
+    def _finish_manifest(self, manifest: FolderScanManifest, *, prefix: str, seen: set[str]) -> None:
+        removed = manifest.prune(prefix=prefix, seen=seen)
+        manifest.save()
+        logger.info(
+            "folder_scan_manifest_applied",
+            extra={
+                "reused": manifest.reused,
+                "extracted": manifest.extracted,
+                "removed": removed,
+                "entries": len(manifest),
+            },
+        )
+
+    def _extract_local(self, path: Path, manifest: FolderScanManifest | None) -> tuple[str, str]:
+        """提取本地文件文本，返回 (extraction_method, text_excerpt)；有清单时优先沿用清单结果。"""
+        source_path = path.as_posix()
+        content_hash = ""
+        size, mtime = 0, 0.0
+        if manifest is not None:
+            try:
+                stat = path.stat()
+                size, mtime = stat.st_size, stat.st_mtime
+                entry = manifest.lookup(source_path, size=size, mtime=mtime)
+                if entry is None:
+                    content_hash = file_sha256(path)
+                    entry = manifest.lookup_hash(source_path, size=size, mtime=mtime, content_hash=content_hash)
+            except OSError:
+                logger.warning("scan_manifest_stat_failed", extra={"path": source_path}, exc_info=True)
+                manifest = None
+                entry = None
+            if entry is not None:
+                return entry.extraction_method, entry.text_excerpt
+
+        try:
+            extraction = self._text_extraction_service.extract_text(source_path)
+        except Exception:
+            logger.exception("scan_extract_failed", extra={"path": source_path})
+            return "none", ""
+        extraction_method = extraction.extraction_method if extraction.success else "none"
+        text_excerpt = (extraction.text or "")[: self._MAX_TEXT_EXCERPT]
+        if manifest is not None:
+            manifest.record(
+                path=source_path,
+                size=size,
+                mtime=mtime,
+                content_hash=content_hash,
+                extraction_method=extraction_method,
+                text_excerpt=text_excerpt,
+            )
+        return extraction_method, text_excerpt
+
     def _build_candidate(
         self,
         *,
@@ -346,6 +478,7 @@ class BoundFolderScanService:
         classification_context: dict[str, Any] | None,
         scan_subfolder: str,
         storage_provider: Any,
+        manifest: FolderScanManifest | None = None,
     ) -> dict[str, Any]:  # pragma: no cover
         """Scan a cloud storage folder using CloudFolderScanner."""
         from apps.core.cloud_storage.scanner_adapter import CloudFolderScanner
@@ -364,20 +497,31 @@ class BoundFolderScanService:
         is_contract_domain = domain == "contract"
         total = len(deduped)
 
+        extracted: dict[int, tuple[str, str]] = {}
+        if enable_recognition and not is_contract_domain:
+            # 下载与提取在工作线程中重叠进行，按完成顺序回报进度
+            extracted = self._run_extractions(
+                [
+                    (
+                        item["scanned"].name,
+                        partial(
+                            self._extract_cloud,
+                            scanner,
+                            item["scanned"],
+                            manifest,
+                            manifest_path=_cloud_manifest_path(folder_path, item["scanned"].as_posix),
+                        ),
+                    )
+                    for item in deduped
+                ],
+                progress_callback,
+            )
+
         for idx, item in enumerate(deduped, start=1):
             scanned = item["scanned"]
             current_file = scanned.name
-            progress = self._calc_progress(idx=idx, total=total)
-
-            extraction_method = "none"
-            text_excerpt = ""
-            if enable_recognition and not is_contract_domain:
-                self._notify(progress_callback, "extracting", progress, current_file)
-                try:
-                    file_bytes = scanner.read_file_bytes(scanned)
-                    extraction_method, text_excerpt = self._extract_text_from_bytes(file_bytes)
-                except Exception:
-                    logger.exception("scan_extract_failed_cloud", extra={"path": scanned.as_posix})
+            progress = self._classification_progress(idx=idx, total=total, after_extraction=bool(extracted))
+            extraction_method, text_excerpt = extracted.get(idx - 1, ("none", ""))
 
             self._notify(progress_callback, "classifying", progress, current_file)
 
@@ -397,6 +541,13 @@ class BoundFolderScanService:
             )
             candidates.append(candidate)
 
+        if manifest is not None:
+            self._finish_manifest(
+                manifest,
+                prefix=folder_path.rstrip("/"),
+                seen={_cloud_manifest_path(folder_path, scanned.as_posix) for scanned in all_scanned},
+            )
+
         self._notify(progress_callback, "completed", 100, None)
 
         return {
@@ -433,6 +584,41 @@ class BoundFolderScanService:
         deduped.sort(key=lambda x: x["scanned"].as_posix)
         return deduped
 
+    def _extract_cloud(
+        self, scanner: Any, scanned: Any, manifest: FolderScanManifest | None, *, manifest_path: str
+    ) -> tuple[str, str]:
+        """提取云端文件文本；有清单时元数据命中则不下载，下载后按内容哈希再查一次。"""
+        size = int(scanned.stat.size or 0)
+        mtime = scanned.stat.mtime
+        if manifest is not None:
+            entry = manifest.lookup(manifest_path, size=size, mtime=mtime)
+            if entry is not None:
+                return entry.extraction_method, entry.text_excerpt
+
+        try:
+            file_bytes = scanner.read_file_bytes(scanned)
+            content_hash = ""
+            if manifest is not None:
+                content_hash = bytes_sha256(file_bytes)
+                entry = manifest.lookup_hash(manifest_path, size=size, mtime=mtime, content_hash=content_hash)
+                if entry is not None:
+                    return entry.extraction_method, entry.text_excerpt
+            extraction_method, text_excerpt = self._extract_text_from_bytes(file_bytes)
+        except Exception:
+            logger.exception("scan_extract_failed_cloud", extra={"path": scanned.as_posix})
+            return "none", ""
+
+        if manifest is not None:
+            manifest.record(
+                path=manifest_path,
+                size=size,
+                mtime=mtime,
+                content_hash=content_hash,
+                extraction_method=extraction_method,
+                text_excerpt=text_excerpt,
+            )
+        return extraction_method, text_excerpt
+
     def _extract_text_from_bytes(self, file_bytes: bytes) -> tuple[str, str]:
         """从 PDF 字节流中提取文本，返回 (extraction_method, text_excerpt)。"""
         import os
@@ -535,3 +721,9 @@ class BoundFolderScanService:
             return candidate
 
         raise ValidationException(message="不支持的扫描领域", code="UNSUPPORTED_SCAN_DOMAIN", errors={"domain": domain})
+
+
+def _cloud_manifest_path(scan_root: str, relative_path: str) -> str:
+    """云端扫描得到的是相对扫描根的路径，清单中统一记录为带根路径的完整路径。"""
+    root = scan_root.rstrip("/")
+    return f"{root}/{relative_path}" if root else relative_path
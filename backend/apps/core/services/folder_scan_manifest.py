@@ -0,0 +1,218 @@
+"""绑定文件夹扫描清单（增量扫描）。
+
+每个绑定文件夹持久化一份清单：路径、大小、修改时间、内容哈希、文本摘录与提取方式。
+再次扫描时：
+- 路径 + 大小 + 修改时间未变 → 直接沿用清单中的摘录，不读文件；
+- 元数据变化但内容哈希命中（文件被 touch、移动或重命名）→ 沿用摘录；
+- 否则才重新提取文本（可能触发 OCR）。
+
+只缓存成功提取到文本的结果；提取失败或没有文本的文件下次扫描会重新提取。
+
+清单以 JSON 存放在 MEDIA_ROOT/folder_scan_manifests/ 下，写入时先写临时文件再原子替换。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    path: str
+    size: int
+    mtime: float
+    content_hash: str
+    extraction_method: str
+    text_excerpt: str
+
+
+class FolderScanManifest:
+    """单个绑定文件夹的扫描清单（可被并发提取线程共享）。"""
+
+    def __init__(self, file_path: Path | None = None, *, extractor_signature: str = "") -> None:
+        self._file_path = file_path
+        self._extractor_signature = extractor_signature
+        self._entries: dict[str, ManifestEntry] = {}
+        self._by_hash: dict[str, ManifestEntry] = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.reused = 0
+        self.extracted = 0
+
+    @classmethod
+    def load(cls, file_path: Path, *, extractor_signature: str = "") -> FolderScanManifest:
+        """读取清单；文件不存在、损坏或提取参数已变化时返回空清单。"""
+        manifest = cls(file_path, extractor_signature=extractor_signature)
+        try:
+            raw = json.loads(file_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError):
+            logger.warning("folder_scan_manifest_unreadable", extra={"path": str(file_path)})
+            return manifest
+
+        if (
+            not isinstance(raw, dict)
+            or raw.get("version") != MANIFEST_VERSION
+            or raw.get("extractor_signature", "") != extractor_signature
+        ):
+            return manifest
+
+        for item in raw.get("entries") or []:
+            try:
+                entry = ManifestEntry(
+                    path=str(item["path"]),
+                    size=int(item["size"]),
+                    mtime=float(item["mtime"]),
+                    content_hash=str(item["content_hash"]),
+                    extraction_method=str(item["extraction_method"]),
+                    text_excerpt=str(item["text_excerpt"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            if _cacheable(entry.extraction_method, entry.text_excerpt):
+                manifest._put(entry)
+        manifest._dirty = False
+        return manifest
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, path: str, *, size: int, mtime: float | None) -> ManifestEntry | None:
+        """按路径 + 大小 + 修改时间查找；修改时间未知时不走快速路径。"""
+        if not mtime:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry.size != size or entry.mtime != float(mtime):
+                return None
+            self.reused += 1
+            return entry
+
+    def lookup_hash(self, path: str, *, size: int, mtime: float | None, content_hash: str) -> ManifestEntry | None:
+        """按内容哈希查找，命中时把该条目登记到新的路径/元数据下。"""
+        with self._lock:
+            entry = self._by_hash.get(content_hash)
+            if entry is None:
+                return None
+            self.reused += 1
+            self.record(
+                path=path,
+                size=size,
+                mtime=mtime,
+                content_hash=content_hash,
+                extraction_method=entry.extraction_method,
+                text_excerpt=entry.text_excerpt,
+                extracted=False,
+            )
+            return entry
+
+    def record(
+        self,
+        *,
+        path: str,
+        size: int,
+        mtime: float | None,
+        content_hash: str,
+        extraction_method: str,
+        text_excerpt: str,
+        extracted: bool = True,
+    ) -> None:
+        entry = ManifestEntry(
+            path=path,
+            size=int(size),
+            mtime=float(mtime or 0.0),
+            content_hash=content_hash,
+            extraction_method=extraction_method,
+            text_excerpt=text_excerpt,
+        )
+        with self._lock:
+            if extracted:
+                self.extracted += 1
+            if _cacheable(extraction_method, text_excerpt):
+                self._put(entry)
+
+    def prune(self, *, prefix: str, seen: set[str]) -> int:
+        """删除 prefix 下本次扫描未出现的条目（文件已删除），返回删除数量。"""
+        prefix = prefix.rstrip("/") + "/" if prefix else ""
+        with self._lock:
+            stale = [path for path in self._entries if path.startswith(prefix) and path not in seen]
+            for path in stale:
+                entry = self._entries.pop(path)
+                if self._by_hash.get(entry.content_hash) is entry:
+                    del self._by_hash[entry.content_hash]
+            if stale:
+                self._dirty = True
+        return len(stale)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty or self._file_path is None:
+                return
+            payload: dict[str, Any] = {
+                "version": MANIFEST_VERSION,
+                "extractor_signature": self._extractor_signature,
+                "entries": [asdict(entry) for entry in self._entries.values()],
+            }
+        directory = self._file_path.parent
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=".manifest-", suffix=".json", dir=str(directory))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(payload, handle, ensure_ascii=False)
+                os.replace(tmp_name, self._file_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError:
+            logger.warning("folder_scan_manifest_save_failed", extra={"path": str(self._file_path)}, exc_info=True)
+            return
+        self._dirty = False
+
+    def _put(self, entry: ManifestEntry) -> None:
+        self._entries[entry.path] = entry
+        if entry.content_hash:
+            self._by_hash[entry.content_hash] = entry
+        self._dirty = True
+
+
+def _cacheable(extraction_method: str, text_excerpt: str) -> bool:
+    return extraction_method != "none" and bool(text_excerpt.strip())
+
+
+def manifest_file_path(directory: Path, manifest_key: str) -> Path:
+    safe_key = re.sub(r"[^\w.-]+", "_", manifest_key).strip("._") or "default"
+    return directory / f"{safe_key}.json"
+
+
+def default_manifest_directory() -> Path:
+    from django.conf import settings
+
+    return Path(settings.MEDIA_ROOT) / "folder_scan_manifests"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def bytes_sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
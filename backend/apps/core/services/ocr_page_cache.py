@@ -0,0 +1,214 @@
+"""OCR 页面结果缓存（内容寻址，跨子系统共享）。
+
+PDF 拆分、文本提取（含绑定文件夹扫描）、发票识别都会对同一批扫描件做 OCR。
+这里按 (文件 sha256, 页码, OCR 参数, 引擎版本) 缓存单页识别结果。各功能统一以 SHARED_RENDER_DPI
+渲染 PDF 页面、使用默认（v5）引擎识别，因此任何一个功能识别过的页面，其他功能再次遇到时直接复用。
+
+- 存储：单个 SQLite 文件（WAL 模式，多进程可并发读写），默认位于 MEDIA_ROOT/ocr_cache/；
+- 淘汰：按最近访问时间 LRU，总文本大小超过上限时删除最久未访问的条目，直到降到上限的 90%；
+- 容错：缓存读写失败只记录日志并视为未命中，不影响 OCR 本身；
+- 识别失败（含 OCR 服务临时故障导致的空结果）不写入缓存，下次遇到时重新识别。
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_LOW_WATERMARK = 0.9
+_EVICT_BATCH = 200
+
+# 共享渲染参数：与 PDF 拆分的 balanced 档位一致，各子系统按此渲染才能互相命中
+SHARED_RENDER_DPI = 200
+SHARED_PROFILE = f"dpi={SHARED_RENDER_DPI}"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr_pages (
+    id INTEGER PRIMARY KEY,
+    file_sha256 TEXT NOT NULL,
+    page_no INTEGER NOT NULL,
+    profile TEXT NOT NULL,
+    engine_version TEXT NOT NULL,
+    text TEXT NOT NULL,
+    ocr_failed INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ocr_pages_key ON ocr_pages (file_sha256, page_no, profile, engine_version);
+CREATE INDEX IF NOT EXISTS ocr_pages_last_access ON ocr_pages (last_access);
+"""
+
+
+@dataclass(frozen=True)
+class OcrPageEntry:
+    text: str
+    ocr_failed: bool
+
+
+class OcrPageCache:
+    """SQLite 支撑的 OCR 页面缓存（线程安全：每个线程独立连接）"""
+
+    def __init__(self, db_path: Path, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._db_path = db_path
+        self._max_bytes = max(1, max_bytes)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._approx_bytes: int | None = None
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, file_sha256: str, page_no: int, *, profile: str, engine_version: str) -> OcrPageEntry | None:
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT id, text, ocr_failed FROM ocr_pages "
+                "WHERE file_sha256 = ? AND page_no = ? AND profile = ? AND engine_version = ? AND ocr_failed = 0",
+                (file_sha256, page_no, profile, engine_version),
+            ).fetchone()
+            if row is not None:
+                with conn:
+                    conn.execute("UPDATE ocr_pages SET last_access = ? WHERE id = ?", (time.time(), row[0]))
+        except sqlite3.Error:
+            logger.warning("ocr_page_cache_read_failed", extra={"db_path": str(self._db_path)}, exc_info=True)
+            return None
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return OcrPageEntry(text=str(row[1]), ocr_failed=bool(row[2]))
+
+    def put(
+        self,
+        file_sha256: str,
+        page_no: int,
+        *,
+        profile: str,
+        engine_version: str,
+        text: str,
+        ocr_failed: bool = False,
+    ) -> None:
+        if ocr_failed:
+            # 失败可能是临时故障（如 paddleocr_api 超时），不缓存以免永久掩盖该页文本
+            return
+        size = len(text.encode("utf-8"))
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT INTO ocr_pages "
+                    "(file_sha256, page_no, profile, engine_version, text, ocr_failed, size, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (file_sha256, page_no, profile, engine_version) DO UPDATE SET "
+                    "text = excluded.text, ocr_failed = excluded.ocr_failed, "
+                    "size = excluded.size, last_access = excluded.last_access",
+                    (file_sha256, page_no, profile, engine_version, text, int(ocr_failed), size, time.time()),
+                )
+            with self._lock:
+                if self._approx_bytes is None:
+                    self._approx_bytes = self._total_bytes(conn)
+                else:
+                    self._approx_bytes += size
+                over_limit = self._approx_bytes > self._max_bytes
+            if over_limit:
+                self._evict(conn)
+        except sqlite3.Error:
+            logger.warning("ocr_page_cache_write_failed", extra={"db_path": str(self._db_path)}, exc_info=True)
+
+    def stats(self) -> dict[str, int]:
+        try:
+            conn = self._connection()
+            entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_pages").fetchone()
+        except sqlite3.Error:
+            entries, total = 0, 0
+        with self._lock:
+            return {"entries": int(entries), "bytes": int(total), "hits": self._hits, "misses": self._misses}
+
+    def clear(self) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM ocr_pages")
+        with self._lock:
+            self._approx_bytes = 0
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._db_path), timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _total_bytes(self, conn: sqlite3.Connection) -> int:
+        return int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_pages").fetchone()[0])
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """删除最久未访问的条目，直到总大小降到上限的 90%（以数据库实际大小为准，兼顾其他进程的写入）"""
+        target = int(self._max_bytes * _LOW_WATERMARK)
+        total = self._total_bytes(conn)
+        evicted = 0
+        while total > target:
+            rows = conn.execute(
+                "SELECT id, size FROM ocr_pages ORDER BY last_access LIMIT ?", (_EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            victims: list[tuple[Any]] = []
+            for row_id, size in rows:
+                victims.append((row_id,))
+                total -= int(size)
+                if total <= target:
+                    break
+            with conn:
+                conn.executemany("DELETE FROM ocr_pages WHERE id = ?", victims)
+            evicted += len(victims)
+        with self._lock:
+            self._approx_bytes = total
+        if evicted:
+            logger.info("ocr_page_cache_evicted", extra={"evicted": evicted, "bytes": total})
+
+
+def engine_version_of(ocr_service: Any) -> str:
+    """OCR 服务的引擎版本标识；无法识别时返回空串（调用方不使用缓存）"""
+    version = getattr(ocr_service, "engine_version", "")
+    return version if isinstance(version, str) else ""
+
+
+_cache: OcrPageCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_ocr_page_cache() -> OcrPageCache | None:
+    """获取进程内共享的 OCR 页面缓存；settings.OCR_PAGE_CACHE_ENABLED=False 时返回 None"""
+    global _cache
+    from django.conf import settings
+
+    if not getattr(settings, "OCR_PAGE_CACHE_ENABLED", True):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                default_path = Path(settings.MEDIA_ROOT) / "ocr_cache" / "pages.sqlite3"
+                _cache = OcrPageCache(
+                    Path(getattr(settings, "OCR_PAGE_CACHE_PATH", default_path)),
+                    max_bytes=int(getattr(settings, "OCR_PAGE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+                )
+    return _cache
@@ -1,8 +1,9 @@
 from .context import get_request_id
-from .metrics import record_httpx, record_request, snapshot, snapshot_prometheus
+from .metrics import flush_metrics, record_httpx, record_request, snapshot, snapshot_prometheus
 from .time import utc_now, utc_now_iso
 
 __all__ = [
+    "flush_metrics",
     "get_request_id",
     "record_httpx",
     "record_request",
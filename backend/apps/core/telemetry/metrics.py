@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import atexit
 import hashlib
 import json
 import logging
+import os
 import re
+import threading
+import time
+from collections import deque
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
 from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCacheClient
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -33,6 +40,21 @@ DEFAULT_BUCKETS_MS: tuple[int, ...] = (
 _UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
 _HEX_RE = re.compile(r"^[0-9a-f]{16,}$", re.IGNORECASE)
 _LABEL_SAFE_RE = re.compile(r"[^a-z0-9_-]+", re.IGNORECASE)
+# 不需要回源的缓存结果：stale 为先返回的过期值，coalesced 为合并到进行中请求的结果
+_CACHE_HIT_RESULTS = frozenset({"hit", "stale", "coalesced"})
+
+# 记录端只把事件追加到进程内队列（deque.append 在 GIL 下原子，无需加锁），
+# 后台线程每秒聚合一次，Redis 下用一个 pipeline 批量写入，其他缓存后端逐键写入聚合后的增量
+FLUSH_INTERVAL_SECONDS = 1.0
+# 缓存长时间不可用时队列的上限，超出后丢弃最早的事件
+_MAX_PENDING_EVENTS = 100_000
+
+# (kind, minute, suffix, meta, ttl, ((field, delta), ...))
+_Event = tuple[str, str, str, dict[str, str], int, tuple[tuple[str, int], ...]]
+
+_pending: deque[_Event] = deque(maxlen=_MAX_PENDING_EVENTS)
+_flusher: threading.Thread | None = None
+_flusher_lock = threading.Lock()
 
 
 def _minute_id(dt: Any | None = None) -> str:
@@ -60,6 +82,11 @@ def _stable_hash(data: dict[str, Any]) -> str:
     return hashlib.sha1(payload.encode("utf-8"), usedforsecurity=False).hexdigest()[:16]
 
 
+@lru_cache(maxsize=4096)
+def _cached_suffix(labels: tuple[tuple[str, str], ...]) -> str:
+    return _stable_hash(dict(labels))
+
+
 def _normalize_label(value: str, *, default: str, max_len: int) -> str:
     v = str(value or "").strip().lower()
     if not v:
@@ -80,8 +107,15 @@ def _set_meta_once(*, kind: str, suffix: str, meta: dict[str, Any], timeout: int
 
 
 def _get_meta(*, kind: str, suffix: str) -> dict[str, Any] | None:
-    key = f"metrics:meta:{kind}:{suffix}"
-    raw = cache.get(key)
+    client = _redis_client()
+    raw: Any
+    if client is None:
+        raw = cache.get(f"metrics:meta:{kind}:{suffix}")
+    else:
+        redis_key = cache.make_key(_meta_json_key(kind, suffix))
+        raw = client.get_client(redis_key).get(redis_key)
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
     if not raw:
         return None
     try:
@@ -167,6 +201,144 @@ def _merge_histograms(histograms: list[Histogram], *, buckets_ms: tuple[int, ...
     return Histogram(buckets_ms=buckets_ms, counts=counts, total_count=total_count, total_sum_ms=total_sum_ms)
 
 
+def _histogram_fields(duration_ms: int, *, is_error: bool, buckets_ms: tuple[int, ...]) -> tuple[tuple[str, int], ...]:
+    duration = int(duration_ms or 0)
+    upper = buckets_ms[-1]
+    for b in buckets_ms:
+        if duration <= b:
+            upper = b
+            break
+    fields = [("count", 1), ("sum_ms", max(0, duration)), (f"bucket:{upper}", 1)]
+    if is_error:
+        fields.append(("errors_5xx", 1))
+    return tuple(fields)
+
+
+def _index_key(kind: str, minute: str) -> str:
+    return f"metrics:index:{kind}:{minute}"
+
+
+def _index_set_key(kind: str, minute: str) -> str:
+    # Redis 集合索引与旧的 JSON 列表索引分开命名，避免滚动发布期间对同一个键 SADD 报 WRONGTYPE
+    return f"metrics:index_set:{kind}:{minute}"
+
+
+def _meta_json_key(kind: str, suffix: str) -> str:
+    # Redis 直写的纯 JSON 元数据，与经缓存序列化器写入的 metrics:meta 键分开命名
+    return f"metrics:meta_json:{kind}:{suffix}"
+
+
+def _redis_client() -> RedisCacheClient | None:
+    client = getattr(cache, "_cache", None)
+    return client if isinstance(client, RedisCacheClient) else None
+
+
+def _enqueue(event: _Event) -> None:
+    _pending.append(event)
+    if _flusher is None:
+        _start_flusher()
+
+
+def _start_flusher() -> None:
+    global _flusher
+    with _flusher_lock:
+        if _flusher is not None:
+            return
+        _flusher = threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True)
+        _flusher.start()
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL_SECONDS)
+        flush_metrics()
+
+
+def _reset_after_fork() -> None:
+    # 子进程不继承父进程的刷写线程；父进程未刷写的事件由父进程负责，子进程丢弃以免重复计数
+    global _flusher, _flusher_lock
+    _pending.clear()
+    _flusher = None
+    _flusher_lock = threading.Lock()
+
+
+@dataclass
+class _Batch:
+    """一次刷写的聚合结果：计数键 -> 增量，kind/minute -> 索引成员，kind/suffix -> 元数据；ttl 取批次内最大值"""
+
+    counters: dict[str, int] = field(default_factory=dict)
+    counter_ttls: dict[str, int] = field(default_factory=dict)
+    indexes: dict[tuple[str, str], set[str]] = field(default_factory=dict)
+    index_ttls: dict[tuple[str, str], int] = field(default_factory=dict)
+    metas: dict[tuple[str, str], tuple[dict[str, str], int]] = field(default_factory=dict)
+
+    def add(self, event: _Event) -> None:
+        kind, minute, suffix, meta, ttl, fields = event
+        self.indexes.setdefault((kind, minute), set()).add(suffix)
+        self.index_ttls[(kind, minute)] = max(ttl, self.index_ttls.get((kind, minute), 0))
+        if (kind, suffix) not in self.metas or ttl > self.metas[(kind, suffix)][1]:
+            self.metas[(kind, suffix)] = (meta, ttl)
+        for name, delta in fields:
+            key = f"metrics:{kind}:{minute}:{suffix}:{name}"
+            self.counters[key] = self.counters.get(key, 0) + delta
+            self.counter_ttls[key] = max(ttl, self.counter_ttls.get(key, 0))
+
+
+def _write_redis(client: RedisCacheClient, batch: _Batch) -> None:
+    pipe = client.get_client(write=True).pipeline(transaction=False)
+    for key, delta in batch.counters.items():
+        redis_key = cache.make_key(key)
+        pipe.incrby(redis_key, delta)
+        pipe.expire(redis_key, batch.counter_ttls[key])
+    for (kind, minute), suffixes in batch.indexes.items():
+        redis_key = cache.make_key(_index_set_key(kind, minute))
+        pipe.sadd(redis_key, *sorted(suffixes))
+        pipe.expire(redis_key, batch.index_ttls[(kind, minute)])
+    for (kind, suffix), (meta, ttl) in batch.metas.items():
+        payload = json.dumps(meta, ensure_ascii=False, separators=(",", ":"))
+        pipe.set(cache.make_key(_meta_json_key(kind, suffix)), payload, nx=True, ex=ttl)
+    pipe.execute()
+
+
+def _write_cache(batch: _Batch) -> None:
+    for (kind, minute), suffixes in batch.indexes.items():
+        for suffix in sorted(suffixes):
+            _add_to_index(_index_key(kind, minute), suffix, timeout=batch.index_ttls[(kind, minute)])
+    for (kind, suffix), (meta, ttl) in batch.metas.items():
+        _set_meta_once(kind=kind, suffix=suffix, meta=meta, timeout=ttl)
+    for key, delta in batch.counters.items():
+        _incr(key, delta, timeout=batch.counter_ttls[key])
+
+
+def flush_metrics() -> int:
+    """把进程内累积的指标聚合后写入缓存，返回本次写入的事件数（写入失败的批次丢弃）"""
+    batch = _Batch()
+    count = 0
+    while True:
+        try:
+            event = _pending.popleft()
+        except IndexError:
+            break
+        batch.add(event)
+        count += 1
+    if not count:
+        return 0
+    try:
+        client = _redis_client()
+        if client is not None:
+            _write_redis(client, batch)
+        else:
+            _write_cache(batch)
+    except Exception:
+        # 刷写在后台线程中执行，任何异常（含 redis 自身的异常类型）都不能让线程退出
+        logger.warning("指标刷写失败，丢弃 %d 条事件", count, exc_info=True)
+    return count
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(flush_metrics)
+
+
 def record_request(
     *,
     method: str,
@@ -182,28 +354,9 @@ def record_request(
     path_group = normalize_path_group(path, max_segments=3)
 
     ttl = max(60, int(window_minutes or 10) * 90)
-    suffix = _stable_hash({"kind": "req", "method": method_u, "status": status_group, "group": path_group})
-    key_prefix = f"metrics:req:{minute}:{suffix}"
-
-    _add_to_index(f"metrics:index:req:{minute}", suffix, timeout=ttl)
-    _set_meta_once(
-        kind="req",
-        suffix=suffix,
-        meta={"method": method_u, "status": status_group, "group": path_group},
-        timeout=ttl,
-    )
-
-    _incr(f"{key_prefix}:count", 1, timeout=ttl)
-    _incr(f"{key_prefix}:sum_ms", max(0, int(duration_ms or 0)), timeout=ttl)
-    if int(status_code or 0) >= 500:
-        _incr(f"{key_prefix}:errors_5xx", 1, timeout=ttl)
-
-    upper = buckets_ms[-1]
-    for b in buckets_ms:
-        if int(duration_ms or 0) <= b:
-            upper = b
-            break
-    _incr(f"{key_prefix}:bucket:{upper}", 1, timeout=ttl)
+    suffix = _cached_suffix((("kind", "req"), ("method", method_u), ("status", status_group), ("group", path_group)))
+    fields = _histogram_fields(duration_ms, is_error=int(status_code or 0) >= 500, buckets_ms=buckets_ms)
+    _enqueue(("req", minute, suffix, {"method": method_u, "status": status_group, "group": path_group}, ttl, fields))
 
 
 def record_httpx(
@@ -221,28 +374,10 @@ def record_httpx(
     host_norm = (host or "unknown").split(":")[0].lower()[:128]
 
     ttl = max(60, int(window_minutes or 10) * 90)
-    suffix = _stable_hash({"kind": "httpx", "method": method_u, "status": status_group, "host": host_norm})
-    key_prefix = f"metrics:httpx:{minute}:{suffix}"
-
-    _add_to_index(f"metrics:index:httpx:{minute}", suffix, timeout=ttl)
-    _set_meta_once(
-        kind="httpx",
-        suffix=suffix,
-        meta={"method": method_u, "status": status_group, "host": host_norm},
-        timeout=ttl,
-    )
-
-    _incr(f"{key_prefix}:count", 1, timeout=ttl)
-    _incr(f"{key_prefix}:sum_ms", max(0, int(duration_ms or 0)), timeout=ttl)
-    if status_code is None or int(status_code) >= 500:
-        _incr(f"{key_prefix}:errors_5xx", 1, timeout=ttl)
-
-    upper = buckets_ms[-1]
-    for b in buckets_ms:
-        if int(duration_ms or 0) <= b:
-            upper = b
-            break
-    _incr(f"{key_prefix}:bucket:{upper}", 1, timeout=ttl)
+    suffix = _cached_suffix((("kind", "httpx"), ("method", method_u), ("status", status_group), ("host", host_norm)))
+    is_error = status_code is None or int(status_code) >= 500
+    fields = _histogram_fields(duration_ms, is_error=is_error, buckets_ms=buckets_ms)
+    _enqueue(("httpx", minute, suffix, {"method": method_u, "status": status_group, "host": host_norm}, ttl, fields))
 
 
 def record_cache_access(
@@ -273,17 +408,11 @@ def record_cache_result(
     result_norm = _normalize_label(result, default="unknown", max_len=16)
 
     ttl = max(60, int(window_minutes or 10) * 90)
-    suffix = _stable_hash({"kind": "cache", "cache_kind": kind_norm, "name": name_norm, "result": result_norm})
-    key_prefix = f"metrics:cache:{minute}:{suffix}"
-
-    _add_to_index(f"metrics:index:cache:{minute}", suffix, timeout=ttl)
-    _set_meta_once(
-        kind="cache",
-        suffix=suffix,
-        meta={"cache_kind": kind_norm, "name": name_norm, "result": result_norm},
-        timeout=ttl,
+    suffix = _cached_suffix(
+        (("kind", "cache"), ("cache_kind", kind_norm), ("name", name_norm), ("result", result_norm))
     )
-    _incr(f"{key_prefix}:count", 1, timeout=ttl)
+    meta = {"cache_kind": kind_norm, "name": name_norm, "result": result_norm}
+    _enqueue(("cache", minute, suffix, meta, ttl, (("count", 1),)))
 
 
 def _load_histogram(
@@ -307,6 +436,15 @@ def _load_counter(*, minute: str, kind: str, suffix: str) -> int:
     return int(cache.get(f"{key_prefix}:count") or 0)
 
 
+def _index_suffixes(kind: str, minute: str) -> Iterable[str]:
+    client = _redis_client()
+    if client is None:
+        return _iter_suffixes(_index_key(kind, minute))
+    redis_key = cache.make_key(_index_set_key(kind, minute))
+    members = client.get_client(redis_key).smembers(redis_key)
+    return sorted(m.decode("utf-8") if isinstance(m, bytes) else str(m) for m in members)
+
+
 def _iter_suffixes(index_key: str) -> Iterable[str]:
     raw = cache.get(index_key)
     if not raw:
@@ -327,6 +465,7 @@ def snapshot(
     top: int = 10,
     buckets_ms: tuple[int, ...] = DEFAULT_BUCKETS_MS,
 ) -> dict[str, Any]:
+    flush_metrics()
     minutes = _last_minutes(window_minutes=window_minutes)
     top_n = max(1, min(int(top or 10), 50))
 
@@ -355,7 +494,7 @@ def _collect_histogram_data(
 ) -> tuple[dict[str, Histogram], Histogram]:
     by_suffix: dict[str, list[Histogram]] = {}
     for m in minutes:
-        for s in _iter_suffixes(f"metrics:index:{kind}:{m}"):
+        for s in _index_suffixes(kind, m):
             by_suffix.setdefault(s, []).append(_load_histogram(minute=m, kind=kind, suffix=s, buckets_ms=buckets_ms))
     merged = {s: _merge_histograms(hs, buckets_ms=buckets_ms) for s, hs in by_suffix.items()}
     total = _merge_histograms(list(merged.values()), buckets_ms=buckets_ms)
@@ -365,7 +504,7 @@ def _collect_histogram_data(
 def _collect_cache_data(minutes: list[str]) -> dict[str, Any]:
     cache_by_suffix: dict[str, list[int]] = {}
     for m in minutes:
-        for s in _iter_suffixes(f"metrics:index:cache:{m}"):
+        for s in _index_suffixes("cache", m):
             cache_by_suffix.setdefault(s, []).append(_load_counter(minute=m, kind="cache", suffix=s))
 
     cache_access_by_kind: dict[str, Any] = {}
@@ -380,14 +519,14 @@ def _collect_cache_data(minutes: list[str]) -> dict[str, Any]:
             cache_kind, {"total": 0, "hits": 0, "misses": 0, "hit_rate": 0.0, "by_name": {}}
         )
         kind_entry["total"] += count
-        if result == "hit":
+        if result in _CACHE_HIT_RESULTS:
             kind_entry["hits"] += count
         else:
             kind_entry["misses"] += count
 
         name_entry = kind_entry["by_name"].setdefault(name, {"total": 0, "hits": 0, "misses": 0, "hit_rate": 0.0})
         name_entry["total"] += count
-        if result == "hit":
+        if result in _CACHE_HIT_RESULTS:
             name_entry["hits"] += count
         else:
             name_entry["misses"] += count
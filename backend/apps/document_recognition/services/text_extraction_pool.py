@@ -0,0 +1,146 @@
+"""
+文本提取进程池
+
+TextExtractionService 的 PDF 直接提取与 OCR 都是 CPU 密集型操作，在扫描线程中串行执行时
+一千个文件要跑好几分钟。本模块提供一个常驻的有界进程池：
+- 每个工作进程初始化一次 Django 与 TextExtractionService，OCR 引擎在进程内首次使用后常驻（热引擎），
+  后续文件直接复用，不再重复加载模型；
+- extract_text() 与 TextExtractionService.extract_text() 签名一致，可直接替换注入；
+- 工作进程异常退出（如 OCR 原生库崩溃）时自动重建进程池，只影响当次提交的文件。
+
+池大小由 settings.FOLDER_SCAN_EXTRACTION_WORKERS 配置，<= 1 或当前进程为守护进程时不启用进程池。
+
+Requirements: 3.1, 3.2, 3.3
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from apps.core.process_pool import bootstrap_worker, can_start_worker_processes
+
+from .text_extraction_service import TextExtractionResult, TextExtractionService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START_METHOD = "spawn"
+
+_worker_service: TextExtractionService | None = None
+
+
+def _init_worker(text_limit: int | None, max_pages: int | None) -> None:
+    """工作进程初始化（经 bootstrap_worker 调用，Django 已就绪）：创建进程内常驻的 TextExtractionService。"""
+    global _worker_service
+
+    _worker_service = TextExtractionService(text_limit=text_limit, max_pages=max_pages)
+
+
+def _extract_in_worker(file_path: str, max_pages: int | None) -> tuple[str, str, bool]:
+    service = _worker_service or TextExtractionService()
+    result = service.extract_text(file_path, max_pages=max_pages)
+    return result.text, result.extraction_method, result.success
+
+
+class TextExtractionPool:
+    """有界文本提取进程池，接口与 TextExtractionService.extract_text 一致。"""
+
+    def __init__(
+        self,
+        *,
+        max_workers: int,
+        text_limit: int | None = None,
+        max_pages: int | None = None,
+        start_method: str = DEFAULT_START_METHOD,
+    ) -> None:
+        self._max_workers = max(1, max_workers)
+        self._text_limit = text_limit
+        self._max_pages = max_pages
+        self._start_method = start_method
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def concurrency(self) -> int:
+        """可同时进行的提取数量（调用方据此决定并发提交的线程数）"""
+        return self._max_workers
+
+    def extract_text(self, file_path: str, max_pages: int | None = None) -> TextExtractionResult:
+        executor = self._get_executor()
+        try:
+            text, method, success = executor.submit(_extract_in_worker, file_path, max_pages).result()
+        except BrokenProcessPool:
+            logger.warning("text_extraction_pool_broken", extra={"file_path": file_path})
+            self._discard_executor(executor)
+            raise
+        return TextExtractionResult(text=text, extraction_method=method, success=success)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context(self._start_method),
+                    initializer=bootstrap_worker,
+                    initargs=(f"{__name__}._init_worker", self._text_limit, self._max_pages),
+                )
+                logger.info(
+                    "text_extraction_pool_started",
+                    extra={"max_workers": self._max_workers, "start_method": self._start_method},
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pools: dict[tuple[int | None, int | None], TextExtractionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def configured_extraction_workers() -> int:
+    from django.conf import settings
+
+    default = min(4, os.cpu_count() or 1)
+    return int(getattr(settings, "FOLDER_SCAN_EXTRACTION_WORKERS", default))
+
+
+def get_text_extraction_pool(
+    *, text_limit: int | None = None, max_pages: int | None = None
+) -> TextExtractionPool | None:
+    """
+    获取进程内共享的文本提取进程池（按提取参数区分）
+
+    Returns:
+        进程池；配置的工作进程数 <= 1 或当前进程不能创建子进程时返回 None（调用方退回串行提取）
+    """
+    workers = configured_extraction_workers()
+    if workers <= 1 or not can_start_worker_processes():
+        return None
+    key = (text_limit, max_pages)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            from django.conf import settings
+
+            pool = TextExtractionPool(
+                max_workers=workers,
+                text_limit=text_limit,
+                max_pages=max_pages,
+                start_method=str(getattr(settings, "FOLDER_SCAN_EXTRACTION_START_METHOD", DEFAULT_START_METHOD)),
+            )
+            _pools[key] = pool
+        return pool
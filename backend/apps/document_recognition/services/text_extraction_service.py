@@ -206,6 +206,8 @@ class TextExtractionService:
         """
         对 PDF 所有页面进行 OCR
 
+        已识别过的页面（任何子系统、相同渲染参数与引擎）直接从共享 OCR 页面缓存读取。
+
         Args:
             file_path: PDF 文件路径
 
@@ -218,30 +220,57 @@ class TextExtractionService:
         from django.conf import settings
 
         from apps.core.interfaces import ServiceLocator
+        from apps.core.services.folder_scan_manifest import file_sha256
+        from apps.core.services.ocr_page_cache import (
+            SHARED_PROFILE,
+            SHARED_RENDER_DPI,
+            engine_version_of,
+            get_ocr_page_cache,
+        )
 
         all_text = []
         temp_files = []
+        ocr_service = ServiceLocator.get_ocr_service()
+        engine_version = engine_version_of(ocr_service)
+        page_cache = get_ocr_page_cache() if engine_version else None
+        pdf_hash = file_sha256(Path(file_path)) if page_cache is not None else ""
 
         try:
             with fitz.open(file_path) as doc:
                 for page_num in range(doc.page_count):
                     if max_pages is not None and max_pages > 0 and page_num >= max_pages:
                         break
-                    # 渲染页面为图片
-                    page = doc.load_page(page_num)
-                    pix = page.get_pixmap()
-
-                    # 保存临时图片
-                    temp_dir = Path(settings.MEDIA_ROOT) / "automation" / "temp"
-                    temp_dir.mkdir(parents=True, exist_ok=True)
-                    temp_name = f"ocr_temp_{uuid.uuid4().hex}_page{page_num}.png"
-                    temp_path = temp_dir / temp_name
-                    pix.save(temp_path.as_posix())
-                    temp_files.append(temp_path)
-
-                    # OCR 识别
-                    ocr_service = ServiceLocator.get_ocr_service()
-                    page_text = ocr_service.recognize(temp_path.as_posix())
+                    cached = (
+                        page_cache.get(pdf_hash, page_num + 1, profile=SHARED_PROFILE, engine_version=engine_version)
+                        if page_cache is not None
+                        else None
+                    )
+                    if cached is not None:
+                        page_text = cached.text
+                    else:
+                        # 渲染页面为图片（与其他子系统统一 DPI，以共享 OCR 页面缓存）
+                        page = doc.load_page(page_num)
+                        pix = page.get_pixmap(dpi=SHARED_RENDER_DPI)
+
+                        # 保存临时图片
+                        temp_dir = Path(settings.MEDIA_ROOT) / "automation" / "temp"
+                        temp_dir.mkdir(parents=True, exist_ok=True)
+                        temp_name = f"ocr_temp_{uuid.uuid4().hex}_page{page_num}.png"
+                        temp_path = temp_dir / temp_name
+                        pix.save(temp_path.as_posix())
+                        temp_files.append(temp_path)
+
+                        # OCR 识别
+                        page_text = ocr_service.recognize(temp_path.as_posix())
+                        if page_cache is not None:
+                            page_cache.put(
+                                pdf_hash,
+                                page_num + 1,
+                                profile=SHARED_PROFILE,
+                                engine_version=engine_version,
+                                text=page_text or "",
+                                ocr_failed=not page_text,
+                            )
                     if page_text:
                         all_text.append(page_text)
 
@@ -1,13 +1,42 @@
 """API endpoints."""
 
+from collections.abc import AsyncIterator, Iterator
 from urllib.parse import quote
 
-from django.http import HttpResponse
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
 
 
-def build_download_response(*, content: bytes, filename: str, content_type: str) -> HttpResponse:
-    response = HttpResponse(content, content_type=content_type)
+def _content_disposition(filename: str) -> str:
     # filename="..." 使用百分号编码（ASCII 安全，避免 Django MIME 编码破坏正则匹配）
     # filename*=UTF-8'' 同样使用百分号编码（RFC 5987，浏览器会自动解码）
-    response["Content-Disposition"] = f"attachment; filename=\"{quote(filename)}\"; filename*=UTF-8''{quote(filename)}"
+    return f"attachment; filename=\"{quote(filename)}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def build_download_response(*, content: bytes, filename: str, content_type: str) -> HttpResponse:
+    response = HttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = _content_disposition(filename)
+    return response
+
+
+def _next_chunk(chunks: Iterator[bytes]) -> bytes | None:
+    return next(chunks, None)
+
+
+async def _iterate_in_thread(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    # 同步迭代器在 ASGI 下会被 Django 整体读入内存再发送；逐块放到同步线程里取，
+    # 既能边生成边发送，又保证渲染时的 ORM 访问发生在同步上下文中
+    next_chunk = sync_to_async(_next_chunk)
+    while True:
+        chunk = await next_chunk(chunks)
+        if chunk is None:
+            break
+        yield chunk
+
+
+def build_streaming_download_response(
+    *, chunks: Iterator[bytes], filename: str, content_type: str
+) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(_iterate_in_thread(iter(chunks)), content_type=content_type)
+    response["Content-Disposition"] = _content_disposition(filename)
     return response
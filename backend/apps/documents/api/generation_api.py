@@ -17,7 +17,7 @@ from apps.core.infrastructure.throttling import rate_limit_from_settings
 from apps.core.security.auth import JWTOrSessionAuth
 from apps.core.exceptions.error_codes import CONTRACT_GENERATION_FAILED
 
-from .download_response_factory import build_download_response
+from .download_response_factory import build_download_response, build_streaming_download_response
 
 logger = logging.getLogger("apps.documents.api")
 router = Router(auth=JWTOrSessionAuth())
@@ -249,18 +249,10 @@ async def download_contract_folder(request: Any, contract_id: int) -> Any:  # pr
     await sync_to_async(_require_contract_access)(request, contract_id)
     service = _get_folder_generation_service()
 
-    # 生成文件夹 ZIP
-    zip_content, zip_filename, extract_path, error = await sync_to_async(
-        service.generate_folder_with_documents_result
-    )(contract_id)
+    # 生成文件夹 ZIP(已绑定文件夹则直接解压,否则流式下载)
+    zip_chunks, zip_filename, extract_path = await sync_to_async(service.stream_folder_with_documents)(contract_id)
 
-    if error:
-        logger.warning("生成合同文件夹失败: %s", error, extra={"contract_id": contract_id, "error": error})
-        raise ValidationException(
-            message="生成合同文件夹失败", code="FOLDER_GENERATION_FAILED", errors={"detail": error}
-        )
-
-    if extract_path:
+    if zip_chunks is None:
         logger.info(
             "合同文件夹已解压到绑定文件夹",
             extra={"contract_id": contract_id, "zip_filename": zip_filename, "extract_path": extract_path},
@@ -272,7 +264,9 @@ async def download_contract_folder(request: Any, contract_id: int) -> Any:  # pr
             "folder_path": extract_path,
         }
 
-    response = build_download_response(content=zip_content, filename=zip_filename, content_type="application/zip")
+    response = build_streaming_download_response(
+        chunks=zip_chunks, filename=zip_filename, content_type="application/zip"
+    )
 
     logger.info("合同文件夹下载成功", extra={"contract_id": contract_id, "zip_filename": zip_filename})
 
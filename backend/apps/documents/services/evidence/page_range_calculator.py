@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 from django.db import transaction
+from django.utils import timezone
 
 from apps.evidence.models import EvidenceItem, EvidenceList
 
@@ -32,17 +35,66 @@ class EvidencePageRangeCalculator:
     @transaction.atomic
     def recalculate_page_ranges_for_chain(self, *, list_id: int) -> None:
         evidence_list = EvidenceList.objects.get(id=list_id)
+        case_lists = list(EvidenceList.objects.filter(case_id=evidence_list.case_id).order_by("order"))
+        targets = [lst for lst in case_lists if lst.id == list_id or lst.order > evidence_list.order]
+        self._recalculate_lists(targets, case_lists)
 
-        self.calculate_page_ranges(evidence_list=evidence_list)
+    def update_subsequent_lists_pages(self, *, case_id: int, start_order: int) -> None:
+        case_lists = list(EvidenceList.objects.filter(case_id=case_id).order_by("order"))
+        self._recalculate_lists([lst for lst in case_lists if lst.order >= start_order], case_lists)
 
-        next_lists = EvidenceList.objects.filter(
-            case_id=evidence_list.case_id,
-            order__gt=evidence_list.order,
-        ).order_by("order")
-        for next_list in next_lists:
-            self.calculate_page_ranges(evidence_list=next_list)
+    def _recalculate_lists(self, targets: Sequence[EvidenceList], case_lists: Sequence[EvidenceList]) -> None:
+        """
+        按顺序重算多个清单的页码：一次查询取出全部明细，在内存中沿 previous_list 链累加起始页，
+        明细与清单各一次 bulk_update（与逐个调用 calculate_page_ranges 的结果一致）。
+        """
+        if not targets:
+            return
+        items_by_list: dict[int, list[EvidenceItem]] = {lst.id: [] for lst in targets}
+        items = EvidenceItem.objects.filter(evidence_list_id__in=list(items_by_list), file__isnull=False).order_by(
+            "evidence_list_id", "order"
+        )
+        for item in items:
+            items_by_list[item.evidence_list_id].append(item)
 
-    def update_subsequent_lists_pages(self, *, case_id: int, start_order: int) -> None:
-        next_lists = EvidenceList.objects.filter(case_id=case_id, order__gte=start_order).order_by("order")
-        for evidence_list in next_lists:
-            self.calculate_page_ranges(evidence_list=evidence_list)
+        lists_by_id = {lst.id: lst for lst in case_lists}
+        now = timezone.now()
+        items_to_update: list[EvidenceItem] = []
+        for evidence_list in targets:
+            current_page = self._start_page(evidence_list, lists_by_id)
+            total_pages = 0
+            for item in items_by_list[evidence_list.id]:
+                if item.page_count > 0:
+                    item.page_start = current_page
+                    item.page_end = current_page + item.page_count - 1
+                    current_page = item.page_end + 1
+                    total_pages += item.page_count
+                    items_to_update.append(item)
+            evidence_list.total_pages = total_pages
+            evidence_list.updated_at = now
+
+        if items_to_update:
+            EvidenceItem.objects.bulk_update(items_to_update, ["page_start", "page_end"])
+        EvidenceList.objects.bulk_update(targets, ["total_pages", "updated_at"])
+
+    def _start_page(self, evidence_list: EvidenceList, lists_by_id: dict[int, EvidenceList]) -> int:
+        """
+        沿 previous_list 链累加已算好的 total_pages（规则同 EvidenceService.calculate_start_page，循环引用返回 1）；
+        链上出现本案件之外的清单时按需补查。
+        """
+        visited: set[int] = {evidence_list.id}
+        total_pages = 0
+        previous_id = evidence_list.previous_list_id
+        while previous_id:
+            previous = lists_by_id.get(previous_id)
+            if previous is None:
+                previous = EvidenceList.objects.filter(id=previous_id).first()
+                if previous is None:
+                    break
+                lists_by_id[previous_id] = previous
+            if previous.id in visited:
+                return 1
+            visited.add(previous.id)
+            total_pages += previous.total_pages
+            previous_id = previous.previous_list_id
+        return total_pages + 1
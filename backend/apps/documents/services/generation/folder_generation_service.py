@@ -9,11 +9,14 @@ Requirements: 2.1, 2.6, 2.7, 3.1, 4.1
 from __future__ import annotations
 
 import logging
+import tempfile
 import zipfile
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import date
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, cast
+from typing import IO, TYPE_CHECKING, Any, cast
 
 from apps.core.exceptions import NotFoundError, ValidationException
 from apps.core.models.enums import CaseType
@@ -23,8 +26,13 @@ if TYPE_CHECKING:
     from apps.core.interfaces import IContractService
     from apps.documents.models import DocumentTemplate, FolderTemplate
 
+    from .pipeline.packager import ZipEntry, ZipPackager
+
 logger = logging.getLogger(__name__)
 
+# 云存储绑定解压前 ZIP 在内存中暂存的上限,超过后落盘到临时文件
+ZIP_SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
 
 @dataclass
 class DocumentPlacement:
@@ -36,6 +44,59 @@ class DocumentPlacement:
     supplementary_agreement: Any | None = None  # 补充协议实例(仅补充协议模板时有值)
 
 
+@dataclass
+class FolderPackage:
+    """文件夹打包计划:结构 + 文书条目(bytes / 磁盘文件 Path / 延迟渲染函数)"""
+
+    folder_structure: dict[str, Any]
+    documents: list[ZipEntry]
+    filename: str
+    has_bound_folder: bool = False
+
+
+def _render_docx(file_location: str, context: dict[str, Any], label: str, name: str) -> bytes | None:
+    """打包时渲染单个文书,失败时记录日志并返回 None(跳过该文书)"""
+    from apps.documents.services.generation.pipeline import DocxRenderer
+
+    try:
+        return DocxRenderer().render(file_location, context)
+    except Exception as e:
+        logger.warning(
+            "%s渲染异常: %s - %s",
+            label,
+            name,
+            e,
+            extra={"template_name": name, "error": str(e)},
+        )
+        return None
+
+
+def _log_stream_abort(chunks: Iterator[bytes], filename: str) -> Iterator[bytes]:
+    """响应头已发出后无法再返回错误响应:记录日志并中断连接,客户端得到的是明确失败而不是静默截断"""
+    try:
+        yield from chunks
+    except Exception:
+        logger.exception("ZIP 流式输出中断: %s", filename, extra={"zip_filename": filename})
+        raise
+
+
+def _iter_file_chunks(fileobj: IO[bytes], chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    try:
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def _is_cloud_binding(binding: Any) -> bool:
+    """与 FolderBindingCrudService._is_cloud_storage 一致:非 local 且配置了云存储账号"""
+    storage_type = getattr(binding, "storage_type", "local")
+    return storage_type != "local" and getattr(binding, "storage_account", None) is not None
+
+
 def _collect_single_file(
     target_path: str,
     file_field: Any,
@@ -46,7 +107,7 @@ def _collect_single_file(
     label: str,
     fallback_name: str = "",
 ) -> None:
-    """读取单个文件字段并追加到 documents 列表。"""
+    """将单个文件字段追加到 documents 列表（打包时再从磁盘分块读取）。"""
     if not file_field:
         return
     try:
@@ -56,7 +117,6 @@ def _collect_single_file(
         abs_path = path_resolver(raw) if callable(path_resolver) else Path(raw)
         if not abs_path.exists():
             return
-        content = abs_path.read_bytes()
         if name_prefix:
             suffix = abs_path.suffix or ".pdf"
             filename = f"{name_prefix}{suffix}"
@@ -64,7 +124,7 @@ def _collect_single_file(
             filename = abs_path.name
             if not filename.lower().endswith(".pdf"):
                 filename = f"{filename}.pdf"
-        documents.append((target_path, content, filename))
+        documents.append((target_path, Path(abs_path), filename))
         logger.info("案件文件夹 - %s已添加: %s → %s", label, filename, target_path)
     except (OSError, ValueError) as e:
         logger.warning("读取%s失败: %s - %s", label, fallback_name or file_field, e)
@@ -338,13 +398,13 @@ class FolderGenerationService:
 
         return []
 
-    def create_zip_package(self, folder_structure: dict[str, Any], documents: list[tuple[str, bytes, str]]) -> bytes:
+    def create_zip_package(self, folder_structure: dict[str, Any], documents: list[ZipEntry]) -> bytes:
         """
         创建ZIP打包
 
         Args:
             folder_structure: 文件夹结构字典
-            documents: 文书列表 [(folder_path, content, filename), ...]
+            documents: 文书列表 [(folder_path, content, filename), ...],content 可为 bytes/Path/延迟渲染函数
 
         Returns:
             ZIP文件内容
@@ -353,20 +413,20 @@ class FolderGenerationService:
 
         return ZipPackager().create(folder_structure, documents)
 
-    def generate_folder_with_documents(self, contract_id: int) -> tuple[bytes | None, str | None, str | None]:
+    def build_folder_package(self, contract_id: int) -> FolderPackage:
         """
-        生成包含文书的文件夹ZIP包
+        构建合同文件夹打包计划(文书延迟渲染,写入 ZIP/磁盘时才逐个渲染)
 
         Args:
             contract_id: 合同ID
 
         Returns:
-            Tuple[ZIP内容, 文件名, 错误信息]
+            FolderPackage
 
         Requirements: 2.6, 2.7
         """
         # 延迟导入,避免循环依赖
-        from .contract_generation_service import ContractDataWrapper, ContractGenerationService
+        from .contract_generation_service import ContractDataWrapper
 
         contract_data = self.contract_service.get_contract_with_details_internal(contract_id)
         if not contract_data:
@@ -393,10 +453,8 @@ class FolderGenerationService:
         # 5. 生成文件夹结构
         folder_structure = self.generate_folder_structure(folder_template, root_name)
 
-        # 6. 生成文书
-        from .pipeline import DocxRenderer, PipelineContextBuilder
-
-        documents: list[Any] = []
+        # 6. 登记文书(渲染推迟到打包时,逐个进行)
+        documents: list[ZipEntry] = []
 
         # 获取合同数据用于构建上下文
         contract_model = self.contract_service.get_contract_model_internal(contract_id)
@@ -404,87 +462,220 @@ class FolderGenerationService:
             raise NotFoundError("合同不存在")
 
         for placement in document_placements:
-            try:
-                # 检查模板文件是否存在
-                file_location = placement.document_template.get_file_location()
-                if not file_location or not Path(file_location).exists():
-                    logger.warning(
-                        "模板文件不存在: %s",
-                        placement.document_template.name,
-                        extra={"template_name": placement.document_template.name},
-                    )
-                    continue
+            # 检查模板文件是否存在
+            file_location = placement.document_template.get_file_location()
+            if not file_location or not Path(file_location).exists():
+                logger.warning(
+                    "模板文件不存在: %s",
+                    placement.document_template.name,
+                    extra={"template_name": placement.document_template.name},
+                )
+                continue
+            documents.append(
+                (
+                    placement.folder_path,
+                    partial(self._render_contract_placement, contract_id, contract_model, placement, file_location),
+                    placement.file_name,
+                )
+            )
 
-                # 根据模板类型构建上下文
-                if placement.supplementary_agreement is not None:
-                    agreement = placement.supplementary_agreement
-                    agreement_principals = [p.client for p in agreement.parties.filter(role="PRINCIPAL")]
-                    contract_principals = [p.client for p in contract_model.contract_parties.filter(role="PRINCIPAL")]
-                    agreement_opposing = [p.client for p in agreement.parties.filter(role="OPPOSING")]
-                    context = PipelineContextBuilder().build_supplementary_agreement_context(
-                        contract=contract_model,
-                        supplementary_agreement=agreement,
-                        agreement_principals=agreement_principals,
-                        contract_principals=contract_principals,
-                        agreement_opposing=agreement_opposing,
-                    )
-                else:
-                    context = PipelineContextBuilder().build_contract_context(contract_model)
+        return FolderPackage(
+            folder_structure=folder_structure,
+            documents=documents,
+            filename=f"{root_name}.zip",
+            has_bound_folder=bool(getattr(contract_model, "folder_binding", None)),
+        )
 
-                # 渲染模板
-                content = DocxRenderer().render(file_location, context)
+    def _render_contract_placement(
+        self, contract_id: int, contract_model: Any, placement: DocumentPlacement, file_location: str
+    ) -> bytes | None:
+        """渲染单个合同文书,失败时记录日志并返回 None(打包时跳过)"""
+        from .pipeline import DocxRenderer, PipelineContextBuilder
 
-                if content:
-                    documents.append((placement.folder_path, content, placement.file_name))
-                    logger.info(
-                        "文书生成成功: %s, 放置路径: %s/%s",
-                        placement.document_template.name,
-                        placement.folder_path,
-                        placement.file_name,
-                        extra={
-                            "contract_id": contract_id,
-                            "template_name": placement.document_template.name,
-                            "folder_path": placement.folder_path,
-                            "file_name": placement.file_name,
-                        },
-                    )
-            except Exception as e:
-                logger.warning(
-                    "生成文书异常: %s - %s",
-                    placement.document_template.name,
-                    e,
-                    extra={"template_name": placement.document_template.name, "error": str(e)},
+        try:
+            # 根据模板类型构建上下文
+            if placement.supplementary_agreement is not None:
+                agreement = placement.supplementary_agreement
+                agreement_principals = [p.client for p in agreement.parties.filter(role="PRINCIPAL")]
+                contract_principals = [p.client for p in contract_model.contract_parties.filter(role="PRINCIPAL")]
+                agreement_opposing = [p.client for p in agreement.parties.filter(role="OPPOSING")]
+                context = PipelineContextBuilder().build_supplementary_agreement_context(
+                    contract=contract_model,
+                    supplementary_agreement=agreement,
+                    agreement_principals=agreement_principals,
+                    contract_principals=contract_principals,
+                    agreement_opposing=agreement_opposing,
                 )
+            else:
+                context = PipelineContextBuilder().build_contract_context(contract_model)
+
+            # 渲染模板
+            content = DocxRenderer().render(file_location, context)
+        except Exception as e:
+            logger.warning(
+                "生成文书异常: %s - %s",
+                placement.document_template.name,
+                e,
+                extra={"template_name": placement.document_template.name, "error": str(e)},
+            )
+            return None
+
+        if not content:
+            return None
+        logger.info(
+            "文书生成成功: %s, 放置路径: %s/%s",
+            placement.document_template.name,
+            placement.folder_path,
+            placement.file_name,
+            extra={
+                "contract_id": contract_id,
+                "template_name": placement.document_template.name,
+                "folder_path": placement.folder_path,
+                "file_name": placement.file_name,
+            },
+        )
+        return content
+
+    def generate_folder_with_documents(self, contract_id: int) -> tuple[bytes | None, str | None, str | None]:
+        """
+        生成包含文书的文件夹ZIP包
+
+        Args:
+            contract_id: 合同ID
+
+        Returns:
+            Tuple[ZIP内容, 文件名, 错误信息]
+
+        Requirements: 2.6, 2.7
+        """
+        package = self.build_folder_package(contract_id)
 
         # 7. 创建ZIP包
         try:
-            zip_content = self.create_zip_package(folder_structure, documents)
-            zip_filename = f"{root_name}.zip"
+            zip_content = self.create_zip_package(package.folder_structure, package.documents)
 
             # 8. 检查绑定并自动解压到绑定文件夹
             self._last_extract_path = self._extract_to_bound_folder_if_exists(contract_id, zip_content)
 
-            return zip_content, zip_filename, None
+            return zip_content, package.filename, None
         except Exception as e:
             logger.exception("创建ZIP包失败")
             raise ValidationException(f"文件夹打包失败: {e!s}") from e
 
+    def stream_folder_with_documents(self, contract_id: int) -> tuple[Iterator[bytes] | None, str, str | None]:
+        """
+        流式生成合同文件夹ZIP
+
+        - 已绑定本地文件夹:按目录结构直接写入绑定文件夹,不生成 ZIP,返回绑定文件夹路径;
+          写入失败时回退为流式下载
+        - 已绑定云存储:ZIP 写入临时文件(超过阈值落盘)后交给绑定服务上传解压
+        - 未绑定:先渲染全部文书,再返回 ZIP 字节块迭代器,不在内存中拼接完整 ZIP
+
+        Returns:
+            Tuple[ZIP字节块迭代器(已写入绑定文件夹时为 None), 文件名, 绑定文件夹路径]
+        """
+        from .pipeline import ZipPackager
+
+        package = self.build_folder_package(contract_id)
+        packager = ZipPackager()
+        binding = self._get_contract_binding(contract_id) if package.has_bound_folder else None
+        if binding is None:
+            return self._stream_package(packager, package), package.filename, None
+
+        if not _is_cloud_binding(binding):
+            extract_path = self._write_to_bound_folder(contract_id, binding, packager, package)
+            if extract_path:
+                return None, package.filename, extract_path
+            return self._stream_package(packager, package), package.filename, None
+
+        spool = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_MEMORY)
+        try:
+            packager.write_to(spool, package.folder_structure, package.documents)
+        except (OSError, zipfile.BadZipFile) as e:
+            spool.close()
+            logger.exception("创建ZIP包失败")
+            raise ValidationException(f"文件夹打包失败: {e!s}") from e
+        spool.seek(0)
+        extract_path = self._extract_to_bound_folder_if_exists(contract_id, spool)
+        if extract_path:
+            spool.close()
+            return None, package.filename, extract_path
+        spool.seek(0)
+        return _iter_file_chunks(spool), package.filename, None
+
     def generate_folder_with_documents_result(
         self, contract_id: int
     ) -> tuple[bytes | None, str | None, str | None, str | None]:
         zip_content, zip_filename, error = self.generate_folder_with_documents(contract_id)
         return zip_content, zip_filename, self._last_extract_path, error
 
-    def generate_case_folder_with_documents(
+    def stream_case_folder_with_documents(
         self,
         case: Any,
         folder_template: FolderTemplate,
         root_name: str,
         *,
         wrap_folder_name: str | None = None,
-    ) -> bytes:  # pragma: no cover
+    ) -> Iterator[bytes]:  # pragma: no cover
+        """流式生成案件文件夹 ZIP：文书在返回前渲染完毕，附件在迭代过程中分块写出。"""
+        from .pipeline import ZipPackager
+
+        package = self.build_case_folder_package(case, folder_template, root_name, wrap_folder_name=wrap_folder_name)
+        return self._stream_package(ZipPackager(), package)
+
+    def _stream_package(self, packager: ZipPackager, package: FolderPackage) -> Iterator[bytes]:
+        """先渲染全部文书(出错时在响应发出前抛 ValidationException),再流式输出 ZIP;磁盘文件仍在输出时分块读取"""
+        try:
+            documents = packager.prerender(package.documents)
+        except Exception as e:
+            logger.exception("渲染文书失败")
+            raise ValidationException(f"文件夹打包失败: {e!s}") from e
+        return _log_stream_abort(packager.stream(package.folder_structure, documents), package.filename)
+
+    def write_case_folder_to_directory(
+        self,
+        case: Any,
+        folder_template: FolderTemplate,
+        root_name: str,
+        target_dir: str | Path,
+        *,
+        wrap_folder_name: str | None = None,
+    ) -> Path:  # pragma: no cover
+        """将案件文件夹直接写入 target_dir（等价于生成 ZIP 后 extractall，但不产生 ZIP）。"""
+        from apps.documents.services.generation.pipeline.template_cache import get_docx_template_cache
+
+        from .pipeline import ZipPackager
+
+        template_cache_before = get_docx_template_cache().stats()
+        package = self.build_case_folder_package(case, folder_template, root_name, wrap_folder_name=wrap_folder_name)
+        root_path = ZipPackager().extract_to(target_dir, package.folder_structure, package.documents)
+        self._log_template_cache_delta(case.id, template_cache_before)
+        return root_path
+
+    def _log_template_cache_delta(self, case_id: int, before: dict[str, int]) -> None:
+        from apps.documents.services.generation.pipeline.template_cache import get_docx_template_cache
+
+        after = get_docx_template_cache().stats()
+        logger.info(
+            "案件文件夹 - 模板编译缓存命中 %s 次，未命中 %s 次",
+            after["hits"] - before["hits"],
+            after["misses"] - before["misses"],
+            extra={"case_id": case_id, "template_cache": after},
+        )
+
+    def build_case_folder_package(
+        self,
+        case: Any,
+        folder_template: FolderTemplate,
+        root_name: str,
+        *,
+        wrap_folder_name: str | None = None,
+    ) -> FolderPackage:  # pragma: no cover
         """
-        生成案件文件夹（包含绑定文档和特殊文件夹内容）。
+        构建案件文件夹打包计划（包含绑定文档和特殊文件夹内容）。
+
+        文书以延迟渲染函数登记、证件等附件以磁盘路径登记，
+        写入 ZIP 或目录时才逐个渲染/读取，峰值内存与单个文书大小相关。
 
         特殊文件夹处理：
         - "身份证明"文件夹：放入本案所有当事人的证件材料（ClientIdentityDoc）
@@ -498,12 +689,9 @@ class FolderGenerationService:
             wrap_folder_name: 若提供，则将所有内容包裹在此文件夹下（合同有多个案件时使用）
 
         Returns:
-            ZIP 文件内容（bytes）
+            FolderPackage
         """
-        from pathlib import Path
-
         from apps.documents.models import DocumentTemplateFolderBinding
-        from apps.documents.services.generation.pipeline import DocxRenderer
         from apps.documents.services.placeholders import EnhancedContextBuilder
 
         # 1. 生成文件夹结构
@@ -520,7 +708,7 @@ class FolderGenerationService:
         ).select_related("document_template")
 
         # 3. 构建案件上下文并渲染文档
-        documents: list[tuple[str, bytes, str]] = []
+        documents: list[ZipEntry] = []
         context = EnhancedContextBuilder().build_context({"case": case, "case_id": case.id})
         # raw_structure 的根才是案件文件夹真正的根（root_name），用于路径剥离
         root_folder_name = raw_structure.get("name", "")
@@ -567,7 +755,13 @@ class FolderGenerationService:
                         # 使用与单独点击"法定代表人身份证明书"相同的上下文构建逻辑
                         auth_service = AuthorizationMaterialGenerationService()
                         client_context = auth_service._build_context(case=case, client=party.client)
-                        content = DocxRenderer().render(file_location, client_context)
+                        content = partial(
+                            _render_docx,
+                            file_location,
+                            client_context,
+                            "案件文件夹 - 法定代表人身份证明书",
+                            party.client.name,
+                        )
                         # 使用与单独点击"法定代表人身份证明书"相同的文件名生成逻辑
                         # 日期使用今日日期
                         from django.utils import timezone
@@ -581,7 +775,7 @@ class FolderGenerationService:
                         )
                         documents.append((folder_path, content, filename))
                         logger.info(
-                            "案件文件夹 - 法定代表人身份证明书已生成: %s → %s",
+                            "案件文件夹 - 法定代表人身份证明书已登记: %s → %s",
                             party.client.name,
                             folder_path,
                             extra={"case_id": case.id, "client": party.client.name},
@@ -601,7 +795,6 @@ class FolderGenerationService:
                 from apps.documents.services.generation.authorization_material_generation_service import (
                     AuthorizationMaterialGenerationService,
                 )
-                from apps.documents.services.generation.pipeline import DocxRenderer
 
                 our_parties = [
                     p
@@ -623,7 +816,7 @@ class FolderGenerationService:
                         case=case,
                         selected_clients=[p.client for p in our_parties],
                     )
-                    content = DocxRenderer().render(file_location, ctx)
+                    content = partial(_render_docx, file_location, ctx, "案件文件夹 - 授权委托书", template.name)
                     # 使用与单独点击"授权委托书"相同的文件名生成逻辑
                     filename = auth_service._build_power_of_attorney_filename(
                         case=case,
@@ -631,7 +824,7 @@ class FolderGenerationService:
                     )
                     documents.append((folder_path, content, filename))
                     logger.info(
-                        "案件文件夹 - 授权委托书已生成: %s",
+                        "案件文件夹 - 授权委托书已登记: %s",
                         folder_path,
                         extra={"case_id": case.id, "template_name": template.name, "client_count": len(our_parties)},
                     )
@@ -652,16 +845,16 @@ class FolderGenerationService:
 
                 try:
                     auth_service = AuthorizationMaterialGenerationService()
-                    # 先渲染模板（使用与单独点击"所函"相同的上下文构建逻辑）
+                    # 使用与单独点击"所函"相同的上下文构建逻辑，打包时再渲染
                     ctx = auth_service._build_context(case=case)
-                    content = DocxRenderer().render(file_location, ctx)
+                    content = partial(_render_docx, file_location, ctx, "案件文件夹 - 所函", template.name)
                     # 使用与单独点击"所函"相同的文件名生成逻辑
                     filename = auth_service._build_authority_letter_filename(
                         case_name=case.name or "案件",
                     )
                     documents.append((folder_path, content, filename))
                     logger.info(
-                        "案件文件夹 - 所函已生成: %s",
+                        "案件文件夹 - 所函已登记: %s",
                         folder_path,
                         extra={"case_id": case.id, "template_name": template.name},
                     )
@@ -676,7 +869,7 @@ class FolderGenerationService:
                     continue
 
             try:
-                content = DocxRenderer().render(file_location, context)
+                content = partial(_render_docx, file_location, context, "案件文件夹 - 文书", template.name)
                 # 生成文件名：模板名称(案件名称)V1_日期.docx
                 # 日期优先使用 specified_date，否则使用今日日期
                 from django.utils import timezone
@@ -694,7 +887,7 @@ class FolderGenerationService:
                 )
                 documents.append((folder_path, content, filename))
                 logger.info(
-                    "案件文件夹 - 文书生成成功: %s → %s",
+                    "案件文件夹 - 文书已登记: %s → %s",
                     template.name,
                     folder_path,
                     extra={"case_id": case.id, "template_name": template.name, "folder_path": folder_path},
@@ -774,14 +967,13 @@ class FolderGenerationService:
 
         # 8. 若有包裹文件夹，需要将所有文档路径加上包裹前缀
         if wrap_folder_name:
-            wrapped_documents: list[tuple[str, bytes, str]] = []
+            wrapped_documents: list[ZipEntry] = []
             for doc_folder_path, content, filename in documents:
                 new_path = f"{wrap_folder_name}/{doc_folder_path}" if doc_folder_path else wrap_folder_name
                 wrapped_documents.append((new_path, content, filename))
             documents = wrapped_documents
 
-        # 9. 创建 ZIP 包
-        return self.create_zip_package(folder_structure, documents)
+        return FolderPackage(folder_structure=folder_structure, documents=documents, filename=f"{root_name}.zip")
 
     def _find_special_folder_paths(self, structure: dict[str, Any], parent_path: str = "") -> dict[str, list[str]]:
         """
@@ -867,13 +1059,39 @@ class FolderGenerationService:
         for child in children:
             self._create_folders_in_zip(zip_file, child, current_path)
 
-    def _extract_to_bound_folder_if_exists(self, contract_id: int, zip_content: bytes) -> Any:
+    def _get_contract_binding(self, contract_id: int) -> Any | None:
+        if self.folder_binding_service is None:
+            return None
+        try:
+            return self.folder_binding_service.get_binding_for_contract(contract_id)
+        except Exception:
+            logger.exception("get_contract_folder_binding_failed", extra={"contract_id": contract_id})
+            return None
+
+    def _write_to_bound_folder(
+        self, contract_id: int, binding: Any, packager: ZipPackager, package: FolderPackage
+    ) -> str | None:
+        """按目录结构直接写入合同绑定的本地文件夹(同名文件不覆盖),失败返回 None"""
+        bound_path = str(getattr(binding, "resolved_folder_path", None) or binding.folder_path)
+        try:
+            packager.extract_to(bound_path, package.folder_structure, package.documents, keep_existing=True)
+        except OSError:
+            logger.exception("auto_extract_folder_zip_failed", extra={"contract_id": contract_id})
+            return None
+        logger.info(
+            "合同文件夹已直接写入绑定文件夹: %s",
+            bound_path,
+            extra={"contract_id": contract_id, "extract_path": bound_path, "action": "auto_extract_folder_zip"},
+        )
+        return bound_path
+
+    def _extract_to_bound_folder_if_exists(self, contract_id: int, zip_content: bytes | IO[bytes]) -> Any:
         """
         如果合同已绑定文件夹,自动解压ZIP到绑定文件夹
 
         Args:
             contract_id: 合同ID
-            zip_content: ZIP文件内容
+            zip_content: ZIP文件内容(bytes 或已定位到开头的二进制文件对象)
         """
         if self.folder_binding_service is None:
             return None
@@ -1,23 +1,173 @@
-"""Business logic services."""
+"""
+ZIP 打包
 
+文书条目 (folder_path, content, filename) 中的 content 支持三种形式:
+- bytes: 已渲染好的内容
+- Path: 磁盘上的文件,打包时分块读取,不整体载入内存
+- Callable[[], bytes | None]: 延迟渲染,写入该条目时才调用,返回 None 表示跳过
+
+stream() 逐条渲染并以块的形式产出 ZIP 字节(用于流式下载),
+write_to() 写入任意可写文件对象(临时文件/绑定文件夹),
+extract_to() 直接按目录结构写入磁盘,不经过 ZIP 中间产物.
+prerender() 在响应发出前渲染全部延迟条目,避免流式下载开始后才暴露渲染错误.
+磁盘文件始终分块读取;读取失败的磁盘文件记录日志后跳过.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
 import zipfile
+from collections.abc import Callable, Iterable, Iterator
 from io import BytesIO
-from typing import Any
+from pathlib import Path
+from typing import IO, Any
+
+ZipEntryContent = bytes | Path | Callable[[], bytes | None]
+ZipEntry = tuple[str, ZipEntryContent, str]
+
+CHUNK_SIZE = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class _ChunkSink:
+    """不可 seek 的写入端:ZipFile 写入的字节暂存于此,由 stream() 及时取走"""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+    def drain(self) -> bytes:
+        if not self._chunks:
+            return b""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
 
 
 class ZipPackager:
-    def create(self, folder_structure: dict[str, Any], documents: list[tuple[str, bytes, str]]) -> bytes:  # pragma: no cover
+    def create(self, folder_structure: dict[str, Any], documents: Iterable[ZipEntry]) -> bytes:
         zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        self.write_to(zip_buffer, folder_structure, documents)
+        return zip_buffer.getvalue()
+
+    def stream(self, folder_structure: dict[str, Any], documents: Iterable[ZipEntry]) -> Iterator[bytes]:
+        """逐条写入并产出 ZIP 字节块,每个文书写完(或每读满一块)即产出"""
+        sink = _ChunkSink()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zip_file:
             self._create_folders_in_zip(zip_file, folder_structure, "")
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
             root = folder_structure.get("name", "folder")
             for folder_path, content, filename in documents:
-                if folder_path:
-                    file_path = f"{root}/{folder_path}/{filename}"
-                else:
-                    file_path = f"{root}/{filename}"
-                zip_file.writestr(file_path, content)
-        return zip_buffer.getvalue()
+                for _ in self._write_entry(zip_file, self._entry_path(root, folder_path, filename), content):
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+
+    def prerender(self, documents: Iterable[ZipEntry]) -> list[ZipEntry]:
+        """渲染全部延迟条目(返回 None 的条目被丢弃),磁盘文件保持为 Path 以便打包时分块读取"""
+        rendered: list[ZipEntry] = []
+        for folder_path, content, filename in documents:
+            if callable(content):
+                data = content()
+                if data is None:
+                    continue
+                content = data
+            rendered.append((folder_path, content, filename))
+        return rendered
+
+    def write_to(self, fileobj: IO[bytes], folder_structure: dict[str, Any], documents: Iterable[ZipEntry]) -> None:
+        with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            self._create_folders_in_zip(zip_file, folder_structure, "")
+            root = folder_structure.get("name", "folder")
+            for folder_path, content, filename in documents:
+                for _ in self._write_entry(zip_file, self._entry_path(root, folder_path, filename), content):
+                    pass
+
+    def extract_to(
+        self,
+        target_dir: str | os.PathLike[str],
+        folder_structure: dict[str, Any],
+        documents: Iterable[ZipEntry],
+        *,
+        keep_existing: bool = False,
+    ) -> Path:
+        """
+        等价于 ZipFile.extractall(target_dir),但直接写文件,不生成 ZIP
+
+        Args:
+            keep_existing: 目标文件已存在时不覆盖,改用带序号后缀的文件名(如 a.docx → a_1.docx)
+
+        Returns:
+            根文件夹路径
+        """
+        base = Path(target_dir)
+        self._create_folders_on_disk(base, folder_structure)
+        root = folder_structure.get("name", "folder")
+        for folder_path, content, filename in documents:
+            target = base.joinpath(*_safe_parts(self._entry_path(root, folder_path, filename)))
+            if keep_existing:
+                target = _unique_path(target)
+            if isinstance(content, Path):
+                target.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    shutil.copyfile(content, target)
+                except OSError as e:
+                    logger.warning("复制文件失败,已跳过: %s - %s", content, e)
+                continue
+            data = content() if callable(content) else content
+            if data is None:
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+        return base.joinpath(*_safe_parts(root))
+
+    def _entry_path(self, root: str, folder_path: str, filename: str) -> str:
+        if folder_path:
+            return f"{root}/{folder_path}/{filename}"
+        return f"{root}/{filename}"
+
+    def _write_entry(self, zip_file: zipfile.ZipFile, file_path: str, content: ZipEntryContent) -> Iterator[None]:
+        """写入单个条目;大文件每写一块 yield 一次,便于调用方及时取走已压缩的数据"""
+        if isinstance(content, Path):
+            try:
+                info = zipfile.ZipInfo.from_file(content, file_path)
+                src = open(content, "rb")
+            except OSError as e:
+                logger.warning("读取文件失败,已跳过: %s - %s", content, e)
+                return
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with src, zip_file.open(info, "w") as dst:
+                while True:
+                    block = src.read(CHUNK_SIZE)
+                    if not block:
+                        break
+                    dst.write(block)
+                    yield
+            yield
+            return
+        data = content() if callable(content) else content
+        if data is None:
+            return
+        zip_file.writestr(file_path, data)
+        yield
 
     def _create_folders_in_zip(self, zip_file: zipfile.ZipFile, structure: dict[str, Any], parent_path: str) -> None:
         if not structure:
@@ -30,3 +180,36 @@ class ZipPackager:
         children = structure.get("children", [])
         for child in children:
             self._create_folders_in_zip(zip_file, child, current_path)
+
+    def _create_folders_on_disk(self, base: Path, structure: dict[str, Any], parent_path: str = "") -> None:
+        if not structure:
+            return
+        folder_name = structure.get("name", "")
+        if not folder_name:
+            return
+        current_path = f"{parent_path}/{folder_name}" if parent_path else folder_name
+        base.joinpath(*_safe_parts(current_path)).mkdir(parents=True, exist_ok=True)
+        for child in structure.get("children", []):
+            self._create_folders_on_disk(base, child, current_path)
+
+
+def _unique_path(target: Path) -> Path:
+    if not target.exists():
+        return target
+    counter = 1
+    while True:
+        candidate = target.with_name(f"{target.stem}_{counter}{target.suffix}")
+        if not candidate.exists():
+            return candidate
+        counter += 1
+
+
+def _safe_parts(member_path: str) -> list[str]:
+    """与 ZipFile.extractall 一致:丢弃空段、"."、".." 与盘符,防止写出目标目录"""
+    parts: list[str] = []
+    for part in member_path.replace("\\", "/").split("/"):
+        part = os.path.splitdrive(part)[1]
+        if part in ("", ".", ".."):
+            continue
+        parts.append(part)
+    return parts
@@ -8,12 +8,12 @@ from apps.documents.services.placeholders.fallback import build_docx_render_cont
 
 class DocxRenderer:
     def render(self, template_path: str, context: dict[str, Any]) -> bytes:  # pragma: no cover
-        from docxtpl import DocxTemplate
-
         from apps.documents.services.placeholders.archive import unwrap_archive_rich_text
 
+        from .template_cache import get_docx_template_cache
+
         render_context = unwrap_archive_rich_text(context)
-        doc = DocxTemplate(template_path)
+        doc = get_docx_template_cache().render_template(template_path)
         doc.render(build_docx_render_context(doc=doc, context=render_context))
         output = BytesIO()
         doc.save(output)
@@ -0,0 +1,179 @@
+"""
+DOCX 模板编译缓存
+
+同一模板在一次打包中往往被渲染数十次(案件文件夹、合同多案件),每次 DocxTemplate(path)
+都会重新解压并解析 XML,缺失变量补齐时还要再解析一次并做 jinja 语法分析.
+
+进程内按 (路径, mtime, 大小) 缓存模板的原始字节、解析后的 python-docx 文档与未声明变量集合,
+渲染时深拷贝已解析的文档,模板文件被修改后 mtime/大小变化自动失效.
+LRU 淘汰,同时受条目数与估算内存上限约束.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any
+
+from docx import Document
+from docxtpl import DocxTemplate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class TemplateCacheKey:
+    path: str
+    mtime_ns: int
+    size: int
+
+    @classmethod
+    def for_path(cls, template_path: str) -> TemplateCacheKey:
+        real_path = os.path.realpath(template_path)
+        stat = os.stat(real_path)
+        return cls(path=real_path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+
+class CompiledDocxTemplate:
+    """解析后的模板:原始字节 + 初始 python-docx 文档(只读,渲染时深拷贝)"""
+
+    def __init__(self, blob: bytes) -> None:
+        self.blob = blob
+        self.document = Document(BytesIO(blob))
+        self.cost_bytes = len(blob) + _uncompressed_size(blob)
+        self._undeclared_variables: frozenset[str] | None = None
+        self._lock = threading.Lock()
+
+    def instantiate(self) -> DocxTemplate:
+        return CachedDocxTemplate(self)
+
+    def undeclared_variables(self, doc: DocxTemplate) -> frozenset[str]:
+        """模板中全部 jinja 变量(不含上下文过滤),首次调用时计算"""
+        with self._lock:
+            if self._undeclared_variables is None:
+                self._undeclared_variables = frozenset(DocxTemplate.get_undeclared_template_variables(doc))
+            return self._undeclared_variables
+
+
+class CachedDocxTemplate(DocxTemplate):
+    """从编译缓存实例化的 DocxTemplate,无需重新读取与解析模板文件"""
+
+    def __init__(self, compiled: CompiledDocxTemplate) -> None:
+        super().__init__(BytesIO(compiled.blob))
+        self._compiled = compiled
+        self.docx = copy.deepcopy(compiled.document)
+
+    def get_undeclared_template_variables(
+        self,
+        jinja_env: Any | None = None,
+        context: dict[str, Any] | None = None,
+    ) -> set[str]:
+        if jinja_env is not None:
+            undeclared: set[str] = super().get_undeclared_template_variables(jinja_env=jinja_env, context=context)
+            return undeclared
+        variables = set(self._compiled.undeclared_variables(self))
+        if context is not None:
+            return variables - set(context.keys())
+        return variables
+
+
+class DocxTemplateCache:
+    """进程内 DOCX 模板编译缓存(LRU,条目数 + 估算内存双上限)"""
+
+    def __init__(self, *, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._max_entries = max(1, max_entries)
+        self._max_bytes = max(1, max_bytes)
+        self._entries: OrderedDict[TemplateCacheKey, CompiledDocxTemplate] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, template_path: str) -> CompiledDocxTemplate:
+        key = TemplateCacheKey.for_path(template_path)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return compiled
+            self._misses += 1
+
+        with open(key.path, "rb") as handle:
+            compiled = CompiledDocxTemplate(handle.read())
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._drop_stale_versions(key.path)
+            if compiled.cost_bytes <= self._max_bytes:
+                self._entries[key] = compiled
+                self._total_bytes += compiled.cost_bytes
+                self._evict()
+        return compiled
+
+    def render_template(self, template_path: str) -> DocxTemplate:
+        """返回可直接 render/save 的模板实例"""
+        return self.get(template_path).instantiate()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _drop_stale_versions(self, path: str) -> None:
+        for stale in [k for k in self._entries if k.path == path]:
+            self._total_bytes -= self._entries.pop(stale).cost_bytes
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self._max_entries or self._total_bytes > self._max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.cost_bytes
+            self._evictions += 1
+
+
+def _uncompressed_size(blob: bytes) -> int:
+    try:
+        with zipfile.ZipFile(BytesIO(blob)) as archive:
+            return sum(info.file_size for info in archive.infolist())
+    except zipfile.BadZipFile:
+        return 0
+
+
+_cache: DocxTemplateCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_docx_template_cache() -> DocxTemplateCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from django.conf import settings
+
+                _cache = DocxTemplateCache(
+                    max_entries=int(getattr(settings, "DOCX_TEMPLATE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                    max_bytes=int(getattr(settings, "DOCX_TEMPLATE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+                )
+    return _cache
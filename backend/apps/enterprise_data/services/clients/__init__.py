@@ -1,4 +1,5 @@
 from .api_key_pool import McpApiKeyPool
+from .mcp_session_pool import McpSessionPool
 from .mcp_tool_client import McpToolClient
 
-__all__ = ["McpApiKeyPool", "McpToolClient"]
+__all__ = ["McpApiKeyPool", "McpSessionPool", "McpToolClient"]
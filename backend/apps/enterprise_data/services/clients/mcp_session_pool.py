@@ -0,0 +1,223 @@
+"""MCP 会话池。
+
+按 (provider, transport, url, api_key 指纹) 复用已完成 initialize 握手的 ClientSession，
+避免每次工具调用都重新建立 SSE / streamable-http 连接。
+
+每个会话由独立的 owner task 持有：transport 与 ClientSession 的 async with 都在该 task 内进入和退出
+（anyio 要求 cancel scope 在进入它的 task 中退出），调用方只借用已初始化的 session。
+会话绑定创建它的事件循环，因此每个事件循环各有一个池。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from mcp.shared.exceptions import McpError
+
+logger = logging.getLogger(__name__)
+
+SESSION_IDLE_TTL_SECONDS = 5 * 60
+SESSION_PING_AFTER_IDLE_SECONDS = 30
+SESSION_PING_TIMEOUT_SECONDS = 5
+_CLOSE_TIMEOUT_SECONDS = 5
+
+SessionKey = tuple[str, str, str, str]
+SessionOpener = Callable[[], AbstractAsyncContextManager[Any]]
+_ResultT = TypeVar("_ResultT")
+
+
+@dataclass(eq=False)
+class _PooledSession:
+    key: SessionKey
+    ready: asyncio.Future[Any]
+    closing: asyncio.Event = field(default_factory=asyncio.Event)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    last_used: float = field(default_factory=time.monotonic)
+    in_use: int = 0
+    task: asyncio.Task[None] | None = None
+
+
+class McpSessionPool:
+    """单个事件循环内的 MCP 会话池：空闲回收、复用前健康检查、连接失效后重连。"""
+
+    def __init__(
+        self,
+        *,
+        idle_ttl_seconds: float = SESSION_IDLE_TTL_SECONDS,
+        ping_after_idle_seconds: float = SESSION_PING_AFTER_IDLE_SECONDS,
+        ping_timeout_seconds: float = SESSION_PING_TIMEOUT_SECONDS,
+    ) -> None:
+        self._idle_ttl_seconds = max(0.0, float(idle_ttl_seconds))
+        self._ping_after_idle_seconds = max(0.0, float(ping_after_idle_seconds))
+        self._ping_timeout_seconds = max(0.1, float(ping_timeout_seconds))
+        self._sessions: dict[SessionKey, _PooledSession] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self._sessions)
+
+    async def run(
+        self,
+        key: SessionKey,
+        opener: SessionOpener,
+        operation: Callable[[Any], Awaitable[_ResultT]],
+    ) -> _ResultT:
+        """借用 key 对应的会话执行 operation。
+
+        复用的会话若因连接问题失败，丢弃后用新会话重试一次；新建会话的失败直接抛出，
+        交给调用方的重试、传输回退与 API Key 切换逻辑处理。
+        """
+        retried = False
+        while True:
+            entry, warm = await self._checkout(key, opener)
+            try:
+                return await operation(entry.ready.result())
+            except Exception as exc:
+                if not self._is_session_failure(entry, exc):
+                    raise
+                self._discard(entry)
+                if not warm or retried:
+                    raise
+                retried = True
+                logger.info(
+                    "Pooled MCP session failed, reconnect and retry: %s",
+                    exc,
+                    extra={"provider": key[0], "transport": key[1], "error_type": type(exc).__name__},
+                )
+            finally:
+                self._checkin(entry)
+
+    async def aclose(self) -> None:
+        """关闭池中全部会话。"""
+        entries = list(self._sessions.values())
+        for entry in entries:
+            self._discard(entry)
+            entry.in_use = 0
+            entry.wakeup.set()
+        tasks = [entry.task for entry in entries if entry.task is not None]
+        if not tasks:
+            return
+        _done, pending = await asyncio.wait(tasks, timeout=_CLOSE_TIMEOUT_SECONDS)
+        for task in pending:
+            task.cancel()
+
+    async def _checkout(self, key: SessionKey, opener: SessionOpener) -> tuple[_PooledSession, bool]:
+        entry = self._sessions.get(key)
+        if entry is None or entry.closing.is_set():
+            entry = self._spawn(key, opener)
+        warm = entry.ready.done()
+        idle_seconds = time.monotonic() - entry.last_used
+        entry.in_use += 1
+        entry.last_used = time.monotonic()
+        try:
+            # shield：调用方被取消时不影响其他等待同一次握手的调用
+            session = await asyncio.shield(entry.ready)
+            if warm and idle_seconds >= self._ping_after_idle_seconds:
+                async with asyncio.timeout(self._ping_timeout_seconds):
+                    await session.send_ping()
+        except Exception as exc:
+            self._checkin(entry)
+            if not warm:
+                raise
+            logger.info(
+                "MCP session health check failed, reconnect: %s",
+                exc,
+                extra={"provider": key[0], "transport": key[1], "error_type": type(exc).__name__},
+            )
+            self._discard(entry)
+            return await self._checkout(key, opener)
+        return entry, warm
+
+    def _checkin(self, entry: _PooledSession) -> None:
+        entry.in_use = max(0, entry.in_use - 1)
+        entry.last_used = time.monotonic()
+        if entry.in_use == 0:
+            entry.wakeup.set()
+
+    def _discard(self, entry: _PooledSession) -> None:
+        entry.closing.set()
+        entry.wakeup.set()
+        if self._sessions.get(entry.key) is entry:
+            del self._sessions[entry.key]
+
+    def _spawn(self, key: SessionKey, opener: SessionOpener) -> _PooledSession:
+        loop = asyncio.get_running_loop()
+        entry = _PooledSession(key=key, ready=loop.create_future())
+        self._sessions[key] = entry
+        entry.task = loop.create_task(self._hold(entry, opener), name=f"mcp-session:{key[0]}:{key[1]}")
+        return entry
+
+    async def _hold(self, entry: _PooledSession, opener: SessionOpener) -> None:
+        try:
+            async with opener() as session:
+                entry.ready.set_result(session)
+                entry.last_used = time.monotonic()
+                await self._wait_until_idle_or_closed(entry)
+        except Exception as exc:
+            if not entry.ready.done():
+                entry.ready.set_exception(exc)
+            else:
+                # 连接在空闲期间断开（transport 的 task group 报错），下次调用会重新握手
+                logger.info(
+                    "MCP session closed with error: %s",
+                    exc,
+                    extra={"provider": entry.key[0], "transport": entry.key[1], "error_type": type(exc).__name__},
+                )
+        finally:
+            self._discard(entry)
+            if not entry.ready.done():
+                entry.ready.cancel()
+
+    async def _wait_until_idle_or_closed(self, entry: _PooledSession) -> None:
+        while True:
+            # 使用中的会话只等 _checkin 唤醒
+            timeout: float | None = None
+            if entry.in_use == 0:
+                if entry.closing.is_set():
+                    return
+                idle_seconds = time.monotonic() - entry.last_used
+                if idle_seconds >= self._idle_ttl_seconds:
+                    return
+                timeout = self._idle_ttl_seconds - idle_seconds
+            entry.wakeup.clear()
+            try:
+                async with asyncio.timeout(timeout):
+                    await entry.wakeup.wait()
+            except TimeoutError:
+                pass
+
+    def _is_session_failure(self, entry: _PooledSession, exc: Exception) -> bool:
+        # McpError 是服务端返回的 JSON-RPC 错误，连接本身仍然可用；除非会话已随连接关闭
+        return not isinstance(exc, McpError) or entry.closing.is_set()
+
+
+_pools: dict[asyncio.AbstractEventLoop, McpSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_session_pool() -> McpSessionPool:
+    """当前事件循环的会话池（同时清理已关闭事件循环遗留的池）。"""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.get(loop)
+        if pool is None:
+            for stale in [item for item in _pools if item.is_closed()]:
+                del _pools[stale]
+            pool = _pools[loop] = McpSessionPool()
+        return pool
+
+
+async def close_session_pool() -> None:
+    """关闭当前事件循环的会话池。"""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.pop(loop, None)
+    if pool is not None:
+        await pool.aclose()
@@ -8,7 +8,7 @@ import json
 import logging
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
 from typing import Any, TypeVar, cast
 
@@ -20,6 +20,11 @@ from mcp.client.streamable_http import streamable_http_client
 
 from apps.core.exceptions import AuthenticationError, ExternalServiceError, ValidationException
 from apps.enterprise_data.services.clients.api_key_pool import McpApiKeyPool
+from apps.enterprise_data.services.clients.mcp_session_pool import (
+    SessionKey,
+    close_session_pool,
+    get_session_pool,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +60,10 @@ def shutdown_persistent_loop() -> None:
     global _persistent_loop, _persistent_loop_thread
     with _persistent_loop_lock:
         if _persistent_loop is not None and not _persistent_loop.is_closed():
+            try:
+                asyncio.run_coroutine_threadsafe(close_session_pool(), _persistent_loop).result(timeout=10)
+            except Exception as exc:
+                logger.warning("Failed to close pooled MCP sessions: %s", exc)
             _persistent_loop.call_soon_threadsafe(_persistent_loop.stop)
             if _persistent_loop_thread is not None:
                 _persistent_loop_thread.join(timeout=5)
@@ -195,8 +204,11 @@ class McpToolClient:
         arguments: dict[str, Any],
         api_key: str,
     ) -> dict[str, Any]:
-        async with self._open_session(transport=transport, api_key=api_key) as session:
-            result = await session.call_tool(name=tool_name, arguments=arguments)
+        result = await self._run_in_session(
+            transport=transport,
+            api_key=api_key,
+            operation=lambda session: session.call_tool(name=tool_name, arguments=arguments),
+        )
         payload = self._extract_payload(result)
         return {
             "payload": payload,
@@ -208,8 +220,11 @@ class McpToolClient:
         }
 
     async def _describe_tools_async(self, *, transport: str, api_key: str) -> list[dict[str, Any]]:
-        async with self._open_session(transport=transport, api_key=api_key) as session:
-            result = await session.list_tools()
+        result = await self._run_in_session(
+            transport=transport,
+            api_key=api_key,
+            operation=lambda session: session.list_tools(),
+        )
         tools: list[dict[str, Any]] = []
         for item in result.tools:
             name = str(getattr(item, "name", "") or "").strip()
@@ -230,6 +245,25 @@ class McpToolClient:
             )
         return tools
 
+    async def _run_in_session(
+        self,
+        *,
+        transport: str,
+        api_key: str,
+        operation: Callable[[ClientSession], Awaitable[_ResultT]],
+    ) -> _ResultT:
+        """在池化的长连接会话中执行操作，同一 (provider, transport, api_key) 复用已初始化的会话。"""
+        return await get_session_pool().run(
+            self._session_key(transport=transport, api_key=api_key),
+            lambda: self._open_session(transport=transport, api_key=api_key),
+            operation,
+        )
+
+    def _session_key(self, *, transport: str, api_key: str) -> SessionKey:
+        url = self._sse_url if transport == _TRANSPORT_SSE else self._base_url
+        fingerprint = self._api_key_pool.fingerprint(api_key or self._api_key)
+        return (self._provider_name, transport, url, fingerprint)
+
     @asynccontextmanager
     async def _open_session(self, *, transport: str, api_key: str) -> Any:  # pragma: no cover
         headers = self._headers(transport=transport, api_key=api_key)
@@ -2,26 +2,35 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
 import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from typing import Any
 
 from django.core.cache import cache
 
 from apps.core.exceptions import ValidationException
+from apps.core.telemetry.metrics import record_cache_result
 from apps.enterprise_data.services.metrics_service import EnterpriseDataMetricsService
 from apps.enterprise_data.services.provider_registry import EnterpriseProviderRegistry
 from apps.enterprise_data.services.providers.base import EnterpriseDataProvider
+from apps.enterprise_data.services.single_flight import LeaderAbandoned, SingleFlight
 from apps.enterprise_data.services.types import (
     DEFAULT_ALERT_AVG_LATENCY_MS_THRESHOLD,
     DEFAULT_ALERT_FALLBACK_RATE_THRESHOLD,
     DEFAULT_ALERT_MIN_SAMPLES,
     DEFAULT_ALERT_SUCCESS_RATE_THRESHOLD,
+    DEFAULT_CACHE_TTL_SECONDS,
     DEFAULT_METRICS_WINDOW_SECONDS,
+    DEFAULT_RETRY_MAX_ATTEMPTS,
     DEFAULT_RISK_TYPE,
+    DEFAULT_STALE_CACHE_TTL_SECONDS,
+    DEFAULT_TIMEOUT_SECONDS,
     ProviderResponse,
 )
 
@@ -29,6 +38,35 @@ logger = logging.getLogger(__name__)
 
 _BIDDING_SEARCH_TYPES = {1, 2, 3}
 _BIDDING_BID_TYPES = {1, 2, 4}
+_CACHE_METRIC_KIND = "enterprise_data"
+
+# 缓存条目为 {"payload": ..., "fresh_until": 时间戳}，在 fresh TTL + stale TTL 后才从缓存中消失
+_single_flight = SingleFlight()
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="enterprise-data-refresh")
+_background_refreshes: set[asyncio.Task[None]] = set()
+
+
+def _pack_cache_entry(payload: dict[str, Any], fresh_ttl: int) -> dict[str, Any]:
+    return {"payload": payload, "fresh_until": time.time() + fresh_ttl}
+
+
+def _unpack_cache_entry(entry: Any) -> tuple[dict[str, Any] | None, bool]:
+    """返回 (payload, 是否仍新鲜)；无法识别的条目（含旧格式）按未命中处理。"""
+    if not isinstance(entry, dict) or not isinstance(entry.get("payload"), dict):
+        return None, False
+    try:
+        fresh_until = float(entry.get("fresh_until") or 0)
+    except (TypeError, ValueError):
+        fresh_until = 0.0
+    return entry["payload"], fresh_until > time.time()
+
+
+def _present(payload: dict[str, Any], *, include_raw: bool, **meta_flags: bool) -> dict[str, Any]:
+    result = dict(payload)
+    result["meta"] = {**dict(result.get("meta", {})), **meta_flags}
+    if not include_raw:
+        result["raw"] = None
+    return result
 
 
 class EnterpriseDataService:
@@ -425,85 +463,51 @@ class EnterpriseDataService:
         include_raw: bool,
         executor: Any,
     ) -> dict[str, Any]:  # pragma: no cover
+        """新鲜缓存直接返回；过期缓存先返回并在后台刷新；未命中时同 key 的并发请求只调用一次 provider。"""
         selected_provider = self._registry.get_provider(provider)
-        selected_provider_name = selected_provider.name
-        cache_key = self._build_cache_key(provider=selected_provider_name, capability=capability, query=query)
-
-        cached = cache.get(cache_key)
-        if isinstance(cached, dict):
-            payload = dict(cached)
-            payload_meta = dict(payload.get("meta", {}))
-            payload_meta["cached"] = True
-            payload["meta"] = payload_meta
-            if not include_raw:
-                payload["raw"] = None
-            return payload
+        cache_key = self._build_cache_key(provider=selected_provider.name, capability=capability, query=query)
 
-        started = time.perf_counter()
-        try:
-            response: ProviderResponse = executor(selected_provider)
-        except Exception as exc:
-            duration_ms = int((time.perf_counter() - started) * 1000)
-            # Stale cache fallback: return expired cached result when provider fails
-            stale = cache.get(cache_key)
-            if isinstance(stale, dict):
-                stale_meta = dict(stale.get("meta", {}))
-                stale_meta["cached"] = True
-                stale_meta["stale"] = True
-                stale["meta"] = stale_meta
-                self._metrics.record(
-                    provider=selected_provider_name,
-                    capability=capability,
-                    success=False,
-                    duration_ms=duration_ms,
-                    fallback_used=True,
-                )
-                logger.warning(
-                    "MCP 调用失败，返回过期缓存: provider=%s capability=%s error=%s",
-                    selected_provider_name,
-                    capability,
-                    exc,
-                )
-                if not include_raw:
-                    stale = dict(stale)
-                    stale["raw"] = None
-                return stale
-            self._metrics.record(
-                provider=selected_provider_name,
+        def fetch(*, background: bool) -> dict[str, Any]:
+            return self._fetch(
+                selected_provider=selected_provider,
                 capability=capability,
-                success=False,
-                duration_ms=duration_ms,
-                fallback_used=False,
+                query=query,
+                executor=executor,
+                cache_key=cache_key,
+                background=background,
             )
-            raise
-        payload = self._build_query_payload(
-            provider=selected_provider_name,
-            transport=selected_provider.transport,
-            capability=capability,
-            query=query,
-            response=response,
-            include_raw=include_raw,
-        )
-        measured_duration_ms = int((time.perf_counter() - started) * 1000)
-        duration_ms = int(response.meta.get("duration_ms", measured_duration_ms) or measured_duration_ms)
-        fallback_used = bool(response.meta.get("fallback_used", False))
-        observability = self._metrics.record(
-            provider=selected_provider_name,
-            capability=capability,
-            success=True,
-            duration_ms=duration_ms,
-            fallback_used=fallback_used,
-        )
-        payload_meta = dict(payload.get("meta", {}))
-        payload_meta["observability"] = observability
-        payload["meta"] = payload_meta
-        cache_ttl = self._registry.get_cache_ttl_seconds()
-        cache.set(cache_key, payload, timeout=cache_ttl)
 
-        if not include_raw:
-            payload = dict(payload)
-            payload["raw"] = None
-        return payload
+        cached, fresh = _unpack_cache_entry(cache.get(cache_key))
+        if cached is not None:
+            if not fresh:
+                self._refresh_in_background(cache_key=cache_key, fetch=lambda: fetch(background=True))
+            return self._serve_cached(cached, capability=capability, include_raw=include_raw, stale=not fresh)
+
+        while True:
+            future, leader = _single_flight.claim(cache_key)
+            if leader:
+                break
+            record_cache_result(cache_kind=_CACHE_METRIC_KIND, name=capability, result="coalesced")
+            try:
+                payload = future.result(timeout=self._coalesce_timeout())
+            except LeaderAbandoned:
+                continue
+            except TimeoutError:
+                logger.warning("等待并发中的企业数据查询超时，改为直接查询", extra={"cache_key": cache_key})
+                return _present(fetch(background=False), include_raw=include_raw)
+            return _present(payload, include_raw=include_raw, coalesced=True)
+
+        record_cache_result(cache_kind=_CACHE_METRIC_KIND, name=capability, result="miss")
+        try:
+            payload = fetch(background=False)
+        except Exception as exc:
+            _single_flight.resolve(cache_key, future, error=exc)
+            raise
+        except BaseException:
+            _single_flight.release(cache_key, future)
+            raise
+        _single_flight.resolve(cache_key, future, result=payload)
+        return _present(payload, include_raw=include_raw)
 
     async def _aexecute(
         self,
@@ -516,69 +520,190 @@ class EnterpriseDataService:
     ) -> dict[str, Any]:
         """异步版本的 _execute，使用 cache.aget/aset 替代同步缓存调用。"""
         selected_provider = self._registry.get_provider(provider)
-        selected_provider_name = selected_provider.name
-        cache_key = self._build_cache_key(provider=selected_provider_name, capability=capability, query=query)
-
-        cached = await cache.aget(cache_key)
-        if isinstance(cached, dict):
-            payload = dict(cached)
-            payload_meta = dict(payload.get("meta", {}))
-            payload_meta["cached"] = True
-            payload["meta"] = payload_meta
-            if not include_raw:
-                payload["raw"] = None
-            return payload
+        cache_key = self._build_cache_key(provider=selected_provider.name, capability=capability, query=query)
+
+        async def afetch(*, background: bool) -> dict[str, Any]:
+            return await self._afetch(
+                selected_provider=selected_provider,
+                capability=capability,
+                query=query,
+                executor=executor,
+                cache_key=cache_key,
+                background=background,
+            )
+
+        cached, fresh = _unpack_cache_entry(await cache.aget(cache_key))
+        if cached is not None:
+            if not fresh:
+                self._arefresh_in_background(cache_key=cache_key, fetch=lambda: afetch(background=True))
+            return self._serve_cached(cached, capability=capability, include_raw=include_raw, stale=not fresh)
+
+        while True:
+            future, leader = _single_flight.claim(cache_key)
+            if leader:
+                break
+            record_cache_result(cache_kind=_CACHE_METRIC_KIND, name=capability, result="coalesced")
+            try:
+                # shield：单个等待方被取消时不取消共享的 Future
+                payload = await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), timeout=self._coalesce_timeout()
+                )
+            except LeaderAbandoned:
+                continue
+            except TimeoutError:
+                logger.warning("等待并发中的企业数据查询超时，改为直接查询", extra={"cache_key": cache_key})
+                return _present(await afetch(background=False), include_raw=include_raw)
+            return _present(payload, include_raw=include_raw, coalesced=True)
+
+        record_cache_result(cache_kind=_CACHE_METRIC_KIND, name=capability, result="miss")
+        try:
+            payload = await afetch(background=False)
+        except Exception as exc:
+            _single_flight.resolve(cache_key, future, error=exc)
+            raise
+        except BaseException:
+            # 客户端断开导致的 CancelledError 不能传给等待方，只释放登记让它们重试
+            _single_flight.release(cache_key, future)
+            raise
+        _single_flight.resolve(cache_key, future, result=payload)
+        return _present(payload, include_raw=include_raw)
+
+    def _fetch(
+        self,
+        *,
+        selected_provider: EnterpriseDataProvider,
+        capability: str,
+        query: dict[str, Any],
+        executor: Any,
+        cache_key: str,
+        background: bool,
+    ) -> dict[str, Any]:  # pragma: no cover
+        started = time.perf_counter()
+        try:
+            response: ProviderResponse = executor(selected_provider)
+        except Exception:
+            self._record_failure(
+                provider=selected_provider.name, capability=capability, started=started, background=background
+            )
+            raise
+        payload = self._payload_from_response(
+            selected_provider=selected_provider, capability=capability, query=query, response=response, started=started
+        )
+        fresh_ttl, stale_ttl = self._cache_ttls()
+        cache.set(cache_key, _pack_cache_entry(payload, fresh_ttl), timeout=fresh_ttl + stale_ttl)
+        return payload
 
+    async def _afetch(
+        self,
+        *,
+        selected_provider: EnterpriseDataProvider,
+        capability: str,
+        query: dict[str, Any],
+        executor: Any,
+        cache_key: str,
+        background: bool,
+    ) -> dict[str, Any]:
         started = time.perf_counter()
         try:
             response: ProviderResponse = await executor(selected_provider)
-        except Exception as exc:
-            duration_ms = int((time.perf_counter() - started) * 1000)
-            # Stale cache fallback: return expired cached result when provider fails
-            stale = await cache.aget(cache_key)
-            if isinstance(stale, dict):
-                stale_meta = dict(stale.get("meta", {}))
-                stale_meta["cached"] = True
-                stale_meta["stale"] = True
-                stale["meta"] = stale_meta
-                self._metrics.record(
-                    provider=selected_provider_name,
-                    capability=capability,
-                    success=False,
-                    duration_ms=duration_ms,
-                    fallback_used=True,
-                )
-                logger.warning(
-                    "MCP 调用失败，返回过期缓存: provider=%s capability=%s error=%s",
-                    selected_provider_name,
-                    capability,
-                    exc,
-                )
-                if not include_raw:
-                    stale = dict(stale)
-                    stale["raw"] = None
-                return stale
-            self._metrics.record(
-                provider=selected_provider_name,
-                capability=capability,
-                success=False,
-                duration_ms=duration_ms,
-                fallback_used=False,
+        except Exception:
+            self._record_failure(
+                provider=selected_provider.name, capability=capability, started=started, background=background
             )
             raise
+        payload = self._payload_from_response(
+            selected_provider=selected_provider, capability=capability, query=query, response=response, started=started
+        )
+        fresh_ttl, stale_ttl = self._cache_ttls()
+        await cache.aset(cache_key, _pack_cache_entry(payload, fresh_ttl), timeout=fresh_ttl + stale_ttl)
+        return payload
+
+    def _refresh_in_background(self, *, cache_key: str, fetch: Callable[[], dict[str, Any]]) -> None:
+        future, leader = _single_flight.claim(cache_key)
+        if not leader:
+            return
+
+        def run() -> None:
+            try:
+                payload = fetch()
+            except Exception as exc:
+                _single_flight.resolve(cache_key, future, error=exc)
+                self._log_refresh_failure(cache_key=cache_key, exc=exc)
+                return
+            except BaseException:
+                _single_flight.release(cache_key, future)
+                raise
+            _single_flight.resolve(cache_key, future, result=payload)
+
+        try:
+            _refresh_executor.submit(run)
+        except RuntimeError as exc:
+            # 解释器退出阶段线程池已关闭
+            _single_flight.resolve(cache_key, future, error=exc)
+
+    def _arefresh_in_background(
+        self,
+        *,
+        cache_key: str,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> None:
+        future, leader = _single_flight.claim(cache_key)
+        if not leader:
+            return
+
+        async def run() -> None:
+            try:
+                payload = await fetch()
+            except Exception as exc:
+                _single_flight.resolve(cache_key, future, error=exc)
+                self._log_refresh_failure(cache_key=cache_key, exc=exc)
+                return
+            except BaseException:
+                _single_flight.release(cache_key, future)
+                raise
+            _single_flight.resolve(cache_key, future, result=payload)
+
+        task = asyncio.get_running_loop().create_task(run())
+        _background_refreshes.add(task)
+        task.add_done_callback(_background_refreshes.discard)
+
+    def _serve_cached(
+        self,
+        payload: dict[str, Any],
+        *,
+        capability: str,
+        include_raw: bool,
+        stale: bool,
+    ) -> dict[str, Any]:
+        result = "stale" if stale else "hit"
+        record_cache_result(cache_kind=_CACHE_METRIC_KIND, name=capability, result=result)
+        if stale:
+            return _present(payload, include_raw=include_raw, cached=True, stale=True)
+        return _present(payload, include_raw=include_raw, cached=True)
+
+    def _payload_from_response(
+        self,
+        *,
+        selected_provider: EnterpriseDataProvider,
+        capability: str,
+        query: dict[str, Any],
+        response: ProviderResponse,
+        started: float,
+    ) -> dict[str, Any]:
+        # 缓存与合并请求共享同一份结果，始终保留 raw，按调用方的 include_raw 在返回时裁剪
         payload = self._build_query_payload(
-            provider=selected_provider_name,
+            provider=selected_provider.name,
             transport=selected_provider.transport,
             capability=capability,
             query=query,
             response=response,
-            include_raw=include_raw,
+            include_raw=True,
         )
         measured_duration_ms = int((time.perf_counter() - started) * 1000)
         duration_ms = int(response.meta.get("duration_ms", measured_duration_ms) or measured_duration_ms)
         fallback_used = bool(response.meta.get("fallback_used", False))
         observability = self._metrics.record(
-            provider=selected_provider_name,
+            provider=selected_provider.name,
             capability=capability,
             success=True,
             duration_ms=duration_ms,
@@ -587,14 +712,36 @@ class EnterpriseDataService:
         payload_meta = dict(payload.get("meta", {}))
         payload_meta["observability"] = observability
         payload["meta"] = payload_meta
-        cache_ttl = self._registry.get_cache_ttl_seconds()
-        await cache.aset(cache_key, payload, timeout=cache_ttl)
-
-        if not include_raw:
-            payload = dict(payload)
-            payload["raw"] = None
         return payload
 
+    def _record_failure(self, *, provider: str, capability: str, started: float, background: bool) -> None:
+        # 后台刷新失败时调用方已拿到过期缓存，记为 fallback
+        self._metrics.record(
+            provider=provider,
+            capability=capability,
+            success=False,
+            duration_ms=int((time.perf_counter() - started) * 1000),
+            fallback_used=background,
+        )
+
+    def _log_refresh_failure(self, *, cache_key: str, exc: BaseException) -> None:
+        logger.warning(
+            "MCP 后台刷新失败，继续使用过期缓存: cache_key=%s error=%s",
+            cache_key,
+            exc,
+            extra={"error_type": type(exc).__name__},
+        )
+
+    def _coalesce_timeout(self) -> float:
+        """等待方最多等 provider 单次超时 × 重试次数，避免 leader 卡死时无限等待"""
+        attempts = self._read_registry_int("get_retry_max_attempts", DEFAULT_RETRY_MAX_ATTEMPTS)
+        return float(DEFAULT_TIMEOUT_SECONDS * attempts)
+
+    def _cache_ttls(self) -> tuple[int, int]:
+        fresh_ttl = self._read_registry_int("get_cache_ttl_seconds", DEFAULT_CACHE_TTL_SECONDS)
+        stale_ttl = self._read_registry_int("get_stale_cache_ttl_seconds", DEFAULT_STALE_CACHE_TTL_SECONDS)
+        return fresh_ttl, stale_ttl
+
     @staticmethod
     def _build_query_payload(
         *,
@@ -13,6 +13,7 @@ from apps.enterprise_data.services.providers import QichachaMcpProvider, Tianyan
 from apps.enterprise_data.services.types import (
     DEFAULT_CACHE_TTL_SECONDS,
     DEFAULT_PROVIDER_NAME,
+    DEFAULT_STALE_CACHE_TTL_SECONDS,
     DEFAULT_TIMEOUT_SECONDS,
     DEFAULT_TRANSPORT,
     ProviderConfig,
@@ -32,6 +33,10 @@ class EnterpriseProviderRegistry:
     def get_cache_ttl_seconds(self) -> int:
         return DEFAULT_CACHE_TTL_SECONDS
 
+    def get_stale_cache_ttl_seconds(self) -> int:
+        """新鲜期过后仍可先返回旧结果（同时后台刷新）的时长。"""
+        return DEFAULT_STALE_CACHE_TTL_SECONDS
+
     def get_default_provider_name(self) -> str:
         return DEFAULT_PROVIDER_NAME
 
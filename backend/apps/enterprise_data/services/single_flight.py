@@ -0,0 +1,53 @@
+"""进程内 single-flight：同一个 key 同一时刻只有一个调用在执行，其他调用等待并共享它的结果。"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any
+
+
+class LeaderAbandoned(Exception):
+    """leader 被取消（客户端断开等）而未产出结果；等待方应重新 claim，而不是跟着被取消。"""
+
+
+class SingleFlight:
+    """按 key 登记进行中的调用；同步线程与异步协程共用同一份登记（结果通过 concurrent Future 传递）。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future[Any]] = {}
+
+    def claim(self, key: str) -> tuple[Future[Any], bool]:
+        """返回 key 对应的 Future 以及调用方是否成为 leader；leader 必须随后调用 resolve。"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def resolve(
+        self,
+        key: str,
+        future: Future[Any],
+        *,
+        result: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def release(self, key: str, future: Future[Any]) -> None:
+        """leader 被取消时释放登记：等待方收到 LeaderAbandoned 后自行重试。"""
+        self.resolve(key, future, error=LeaderAbandoned(key))
+
+    def is_running(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
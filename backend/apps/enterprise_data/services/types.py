@@ -9,6 +9,7 @@ DEFAULT_PROVIDER_NAME = "tianyancha"
 DEFAULT_TRANSPORT = "streamable_http"
 DEFAULT_TIMEOUT_SECONDS = 30
 DEFAULT_CACHE_TTL_SECONDS = 300
+DEFAULT_STALE_CACHE_TTL_SECONDS = 24 * 60 * 60
 DEFAULT_RISK_TYPE = "自身风险"
 DEFAULT_RATE_LIMIT_REQUESTS = 60
 DEFAULT_RATE_LIMIT_WINDOW_SECONDS = 60
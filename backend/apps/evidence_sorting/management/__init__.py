@@ -0,0 +1 @@
+"""Evidence sorting management package."""
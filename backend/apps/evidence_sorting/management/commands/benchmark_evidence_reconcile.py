@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.evidence_sorting.services.reconciler import (
+    STATUS_MATCHED,
+    STATUS_UNMATCHED,
+    DeliveryNote,
+    LineItem,
+    ReconcilerService,
+    StatementInfo,
+)
+
+# (月份组 [(月份, [(出库单文件名, 比对状态)])], 未匹配出库单文件名)
+Outcome = tuple[list[tuple[str, list[tuple[str, str]]]], list[str]]
+
+
+class _PreparsedReconciler(ReconcilerService):
+    """跳过 LLM：按 ocr_text 返回预先构造的对账单解析结果"""
+
+    def __init__(self, parsed: dict[str, StatementInfo]) -> None:
+        self._parsed = parsed
+
+    async def parse_statement_async(
+        self,
+        ocr_text: str,
+        backend: str | None = None,
+        model: str | None = None,
+    ) -> StatementInfo:
+        return self._parsed[ocr_text]
+
+
+def _legacy_assign(
+    svc: ReconcilerService, statements: list[StatementInfo], deliveries: list[dict[str, Any]]
+) -> Outcome:
+    """改造前的明细 × 出库单逐一比较，作为基准对照（对账单均已签名且月份互不相同）"""
+    notes = [DeliveryNote(filename=d["filename"], date=d.get("date"), amount=d.get("amount")) for d in deliveries]
+    month_map = {svc._extract_month_key(st): st for st in statements}
+    used: set[int] = set()
+    groups: list[tuple[str, list[tuple[str, str]]]] = []
+    for month_key, statement in sorted(month_map.items()):
+        group: list[tuple[str, str]] = []
+        for li in statement.line_items:
+            for i, dn in enumerate(notes):
+                if i in used:
+                    continue
+                if svc._match_delivery(li, dn):
+                    group.append((dn.filename, STATUS_MATCHED))
+                    used.add(i)
+                    break
+        month_yyyymm = svc._month_key_to_yyyymm(month_key)
+        if month_yyyymm:
+            for i, dn in enumerate(notes):
+                if i not in used and dn.date and dn.date[:6] == month_yyyymm:
+                    group.append((dn.filename, STATUS_UNMATCHED))
+                    used.add(i)
+        groups.append((month_key, group))
+    return groups, [dn.filename for i, dn in enumerate(notes) if i not in used]
+
+
+class Command(BaseCommand):
+    help = "对比逐一比较与日期/金额索引两种对账单明细 × 出库单比对实现的耗时与结果"
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--deliveries", type=int, default=10000, help="合成出库单数（默认10000）")
+        parser.add_argument("--months", type=int, default=12, help="对账单月份数（默认12）")
+        parser.add_argument("--repeat", type=int, default=1, help="重复轮数，取中位数（默认1）")
+        parser.add_argument("--seed", type=int, default=20240601, help="随机种子")
+        parser.add_argument("--output-json", type=str, default="", help="将报告输出到 JSON 文件")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        delivery_count = int(options["deliveries"])
+        months = int(options["months"])
+        repeat = int(options["repeat"])
+        if delivery_count <= 0 or repeat <= 0 or not 1 <= months <= 12:
+            raise CommandError("--deliveries 与 --repeat 必须为正整数，--months 取 1~12")
+
+        statements, deliveries = self._synthetic_data(random.Random(int(options["seed"])), delivery_count, months)
+        svc = ReconcilerService()
+        line_count = sum(len(st.line_items) for st in statements)
+
+        legacy_outcome, legacy_seconds = self._measure(
+            lambda: _legacy_assign(svc, statements, deliveries), repeat=repeat
+        )
+        indexed_outcome, indexed_seconds = self._measure(lambda: self._indexed(statements, deliveries), repeat=repeat)
+        report = self._build_report(
+            deliveries=delivery_count,
+            line_items=line_count,
+            repeat=repeat,
+            legacy_seconds=legacy_seconds,
+            indexed_seconds=indexed_seconds,
+            identical=legacy_outcome == indexed_outcome,
+            matched=sum(status == STATUS_MATCHED for _, group in indexed_outcome[0] for _, status in group),
+        )
+
+        self.stdout.write(
+            f"出库单={delivery_count} 对账单明细={line_count} 月份={months} 轮数={repeat}\n"
+            f"逐一比较: {report['legacy_ms']:.2f} ms\n"
+            f"日期/金额索引: {report['indexed_ms']:.2f} ms\n"
+            f"加速比: {report['speedup']:.1f}x  匹配 {report['matched']} 条  结果一致: {report['identical']}"
+        )
+        output_json = str(options.get("output_json") or "").strip()
+        if output_json:
+            path = Path(output_json)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"已写入报告: {path}"))
+
+    @staticmethod
+    def _indexed(statements: list[StatementInfo], deliveries: list[dict[str, Any]]) -> Outcome:
+        svc = _PreparsedReconciler({f"st-{i}": st for i, st in enumerate(statements)})
+        result = asyncio.run(
+            svc.reconcile_async(
+                [{"ocr_text": f"st-{i}", "filename": st.filename} for i, st in enumerate(statements)],
+                deliveries,
+                [],
+                [],
+            )
+        )
+        groups = [(g.month, [(d.filename, d.match_status) for d in g.deliveries]) for g in result.month_groups]
+        return groups, [d.filename for d in result.unmatched_deliveries]
+
+    @staticmethod
+    def _measure(run: Callable[[], Outcome], *, repeat: int) -> tuple[Outcome, float]:
+        timings: list[float] = []
+        outcome: Outcome = ([], [])
+        for _ in range(repeat):
+            started = time.perf_counter()
+            outcome = run()
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return outcome, timings[len(timings) // 2]
+
+    @staticmethod
+    def _synthetic_data(
+        rng: random.Random, delivery_count: int, months: int
+    ) -> tuple[list[StatementInfo], list[dict[str, Any]]]:
+        """
+        模拟一年的供货纠纷：出库单分布在各月，少量缺日期或金额识别失败；
+        对账单明细取自大部分出库单（金额有 OCR 误差、偶尔缺日期），另有少量无对应出库单的明细
+        """
+        year = 2022
+        deliveries: list[dict[str, Any]] = []
+        items_by_month: dict[int, list[LineItem]] = {month: [] for month in range(1, months + 1)}
+        for i in range(delivery_count):
+            month = rng.randint(1, months)
+            date = f"{year}{month:02d}{rng.randint(1, 28):02d}"
+            amount = round(rng.uniform(100, 100000), 2)
+            roll = rng.random()
+            deliveries.append(
+                {
+                    "filename": f"出库单_{i:05d}.jpg",
+                    "date": None if roll < 0.05 else date,
+                    "amount": "识别失败" if 0.05 <= roll < 0.08 else f"{amount:.2f}",
+                }
+            )
+            if rng.random() < 0.85:
+                noisy = round(amount * (1 + rng.uniform(-0.008, 0.008)), 2)
+                items_by_month[month].append(LineItem(date=None if rng.random() < 0.05 else date, amount=noisy))
+        for month, items in items_by_month.items():
+            for _ in range(max(1, len(items) // 50)):
+                items.append(LineItem(date=f"{year}{month:02d}29", amount=round(rng.uniform(100, 100000), 2)))
+            rng.shuffle(items)
+        statements = [
+            StatementInfo(
+                month=f"{year}-{month:02d}", signed=True, line_items=items, filename=f"对账单_{month:02d}.jpg"
+            )
+            for month, items in items_by_month.items()
+        ]
+        return statements, deliveries
+
+    @staticmethod
+    def _build_report(
+        *,
+        deliveries: int,
+        line_items: int,
+        repeat: int,
+        legacy_seconds: float,
+        indexed_seconds: float,
+        identical: bool,
+        matched: int,
+    ) -> dict[str, Any]:
+        return {
+            "deliveries": deliveries,
+            "line_items": line_items,
+            "repeat": repeat,
+            "legacy_ms": legacy_seconds * 1000,
+            "indexed_ms": indexed_seconds * 1000,
+            "speedup": legacy_seconds / indexed_seconds if indexed_seconds > 0 else 0.0,
+            "identical": identical,
+            "matched": matched,
+        }
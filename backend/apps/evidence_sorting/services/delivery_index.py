@@ -0,0 +1,122 @@
+"""
+出库单索引
+
+对账单明细原先对每张出库单逐一调用 _match_delivery（明细数 × 出库单数）。
+按 _match_delivery 的规则，明细只可能匹配两类出库单：
+- 双方都有日期：日期相同即匹配（与金额无关）→ 按日期分桶；
+- 只有一方有日期：金额在容差内才匹配 → 按金额排序，二分查出容差区间。
+候选仍逐个用原判定函数校验，并取下标最小的未使用出库单，结果与逐一比较完全一致。
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .reconciler import DeliveryNote, LineItem
+
+# 二分区间相对容差的放宽比例（浮点舍入误差远小于此），区间内的候选再用原判定精确校验
+_RANGE_SLACK = 1e-9
+
+
+class _AmountIndex:
+    """按金额排序的出库单下标（金额无法解析或非有限值的不入索引，它们在金额比较中不可能命中有限金额）"""
+
+    def __init__(self, deliveries: list[DeliveryNote], indices: Iterable[int]) -> None:
+        self.indices: list[int] = list(indices)
+        pairs: list[tuple[float, int]] = []
+        for i in self.indices:
+            try:
+                value = float(deliveries[i].amount)  # type: ignore[arg-type]
+            except (ValueError, TypeError):
+                continue
+            if math.isfinite(value):
+                pairs.append((value, i))
+        pairs.sort()
+        self._amounts = [value for value, _ in pairs]
+        self._sorted = [i for _, i in pairs]
+
+    def candidates(self, amount: float) -> Iterable[int]:
+        """金额可能在容差内的出库单下标；非有限或非数值金额退化为全部下标"""
+        try:
+            finite = math.isfinite(amount)
+        except TypeError:
+            finite = False
+        if not finite:
+            return self.indices
+        tolerance = max(abs(amount) * 0.01, 1.0)
+        slack = tolerance * _RANGE_SLACK
+        lo = bisect_left(self._amounts, amount - tolerance - slack)
+        hi = bisect_right(self._amounts, amount + tolerance + slack)
+        return self._sorted[lo:hi]
+
+
+class DeliveryIndex:
+    """
+    出库单匹配索引（记录已使用的出库单）
+
+    Args:
+        deliveries: 出库单列表，下标即原顺序
+        match: 明细与出库单的判定函数，通常为 ReconcilerService._match_delivery
+    """
+
+    def __init__(self, deliveries: list[DeliveryNote], match: Callable[[LineItem, DeliveryNote], bool]) -> None:
+        self._deliveries = deliveries
+        self._match = match
+        self.used: set[int] = set()
+        self._by_date: dict[str, list[int]] = {}
+        self._by_month: dict[str, list[int]] = {}
+        self._cursor: dict[str, int] = {}
+        undated: list[int] = []
+        for i, dn in enumerate(deliveries):
+            if dn.date:
+                self._by_date.setdefault(dn.date, []).append(i)
+                self._by_month.setdefault(dn.date[:6], []).append(i)
+            else:
+                undated.append(i)
+        self._dated_amounts = _AmountIndex(deliveries, (i for i, dn in enumerate(deliveries) if dn.date))
+        self._undated_amounts = _AmountIndex(deliveries, undated)
+
+    def take(self, line_item: LineItem) -> int | None:
+        """找出与明细匹配、下标最小的未使用出库单并标记为已使用"""
+        best: int | None = None
+        if line_item.date:
+            best = self._first_same_date(line_item)
+            amount_index = self._undated_amounts
+        else:
+            amount_index = self._dated_amounts
+        if line_item.amount is not None:
+            for i in amount_index.candidates(line_item.amount):
+                if (best is None or i < best) and i not in self.used and self._match(line_item, self._deliveries[i]):
+                    best = i
+        if best is not None:
+            self.used.add(best)
+        return best
+
+    def take_month(self, yyyymm: str) -> list[int]:
+        """取出日期前 6 位为 yyyymm 的全部未使用出库单（按原顺序）并标记为已使用"""
+        taken = [i for i in self._by_month.get(yyyymm, ()) if i not in self.used]
+        self.used.update(taken)
+        return taken
+
+    def unused(self) -> list[int]:
+        return [i for i in range(len(self._deliveries)) if i not in self.used]
+
+    def _first_same_date(self, line_item: LineItem) -> int | None:
+        """同日期桶中第一张未使用的出库单；已使用的下标只增不减，游标只需前移"""
+        date = line_item.date or ""
+        bucket = self._by_date.get(date)
+        if not bucket:
+            return None
+        pos = self._cursor.get(date, 0)
+        while pos < len(bucket) and bucket[pos] in self.used:
+            pos += 1
+        self._cursor[date] = pos
+        for i in itertools.islice(bucket, pos, None):
+            if i not in self.used and self._match(line_item, self._deliveries[i]):
+                return i
+        return None
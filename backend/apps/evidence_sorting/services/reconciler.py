@@ -9,6 +9,8 @@ import re
 from dataclasses import dataclass, field
 from typing import Any
 
+from .delivery_index import DeliveryIndex
+
 logger = logging.getLogger("apps.evidence_sorting")
 
 # 比对状态
@@ -263,7 +265,7 @@ class ReconcilerService:
                 if not st.signed:
                     result.unsigned_statements.append(st)
 
-        used_deliveries: set[int] = set()
+        index = DeliveryIndex(delivery_notes, self._match_delivery)
 
         for month_key, statement in sorted(month_map.items()):
             group = MonthGroup(
@@ -276,30 +278,22 @@ class ReconcilerService:
             unmatched_in_statement: list[LineItem] = []
 
             for li in statement.line_items:
-                found = False
-                for i, dn in enumerate(delivery_notes):
-                    if i in used_deliveries:
-                        continue
-                    if self._match_delivery(li, dn):
-                        dn.match_status = STATUS_MATCHED
-                        group.deliveries.append(dn)
-                        used_deliveries.add(i)
-                        matched_count += 1
-                        found = True
-                        break
-                if not found:
+                i = index.take(li)
+                if i is None:
                     unmatched_in_statement.append(li)
+                    continue
+                dn = delivery_notes[i]
+                dn.match_status = STATUS_MATCHED
+                group.deliveries.append(dn)
+                matched_count += 1
 
             month_yyyymm = self._month_key_to_yyyymm(month_key)
             if month_yyyymm:
-                for i, dn in enumerate(delivery_notes):
-                    if i in used_deliveries:
-                        continue
-                    if dn.date and dn.date[:6] == month_yyyymm:
-                        dn.match_status = STATUS_UNMATCHED
-                        dn.remark = "这张单未出现在对账单中"
-                        group.deliveries.append(dn)
-                        used_deliveries.add(i)
+                for i in index.take_month(month_yyyymm):
+                    dn = delivery_notes[i]
+                    dn.match_status = STATUS_UNMATCHED
+                    dn.remark = "这张单未出现在对账单中"
+                    group.deliveries.append(dn)
 
             issues: list[str] = []
             if not statement.signed:
@@ -317,9 +311,8 @@ class ReconcilerService:
             group.folder_name = self._build_folder_name(month_key, statement, group, issues)
             result.month_groups.append(group)
 
-        for i, dn in enumerate(delivery_notes):
-            if i not in used_deliveries:
-                result.unmatched_deliveries.append(dn)
+        for i in index.unused():
+            result.unmatched_deliveries.append(delivery_notes[i])
 
         logger.info(
             "比对完成(并发): %d 个月份组, %d 张未匹配出库单",
@@ -125,24 +125,25 @@ async def detect_orientation(request: HttpRequest) -> dict[str, Any]:  # pragma:
     if not images:
         return {"success": False, "results": []}
     total_start = time.perf_counter()
+    from apps.image_rotation.services.orientation.service import OrientationDetectionService
+
+    service = OrientationDetectionService()
+    if method != "ocr_voting":
+        # ONNX 整批推理:一次调用完成全部图片,elapsed_ms 取批内平均
+        results = await sync_to_async(service.detect_batch)(images, with_text=False)
+        avg_ms = round((time.perf_counter() - total_start) * 1000 / len(images), 1)
+        for result in results:
+            result["elapsed_ms"] = avg_ms
+            result.setdefault("ocr_text", "")
+        total_elapsed_ms = round((time.perf_counter() - total_start) * 1000, 1)
+        return {"success": True, "results": results, "total_elapsed_ms": total_elapsed_ms}
 
     async def _process_image(img: dict[str, Any]) -> dict[str, Any]:
         async with _IMAGE_SEM:
             try:
                 image_bytes = _decode_image_data(img.get("data", ""))
                 t0 = time.perf_counter()
-                if method == "ocr_voting":
-                    from apps.image_rotation.services.orientation.service import OrientationDetectionService
-
-                    result = await sync_to_async(
-                        OrientationDetectionService().detect_orientation_with_text
-                    )(image_bytes)
-                else:
-                    from apps.image_rotation.services.orientation.onnx_service import get_onnx_orientation_service
-
-                    result = await sync_to_async(
-                        get_onnx_orientation_service().detect_orientation
-                    )(image_bytes)
+                result = (await sync_to_async(service.detect_batch_bytes)([image_bytes]))[0]
                 result["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 1)
                 result["filename"] = img.get("filename", "")
                 return result
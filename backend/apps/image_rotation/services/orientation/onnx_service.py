@@ -8,10 +8,17 @@
 推理流程: EXIF 转正 → ONNX 分类 → 返回旋转角度
 模型在 EXIF 转正后的像素上训练，推理时需保持一致。
 本地无模型时自动从 HuggingFace Hub 下载。
+
+批量检测（detect_orientation_batch）：线程池并行解码/预处理，按批堆叠为 [N, 3, 384, 384]，
+每批只调用一次 InferenceSession.run；下一批的预处理与当前批的推理重叠进行。
+模型导出为固定 batch=1 时自动退回逐张推理。
 """
 
 import io
 import logging
+import os
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -42,6 +49,12 @@ ORIENTATION_TO_ROTATION = {
     3: -270,
 }
 
+INPUT_SIZE = 384
+DEFAULT_BATCH_SIZE = 16
+
+_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape(3, 1, 1)
+_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape(3, 1, 1)
+
 
 class ONNXOrientationService:
     """基于微调 BEiT 的方向检测服务
@@ -56,6 +69,7 @@ class ONNXOrientationService:
     def __init__(self, model_path: str | None = None):
         self._session = None
         self._model_path = model_path or str(MODEL_PATH)
+        self._batch_unsupported = False
 
     @property
     def session(self) -> "ort.InferenceSession | None":  # type: ignore[name-defined]
@@ -114,33 +128,8 @@ class ONNXOrientationService:
         - 输入: float32 [1, 3, 384, 384]
         - 归一化: ImageNet 标准 (mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
         """
-        img = Image.open(io.BytesIO(image_data))
-
-        # EXIF 转正：与训练时 prepare_data.py 的 ImageOps.exif_transpose() 保持一致
-        img = ImageOps.exif_transpose(img) or img
-
-        # 转换为 RGB
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-
-        # 调整大小到 384x384（ConvNeXtV2 模型要求）
-        img = img.resize((384, 384), Image.Resampling.LANCZOS)
-
-        # 转换为 numpy 数组
-        img_array = np.array(img, dtype=np.float32)
-
-        # HWC -> CHW
-        img_array = img_array.transpose(2, 0, 1)
-
-        # ImageNet 归一化: (x/255 - mean) / std
-        mean = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape(3, 1, 1)
-        std = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape(3, 1, 1)
-        img_array = (img_array / 255.0 - mean) / std
-
         # 添加 batch 维度
-        img_array = np.expand_dims(img_array, axis=0)
-
-        return img_array
+        return np.expand_dims(_preprocess_chw(image_data), axis=0)
 
     def detect_orientation(self, image_data: bytes) -> dict[str, Any]:
         """检测图片方向
@@ -166,41 +155,13 @@ class ONNXOrientationService:
             input_data = self.preprocess_image(image_data)
 
             # 运行推理（BEiT 模型输入名为 "pixel_values"）
-            inputs = {"pixel_values": input_data}
-            outputs = self.session.run(None, inputs)
-
-            # 解析输出
-            logits = outputs[0]
-
-            # Softmax
-            exp_logits = np.exp(logits - np.max(logits, axis=1, keepdims=True))
-            probabilities = exp_logits / np.sum(exp_logits, axis=1, keepdims=True)
-
-            # 获取预测结果
-            predicted_class = int(np.argmax(probabilities, axis=1)[0])
-            confidence = float(probabilities[0][predicted_class])
-
-            # ONNX 预测的旋转角度（EXIF 转正后像素上的预测，直接作为旋转角度）
-            rotation = ORIENTATION_TO_ROTATION[predicted_class]
-            label = ORIENTATION_LABELS[predicted_class]
+            probabilities = self._predict(input_data)
+            result = self._build_result(probabilities[0])
 
             logger.info(
-                f"ONNX 方向检测: {label}, 置信度: {confidence:.4f}, rotation={rotation}°",
+                f"ONNX 方向检测: {result['label']}, 置信度: {result['confidence']:.4f}, rotation={result['rotation']}°",
             )
-
-            # 判断是否可以自动旋转
-            high_confidence = confidence >= self.AUTO_ROTATE_THRESHOLD
-
-            can_auto_rotate = high_confidence and rotation != 0
-
-            return {
-                "rotation": rotation,
-                "confidence": round(confidence, 4),
-                "method": "onnx_classifier",
-                "label": label,
-                "can_auto_rotate": can_auto_rotate,
-                "probabilities": {ORIENTATION_LABELS[i]: round(float(probabilities[0][i]), 4) for i in range(4)},
-            }
+            return result
 
         except Exception as e:
             logger.error(f"ONNX 方向检测失败: {e}")
@@ -217,6 +178,147 @@ class ONNXOrientationService:
             image_data = f.read()
         return self.detect_orientation(image_data)
 
+    def detect_orientation_batch(
+        self,
+        images: Sequence[bytes],
+        *,
+        batch_size: int | None = None,
+        workers: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """批量检测图片方向，结果顺序与输入一致，单张失败不影响其他图片
+
+        Args:
+            images: 图片字节数据列表
+            batch_size: 每次推理的张数，默认读取 settings.IMAGE_ROTATION_ONNX_BATCH_SIZE
+            workers: 预处理线程数，默认读取 settings.IMAGE_ROTATION_PREPROCESS_WORKERS
+        """
+        if not images:
+            return []
+        if not self.session:
+            return [
+                {"rotation": 0, "confidence": 0, "method": "onnx_unavailable", "error": "ONNX 模型未加载"}
+                for _ in images
+            ]
+
+        size = max(1, batch_size or configured_batch_size())
+        chunks = [range(start, min(start + size, len(images))) for start in range(0, len(images), size)]
+        results: list[dict[str, Any]] = [{} for _ in images]
+
+        with ThreadPoolExecutor(max_workers=max(1, workers or configured_preprocess_workers())) as executor:
+
+            def submit(chunk: range) -> list[Future[np.ndarray]]:
+                return [executor.submit(_preprocess_chw, images[i]) for i in chunk]
+
+            pending = submit(chunks[0])
+            for index, chunk in enumerate(chunks):
+                futures = pending
+                # 提前提交下一批的预处理，与本批推理重叠
+                if index + 1 < len(chunks):
+                    pending = submit(chunks[index + 1])
+                self._run_chunk(chunk, futures, results)
+
+        logger.info(f"ONNX 批量方向检测完成: {len(images)} 张, batch_size={size}")
+        return results
+
+    def _run_chunk(self, chunk: range, futures: list[Future[np.ndarray]], results: list[dict[str, Any]]) -> None:
+        tensors: list[np.ndarray] = []
+        positions: list[int] = []
+        for position, future in zip(chunk, futures, strict=True):
+            try:
+                tensors.append(future.result())
+                positions.append(position)
+            except Exception as e:
+                logger.warning(f"ONNX 批量方向检测预处理失败: {e}")
+                results[position] = _error_result(e)
+        if not tensors:
+            return
+
+        try:
+            probabilities = self._predict_stacked(np.stack(tensors))
+        except Exception as e:
+            logger.error(f"ONNX 方向检测失败: {e}")
+            for position in positions:
+                results[position] = _error_result(e)
+            return
+
+        for position, row in zip(positions, probabilities, strict=True):
+            results[position] = self._build_result(row)
+
+    def _predict_stacked(self, batch: np.ndarray) -> np.ndarray:
+        """对 [N, 3, H, W] 推理；模型不支持动态 batch 时逐张推理"""
+        if len(batch) == 1 or not self._batch_unsupported:
+            try:
+                return self._predict(batch)
+            except Exception:
+                if len(batch) == 1:
+                    raise
+                logger.info("ONNX 模型不支持批量输入，退回逐张推理")
+                self._batch_unsupported = True
+        return np.concatenate([self._predict(batch[i : i + 1]) for i in range(len(batch))])
+
+    def _predict(self, input_data: np.ndarray) -> np.ndarray:
+        """运行推理并返回 softmax 概率 [N, 4]"""
+        outputs = self.session.run(None, {"pixel_values": input_data})  # type: ignore[union-attr]
+        logits = np.asarray(outputs[0], dtype=np.float32)
+        if logits.ndim != 2 or logits.shape[0] != len(input_data):
+            raise ValueError(f"模型输出形状异常: {logits.shape}")
+        exp_logits = np.exp(logits - np.max(logits, axis=1, keepdims=True))
+        return exp_logits / np.sum(exp_logits, axis=1, keepdims=True)
+
+    def _build_result(self, probabilities: np.ndarray) -> dict[str, Any]:
+        predicted_class = int(np.argmax(probabilities))
+        confidence = float(probabilities[predicted_class])
+
+        # ONNX 预测的旋转角度（EXIF 转正后像素上的预测，直接作为旋转角度）
+        rotation = ORIENTATION_TO_ROTATION[predicted_class]
+
+        # 判断是否可以自动旋转
+        high_confidence = confidence >= self.AUTO_ROTATE_THRESHOLD
+
+        return {
+            "rotation": rotation,
+            "confidence": round(confidence, 4),
+            "method": "onnx_classifier",
+            "label": ORIENTATION_LABELS[predicted_class],
+            "can_auto_rotate": high_confidence and rotation != 0,
+            "probabilities": {ORIENTATION_LABELS[i]: round(float(probabilities[i]), 4) for i in range(4)},
+        }
+
+
+def _preprocess_chw(image_data: bytes) -> np.ndarray:
+    """解码并预处理单张图片为 float32 [3, 384, 384]（PIL 解码/缩放期间释放 GIL，可在线程池中并行）"""
+    img = Image.open(io.BytesIO(image_data))
+
+    # EXIF 转正：与训练时 prepare_data.py 的 ImageOps.exif_transpose() 保持一致
+    img = ImageOps.exif_transpose(img) or img
+
+    # 转换为 RGB
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    # 调整大小到 384x384（ConvNeXtV2 模型要求）
+    img = img.resize((INPUT_SIZE, INPUT_SIZE), Image.Resampling.LANCZOS)
+
+    # HWC -> CHW，ImageNet 归一化: (x/255 - mean) / std
+    img_array = np.array(img, dtype=np.float32).transpose(2, 0, 1)
+    return (img_array / 255.0 - _MEAN) / _STD
+
+
+def _error_result(error: Exception) -> dict[str, Any]:
+    return {"rotation": 0, "confidence": 0, "method": "onnx_error", "error": str(error)}
+
+
+def configured_batch_size() -> int:
+    from django.conf import settings
+
+    return int(getattr(settings, "IMAGE_ROTATION_ONNX_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+
+
+def configured_preprocess_workers() -> int:
+    from django.conf import settings
+
+    return int(getattr(settings, "IMAGE_ROTATION_PREPROCESS_WORKERS", min(4, os.cpu_count() or 1)))
+
 
 # 全局单例
 _onnx_service: ONNXOrientationService | None = None
@@ -5,12 +5,28 @@ import io
 import logging
 from typing import Any
 
-from PIL import Image
+from PIL import Image, ImageOps
 
 from apps.core.protocols import IOcrService
 
+from .onnx_service import ONNXOrientationService, get_onnx_orientation_service
+
 logger = logging.getLogger("apps.image_rotation")
 
+# OCR 投票的逆时针角度 → ONNX 约定(与 ORIENTATION_TO_ROTATION 取值一致)
+_OCR_TO_ONNX_ROTATION = {0: 0, 90: -90, 180: 180, 270: -270}
+
+
+def _exif_upright(image_bytes: bytes) -> bytes:
+    """按 EXIF 方向转正像素,使 OCR 投票与 ONNX 基于同一坐标系;无 EXIF 旋转时原样返回"""
+    img = Image.open(io.BytesIO(image_bytes))
+    if img.getexif().get(0x0112, 1) == 1:
+        return image_bytes
+    transposed = ImageOps.exif_transpose(img)
+    buf = io.BytesIO()
+    transposed.save(buf, format="PNG")
+    return buf.getvalue()
+
 
 class OrientationDetectionService:
     """
@@ -19,10 +35,21 @@ class OrientationDetectionService:
     使用四方向 OCR 投票法检测图片方向:
     对图片分别做 0°/90°/180°/270° 旋转,用 OCR 识别,
     哪个方向识别出的文字置信度最高就是正确方向.
+
+    批量检测(detect_batch)先用 ONNX 分类器整批推理,只有低置信度的图片才走 OCR 投票.
     """
 
-    def __init__(self, ocr_service: IOcrService | None = None) -> None:
+    def __init__(
+        self, ocr_service: IOcrService | None = None, onnx_service: ONNXOrientationService | None = None
+    ) -> None:
         self._ocr_service = ocr_service
+        self._onnx_service = onnx_service
+
+    @property
+    def onnx_service(self) -> ONNXOrientationService:
+        if self._onnx_service is None:
+            self._onnx_service = get_onnx_orientation_service()
+        return self._onnx_service
 
     @property
     def ocr_service(self) -> IOcrService | None:
@@ -185,27 +212,93 @@ class OrientationDetectionService:
                 "ocr_text": "",
             }
 
-    def detect_batch(self, images: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        results: list[Any] = []
-        for img_item in images:
+    def detect_batch(self, images: list[dict[str, Any]], *, with_text: bool = True) -> list[dict[str, Any]]:
+        """批量检测 base64 图片(可带 data URL 前缀),结果带回 filename,见 detect_batch_bytes"""
+        results: list[dict[str, Any]] = [{} for _ in images]
+        decoded: dict[int, bytes] = {}
+        for index, img_item in enumerate(images):
             try:
                 data = img_item.get("data", "")
                 if "," in data:
                     data = data.split(",", 1)[1]
-                image_bytes = base64.b64decode(data)
+                decoded[index] = base64.b64decode(data)
+            except Exception as e:
+                logger.exception("操作失败")
+                results[index] = self._batch_error(img_item, e)
 
-                result = self.detect_orientation_with_text(image_bytes)
-                result["filename"] = img_item.get("filename", "")
-                results.append(result)
+        detected = self.detect_batch_bytes(list(decoded.values()), with_text=with_text)
+        for index, result in zip(decoded, detected, strict=True):
+            result["filename"] = images[index].get("filename", "")
+            results[index] = result
+        return results
+
+    def detect_batch_bytes(self, images: list[bytes], *, with_text: bool = True) -> list[dict[str, Any]]:
+        """
+        批量检测图片方向,结果顺序与输入一致
+
+        先用 ONNX 分类器整批推理;with_text=True 时低置信度(或 ONNX 不可用)的图片改走四方向 OCR 投票,
+        高置信度图片按 ONNX 结果转正后做一次 OCR 填充 ocr_text.
+        rotation 统一使用 ONNX 约定:基于 EXIF 转正后的像素,顺时针旋转 rotation 度(rotate(-rotation))即为正向.
+        """
+        results: list[dict[str, Any]] = []
+        for image_bytes, onnx_result in zip(images, self._detect_batch_onnx(images), strict=True):
+            try:
+                if not with_text:
+                    result = onnx_result
+                elif self._is_confident(onnx_result):
+                    result = {**onnx_result, "ocr_text": self._upright_text(image_bytes, onnx_result["rotation"])}
+                else:
+                    # 仅对 ONNX 低置信度(或不可用)的图片做四方向 OCR 投票
+                    result = self._normalize_ocr_voting(self.detect_orientation_with_text(_exif_upright(image_bytes)))
             except Exception as e:
                 logger.exception("操作失败")
-                results.append(
-                    {
-                        "filename": img_item.get("filename", ""),
-                        "rotation": 0,
-                        "confidence": 0,
-                        "error": str(e),
-                        "ocr_text": "",
-                    }
-                )
+                result = self._batch_error({}, e)
+                result.pop("filename")
+            results.append(result)
         return results
+
+    def _detect_batch_onnx(self, images: list[bytes]) -> list[dict[str, Any]]:
+        if not images:
+            return []
+        try:
+            return self.onnx_service.detect_orientation_batch(images)
+        except Exception as e:
+            logger.warning(f"ONNX 批量方向检测失败,退回 OCR 投票: {e}")
+            return [{"rotation": 0, "confidence": 0, "method": "onnx_error", "error": str(e)} for _ in images]
+
+    def _is_confident(self, onnx_result: dict[str, Any]) -> bool:
+        return (
+            onnx_result.get("method") == "onnx_classifier"
+            and float(onnx_result.get("confidence", 0)) >= ONNXOrientationService.AUTO_ROTATE_THRESHOLD
+        )
+
+    def _upright_text(self, image_bytes: bytes, rotation: int) -> str:
+        """按 ONNX 结果转正后 OCR 一次,取代四方向投票"""
+        ocr_service = self.ocr_service
+        if not ocr_service:
+            return ""
+        img = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes)))
+        if rotation % 360:
+            img = img.rotate(-rotation, expand=True)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=85)
+        result = ocr_service.recognize_raw(buf.getvalue())
+        return "\n".join(result.txts) if result and result.txts else ""
+
+    def _normalize_ocr_voting(self, result: dict[str, Any]) -> dict[str, Any]:
+        """OCR 投票的 rotation 是逆时针角度(rotate(rotation)),换算为 ONNX 约定的顺时针角度"""
+        rotation = int(result.get("rotation", 0)) % 360
+        normalized = {**result, "rotation": _OCR_TO_ONNX_ROTATION[rotation]}
+        normalized.setdefault("can_auto_rotate", result.get("method") == "ocr_voting" and rotation != 0)
+        return normalized
+
+    def _batch_error(self, img_item: dict[str, Any], error: Exception) -> dict[str, Any]:
+        return {
+            "filename": img_item.get("filename", ""),
+            "rotation": 0,
+            "confidence": 0,
+            "error": str(error),
+            "ocr_text": "",
+        }
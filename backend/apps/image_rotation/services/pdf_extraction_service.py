@@ -78,15 +78,29 @@ class PDFExtractionService:
     def _extract_all_pages_with_detection(
         self, pdf_document: Any, filename: str, page_count: int
     ) -> list[dict[str, Any]]:
-        """提取所有页面(包含方向检测)"""
-        pages: list[Any] = []
+        """提取所有页面(包含方向检测):先渲染全部页面,再整批做方向检测"""
+        rendered: list[tuple[int, bytes, int, int]] = []
         for page_num in range(page_count):
             try:
                 page = pdf_document[page_num]
-                page_result = self._extract_single_page(page, page_num + 1, filename)
-                pages.append(page_result)
+                rendered.append((page_num + 1, *self._render_page(page)))
             except Exception as e:
                 logger.warning(f"页面提取失败: 第 {page_num + 1} 页", extra={"pdf_filename": filename, "error": str(e)})
+
+        orientations = self._detect_pages_orientation([image_bytes for _, image_bytes, _, _ in rendered])
+        pages: list[Any] = []
+        for (page_number, image_bytes, width, height), orientation_result in zip(rendered, orientations, strict=True):
+            # 直接使用检测结果(置信度过低时 ONNX 分类器已返回 can_auto_rotate=False)
+            pages.append(
+                {
+                    "page_number": page_number,
+                    "data": f"data:image/png;base64,{base64.b64encode(image_bytes).decode('utf-8')}",
+                    "rotation": orientation_result.get("rotation", 0),
+                    "confidence": orientation_result.get("confidence", 0),
+                    "width": width,
+                    "height": height,
+                }
+            )
         return pages
 
     def _open_pdf_document(self, pdf_data: str, filename: str) -> Any:  # pragma: no cover
@@ -182,7 +196,7 @@ class PDFExtractionService:
 
         Returns:
             {
-                "rotation": 0/90/180/270,
+                "rotation": 0/-90/180/-270,
                 "confidence": float,
                 "method": str
             }
@@ -201,45 +215,13 @@ class PDFExtractionService:
                 "error": str(e),
             }
 
-    def _extract_single_page(self, page: Any, page_number: int, filename: str) -> dict[str, Any]:
-        """
-        提取单个 PDF 页面为图片并检测方向
-
-        Args:
-            page: PyMuPDF 页面对象
-            page_number: 页码(从 1 开始)
-            filename: 原始 PDF 文件名
-
-        Returns:
-            页面数据字典
-        """
-        # 提取页面为 PNG 图片
+    def _render_page(self, page: Any) -> tuple[bytes, int, int]:
+        """渲染单个 PDF 页面为 PNG,返回 (图片字节, 像素宽, 像素高)"""
         image_bytes = self._extract_page_image(page, self.DPI)
-
-        # 获取页面尺寸
         rect = page.rect
         width = int(rect.width * self.DPI / 72)  # 转换为像素
         height = int(rect.height * self.DPI / 72)
-
-        # 检测页面方向 (Requirements 2.1, 2.2, 2.3)
-        # 得分阈值判断已在 OrientationDetectionService 中处理
-        orientation_result = self._detect_page_orientation(image_bytes)
-
-        # 直接使用检测结果(得分过低时 OrientationDetectionService 已返回 rotation=0)
-        rotation = orientation_result.get("rotation", 0)
-        confidence = orientation_result.get("confidence", 0)
-
-        # 编码为 Base64
-        image_base64 = base64.b64encode(image_bytes).decode("utf-8")
-
-        return {
-            "page_number": page_number,
-            "data": f"data:image/png;base64,{image_base64}",
-            "rotation": rotation,
-            "confidence": confidence,
-            "width": width,
-            "height": height,
-        }
+        return image_bytes, width, height
 
     def _extract_page_image(self, page: Any, dpi: int = 150) -> Any:  # pragma: no cover
         """
@@ -268,24 +250,30 @@ class PDFExtractionService:
 
     def _detect_page_orientation(self, image_data: bytes) -> dict[str, Any]:
         """
-        检测页面方向（使用 ONNX 方向分类器）
+        检测单个页面方向(走批量接口,单元素批次)
 
         Args:
             image_data: PNG 图片字节数据
 
         Returns:
-            {"rotation": 0/90/180/270, "confidence": float, "method": str}
+            {"rotation": 0/-90/180/-270, "confidence": float, "method": str}
         """
-        try:
-            from apps.image_rotation.services.orientation.onnx_service import get_onnx_orientation_service
+        return self._detect_pages_orientation([image_data])[0]
 
-            svc = get_onnx_orientation_service()
-            return svc.detect_orientation(image_data)
+    def _detect_pages_orientation(self, images: list[bytes]) -> list[dict[str, Any]]:
+        """整批检测页面方向(ONNX 分类器一次推理),失败时全部使用默认方向"""
+        if not images:
+            return []
+        try:
+            return self.orientation_service.detect_batch_bytes(images, with_text=False)
         except Exception as e:
             logger.warning(f"页面方向检测失败,使用默认方向: {e}", extra={})
-            return {
-                "rotation": 0,
-                "confidence": 0,
-                "method": "default",
-                "error": str(e),
-            }
+            return [
+                {
+                    "rotation": 0,
+                    "confidence": 0,
+                    "method": "default",
+                    "error": str(e),
+                }
+                for _ in images
+            ]
@@ -71,16 +71,7 @@ class InvoiceRecognitionService:
         if text is not None:
             return text
 
-        image_paths, img_tmp_dir = self._pdf_extractor.pdf_to_images(file_path)
-        try:
-            parts: list[str] = []
-            for img_path in image_paths:
-                parts.append(self._ocr.recognize(str(img_path)))
-            return "\n".join(parts)
-        finally:
-            import shutil
-
-            shutil.rmtree(img_tmp_dir, ignore_errors=True)
+        return self._pdf_extractor.ocr_pages(file_path, self._ocr)
 
     def _process_image(self, file_path: Path) -> str:
         return self._ocr.recognize(str(file_path))
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import shutil
 from pathlib import Path
 
 from asgiref.sync import sync_to_async
@@ -138,15 +137,7 @@ class QuickRecognitionService:
             if text is not None:
                 return text
 
-            image_paths, img_tmp_dir = self._pdf_extractor.pdf_to_images(tmp_path)
-            try:
-                parts: list[str] = []
-                for img_path in image_paths:
-                    parts.append(self._ocr.recognize(str(img_path)))
-                return "\n".join(parts)
-            finally:
-                shutil.rmtree(img_tmp_dir, ignore_errors=True)
-
+            return self._pdf_extractor.ocr_pages(tmp_path, self._ocr)
         finally:
             tmp_path.unlink(missing_ok=True)
 
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.legal_research.services.similarity import ngram_vectors
+from apps.legal_research.services.similarity.scorers import char_ngrams
+
+_VOCABULARY = (
+    "原告",
+    "被告",
+    "买卖合同",
+    "借款合同",
+    "民间借贷",
+    "违约金",
+    "逾期付款",
+    "利息",
+    "本金",
+    "担保",
+    "连带责任",
+    "保证期间",
+    "诉讼时效",
+    "商品房",
+    "交房",
+    "定金",
+    "解除合同",
+    "损失赔偿",
+    "工程款",
+    "实际施工人",
+    "劳动合同",
+    "经济补偿",
+    "工伤",
+    "股权转让",
+    "公司决议",
+    "本院认为",
+    "经审理查明",
+    "判决如下",
+    "驳回",
+    "上诉",
+    "证据",
+    "举证责任",
+    "调减",
+    "过高",
+    "显失公平",
+    "欺诈",
+    "撤销",
+)
+
+
+def _counter_cosine(text_a: str, text_b: str) -> float:
+    """改造前的 Counter 实现，作为基准对照。"""
+    grams_a = char_ngrams(text_a)
+    grams_b = char_ngrams(text_b)
+    if not grams_a or not grams_b:
+        return 0.0
+    dot = sum(grams_a[g] * grams_b[g] for g in set(grams_a).intersection(grams_b))
+    norm_a = math.sqrt(sum(v * v for v in grams_a.values()))
+    norm_b = math.sqrt(sum(v * v for v in grams_b.values()))
+    if norm_a <= 0 or norm_b <= 0:
+        return 0.0
+    return max(0.0, min(1.0, dot / (norm_a * norm_b)))
+
+
+class Command(BaseCommand):
+    help = "对比 Counter 与特征哈希稀疏矩阵两种 n-gram 余弦相似度实现的耗时与分数偏差"
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--candidates", type=int, default=500, help="每轮候选文本数（默认500）")
+        parser.add_argument("--doc-chars", type=int, default=1200, help="候选文本近似长度（默认1200字）")
+        parser.add_argument("--query-chars", type=int, default=200, help="查询文本近似长度（默认200字）")
+        parser.add_argument("--repeat", type=int, default=5, help="重复轮数，取中位数（默认5）")
+        parser.add_argument("--seed", type=int, default=20240601, help="随机种子")
+        parser.add_argument("--output-json", type=str, default="", help="将报告输出到 JSON 文件")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        candidates = int(options["candidates"])
+        repeat = int(options["repeat"])
+        if candidates <= 0 or repeat <= 0:
+            raise CommandError("--candidates 与 --repeat 必须为正整数")
+
+        rng = random.Random(int(options["seed"]))
+        query_text = self._random_text(rng, int(options["query_chars"]))
+        texts = [self._random_text(rng, int(options["doc_chars"])) for _ in range(candidates)]
+
+        baseline_scores, baseline_seconds = self._measure(
+            lambda: [_counter_cosine(query_text, text) for text in texts], repeat=repeat
+        )
+        vectorized_scores, vectorized_seconds = self._measure(
+            lambda: self._vectorized(query_text, texts), repeat=repeat
+        )
+        max_abs_diff = max(
+            (abs(a - b) for a, b in zip(baseline_scores, vectorized_scores, strict=True)),
+            default=0.0,
+        )
+        report = self._build_report(
+            candidates=candidates,
+            repeat=repeat,
+            baseline_seconds=baseline_seconds,
+            vectorized_seconds=vectorized_seconds,
+            max_abs_diff=max_abs_diff,
+        )
+
+        self.stdout.write(
+            f"候选数={candidates} 轮数={repeat}\n"
+            f"Counter 实现: {report['baseline_ms']:.2f} ms ({report['baseline_pairs_per_sec']:.0f} 对/秒)\n"
+            f"稀疏矩阵实现: {report['vectorized_ms']:.2f} ms ({report['vectorized_pairs_per_sec']:.0f} 对/秒)\n"
+            f"加速比: {report['speedup']:.2f}x  最大分数偏差: {report['max_abs_diff']:.6f}"
+        )
+        output_json = str(options.get("output_json") or "").strip()
+        if output_json:
+            path = Path(output_json)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"已写入报告: {path}"))
+
+    @staticmethod
+    def _vectorized(query_text: str, texts: list[str]) -> list[float]:
+        # 每轮清空查询缓存，计入查询向量化的一次性开销
+        ngram_vectors.query_vector.cache_clear()
+        return ngram_vectors.cosine_similarity_batch(query_text, texts)
+
+    @staticmethod
+    def _measure(run: Callable[[], list[float]], *, repeat: int) -> tuple[list[float], float]:
+        timings: list[float] = []
+        scores: list[float] = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            scores = run()
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return scores, timings[len(timings) // 2]
+
+    @staticmethod
+    def _random_text(rng: random.Random, approx_chars: int) -> str:
+        parts: list[str] = []
+        length = 0
+        while length < max(2, approx_chars):
+            word = rng.choice(_VOCABULARY)
+            parts.append(word)
+            length += len(word)
+            if rng.random() < 0.12:
+                parts.append("。")
+                length += 1
+        return "".join(parts)
+
+    @staticmethod
+    def _build_report(
+        *,
+        candidates: int,
+        repeat: int,
+        baseline_seconds: float,
+        vectorized_seconds: float,
+        max_abs_diff: float,
+    ) -> dict[str, Any]:
+        def _rate(seconds: float) -> float:
+            return candidates / seconds if seconds > 0 else 0.0
+
+        return {
+            "candidates": candidates,
+            "repeat": repeat,
+            "baseline_ms": baseline_seconds * 1000,
+            "vectorized_ms": vectorized_seconds * 1000,
+            "baseline_pairs_per_sec": _rate(baseline_seconds),
+            "vectorized_pairs_per_sec": _rate(vectorized_seconds),
+            "speedup": baseline_seconds / vectorized_seconds if vectorized_seconds > 0 else 0.0,
+            "max_abs_diff": max_abs_diff,
+        }
@@ -1,12 +1,28 @@
-"""缓存管理：案例详情两级缓存（内存 + Django cache）。"""
+"""缓存管理：案例详情两级缓存（内存 + Django cache）与本地语料索引。"""
 
 from __future__ import annotations
 
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
 from typing import Any
 
+from apps.legal_research.services.similarity.corpus_index import CaseCorpusIndex, get_case_corpus_index
 from apps.legal_research.services.sources import CaseDetail
 
+logger = logging.getLogger(__name__)
+
+# 语料索引写入是 SQLite 单写者，放到单线程后台执行，避免阻塞详情下载/粗召回主循环
+_CORPUS_INDEX_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="legal-research-corpus")
+
+
+def _add_corpus_documents(index: CaseCorpusIndex, source: str, details: list[CaseDetail]) -> None:
+    try:
+        index.add_documents(source=source, details=details)
+    except (sqlite3.Error, OSError):
+        logger.warning("案例写入语料索引失败", exc_info=True)
+
 
 class ExecutorCacheMixin:
     DETAIL_CACHE_TTL_SECONDS = 21600
@@ -61,6 +77,46 @@ class ExecutorCacheMixin:
             cls._save_case_detail_cache(cache_key=cache_key, detail=detail, ttl_seconds=ttl_seconds)
         return detail  # type: ignore[no-any-return]
 
+    @classmethod
+    def _index_case_details(cls, *, source: str, details: list[CaseDetail], tuning: Any) -> None:
+        """将一批下载到的案例详情提交后台，单事务增量写入本地语料索引（词项统计 + 倒排表）。"""
+        if not details or not bool(getattr(tuning, "corpus_index_enabled", True)):
+            return
+        _CORPUS_INDEX_EXECUTOR.submit(_add_corpus_documents, get_case_corpus_index(), source, list(details))
+
+    @classmethod
+    def _corpus_prerank_items(
+        cls, *, task: Any, query_text: str, tuning: Any, similarity: Any | None = None
+    ) -> list[Any]:
+        """远程检索前对本地语料做 BM25 + 语义向量预排序，返回可直接作为候选的条目。"""
+        if not bool(getattr(tuning, "corpus_index_enabled", True)):
+            return []
+        # 本地语料不携带法院/案由/日期等元数据，存在筛选条件时不参与预排序
+        for attr in ("search_url", "advanced_query", "court_filter", "cause_of_action_filter", "date_from", "date_to"):
+            if getattr(task, attr, None):
+                return []
+        bm25_top_k = max(0, int(getattr(tuning, "corpus_prerank_top_k", 0) or 0))
+        semantic_top_k = max(0, int(getattr(tuning, "semantic_prerank_top_k", 0) or 0))
+        hits: list[Any] = []
+        try:
+            index = get_case_corpus_index()
+            if bm25_top_k > 0:
+                hits.extend(index.search(source=task.source, query_text=query_text, top_k=bm25_top_k))
+            semantic_prerank = getattr(similarity, "semantic_prerank", None)
+            if semantic_top_k > 0 and callable(semantic_prerank):
+                scored = semantic_prerank(query_text=query_text, source=task.source, top_k=semantic_top_k)
+                hits.extend(index.hits_for(source=task.source, scored_doc_ids=list(scored or [])))
+        except (sqlite3.Error, OSError):
+            logger.warning("本地语料预排序失败", exc_info=True)
+        seen: set[str] = set()
+        out: list[Any] = []
+        for hit in hits:
+            if hit.doc_id_unquoted in seen:
+                continue
+            seen.add(hit.doc_id_unquoted)
+            out.append(hit)
+        return out
+
     @classmethod
     def _build_case_detail_cache_key(cls, *, source: str, doc_id: str) -> str:
         source_name = str(source or "").strip().lower()
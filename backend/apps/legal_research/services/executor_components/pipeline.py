@@ -0,0 +1,153 @@
+"""候选处理流水线：详情并发预取 + LLM 评分阶段与抓取重叠。"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from types import TracebackType
+from typing import Any
+
+from django.db import close_old_connections
+
+from apps.legal_research.services.sources import CaseDetail
+
+logger = logging.getLogger(__name__)
+
+ScoredCandidate = tuple[Any, Any, float, str]
+
+
+def _run_in_worker(operation: Callable[[], Any]) -> Any:
+    """工作线程内执行，结束后释放线程持有的数据库连接（DB cache 后端等）。"""
+    try:
+        return operation()
+    finally:
+        close_old_connections()
+
+
+class DetailPrefetcher:
+    """
+    按输入顺序产出候选详情，后台以有限并发提前抓取后续详情。
+
+    concurrency <= 1 时在调用线程内串行抓取（Playwright 会话不可跨线程使用）。
+    在途请求数不超过 concurrency * PREFETCH_WINDOW_FACTOR，避免一次性压垮数据源。
+    """
+
+    PREFETCH_WINDOW_FACTOR = 2
+
+    def __init__(self, *, fetch: Callable[[Any], CaseDetail | None], concurrency: int) -> None:
+        self._fetch = fetch
+        self._concurrency = max(1, int(concurrency))
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    def iter_details(self, items: Iterable[Any]) -> Generator[tuple[Any, CaseDetail | None], None, None]:
+        for batch in self.iter_detail_batches(items, max_batch_size=1):
+            yield from batch
+
+    def iter_detail_batches(
+        self, items: Iterable[Any], *, max_batch_size: int
+    ) -> Generator[list[tuple[Any, CaseDetail | None]], None, None]:
+        """
+        按输入顺序成批产出详情：阻塞等待下一条，再带上窗口中紧随其后且已抓取完成的详情。
+
+        批次只收集已就绪的结果，不为凑满批次额外等待；串行模式下每批一条。
+        """
+        limit = max(1, int(max_batch_size))
+        if self._concurrency <= 1:
+            for item in items:
+                yield [(item, self._fetch(item))]
+            return
+
+        pool = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="legal-research-detail")
+        window: deque[tuple[Any, Future[CaseDetail | None]]] = deque()
+        pending = iter(items)
+        window_size = self._concurrency * self.PREFETCH_WINDOW_FACTOR
+        try:
+            for item in pending:
+                window.append((item, pool.submit(_run_in_worker, partial(self._fetch, item))))
+                if len(window) >= window_size:
+                    break
+            while window:
+                batch: list[tuple[Any, CaseDetail | None]] = []
+                while window and len(batch) < limit and (not batch or window[0][1].done()):
+                    item, future = window.popleft()
+                    next_item = next(pending, None)
+                    if next_item is not None:
+                        window.append((next_item, pool.submit(_run_in_worker, partial(self._fetch, next_item))))
+                    batch.append((item, self._result(future)))
+                yield batch
+        finally:
+            # 消费方提前退出（取消/达到目标）时丢弃尚未开始的抓取
+            for _, future in window:
+                future.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _result(future: Future[CaseDetail | None]) -> CaseDetail | None:
+        try:
+            return future.result()
+        except Exception:
+            logger.exception("案例详情预取异常")
+            return None
+
+
+class CandidateScoringStage:
+    """
+    LLM 评分阶段：候选在宽召回后立即提交，与后续详情抓取、粗筛并行执行。
+
+    drain() 按提交顺序返回评分成功的候选，调用方负责重排与排序。
+    作为上下文管理器使用，退出时（含异常）释放线程池。
+    """
+
+    def __init__(self, *, score_one: Callable[[Any], Any | None], concurrency: int, task_id: str) -> None:
+        self._score_one = score_one
+        self._task_id = task_id
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(concurrency)), thread_name_prefix="legal-research-score")
+        self._futures: list[tuple[Future[Any], tuple[Any, float, str]]] = []
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def __enter__(self) -> CandidateScoringStage:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def submit(self, candidate: tuple[Any, float, str]) -> None:
+        detail = candidate[0]
+        future = self._pool.submit(_run_in_worker, partial(self._score_one, detail))
+        self._futures.append((future, candidate))
+
+    def drain(self) -> list[ScoredCandidate]:
+        results: list[ScoredCandidate] = []
+        try:
+            for future, (detail, coarse_score, coarse_reason) in self._futures:
+                try:
+                    sim = future.result()
+                except Exception:
+                    logger.warning("并发LLM评分异常", extra={"task_id": self._task_id})
+                    continue
+                if sim is not None:
+                    results.append((detail, sim, coarse_score, coarse_reason))
+        finally:
+            self._futures = []
+            self._pool.shutdown(wait=True)
+        return results
+
+    def close(self) -> None:
+        """取消尚未开始的评分并释放线程，可重复调用。"""
+        for future, _ in self._futures:
+            future.cancel()
+        self._futures = []
+        self._pool.shutdown(wait=True, cancel_futures=True)
@@ -4,12 +4,12 @@ from __future__ import annotations
 
 import logging
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
 from apps.legal_research.models import LegalResearchTask
+from apps.legal_research.services.executor_components.pipeline import CandidateScoringStage
 from apps.legal_research.services.executor_components.policy_mixin import DualReviewPolicy
-from apps.legal_research.services.similarity.service import SimilarityResult
+from apps.legal_research.services.similarity.service import RecallDocument, SimilarityResult
 from apps.legal_research.services.sources import CaseDetail
 
 logger = logging.getLogger(__name__)
@@ -114,6 +114,7 @@ class ExecutorScoringMixin:  # pragma: no cover
     DEFERRED_RERANK_MULTIPLIER = 6
     LLM_SCORING_CONCURRENCY = 5
     LLM_SCORING_BATCH_SIZE = 8
+    COARSE_RECALL_BATCH_SIZE = 16
 
     # ── 粗筛与阈值 ───────────────────────────────────────────
 
@@ -125,6 +126,7 @@ class ExecutorScoringMixin:  # pragma: no cover
         keyword: str,
         case_summary: str,
         detail: CaseDetail,
+        source: str = "",
     ) -> tuple[float, str]:
         scorer = getattr(similarity, "coarse_recall_score", None)
         if callable(scorer):
@@ -135,6 +137,8 @@ class ExecutorScoringMixin:  # pragma: no cover
                     title=detail.title,
                     case_digest=detail.case_digest,
                     content_text=detail.content_text,
+                    doc_id=str(getattr(detail, "doc_id_unquoted", "") or getattr(detail, "doc_id_raw", "")),
+                    source=source,
                 )
                 score = cls._normalize_score(getattr(coarse, "score", 0.0))
                 reason = str(getattr(coarse, "reason", "") or "")
@@ -148,6 +152,53 @@ class ExecutorScoringMixin:  # pragma: no cover
         overlap = cls._keyword_overlap(keyword=keyword, detail=detail)
         return overlap, f"宽召回fallback:关键词重合={overlap:.2f}"
 
+    @classmethod
+    def _coarse_recall_batch(  # pragma: no cover
+        cls,
+        *,
+        similarity: Any,
+        keyword: str,
+        case_summary: str,
+        details: list[CaseDetail],
+        source: str = "",
+    ) -> list[tuple[float, str]]:
+        """一批候选的宽召回：n-gram 向量分整批计算；批量接口不可用或失败时逐条回退。"""
+        scorer = getattr(similarity, "coarse_recall_scores", None)
+        if len(details) > 1 and callable(scorer):
+            try:
+                results = list(
+                    scorer(
+                        keyword=keyword,
+                        case_summary=case_summary,
+                        documents=[
+                            RecallDocument(
+                                title=detail.title,
+                                case_digest=detail.case_digest,
+                                content_text=detail.content_text,
+                                doc_id=str(
+                                    getattr(detail, "doc_id_unquoted", "") or getattr(detail, "doc_id_raw", "")
+                                ),
+                            )
+                            for detail in details
+                        ],
+                        source=source,
+                    )
+                )
+                if len(results) == len(details):
+                    return [
+                        (cls._normalize_score(getattr(result, "score", 0.0)), str(getattr(result, "reason", "") or ""))
+                        for result in results
+                    ]
+                logger.warning("批量宽召回结果数量不符，逐条回退", extra={"expected": len(details), "actual": len(results)})
+            except Exception:
+                logger.exception("批量宽召回评分失败，逐条回退")
+        return [
+            cls._coarse_recall(
+                similarity=similarity, keyword=keyword, case_summary=case_summary, detail=detail, source=source
+            )
+            for detail in details
+        ]
+
     @classmethod
     def _coarse_rerank_budget(  # pragma: no cover
         cls,
@@ -541,6 +592,19 @@ class ExecutorScoringMixin:  # pragma: no cover
 
     # ── 并发评分 ─────────────────────────────────────────────
 
+    def _start_scoring_stage(  # pragma: no cover
+        self,
+        *,
+        similarity: Any,
+        task: LegalResearchTask,
+        task_id: str,
+        concurrency: int,
+    ) -> CandidateScoringStage:
+        def _score_one(detail: Any) -> Any | None:  # pragma: no cover
+            return self._score_case_with_retry(similarity=similarity, task=task, detail=detail, task_id=task_id)
+
+        return CandidateScoringStage(score_one=_score_one, concurrency=concurrency, task_id=task_id)
+
     def _batch_rerank_candidates(  # pragma: no cover
         self,
         *,
@@ -550,30 +614,25 @@ class ExecutorScoringMixin:  # pragma: no cover
         task_id: str,
         concurrency: int,
         tuning: Any = None,
+        scoring_stage: CandidateScoringStage | None = None,
     ) -> list[tuple[Any, Any, float, str]]:
-        if not candidates:
-            return []
+        """并发 LLM 评分；传入 scoring_stage 时复用已提前提交的评分任务。"""
+        if scoring_stage is None:
+            if not candidates:
+                return []
 
-        results: list[tuple[Any, Any, float, str]] = []
+            def _score_one(detail: Any) -> Any | None:  # pragma: no cover
+                return self._score_case_with_retry(similarity=similarity, task=task, detail=detail, task_id=task_id)
 
-        def _score_one(detail: Any) -> Any | None:  # pragma: no cover
-            return self._score_case_with_retry(similarity=similarity, task=task, detail=detail, task_id=task_id)
-
-        effective_concurrency = max(1, min(concurrency, len(candidates)))
-        with ThreadPoolExecutor(max_workers=effective_concurrency) as pool:
-            future_map = {
-                pool.submit(_score_one, detail): (detail, coarse_score, coarse_reason)
-                for detail, coarse_score, coarse_reason in candidates
-            }
-            for future in as_completed(future_map):
-                detail, coarse_score, coarse_reason = future_map[future]
-                try:
-                    sim = future.result()
-                    if sim is not None:
-                        results.append((detail, sim, coarse_score, coarse_reason))
-                except Exception:
-                    logger.warning("并发LLM评分异常", extra={"task_id": task_id})
+            scoring_stage = CandidateScoringStage(
+                score_one=_score_one,
+                concurrency=max(1, min(concurrency, len(candidates))),
+                task_id=task_id,
+            )
+            for candidate in candidates:
+                scoring_stage.submit(candidate)
 
+        results = scoring_stage.drain()
         results = self._apply_reranker(results=results, task=task, tuning=tuning)
         results.sort(key=lambda x: getattr(x[1], "score", 0.0), reverse=True)
         return results
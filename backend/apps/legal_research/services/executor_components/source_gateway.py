@@ -21,6 +21,25 @@ class ExecutorSourceGatewayMixin:  # pragma: no cover
     PAGE_SIZE_HINT: int
     MAX_PAGE_WINDOW: int
 
+    @classmethod
+    def _resolve_detail_fetch_concurrency(  # pragma: no cover
+        cls,
+        *,
+        source_client: Any,
+        session: Any,
+        source: str,
+        tuning: Any,
+    ) -> int:
+        supports_concurrency = getattr(source_client, "supports_concurrent_detail_fetch", None)
+        if not callable(supports_concurrency):
+            return 1
+        if supports_concurrency(session=session) is not True:
+            return 1
+        resolver = getattr(tuning, "detail_fetch_concurrency_for", None)
+        if not callable(resolver):
+            return 1
+        return max(1, int(resolver(source)))
+
     @classmethod
     def _fetch_candidate_batch_with_retry(  # pragma: no cover
         cls,
@@ -343,6 +362,58 @@ class ExecutorSourceGatewayMixin:  # pragma: no cover
                 await cls._asleep_for_retry(attempt=attempt)
         return None
 
+    @classmethod
+    def _fetch_candidate_batch(  # pragma: no cover
+        cls,
+        *,
+        source_client: Any,
+        session: Any,
+        keyword: str,
+        offset: int,
+        batch_size: int,
+        advanced_query: list[dict[str, str]] | None = None,
+        court_filter: str = "",
+        cause_of_action_filter: str = "",
+        date_from: str = "",
+        date_to: str = "",
+        raw_payload: dict[str, Any] | None = None,
+    ) -> list[Any]:
+        search_cases = source_client.search_cases
+        max_pages = cls._estimate_max_pages(offset=offset, batch_size=batch_size)
+        signature = inspect.signature(search_cases)
+        extra_kwargs: dict[str, Any] = {}
+        if "advanced_query" in signature.parameters:
+            extra_kwargs["advanced_query"] = advanced_query
+        if "court_filter" in signature.parameters:
+            extra_kwargs["court_filter"] = court_filter
+        if "cause_of_action_filter" in signature.parameters:
+            extra_kwargs["cause_of_action_filter"] = cause_of_action_filter
+        if "date_from" in signature.parameters:
+            extra_kwargs["date_from"] = date_from
+        if "date_to" in signature.parameters:
+            extra_kwargs["date_to"] = date_to
+        if "raw_payload" in signature.parameters:
+            extra_kwargs["raw_payload"] = raw_payload
+
+        if "offset" in signature.parameters:
+            return search_cases(  # type: ignore[no-any-return]
+                session=session,
+                keyword=keyword,
+                max_candidates=batch_size,
+                max_pages=max_pages,
+                offset=offset,
+                **extra_kwargs,
+            )
+
+        window = search_cases(
+            session=session,
+            keyword=keyword,
+            max_candidates=offset + batch_size,
+            max_pages=max_pages,
+            **extra_kwargs,
+        )
+        return window[offset : offset + batch_size]  # type: ignore[no-any-return]
+
     @classmethod
     async def _afetch_candidate_batch(  # pragma: no cover
         cls,
@@ -0,0 +1,394 @@
+"""案例相似度 - 本地语料词项统计与倒排索引.
+
+执行器每下载一篇案例详情即增量写入：文档频率、平均文档长度、倒排表与预分词词频。
+宽召回阶段据此计算真实 BM25（免去逐候选重复分词），并可在远程检索前对本地语料预排序。
+
+存储为 MEDIA_ROOT/legal_research/corpus/ 下的 SQLite 文件（WAL 模式，多进程可并发读写）。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from . import scorers
+
+logger = logging.getLogger(__name__)
+
+CORPUS_INDEX_SCHEMA_VERSION = 1
+CORPUS_INDEX_FILENAME = "corpus_index.sqlite3"
+CORPUS_QUERY_MAX_TERMS = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    doc_id_raw TEXT NOT NULL DEFAULT '',
+    detail_url TEXT NOT NULL DEFAULT '',
+    search_id TEXT NOT NULL DEFAULT '',
+    module TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    length INTEGER NOT NULL,
+    term_freqs TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    UNIQUE (source, doc_id)
+);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class CorpusHit:
+    """本地语料预排序命中；字段与 CaseSearchItem 协议一致，可直接作为候选条目。"""
+
+    doc_id_raw: str
+    doc_id_unquoted: str
+    detail_url: str
+    search_id: str
+    module: str
+    title_hint: str
+    score: float
+
+
+def _normalize_source(source: str) -> str:
+    return str(source or "").strip().lower()
+
+
+def _query_terms(query_text: str) -> list[str]:
+    tokens = scorers.dedupe_tokens(scorers.tokenize(query_text), max_tokens=CORPUS_QUERY_MAX_TERMS)
+    return [token.lower() for token in tokens]
+
+
+class CaseCorpusIndex:
+    """案例语料词项统计存储。"""
+
+    MIN_DOCUMENTS_FOR_STATS = 30
+    STATS_REFRESH_SECONDS = 60.0
+    TERM_FREQ_LOCAL_CACHE_MAX_SIZE = 2048
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._totals: tuple[int, int] = (0, 0)
+        self._totals_loaded_at = 0.0
+        self._term_freq_cache: OrderedDict[tuple[str, str], tuple[dict[str, int], int]] = OrderedDict()
+        self._initialized = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    # ── 写入 ────────────────────────────────────────────────
+
+    def add_document(self, *, source: str, detail: Any) -> bool:
+        """写入一篇案例详情；已存在则跳过。返回是否新增。"""
+        return self.add_documents(source=source, details=[detail]) == 1
+
+    def add_documents(self, *, source: str, details: Iterable[Any]) -> int:
+        """在一个事务内写入一批案例详情（分词在事务外完成）；已存在的跳过。返回新增篇数。"""
+        source_key = _normalize_source(source)
+        if not source_key:
+            return 0
+        rows: list[tuple[Any, str, Counter[str], int]] = []
+        for detail in details:
+            doc_id = str(getattr(detail, "doc_id_unquoted", "") or getattr(detail, "doc_id_raw", "")).strip()
+            if not doc_id:
+                continue
+            document_text = scorers.build_recall_document_text(
+                title=str(getattr(detail, "title", "") or ""),
+                case_digest=str(getattr(detail, "case_digest", "") or ""),
+                content_text=str(getattr(detail, "content_text", "") or ""),
+            )
+            tokens = scorers.tokenize(document_text)
+            if tokens:
+                rows.append((detail, doc_id, Counter(tokens), len(tokens)))
+        if not rows:
+            return 0
+
+        added = 0
+        added_length = 0
+        conn = self._connection()
+        with conn:
+            for detail, doc_id, term_freqs, length in rows:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO documents "
+                    "(source, doc_id, doc_id_raw, detail_url, search_id, module, title, length, term_freqs, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        source_key,
+                        doc_id,
+                        str(getattr(detail, "doc_id_raw", "") or ""),
+                        str(getattr(detail, "detail_url", "") or ""),
+                        str(getattr(detail, "search_id", "") or ""),
+                        str(getattr(detail, "module", "") or ""),
+                        str(getattr(detail, "title", "") or "")[:300],
+                        length,
+                        json.dumps(term_freqs, ensure_ascii=False, separators=(",", ":")),
+                        time.time(),
+                    ),
+                )
+                if cursor.rowcount != 1:
+                    continue
+                doc_rowid = cursor.lastrowid
+                conn.executemany(
+                    "INSERT INTO postings (term, doc, tf) VALUES (?, ?, ?)",
+                    [(term, doc_rowid, tf) for term, tf in term_freqs.items()],
+                )
+                conn.executemany(
+                    "INSERT INTO terms (term, df) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                    [(term,) for term in term_freqs],
+                )
+                added += 1
+                added_length += length
+            if added:
+                conn.execute(
+                    "UPDATE meta SET value = CAST(value AS INTEGER) + ? WHERE key = 'doc_count'",
+                    (added,),
+                )
+                conn.execute(
+                    "UPDATE meta SET value = CAST(value AS INTEGER) + ? WHERE key = 'total_length'",
+                    (added_length,),
+                )
+        if added:
+            with self._lock:
+                doc_count, total_length = self._totals
+                self._totals = (doc_count + added, total_length + added_length)
+        return added
+
+    # ── 统计 ────────────────────────────────────────────────
+
+    def document_count(self) -> int:
+        return self._load_totals()[0]
+
+    def statistics_for(self, query_text: str) -> scorers.CorpusStatistics | None:
+        """返回查询词的语料统计；语料规模不足时返回 None（调用方回退启发式权重）。"""
+        doc_count, total_length = self._load_totals()
+        if doc_count < self.MIN_DOCUMENTS_FOR_STATS:
+            return None
+        terms = _query_terms(query_text)
+        frequencies: dict[str, int] = {}
+        if terms:
+            placeholders = ",".join("?" for _ in terms)
+            rows = (
+                self._connection()
+                .execute(
+                    f"SELECT term, df FROM terms WHERE term IN ({placeholders})",  # nosec B608 - 仅占位符
+                    terms,
+                )
+                .fetchall()
+            )
+            frequencies = {str(term): int(df) for term, df in rows}
+        return scorers.CorpusStatistics(
+            doc_count=doc_count,
+            avg_doc_length=total_length / doc_count,
+            document_frequencies=frequencies,
+        )
+
+    def document_term_frequencies(self, *, source: str, doc_id: str) -> tuple[dict[str, int], int] | None:
+        """返回预分词的文档词频与文档长度，未收录时返回 None。"""
+        key = (_normalize_source(source), str(doc_id or "").strip())
+        if not key[0] or not key[1]:
+            return None
+        with self._lock:
+            cached = self._term_freq_cache.get(key)
+            if cached is not None:
+                self._term_freq_cache.move_to_end(key)
+                return cached
+        row = (
+            self._connection()
+            .execute(
+                "SELECT term_freqs, length FROM documents WHERE source = ? AND doc_id = ?",
+                key,
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        try:
+            term_freqs = {str(term): int(tf) for term, tf in json.loads(row[0]).items()}
+        except (TypeError, ValueError, AttributeError):
+            return None
+        entry = (term_freqs, int(row[1]))
+        with self._lock:
+            self._term_freq_cache[key] = entry
+            while len(self._term_freq_cache) > self.TERM_FREQ_LOCAL_CACHE_MAX_SIZE:
+                self._term_freq_cache.popitem(last=False)
+        return entry
+
+    # ── 检索 ────────────────────────────────────────────────
+
+    def search(self, *, source: str, query_text: str, top_k: int) -> list[CorpusHit]:
+        """基于倒排表对本地语料做 BM25 预排序。"""
+        source_key = _normalize_source(source)
+        stats = self.statistics_for(query_text)
+        if stats is None or not source_key or top_k <= 0:
+            return []
+        terms = [term for term in _query_terms(query_text) if stats.document_frequencies.get(term)]
+        if not terms:
+            return []
+
+        placeholders = ",".join("?" for _ in terms)
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT p.term, p.doc, p.tf, d.length FROM postings p "  # nosec B608 - 仅占位符
+                f"JOIN documents d ON d.id = p.doc WHERE p.term IN ({placeholders}) AND d.source = ?",
+                [*terms, source_key],
+            )
+            .fetchall()
+        )
+        avg_dl = max(1.0, stats.avg_doc_length)
+        idf = {term: stats.idf(term) for term in terms}
+        scores: dict[int, float] = {}
+        for term, doc, tf, length in rows:
+            denom = tf + scorers.BM25_K1 * (1 - scorers.BM25_B + scorers.BM25_B * length / avg_dl)
+            scores[doc] = scores.get(doc, 0.0) + idf[term] * (tf * (scorers.BM25_K1 + 1)) / denom
+        if not scores:
+            return []
+
+        max_possible = sum(idf.values()) * (scorers.BM25_K1 + 1)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        doc_placeholders = ",".join("?" for _ in ranked)
+        meta_rows = (
+            self._connection()
+            .execute(
+                "SELECT id, doc_id, doc_id_raw, detail_url, search_id, module, title "  # nosec B608 - 仅占位符
+                f"FROM documents WHERE id IN ({doc_placeholders})",
+                [doc for doc, _ in ranked],
+            )
+            .fetchall()
+        )
+        meta = {int(row[0]): row for row in meta_rows}
+        hits: list[CorpusHit] = []
+        for doc, score in ranked:
+            row = meta.get(doc)
+            if row is None:
+                continue
+            hits.append(
+                CorpusHit(
+                    doc_id_raw=str(row[2] or row[1]),
+                    doc_id_unquoted=str(row[1]),
+                    detail_url=str(row[3] or ""),
+                    search_id=str(row[4] or ""),
+                    module=str(row[5] or ""),
+                    title_hint=str(row[6] or ""),
+                    score=min(1.0, score / max_possible) if max_possible > 0 else 0.0,
+                )
+            )
+        return hits
+
+    def hits_for(self, *, source: str, scored_doc_ids: list[tuple[str, float]]) -> list[CorpusHit]:
+        """将外部召回（如语义向量）得到的案例 ID 还原为候选条目，保持输入顺序，未收录的忽略。"""
+        source_key = _normalize_source(source)
+        doc_ids = [doc_id for doc_id, _ in scored_doc_ids if doc_id]
+        if not source_key or not doc_ids:
+            return []
+        placeholders = ",".join("?" for _ in doc_ids)
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT doc_id, doc_id_raw, detail_url, search_id, module, title "  # nosec B608 - 仅占位符
+                f"FROM documents WHERE source = ? AND doc_id IN ({placeholders})",
+                [source_key, *doc_ids],
+            )
+            .fetchall()
+        )
+        meta = {str(row[0]): row for row in rows}
+        hits: list[CorpusHit] = []
+        for doc_id, score in scored_doc_ids:
+            row = meta.get(doc_id)
+            if row is None:
+                continue
+            hits.append(
+                CorpusHit(
+                    doc_id_raw=str(row[1] or row[0]),
+                    doc_id_unquoted=str(row[0]),
+                    detail_url=str(row[2] or ""),
+                    search_id=str(row[3] or ""),
+                    module=str(row[4] or ""),
+                    title_hint=str(row[5] or ""),
+                    score=max(0.0, min(1.0, float(score))),
+                )
+            )
+        return hits
+
+    # ── 内部方法 ────────────────────────────────────────────
+
+    def _load_totals(self) -> tuple[int, int]:
+        now = time.monotonic()
+        with self._lock:
+            if self._totals_loaded_at and now - self._totals_loaded_at < self.STATS_REFRESH_SECONDS:
+                return self._totals
+        rows = dict(self._connection().execute("SELECT key, value FROM meta").fetchall())
+        totals = (int(rows.get("doc_count", 0) or 0), int(rows.get("total_length", 0) or 0))
+        with self._lock:
+            self._totals = totals
+            self._totals_loaded_at = now
+        return totals
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._path), timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            if not self._initialized:
+                self._initialize(conn)
+                self._initialized = True
+        self._local.conn = conn
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.executescript(_SCHEMA)
+            conn.executemany(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("schema_version", str(CORPUS_INDEX_SCHEMA_VERSION)),
+                    ("doc_count", "0"),
+                    ("total_length", "0"),
+                ],
+            )
+
+
+_default_index: CaseCorpusIndex | None = None
+_default_index_lock = threading.Lock()
+
+
+def get_case_corpus_index() -> CaseCorpusIndex:
+    """进程内共享的语料索引（MEDIA_ROOT/legal_research/corpus/）。"""
+    global _default_index
+    if _default_index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                from django.conf import settings
+
+                path = Path(settings.MEDIA_ROOT) / "legal_research" / "corpus" / CORPUS_INDEX_FILENAME
+                _default_index = CaseCorpusIndex(path)
+    return _default_index
@@ -0,0 +1,159 @@
+"""案例相似度 - 特征哈希 n-gram 向量（NumPy 稀疏 CSR 表示）.
+
+与 scorers.char_ngrams 口径一致（去空白、小写、截断 2000 字，取 2/3-gram），
+但 n-gram 直接在码点数组上向量化哈希到固定维度，不再逐对构造 Counter：
+
+- 查询侧向量按文本缓存，同一任务内只计算一次
+- 候选侧批量构造为 CSR 矩阵，一次稀疏矩阵-向量乘积得到整批余弦相似度
+
+哈希冲突概率约为 gram 数 / 2^20，对 0~1 区间的余弦分数影响可忽略。
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import numpy.typing as npt
+
+NGRAM_SIZES: tuple[int, ...] = (2, 3)
+NGRAM_MAX_CHARS = 2000
+NGRAM_HASH_BITS = 20
+NGRAM_HASH_DIM = 1 << NGRAM_HASH_BITS
+QUERY_VECTOR_CACHE_MAX_SIZE = 256
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_HASH_MASK = np.uint64(NGRAM_HASH_DIM - 1)
+# 各位置的奇数乘子与各 n 的种子，保证 "ab" 与 "ba"、2-gram 与 3-gram 落在不同桶
+_POSITION_MULTIPLIERS = (
+    np.uint64(0x9E3779B97F4A7C15),
+    np.uint64(0xC2B2AE3D27D4EB4F),
+    np.uint64(0x165667B19E3779F9),
+)
+_SIZE_SEEDS = {2: np.uint64(0x27D4EB2F165667C5), 3: np.uint64(0x85EBCA77C2B2AE63)}
+_MIX_MULTIPLIER = np.uint64(0xFF51AFD7ED558CCD)
+
+IntArray = npt.NDArray[np.int64]
+FloatArray = npt.NDArray[np.float64]
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub("", (text or "").lower())[:NGRAM_MAX_CHARS]
+
+
+def hashed_ngram_indices(text: str) -> IntArray:
+    """返回文本全部 2/3-gram 的哈希桶下标（含重复，未排序）。"""
+    normalized = _normalize(text)
+    if len(normalized) < min(NGRAM_SIZES):
+        return np.empty(0, dtype=np.int64)
+    codepoints = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    parts: list[IntArray] = []
+    for n in NGRAM_SIZES:
+        count = len(codepoints) - n + 1
+        if count <= 0:
+            continue
+        hashed = np.full(count, _SIZE_SEEDS[n], dtype=np.uint64)
+        for offset in range(n):
+            hashed ^= codepoints[offset : offset + count] * _POSITION_MULTIPLIERS[offset]
+        hashed ^= hashed >> np.uint64(33)
+        hashed *= _MIX_MULTIPLIER
+        hashed ^= hashed >> np.uint64(29)
+        parts.append((hashed & _HASH_MASK).astype(np.int64))
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class HashedNgramVector:
+    """单条文本的稀疏向量：indices 升序唯一，data 为 n-gram 计数。"""
+
+    indices: IntArray
+    data: FloatArray
+    norm: float
+
+    @classmethod
+    def from_text(cls, text: str) -> HashedNgramVector:
+        indices, counts = np.unique(hashed_ngram_indices(text), return_counts=True)
+        data = counts.astype(np.float64)
+        indices.setflags(write=False)
+        data.setflags(write=False)
+        return cls(indices=indices, data=data, norm=float(np.sqrt(np.dot(data, data))))
+
+    def __len__(self) -> int:
+        return int(self.indices.size)
+
+
+@dataclass(frozen=True)
+class HashedNgramMatrix:
+    """一批文本的 CSR 稀疏矩阵（indptr/indices/data），rows 为每个非零元所属行。"""
+
+    indptr: IntArray
+    indices: IntArray
+    data: FloatArray
+    rows: IntArray
+    norms: FloatArray
+
+    @classmethod
+    def from_texts(cls, texts: Sequence[str]) -> HashedNgramMatrix:
+        row_hashes = [hashed_ngram_indices(text) for text in texts]
+        lengths = np.fromiter((h.size for h in row_hashes), dtype=np.int64, count=len(row_hashes))
+        if not row_hashes or not lengths.any():
+            empty_int = np.empty(0, dtype=np.int64)
+            return cls(
+                indptr=np.zeros(len(row_hashes) + 1, dtype=np.int64),
+                indices=empty_int,
+                data=np.empty(0, dtype=np.float64),
+                rows=empty_int,
+                norms=np.zeros(len(row_hashes), dtype=np.float64),
+            )
+        # 行号编码进高位后整体去重计数，一次 np.unique 完成整批 CSR 构造（结果按行、列有序）
+        row_ids = np.repeat(np.arange(len(row_hashes), dtype=np.int64), lengths)
+        keys, counts = np.unique(row_ids * NGRAM_HASH_DIM + np.concatenate(row_hashes), return_counts=True)
+        rows = keys // NGRAM_HASH_DIM
+        data = counts.astype(np.float64)
+        indptr = np.zeros(len(row_hashes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(row_hashes)), out=indptr[1:])
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(row_hashes)))
+        return cls(indptr=indptr, indices=keys % NGRAM_HASH_DIM, data=data, rows=rows, norms=norms)
+
+    @property
+    def row_count(self) -> int:
+        return int(self.indptr.size - 1)
+
+    def dot(self, vector: HashedNgramVector) -> FloatArray:
+        """稀疏矩阵 × 稀疏向量：在查询的有序下标上二分定位共有 n-gram。"""
+        if not len(vector) or not self.indices.size:
+            return np.zeros(self.row_count, dtype=np.float64)
+        positions = np.searchsorted(vector.indices, self.indices)
+        np.minimum(positions, vector.indices.size - 1, out=positions)
+        matched = vector.indices[positions] == self.indices
+        products = np.where(matched, vector.data[positions] * self.data, 0.0)
+        return np.bincount(self.rows, weights=products, minlength=self.row_count)
+
+    def cosine(self, vector: HashedNgramVector) -> FloatArray:
+        dots = self.dot(vector)
+        denom = self.norms * vector.norm
+        scores = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+        return np.clip(scores, 0.0, 1.0)
+
+
+@lru_cache(maxsize=QUERY_VECTOR_CACHE_MAX_SIZE)
+def query_vector(text: str) -> HashedNgramVector:
+    """查询侧向量（进程内 LRU 缓存，同一任务的查询文本只向量化一次）。"""
+    return HashedNgramVector.from_text(text)
+
+
+def cosine_similarity_batch(query_text: str, texts: Sequence[str]) -> list[float]:
+    """查询文本与一批候选文本的 n-gram 余弦相似度，顺序与 texts 一致。"""
+    if not texts:
+        return []
+    query = query_vector(query_text)
+    if not len(query):
+        return [0.0] * len(texts)
+    return [float(score) for score in HashedNgramMatrix.from_texts(texts).cosine(query)]
+
+
+def cosine_similarity(query_text: str, text: str) -> float:
+    return cosine_similarity_batch(query_text, [text])[0]
@@ -7,7 +7,7 @@ import re
 from .scorers import (
     build_candidate_excerpt,
     focus_content_after_fact_marker,
-    lexical_vector_similarity_score,
+    lexical_vector_similarity_scores,
     token_overlap_score,
 )
 
@@ -63,10 +63,10 @@ def select_relevant_passages(
         return []
 
     query_text = f"{keyword} {case_summary} {title} {case_digest}"
+    vector_scores = lexical_vector_similarity_scores(query_text, paragraphs)
     ranked: list[tuple[float, str]] = []
-    for paragraph in paragraphs:
+    for paragraph, vector in zip(paragraphs, vector_scores, strict=True):
         overlap = token_overlap_score(query_text, paragraph)
-        vector = lexical_vector_similarity_score(query_text, paragraph)
         score = overlap * 0.58 + vector * 0.42
         if score <= 0:
             continue
@@ -102,11 +102,9 @@ def passage_alignment_score(
         return 0.0
 
     query_text = f"{keyword} {case_summary}"
+    vector_scores = lexical_vector_similarity_scores(query_text, passages)
     scores = [
-        max(
-            token_overlap_score(query_text, passage),
-            lexical_vector_similarity_score(query_text, passage),
-        )
-        for passage in passages
+        max(token_overlap_score(query_text, passage), vector)
+        for passage, vector in zip(passages, vector_scores, strict=True)
     ]
     return max(0.0, min(1.0, max(scores, default=0.0)))
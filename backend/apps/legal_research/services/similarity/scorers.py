@@ -5,6 +5,15 @@ from __future__ import annotations
 import math
 import re
 from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+
+from . import ngram_vectors
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_HEURISTIC_AVG_DL = 280.0
+RECALL_DOCUMENT_CONTENT_MAX_CHARS = 2400
 
 
 def tokenize(text: str) -> list[str]:
@@ -59,7 +68,7 @@ def char_ngrams(text: str) -> Counter[str]:
 
 
 def _heuristic_idf_weight(token: str) -> float:
-    """启发式 IDF 权重：按词长估算稀有度，无语料库统计。"""
+    """启发式 IDF 权重：按词长估算稀有度，无语料库统计时使用。"""
     length = len(token)
     if length >= 4:
         return 1.0
@@ -68,30 +77,66 @@ def _heuristic_idf_weight(token: str) -> float:
     return 0.4
 
 
-def bm25_proxy_score(*, query_text: str, document_text: str) -> float:
+@dataclass(frozen=True)
+class CorpusStatistics:
+    """语料库词项统计：文档数、平均文档长度与查询词的文档频率。"""
+
+    doc_count: int
+    avg_doc_length: float
+    document_frequencies: Mapping[str, int] = field(default_factory=dict)
+
+    def idf(self, token: str) -> float:
+        df = max(0, int(self.document_frequencies.get(token.lower(), 0)))
+        return math.log(1.0 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+
+def build_recall_document_text(*, title: str, case_digest: str, content_text: str) -> str:
+    """宽召回阶段参与词项评分的文档文本（语料索引与在线评分共用同一口径）。"""
+    return f"{title} {case_digest} {(content_text or '')[:RECALL_DOCUMENT_CONTENT_MAX_CHARS]}"
+
+
+def bm25_proxy_score(
+    *,
+    query_text: str,
+    document_text: str,
+    corpus_stats: CorpusStatistics | None = None,
+    document_term_frequencies: Mapping[str, int] | None = None,
+    document_length: int | None = None,
+) -> float:
+    """
+    BM25 评分，归一化到 [0, 1]。
+
+    提供 corpus_stats 时使用语料库真实 IDF 与平均文档长度，否则按词长估算 IDF、固定平均长度；
+    两种口径都按命中查询词的 IDF 加权平均，分值尺度一致，宽召回权重与阈值无需区分。
+    document_term_frequencies/document_length 为预计算的文档词频，提供时跳过分词。
+    """
     query_tokens = tokenize(query_text)
     if not query_tokens:
         return 0.0
-    doc_tokens = tokenize(document_text)
-    if not doc_tokens:
+    if document_term_frequencies is None:
+        doc_tokens = tokenize(document_text)
+        freq: Mapping[str, int] = Counter(doc_tokens)
+        doc_len = max(1, len(doc_tokens))
+    else:
+        freq = document_term_frequencies
+        doc_len = max(1, int(document_length or sum(freq.values())))
+    if not freq:
         return 0.0
 
-    freq = Counter(doc_tokens)
-    doc_len = max(1, len(doc_tokens))
-    avg_dl = 280.0
-    k1 = 1.2
-    b = 0.75
+    use_corpus = corpus_stats is not None and corpus_stats.doc_count > 0
+    avg_dl = corpus_stats.avg_doc_length if use_corpus and corpus_stats is not None else BM25_HEURISTIC_AVG_DL
+    avg_dl = max(1.0, avg_dl)
     total = 0.0
     weight_sum = 0.0
     for token in dedupe_tokens(query_tokens, max_tokens=20):
         tf = freq.get(token.lower(), 0)
         if tf <= 0:
             continue
-        denom = tf + k1 * (1 - b + b * doc_len / avg_dl)
+        denom = tf + BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avg_dl)
         if denom <= 0:
             continue
-        score = (tf * (k1 + 1)) / denom
-        idf = _heuristic_idf_weight(token)
+        score = (tf * (BM25_K1 + 1)) / denom
+        idf = corpus_stats.idf(token) if use_corpus and corpus_stats is not None else _heuristic_idf_weight(token)
         total += min(1.0, score / 2.3) * idf
         weight_sum += idf
 
@@ -101,19 +146,13 @@ def bm25_proxy_score(*, query_text: str, document_text: str) -> float:
 
 
 def lexical_vector_similarity_score(text_a: str, text_b: str) -> float:
-    grams_a = char_ngrams(text_a)
-    grams_b = char_ngrams(text_b)
-    if not grams_a or not grams_b:
-        return 0.0
+    """字符 2/3-gram 余弦相似度；text_a 视为查询侧（向量缓存复用）。"""
+    return ngram_vectors.cosine_similarity(text_a, text_b)
 
-    common = set(grams_a).intersection(grams_b)
-    dot = sum(grams_a[g] * grams_b[g] for g in common)
-    norm_a = math.sqrt(sum(v * v for v in grams_a.values()))
-    norm_b = math.sqrt(sum(v * v for v in grams_b.values()))
-    if norm_a <= 0 or norm_b <= 0:
-        return 0.0
-    cosine = dot / (norm_a * norm_b)
-    return max(0.0, min(1.0, cosine))
+
+def lexical_vector_similarity_scores(query_text: str, texts: Sequence[str]) -> list[float]:
+    """批量版本：查询向量只计算一次，候选整批做一次稀疏矩阵乘积。"""
+    return ngram_vectors.cosine_similarity_batch(query_text, texts)
 
 
 def token_overlap_score(query_text: str, text: str) -> float:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import math
+import sqlite3
 import time
 from dataclasses import dataclass, field
 from types import SimpleNamespace
@@ -14,9 +15,11 @@ from django.core.cache import cache
 from apps.core.interfaces import ServiceLocator
 
 from . import cache as cache_mod
+from . import corpus_index as corpus_index_mod
 from . import json_utils as json_utils
 from . import passage as passage_mod
 from . import scorers as scorers
+from . import vector_store as vector_store_mod
 from .tuning_config import LegalResearchTuningConfig
 
 logger = logging.getLogger(__name__)
@@ -57,6 +60,16 @@ class SimilarityResult:  # pragma: no cover
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class RecallDocument:
+    """宽召回批量评分的单个候选。"""
+
+    title: str
+    case_digest: str
+    content_text: str
+    doc_id: str = ""
+
+
 class CaseSimilarityService:  # pragma: no cover
     """计算案例相似度。"""
 
@@ -137,6 +150,9 @@ class CaseSimilarityService:  # pragma: no cover
                 ),
             ),
         )
+        self._corpus_index_enabled = bool(getattr(self._tuning, "corpus_index_enabled", True))
+        self._semantic_vector_store_enabled = bool(getattr(self._tuning, "semantic_vector_store_enabled", True))
+        self._corpus_stats_cache: dict[str, scorers.CorpusStatistics | None] = {}
 
     def score_case(  # pragma: no cover
         self,
@@ -428,42 +444,98 @@ class CaseSimilarityService:  # pragma: no cover
         title: str,
         case_digest: str,
         content_text: str,
+        doc_id: str = "",
+        source: str = "",
     ) -> SimilarityResult:
         """阶段1宽召回：使用词项重合进行高召回初筛，不做严格判负。"""
+        query_text = f"{keyword} {case_summary}"
+        document_text = scorers.build_recall_document_text(
+            title=title, case_digest=case_digest, content_text=content_text
+        )
+        return self._coarse_recall(
+            keyword=keyword,
+            case_summary=case_summary,
+            document=RecallDocument(title=title, case_digest=case_digest, content_text=content_text, doc_id=doc_id),
+            document_text=document_text,
+            vector_lexical_score=scorers.lexical_vector_similarity_score(query_text, document_text),
+            source=source,
+        )
+
+    def coarse_recall_scores(  # pragma: no cover
+        self,
+        *,
+        keyword: str,
+        case_summary: str,
+        documents: list[RecallDocument],
+        source: str = "",
+    ) -> list[SimilarityResult]:
+        """批量宽召回：n-gram 向量分整批一次稀疏矩阵乘积，其余信号逐条计算，结果与 coarse_recall_score 一致。"""
+        if not documents:
+            return []
+        query_text = f"{keyword} {case_summary}"
+        document_texts = [
+            scorers.build_recall_document_text(
+                title=document.title, case_digest=document.case_digest, content_text=document.content_text
+            )
+            for document in documents
+        ]
+        lexical_scores = scorers.lexical_vector_similarity_scores(query_text, document_texts)
+        return [
+            self._coarse_recall(
+                keyword=keyword,
+                case_summary=case_summary,
+                document=document,
+                document_text=document_text,
+                vector_lexical_score=lexical_score,
+                source=source,
+            )
+            for document, document_text, lexical_score in zip(documents, document_texts, lexical_scores, strict=True)
+        ]
+
+    def _coarse_recall(  # pragma: no cover
+        self,
+        *,
+        keyword: str,
+        case_summary: str,
+        document: RecallDocument,
+        document_text: str,
+        vector_lexical_score: float,
+        source: str,
+    ) -> SimilarityResult:
         keyword_overlap = scorers.keyword_overlap_score(
             keyword=keyword,
-            title=title,
-            case_digest=case_digest,
-            content_text=content_text,
+            title=document.title,
+            case_digest=document.case_digest,
+            content_text=document.content_text,
         )
         summary_overlap = scorers.summary_overlap_score(
             case_summary=case_summary,
-            title=title,
-            case_digest=case_digest,
-            content_text=content_text,
+            title=document.title,
+            case_digest=document.case_digest,
+            content_text=document.content_text,
         )
         query_text = f"{keyword} {case_summary}"
-        document_text = f"{title} {case_digest} {(content_text or '')[:2400]}"
 
+        document_terms = self._corpus_document_terms(source=source, doc_id=document.doc_id)
         bm25_score = scorers.bm25_proxy_score(
             query_text=query_text,
             document_text=document_text,
-        )
-        vector_lexical_score = self._vector_similarity_score(
-            text_a=query_text, text_b=document_text, allow_semantic=False
+            corpus_stats=self._corpus_statistics(query_text),
+            document_term_frequencies=document_terms[0] if document_terms else None,
+            document_length=document_terms[1] if document_terms else None,
         )
         passage_score = self._passage_alignment_score(
             keyword=keyword,
             case_summary=case_summary,
-            title=title,
-            case_digest=case_digest,
-            content_text=content_text,
+            title=document.title,
+            case_digest=document.case_digest,
+            content_text=document.content_text,
         )
         metadata_score = scorers.metadata_hint_score(
             keyword=keyword,
-            title=title,
-            case_digest=case_digest,
-            content_text=content_text,
+            title=document.title,
+            case_digest=document.case_digest,
+            content_text=document.content_text,
         )
         semantic_always_on = bool(getattr(self._tuning, "semantic_vector_always_on", False))
         semantic_recheck = semantic_always_on or self._should_enable_semantic_vector_recheck(
@@ -478,7 +550,14 @@ class CaseSimilarityService:  # pragma: no cover
         vector_score = vector_lexical_score
         vector_mode = "lex"
         if semantic_recheck:
-            vector_score = self._vector_similarity_score(text_a=query_text, text_b=document_text, allow_semantic=True)
+            vector_score = self._vector_similarity_score(
+                text_a=query_text,
+                text_b=document_text,
+                allow_semantic=True,
+                source=source,
+                doc_id=document.doc_id,
+                lexical=vector_lexical_score,
+            )
             vector_mode = "sem"
         (
             weight_keyword,
@@ -507,6 +586,29 @@ class CaseSimilarityService:  # pragma: no cover
         )
         return SimilarityResult(score=score, reason=reason, model="coarse-heuristic")
 
+    def _corpus_statistics(self, query_text: str) -> scorers.CorpusStatistics | None:  # pragma: no cover
+        """查询词的语料统计，同一查询在本实例内只查一次。"""
+        if not self._corpus_index_enabled:
+            return None
+        if query_text in self._corpus_stats_cache:
+            return self._corpus_stats_cache[query_text]
+        try:
+            stats = corpus_index_mod.get_case_corpus_index().statistics_for(query_text)
+        except (sqlite3.Error, OSError):
+            logger.warning("语料统计读取失败，回退启发式 IDF", exc_info=True)
+            stats = None
+        self._corpus_stats_cache[query_text] = stats
+        return stats
+
+    def _corpus_document_terms(self, *, source: str, doc_id: str) -> tuple[dict[str, int], int] | None:  # pragma: no cover
+        if not self._corpus_index_enabled or not source or not doc_id:
+            return None
+        try:
+            return corpus_index_mod.get_case_corpus_index().document_term_frequencies(source=source, doc_id=doc_id)
+        except (sqlite3.Error, OSError):
+            logger.warning("语料词频读取失败，回退在线分词", exc_info=True)
+            return None
+
     def _should_enable_semantic_vector_recheck(  # pragma: no cover
         self,
         *,
@@ -577,15 +679,31 @@ class CaseSimilarityService:  # pragma: no cover
             passage_top_k=self._passage_top_k,
         )
 
-    def _vector_similarity_score(self, text_a: str, text_b: str, *, allow_semantic: bool = True) -> float:  # pragma: no cover
-        lexical = scorers.lexical_vector_similarity_score(text_a, text_b)
-        semantic = self._semantic_vector_similarity_score(text_a, text_b) if allow_semantic else None
+    def _vector_similarity_score(  # pragma: no cover
+        self,
+        text_a: str,
+        text_b: str,
+        *,
+        allow_semantic: bool = True,
+        source: str = "",
+        doc_id: str = "",
+        lexical: float | None = None,
+    ) -> float:
+        if lexical is None:
+            lexical = scorers.lexical_vector_similarity_score(text_a, text_b)
+        semantic = (
+            self._semantic_vector_similarity_score(text_a, text_b, source=source, doc_id=doc_id)
+            if allow_semantic
+            else None
+        )
         if semantic is None:
             return lexical
         blended = semantic * self.VECTOR_SEMANTIC_WEIGHT + lexical * self.VECTOR_LEXICAL_WEIGHT
         return max(0.0, min(1.0, blended))
 
-    def _semantic_vector_similarity_score(self, text_a: str, text_b: str) -> float | None:  # pragma: no cover
+    def _semantic_vector_similarity_score(  # pragma: no cover
+        self, text_a: str, text_b: str, *, source: str = "", doc_id: str = ""
+    ) -> float | None:
         if not self._semantic_vector_enabled or not self._semantic_vector_model:
             return None
         now = time.time()
@@ -593,7 +711,7 @@ class CaseSimilarityService:  # pragma: no cover
             return None
 
         vector_a = self._get_semantic_embedding(text_a)
-        vector_b = self._get_semantic_embedding(text_b)
+        vector_b = self._get_semantic_embedding(text_b, source=source, doc_id=doc_id)
         if not vector_a or not vector_b:
             return None
         if len(vector_a) != len(vector_b):
@@ -607,7 +725,9 @@ class CaseSimilarityService:  # pragma: no cover
         cosine = dot / (norm_a * norm_b)
         return max(0.0, min(1.0, cosine))
 
-    def _get_semantic_embedding(self, text: str) -> list[float] | None:  # pragma: no cover
+    def _get_semantic_embedding(  # pragma: no cover
+        self, text: str, *, source: str = "", doc_id: str = ""
+    ) -> list[float] | None:
         normalized = cache_mod.normalize_embedding_text(text)
         if not normalized:
             return None
@@ -619,8 +739,16 @@ class CaseSimilarityService:  # pragma: no cover
         if local is not None:
             return local
 
+        # 本地向量库先于 Django cache 查询：命中即返回，不再重复写库；
+        # 仅 Django cache 有而向量库缺失的向量才补写入库
+        stored = self._load_stored_semantic_embedding(cache_key)
+        if stored is not None:
+            self._semantic_vector_cache.write_local(cache_key=cache_key, vector=stored)
+            return stored
+
         django_cached = self._semantic_vector_cache.load_from_django_cache(cache_key)
         if django_cached is not None:
+            self._store_semantic_embedding(cache_key=cache_key, vector=django_cached, source=source, doc_id=doc_id)
             return django_cached
 
         try:
@@ -637,12 +765,54 @@ class CaseSimilarityService:  # pragma: no cover
             if not vector:
                 return None
             self._semantic_vector_cache.save_to_django_cache(cache_key=cache_key, vector=vector)
+            self._store_semantic_embedding(cache_key=cache_key, vector=vector, source=source, doc_id=doc_id)
             return vector
         except Exception as exc:
             self._semantic_vector_fail_until = time.time() + self.SEMANTIC_EMBEDDING_FAIL_COOLDOWN_SECONDS
             logger.info("语义向量调用失败，回退字符向量", extra={"error": str(exc)})
             return None
 
+    def semantic_prerank(self, *, query_text: str, source: str, top_k: int) -> list[tuple[str, float]]:  # pragma: no cover
+        """在本地向量库累积的案例向量中做语义 top-k 召回，返回 (案例ID, 余弦分)。"""
+        store = self._semantic_vector_store()
+        if store is None or top_k <= 0 or time.time() < self._semantic_vector_fail_until:
+            return []
+        query_vector = self._get_semantic_embedding(query_text)
+        if not query_vector:
+            return []
+        try:
+            hits = store.search(query_vector, top_k=top_k, source=source)
+        except (sqlite3.Error, OSError, ValueError):
+            logger.warning("本地向量库检索失败", exc_info=True)
+            return []
+        return [(hit.doc_id, hit.score) for hit in hits]
+
+    def _semantic_vector_store(self) -> vector_store_mod.SemanticVectorStore | None:  # pragma: no cover
+        if not (self._semantic_vector_store_enabled and self._semantic_vector_enabled and self._semantic_vector_model):
+            return None
+        return vector_store_mod.get_semantic_vector_store(self._semantic_vector_model)
+
+    def _load_stored_semantic_embedding(self, cache_key: str) -> list[float] | None:  # pragma: no cover
+        store = self._semantic_vector_store()
+        if store is None:
+            return None
+        try:
+            return store.get(cache_key)
+        except (sqlite3.Error, OSError, ValueError):
+            logger.warning("本地向量库读取失败", exc_info=True)
+            return None
+
+    def _store_semantic_embedding(  # pragma: no cover
+        self, *, cache_key: str, vector: list[float], source: str, doc_id: str
+    ) -> None:
+        store = self._semantic_vector_store()
+        if store is None:
+            return
+        try:
+            store.add(cache_key, vector, source=source, doc_id=doc_id)
+        except (sqlite3.Error, OSError, ValueError):
+            logger.warning("本地向量库写入失败", exc_info=True)
+
     def _get_embedding_client(self) -> Any:  # pragma: no cover
         if self._embedding_client is None:
             self._embedding_client = _LLMEmbeddingClientAdapter(self._llm)
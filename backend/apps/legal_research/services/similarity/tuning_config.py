@@ -43,14 +43,20 @@ class LegalResearchTuningConfig:
     similarity_cache_ttl_seconds: int = 86400
     similarity_local_cache_max_size: int = 1024
 
+    corpus_index_enabled: bool = True
+    corpus_prerank_top_k: int = 20
+
     semantic_vector_enabled: bool = True
     semantic_vector_model: str = ""
     semantic_vector_cache_ttl_seconds: int = 86400
     semantic_vector_local_cache_max_size: int = 2048
+    semantic_vector_store_enabled: bool = True
+    semantic_prerank_top_k: int = 10
 
     weike_session_restrict_cooldown_seconds: int = 180
     weike_search_api_degrade_streak_threshold: int = 2
     weike_search_api_degrade_cooldown_seconds: int = 180
+    weike_detail_fetch_concurrency: int = 4
 
     dual_review_enabled: bool = True
     dual_review_model: str = "Qwen/Qwen2.5-14B-Instruct"
@@ -95,6 +101,33 @@ class LegalResearchTuningConfig:
         if config_service is None:
             return cls()
         return cls(
+            corpus_index_enabled=cls._get_bool(
+                config_service, "LEGAL_RESEARCH_CORPUS_INDEX_ENABLED", cls.corpus_index_enabled
+            ),
+            corpus_prerank_top_k=cls._get_int(
+                config_service,
+                "LEGAL_RESEARCH_CORPUS_PRERANK_TOP_K",
+                cls.corpus_prerank_top_k,
+                0,
+                100,
+            ),
+            semantic_vector_store_enabled=cls._get_bool(
+                config_service, "LEGAL_RESEARCH_SEMANTIC_VECTOR_STORE_ENABLED", cls.semantic_vector_store_enabled
+            ),
+            semantic_prerank_top_k=cls._get_int(
+                config_service,
+                "LEGAL_RESEARCH_SEMANTIC_PRERANK_TOP_K",
+                cls.semantic_prerank_top_k,
+                0,
+                100,
+            ),
+            weike_detail_fetch_concurrency=cls._get_int(
+                config_service,
+                "LEGAL_RESEARCH_WEIKE_DETAIL_FETCH_CONCURRENCY",
+                cls.weike_detail_fetch_concurrency,
+                1,
+                16,
+            ),
             semantic_vector_always_on=cls._get_bool(
                 config_service, "LEGAL_RESEARCH_SEMANTIC_VECTOR_ALWAYS_ON", cls.semantic_vector_always_on
             ),
@@ -108,6 +141,12 @@ class LegalResearchTuningConfig:
             ),
         )
 
+    def detail_fetch_concurrency_for(self, source: str) -> int:
+        """按数据源返回案例详情并发抓取上限，未配置的数据源串行抓取。"""
+        if str(source or "").strip().lower() == "weike":
+            return max(1, int(self.weike_detail_fetch_concurrency))
+        return 1
+
     @property
     def normalized_recall_weights(self) -> tuple[float, float, float, float, float, float]:
         raw = [
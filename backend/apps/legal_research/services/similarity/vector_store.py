@@ -0,0 +1,398 @@
+"""案例相似度 - 本地语义向量库（float16 内存映射矩阵 + IVF 倒排聚类索引）.
+
+按 embedding 模型分目录持久化每一次计算过的语义向量：
+
+- vectors.f16：行优先 float16 矩阵（单位化后存储，内积即余弦），按需翻倍扩容
+- store.sqlite3：向量键（与 Django cache 键一致）→ 行号、来源、案例 ID、所属聚类
+- centroids.npy：行数达到阈值后由后台线程训练的球面 k-means 质心，检索时只扫描最近的若干聚类
+
+同一文本再次出现时直接读取本地向量，无需重新调用 embedding 接口；
+携带案例 ID 的向量可作为语料，在远程检索前做语义 top-k 召回。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+logger = logging.getLogger(__name__)
+
+VECTOR_STORE_SCHEMA_VERSION = 1
+VECTOR_FILENAME = "vectors.f16"
+METADATA_FILENAME = "store.sqlite3"
+CENTROIDS_FILENAME = "centroids.npy"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vectors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL DEFAULT '',
+    doc_id TEXT NOT NULL DEFAULT '',
+    cluster INTEGER NOT NULL DEFAULT -1
+);
+CREATE INDEX IF NOT EXISTS idx_vectors_doc ON vectors (source, doc_id);
+CREATE INDEX IF NOT EXISTS idx_vectors_cluster ON vectors (cluster);
+"""
+
+FloatMatrix = npt.NDArray[np.float32]
+
+
+@dataclass(frozen=True)
+class VectorHit:
+    source: str
+    doc_id: str
+    score: float
+
+
+def _normalize_source(source: str) -> str:
+    return str(source or "").strip().lower()
+
+
+def _unit_vector(vector: list[float] | npt.NDArray[np.floating]) -> FloatMatrix | None:
+    array = np.asarray(vector, dtype=np.float32).reshape(-1)
+    if not array.size or not np.all(np.isfinite(array)):
+        return None
+    norm = float(np.linalg.norm(array))
+    if norm <= 0:
+        return None
+    return array / norm
+
+
+class SemanticVectorStore:
+    """单个 embedding 模型的本地向量库；进程内线程安全，跨进程写入由 SQLite 事务串行化。"""
+
+    INITIAL_CAPACITY = 1024
+    IVF_MIN_ROWS = 4096
+    IVF_RETRAIN_GROWTH = 2.0
+    IVF_NPROBE = 8
+    IVF_TRAIN_SAMPLE = 20000
+    KMEANS_ITERATIONS = 10
+    SEARCH_CHUNK_ROWS = 65536
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = Path(directory)
+        self._vector_path = self._directory / VECTOR_FILENAME
+        self._centroids_path = self._directory / CENTROIDS_FILENAME
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._train_lock = threading.Lock()
+        self._train_thread: threading.Thread | None = None
+        self._initialized = False
+        self._reader: np.memmap | None = None
+        self._reader_rows = 0
+        self._centroids: FloatMatrix | None = None
+        self._centroids_version = ""
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    # ── 读写 ────────────────────────────────────────────────
+
+    def get(self, key: str) -> list[float] | None:
+        """按向量键读取已存储的（单位化）向量。"""
+        row = self._connection().execute("SELECT id FROM vectors WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        dim = self._dimension()
+        if dim <= 0:
+            return None
+        matrix = self._matrix(rows=int(row[0]), dim=dim)
+        return [float(v) for v in matrix[int(row[0]) - 1].astype(np.float32)]
+
+    def add(self, key: str, vector: list[float], *, source: str = "", doc_id: str = "") -> bool:
+        """写入向量；键已存在时仅补齐案例归属。返回是否新增。"""
+        unit = _unit_vector(vector)
+        if not key or unit is None:
+            return False
+        source_key = _normalize_source(source)
+        doc_key = str(doc_id or "").strip()
+
+        conn = self._connection()
+        existing = conn.execute("SELECT id, doc_id FROM vectors WHERE key = ?", (key,)).fetchone()
+        if existing is not None:
+            if doc_key and not existing[1]:
+                conn.execute(
+                    "UPDATE vectors SET source = ?, doc_id = ? WHERE id = ? AND doc_id = ''",
+                    (source_key, doc_key, existing[0]),
+                )
+            return False
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM vectors WHERE key = ?", (key,)).fetchone() is not None:
+                conn.execute("COMMIT")
+                return False
+            dim = self._dimension(conn)
+            if dim <= 0:
+                dim = int(unit.size)
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+            elif dim != unit.size:
+                conn.execute("ROLLBACK")
+                logger.warning("语义向量维度与向量库不一致", extra={"expected": dim, "actual": int(unit.size)})
+                return False
+            cursor = conn.execute(
+                "INSERT INTO vectors (key, source, doc_id, cluster) VALUES (?, ?, ?, ?)",
+                (key, source_key, doc_key, self._nearest_cluster(unit)),
+            )
+            row_id = int(cursor.lastrowid or 0)
+            self._write_row(row=row_id - 1, dim=dim, unit=unit)
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        self._schedule_ivf_training(rows=row_id)
+        return True
+
+    # ── 检索 ────────────────────────────────────────────────
+
+    def search(self, vector: list[float], *, top_k: int, source: str = "") -> list[VectorHit]:
+        """在带案例归属的向量中检索余弦最相近的 top_k；向量库较大时仅扫描最近聚类。"""
+        query = _unit_vector(vector)
+        dim = self._dimension()
+        if query is None or top_k <= 0 or dim != query.size:
+            return []
+        source_key = _normalize_source(source)
+        clusters = self._probe_clusters(query)
+        sql = "SELECT id, source, doc_id FROM vectors WHERE doc_id != ''"
+        params: list[object] = []
+        if source_key:
+            sql += " AND source = ?"
+            params.append(source_key)
+        if clusters:
+            placeholders = ",".join("?" for _ in clusters)
+            sql += f" AND cluster IN (-1, {placeholders})"
+            params.extend(clusters)
+        rows = self._connection().execute(sql, params).fetchall()
+        if not rows:
+            return []
+
+        ids = np.fromiter((int(r[0]) for r in rows), dtype=np.int64, count=len(rows))
+        matrix = self._matrix(rows=int(ids.max()), dim=dim)
+        scores = np.empty(ids.size, dtype=np.float32)
+        for start in range(0, ids.size, self.SEARCH_CHUNK_ROWS):
+            chunk = ids[start : start + self.SEARCH_CHUNK_ROWS] - 1
+            scores[start : start + chunk.size] = matrix[chunk].astype(np.float32) @ query
+        k = min(top_k, ids.size)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [
+            VectorHit(source=str(rows[i][1]), doc_id=str(rows[i][2]), score=max(0.0, min(1.0, float(scores[i]))))
+            for i in best
+        ]
+
+    def count(self) -> int:
+        row = self._connection().execute("SELECT COUNT(*) FROM vectors").fetchone()
+        return int(row[0] or 0) if row else 0
+
+    # ── IVF 索引 ────────────────────────────────────────────
+
+    def train_ivf(self, *, force: bool = False) -> bool:
+        """训练 IVF 质心并重新分配聚类；未达到阈值且未强制时跳过。返回是否写入了新索引。"""
+        conn = self._connection()
+        rows = self.count()
+        if rows <= 0 or not (force or self._ivf_due(conn, rows)):
+            return False
+        dim = self._dimension(conn)
+        matrix = self._matrix(rows=rows, dim=dim)
+        rng = np.random.default_rng(rows)
+        sample_ids = rng.choice(rows, size=min(rows, self.IVF_TRAIN_SAMPLE), replace=False)
+        centroids = self._train_centroids(matrix[np.sort(sample_ids)].astype(np.float32), rng=rng)
+
+        assignments: list[tuple[int, int]] = []
+        for start in range(0, rows, self.SEARCH_CHUNK_ROWS):
+            block = matrix[start : start + self.SEARCH_CHUNK_ROWS].astype(np.float32)
+            nearest = np.argmax(block @ centroids.T, axis=1)
+            assignments.extend((int(c), start + i + 1) for i, c in enumerate(nearest))
+
+        tmp_path = self._centroids_path.with_suffix(".tmp.npy")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 其他进程可能已在训练期间写入了覆盖更多行的索引
+            if not force and int(self._meta_value(conn, "ivf_rows") or 0) >= rows:
+                conn.execute("ROLLBACK")
+                return False
+            np.save(tmp_path, centroids)
+            os.replace(tmp_path, self._centroids_path)
+            conn.executemany("UPDATE vectors SET cluster = ? WHERE id = ?", assignments)
+            # 训练期间新增的行按旧质心分配，改回未分配，检索时始终参与扫描
+            conn.execute("UPDATE vectors SET cluster = -1 WHERE id > ?", (rows,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("ivf_rows", str(rows)), ("ivf_version", f"{rows}-{centroids.shape[0]}")],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        logger.info("语义向量库 IVF 索引已重建", extra={"rows": rows, "clusters": int(centroids.shape[0])})
+        return True
+
+    def _ivf_due(self, conn: sqlite3.Connection, rows: int) -> bool:
+        trained_rows = int(self._meta_value(conn, "ivf_rows") or 0)
+        return rows >= self.IVF_MIN_ROWS and not (trained_rows and rows < trained_rows * self.IVF_RETRAIN_GROWTH)
+
+    def _schedule_ivf_training(self, *, rows: int) -> None:
+        """达到阈值时在后台线程训练；同一时刻每个向量库最多一个训练线程，写入路径不等待。"""
+        if not self._ivf_due(self._connection(), rows):
+            return
+        if not self._train_lock.acquire(blocking=False):
+            return
+        try:
+            thread = threading.Thread(target=self._run_ivf_training, name="legal-research-ivf", daemon=True)
+            self._train_thread = thread
+            thread.start()
+        except BaseException:
+            self._train_lock.release()
+            raise
+
+    def _run_ivf_training(self) -> None:
+        try:
+            self.train_ivf()
+        except Exception:
+            logger.warning("语义向量库 IVF 索引训练失败", exc_info=True)
+        finally:
+            conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
+            self._train_lock.release()
+
+    def _train_centroids(self, sample: FloatMatrix, *, rng: np.random.Generator) -> FloatMatrix:
+        """球面 k-means：质心数取 sqrt(样本数)。"""
+        cluster_count = max(1, int(np.sqrt(sample.shape[0])))
+        centroids = sample[rng.choice(sample.shape[0], size=cluster_count, replace=False)].copy()
+        for _ in range(self.KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] <= 0
+            sums[empty] = centroids[empty]
+            norms[empty] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+        return centroids
+
+    def _probe_clusters(self, query: FloatMatrix) -> list[int]:
+        centroids = self._load_centroids()
+        if centroids is None or centroids.shape[1] != query.size:
+            return []
+        nprobe = min(self.IVF_NPROBE, centroids.shape[0])
+        return [int(c) for c in np.argsort(-(centroids @ query))[:nprobe]]
+
+    def _nearest_cluster(self, unit: FloatMatrix) -> int:
+        centroids = self._load_centroids()
+        if centroids is None or centroids.shape[1] != unit.size:
+            return -1
+        return int(np.argmax(centroids @ unit))
+
+    def _load_centroids(self) -> FloatMatrix | None:
+        version = self._meta_value(self._connection(), "ivf_version") or ""
+        with self._lock:
+            if version == self._centroids_version:
+                return self._centroids
+        centroids: FloatMatrix | None = None
+        if version:
+            try:
+                centroids = np.load(self._centroids_path).astype(np.float32)
+            except (OSError, ValueError):
+                logger.warning("语义向量库质心文件读取失败，回退全量扫描", exc_info=True)
+        with self._lock:
+            self._centroids = centroids
+            self._centroids_version = version
+        return centroids
+
+    # ── 存储 ────────────────────────────────────────────────
+
+    def _write_row(self, *, row: int, dim: int, unit: FloatMatrix) -> None:
+        row_bytes = dim * np.dtype(np.float16).itemsize
+        required = (row + 1) * row_bytes
+        current = self._vector_path.stat().st_size if self._vector_path.exists() else 0
+        if current < required:
+            capacity = max(self.INITIAL_CAPACITY * row_bytes, current)
+            while capacity < required:
+                capacity *= 2
+            with open(self._vector_path, "ab") as handle:
+                handle.truncate(capacity)
+        writer = np.memmap(self._vector_path, dtype=np.float16, mode="r+", offset=row * row_bytes, shape=(dim,))
+        writer[:] = unit.astype(np.float16)
+        writer.flush()
+        del writer
+
+    def _matrix(self, *, rows: int, dim: int) -> np.memmap:
+        """只读内存映射；文件扩容后重新映射。"""
+        with self._lock:
+            if self._reader is not None and self._reader_rows >= rows and self._reader.shape[1] == dim:
+                return self._reader
+            capacity_rows = self._vector_path.stat().st_size // (dim * np.dtype(np.float16).itemsize)
+            self._reader = np.memmap(self._vector_path, dtype=np.float16, mode="r", shape=(capacity_rows, dim))
+            self._reader_rows = capacity_rows
+            return self._reader
+
+    def _dimension(self, conn: sqlite3.Connection | None = None) -> int:
+        return int(self._meta_value(conn or self._connection(), "dim") or 0)
+
+    def _meta_value(self, conn: sqlite3.Connection, key: str) -> str | None:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return str(row[0]) if row else None
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        self._directory.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._directory / METADATA_FILENAME), timeout=30.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            if not self._initialized:
+                conn.executescript(_SCHEMA)
+                conn.execute(
+                    "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (str(VECTOR_STORE_SCHEMA_VERSION),),
+                )
+                self._initialized = True
+        self._local.conn = conn
+        return conn
+
+
+def model_directory_name(model: str) -> str:
+    """模型名转目录名：可读前缀 + 哈希后缀，避免路径字符与重名。"""
+    slug = re.sub(r"[^0-9A-Za-z._-]+", "_", model).strip("._")[:64] or "model"
+    digest = hashlib.sha256(model.encode("utf-8")).hexdigest()[:10]
+    return f"{slug}-{digest}"
+
+
+_stores: dict[str, SemanticVectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_semantic_vector_store(model: str) -> SemanticVectorStore:
+    """进程内按模型共享的向量库（MEDIA_ROOT/legal_research/vectors/<模型>/）。"""
+    store = _stores.get(model)
+    if store is not None:
+        return store
+    from django.conf import settings
+
+    with _stores_lock:
+        store = _stores.get(model)
+        if store is None:
+            directory = Path(settings.MEDIA_ROOT) / "legal_research" / "vectors" / model_directory_name(model)
+            store = SemanticVectorStore(directory)
+            _stores[model] = store
+        return store
@@ -44,6 +44,10 @@ class WeikeCaseClient(WeikeAuthMixin, WeikeSearchMixin, WeikeDocumentMixin, Weik
             int(getattr(config, "weike_search_api_degrade_cooldown_seconds", 180)),
         )
 
+    def supports_concurrent_detail_fetch(self, *, session: WeikeSession) -> bool:
+        """仅 HTTP 会话可跨线程并发请求；Playwright 页面必须在创建线程内串行使用。"""
+        return session.http_client is not None
+
     def open_session(  # pragma: no cover
         self,
         *,
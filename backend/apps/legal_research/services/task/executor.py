@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import re
+from contextlib import closing
 from typing import Any
 
 from apps.legal_research.models import LegalResearchSearchMode, LegalResearchTask
@@ -16,10 +17,11 @@ from apps.legal_research.services.executor_components import (
     ExecutorSourceGatewayMixin,
     ExecutorTaskLifecycleMixin,
 )
+from apps.legal_research.services.executor_components.pipeline import DetailPrefetcher
 from apps.legal_research.services.executor_components.policy_mixin import AdaptiveThresholdPolicy, DualReviewPolicy
 from apps.legal_research.services.similarity.service import CaseSimilarityService
 from apps.legal_research.services.similarity.tuning_config import LegalResearchTuningConfig
-from apps.legal_research.services.sources import get_case_source_client
+from apps.legal_research.services.sources import CaseDetail, get_case_source_client
 
 logger = logging.getLogger(__name__)
 
@@ -179,6 +181,34 @@ class LegalResearchExecutor(  # pragma: no cover
             feedback_term_weights: dict[str, int] = {}
             feedback_queries_added = 0
             detail_cache_local: dict[str, Any] = {}
+            detail_fetch_concurrency = self._resolve_detail_fetch_concurrency(
+                source_client=source_client,
+                session=session,
+                source=task.source,
+                tuning=tuning,
+            )
+            detail_prefetcher = DetailPrefetcher(
+                fetch=lambda item: self._fetch_case_detail_with_cache(
+                    source_client=source_client,
+                    session=session,
+                    source=task.source,
+                    item=item,
+                    task_id=str(task.id),
+                    local_cache=detail_cache_local,
+                    ttl_seconds=detail_cache_ttl_seconds,
+                ),
+                concurrency=detail_fetch_concurrency,
+            )
+
+            # ── 本地语料预排序：命中条目并入首个检索批次，详情多已在缓存中 ──
+            corpus_items = self._corpus_prerank_items(
+                task=task,
+                query_text=f"{scoring_keyword} {task.case_summary}",
+                tuning=tuning,
+                similarity=similarity,
+            )
+            if corpus_items:
+                logger.info("本地语料预排序命中 %s 篇", len(corpus_items), extra={"task_id": str(task.id)})
 
             scanned = 0
             matched = 0
@@ -216,7 +246,7 @@ class LegalResearchExecutor(  # pragma: no cover
                     fetch_limit = self._effective_fetch_limit(max_candidates=task.max_candidates, skipped=skipped)
                     batch_size = min(self.CANDIDATE_BATCH_SIZE, max(1, fetch_limit - fetched))
                     effective_advanced_query = getattr(task, "advanced_query", None) or field_queries
-                    items = self._fetch_candidate_batch_with_retry(
+                    remote_items = self._fetch_candidate_batch_with_retry(
                         source_client=source_client,
                         session=session,
                         keyword=search_keyword,
@@ -230,10 +260,12 @@ class LegalResearchExecutor(  # pragma: no cover
                         date_to=str(getattr(task, "date_to", "") or ""),
                         raw_payload=intercepted_payload,
                     )
+                    items = [*corpus_items, *remote_items]
+                    corpus_items = []
 
                     if not items:
                         break
-                    query_offset += len(items)
+                    query_offset += len(remote_items)
 
                     unique_items, duplicate_in_batch = self._reserve_new_items(items=items, seen_doc_ids=seen_doc_ids)
                     if not unique_items:
@@ -255,23 +287,9 @@ class LegalResearchExecutor(  # pragma: no cover
                     rerank_budget = self._coarse_rerank_budget(task=task, matched=matched, batch_size=len(unique_items))
                     rerank_used = 0
                     deferred_candidates: list[tuple[Any, float, str]] = []
-                    # ── [4] 候选预筛 + 宽召回 → 收集待评分批次 ──
-                    pending_rerank: list[tuple[Any, float, str]] = []
+                    # ── [4] 标题预筛（仅依赖检索结果，先于详情抓取）──
+                    fetch_items: list[Any] = []
                     for item in unique_items:
-                        if self._is_cancel_requested(task.id):
-                            self._mark_cancelled(task=task, scanned=scanned, matched=matched, skipped=skipped)
-                            return {
-                                "task_id": str(task.id),
-                                "status": task.status,
-                                "scanned_count": scanned,
-                                "matched_count": matched,
-                                "skipped_count": skipped,
-                            }
-
-                        if matched >= task.target_count:
-                            break
-
-                        # ── [4] 标题预筛 ──
                         if title_prefilter_enabled:
                             title_hint = getattr(item, "title_hint", "") or ""
                             if not self._title_prefilter(
@@ -283,48 +301,68 @@ class LegalResearchExecutor(  # pragma: no cover
                                 skipped += 1
                                 query_metric["skipped"] = query_metric.get("skipped", 0) + 1
                                 continue
+                        fetch_items.append(item)
 
-                        detail = self._fetch_case_detail_with_cache(
-                            source_client=source_client,
-                            session=session,
-                            source=task.source,
-                            item=item,
-                            task_id=str(task.id),
-                            local_cache=detail_cache_local,
-                            ttl_seconds=detail_cache_ttl_seconds,
+                    # ── [5] 流水线：详情并发预取 → 宽召回 → LLM 评分（评分与抓取重叠）──
+                    pending_rerank: list[tuple[Any, float, str]] = []
+                    with self._start_scoring_stage(
+                        similarity=similarity,
+                        task=task,
+                        task_id=str(task.id),
+                        concurrency=llm_scoring_concurrency,
+                    ) as scoring_stage:
+                        cancelled = False
+                        detail_batches = detail_prefetcher.iter_detail_batches(
+                            fetch_items, max_batch_size=self.COARSE_RECALL_BATCH_SIZE
                         )
-                        if detail is None:
-                            skipped += 1
-                            query_metric["skipped"] = query_metric.get("skipped", 0) + 1
-                            self._update_progress(task=task, scanned=scanned, matched=matched, skipped=skipped)
-                            continue
-
-                        scanned += 1
-                        query_metric["scanned"] += 1
+                        with closing(detail_batches) as detail_stream:
+                            for detail_batch in detail_stream:
+                                if self._is_cancel_requested(task.id):
+                                    cancelled = True
+                                    break
+
+                                details: list[CaseDetail] = []
+                                for _item, detail in detail_batch:
+                                    if detail is None:
+                                        skipped += 1
+                                        query_metric["skipped"] = query_metric.get("skipped", 0) + 1
+                                        self._update_progress(
+                                            task=task, scanned=scanned, matched=matched, skipped=skipped
+                                        )
+                                        continue
+                                    details.append(detail)
+                                if not details:
+                                    continue
 
-                        # ── [2] 宽召回（更激进过滤）──
-                        coarse_score, coarse_reason = self._coarse_recall(
-                            similarity=similarity,
-                            keyword=scoring_keyword,
-                            case_summary=task.case_summary,
-                            detail=detail,
-                        )
-                        should_rerank = self._should_rerank(
-                            coarse_score=coarse_score,
-                            threshold=rerank_threshold,
-                            rerank_used=rerank_used,
-                            rerank_budget=rerank_budget,
-                        )
-                        if not should_rerank:
-                            deferred_candidates.append((detail, coarse_score, coarse_reason))
-                            self._update_progress(task=task, scanned=scanned, matched=matched, skipped=skipped)
-                            continue
-                        rerank_used += 1
-                        pending_rerank.append((detail, coarse_score, coarse_reason))
+                                # ── [2] 宽召回（更激进过滤，已就绪的详情整批计算）──
+                                coarse_results = self._coarse_recall_batch(
+                                    similarity=similarity,
+                                    keyword=scoring_keyword,
+                                    case_summary=task.case_summary,
+                                    details=details,
+                                    source=task.source,
+                                )
+                                self._index_case_details(source=task.source, details=details, tuning=tuning)
+                                for detail, (coarse_score, coarse_reason) in zip(details, coarse_results, strict=True):
+                                    scanned += 1
+                                    query_metric["scanned"] += 1
+                                    should_rerank = self._should_rerank(
+                                        coarse_score=coarse_score,
+                                        threshold=rerank_threshold,
+                                        rerank_used=rerank_used,
+                                        rerank_budget=rerank_budget,
+                                    )
+                                    if not should_rerank:
+                                        deferred_candidates.append((detail, coarse_score, coarse_reason))
+                                        self._update_progress(
+                                            task=task, scanned=scanned, matched=matched, skipped=skipped
+                                        )
+                                        continue
+                                    rerank_used += 1
+                                    pending_rerank.append((detail, coarse_score, coarse_reason))
+                                    scoring_stage.submit((detail, coarse_score, coarse_reason))
 
-                    # ── [1] 并发 LLM 评分 ──
-                    if pending_rerank and matched < task.target_count:
-                        if self._is_cancel_requested(task.id):
+                        if cancelled:
                             self._mark_cancelled(task=task, scanned=scanned, matched=matched, skipped=skipped)
                             return {
                                 "task_id": str(task.id),
@@ -333,146 +371,163 @@ class LegalResearchExecutor(  # pragma: no cover
                                 "matched_count": matched,
                                 "skipped_count": skipped,
                             }
-                        task.message = f"正在并发评分 {len(pending_rerank)} 篇候选（{llm_scoring_concurrency} 并发）"
-                        self._save_task_safely(task, update_fields=["message", "updated_at"])
 
-                        scored_results = self._batch_rerank_candidates(
-                            candidates=pending_rerank,
-                            similarity=similarity,
-                            task=task,
-                            task_id=str(task.id),
-                            concurrency=llm_scoring_concurrency,
-                            tuning=tuning,
-                        )
-                        for detail, sim, coarse_score, coarse_reason in scored_results:
-                            if matched >= task.target_count:
-                                break
-                            if not task.llm_model and sim.model:
-                                task.llm_model = sim.model
+                        # ── [1] 并发 LLM 评分（收集已提前提交的评分结果）──
+                        if pending_rerank and matched < task.target_count:
+                            if self._is_cancel_requested(task.id):
+                                self._mark_cancelled(task=task, scanned=scanned, matched=matched, skipped=skipped)
+                                return {
+                                    "task_id": str(task.id),
+                                    "status": task.status,
+                                    "scanned_count": scanned,
+                                    "matched_count": matched,
+                                    "skipped_count": skipped,
+                                }
+                            task.message = (
+                                f"正在并发评分 {len(pending_rerank)} 篇候选（{llm_scoring_concurrency} 并发）"
+                            )
+                            self._save_task_safely(task, update_fields=["message", "updated_at"])
 
-                            # 近阈值复判
-                            if sim.score < effective_min_similarity_threshold and sim.score >= max(
-                                0.0, effective_min_similarity_threshold - self.BORDERLINE_RECHECK_GAP
-                            ):
-                                rescored = self._rescore_borderline_with_retry(
-                                    similarity=similarity,
-                                    task=task,
+                            scored_results = self._batch_rerank_candidates(
+                                candidates=pending_rerank,
+                                similarity=similarity,
+                                task=task,
+                                task_id=str(task.id),
+                                concurrency=llm_scoring_concurrency,
+                                tuning=tuning,
+                                scoring_stage=scoring_stage,
+                            )
+                            # 评分已全部收回，下载 PDF 前先释放评分线程
+                            scoring_stage.close()
+                            for detail, sim, coarse_score, coarse_reason in scored_results:
+                                if matched >= task.target_count:
+                                    break
+                                if not task.llm_model and sim.model:
+                                    task.llm_model = sim.model
+
+                                # 近阈值复判
+                                if sim.score < effective_min_similarity_threshold and sim.score >= max(
+                                    0.0, effective_min_similarity_threshold - self.BORDERLINE_RECHECK_GAP
+                                ):
+                                    rescored = self._rescore_borderline_with_retry(
+                                        similarity=similarity,
+                                        task=task,
+                                        detail=detail,
+                                        first_score=sim.score,
+                                        first_reason=sim.reason,
+                                        task_id=str(task.id),
+                                    )
+                                    if rescored is not None and rescored.score > sim.score:
+                                        sim = rescored
+
+                                # 双模型复核
+                                dual_review_metadata: dict[str, Any] | None = None
+                                similarity_metadata = self._extract_similarity_metadata(similarity=sim)
+                                if (
+                                    dual_review_policy.enabled
+                                    and sim.score >= dual_review_policy.trigger_floor
+                                    and str(getattr(sim, "model", "") or "").strip() != dual_review_policy.review_model
+                                ):
+                                    reviewed = self._review_case_with_retry(
+                                        similarity=similarity,
+                                        task=task,
+                                        detail=detail,
+                                        task_id=str(task.id),
+                                        review_model=dual_review_policy.review_model,
+                                        primary_score=sim.score,
+                                        primary_reason=sim.reason,
+                                    )
+                                    if reviewed is not None:
+                                        merged_score, merged_reason, merged_model, dual_review_metadata = (
+                                            self._merge_dual_review_scores(
+                                                primary=sim,
+                                                reviewed=reviewed,
+                                                dual_review_policy=dual_review_policy,
+                                            )
+                                        )
+                                        sim.score = merged_score
+                                        sim.reason = merged_reason
+                                        sim.model = merged_model
+
+                                # 反馈更新
+                                self._update_feedback_terms(
+                                    feedback_term_weights=feedback_term_weights,
+                                    detail=detail,
+                                    reason=sim.reason,
+                                    similarity_score=sim.score,
+                                    min_similarity=effective_min_similarity_threshold,
+                                    feedback_min_score_floor=feedback_min_score_floor,
+                                    feedback_score_margin=feedback_score_margin,
+                                )
+
+                                if sim.score < effective_min_similarity_threshold:
+                                    continue
+
+                                # 命中 → 下载 PDF
+                                pdf = self._download_pdf_with_retry(
+                                    source_client=source_client,
+                                    session=session,
                                     detail=detail,
-                                    first_score=sim.score,
-                                    first_reason=sim.reason,
                                     task_id=str(task.id),
                                 )
-                                if rescored is not None and rescored.score > sim.score:
-                                    sim = rescored
-
-                            # 双模型复核
-                            dual_review_metadata: dict[str, Any] | None = None
-                            similarity_metadata = self._extract_similarity_metadata(similarity=sim)
-                            if (
-                                dual_review_policy.enabled
-                                and sim.score >= dual_review_policy.trigger_floor
-                                and str(getattr(sim, "model", "") or "").strip() != dual_review_policy.review_model
-                            ):
-                                reviewed = self._review_case_with_retry(
-                                    similarity=similarity,
+                                if pdf is None:
+                                    skipped += 1
+                                    continue
+
+                                matched += 1
+                                query_metric["matched"] += 1
+                                merged_metadata: dict[str, Any] | None = None
+                                if similarity_metadata or dual_review_metadata:
+                                    merged_metadata = {}
+                                    if similarity_metadata:
+                                        merged_metadata.update(similarity_metadata)
+                                    if dual_review_metadata:
+                                        merged_metadata.update(dual_review_metadata)
+                                self._save_result(
                                     task=task,
                                     detail=detail,
-                                    task_id=str(task.id),
-                                    review_model=dual_review_policy.review_model,
-                                    primary_score=sim.score,
-                                    primary_reason=sim.reason,
+                                    similarity=sim,
+                                    rank=matched,
+                                    pdf=pdf,
+                                    coarse_score=coarse_score,
+                                    coarse_reason=coarse_reason,
+                                    extra_metadata=merged_metadata,
                                 )
-                                if reviewed is not None:
-                                    merged_score, merged_reason, merged_model, dual_review_metadata = (
-                                        self._merge_dual_review_scores(
-                                            primary=sim,
-                                            reviewed=reviewed,
-                                            dual_review_policy=dual_review_policy,
-                                        )
-                                    )
-                                    sim.score = merged_score
-                                    sim.reason = merged_reason
-                                    sim.model = merged_model
-
-                            # 反馈更新
-                            self._update_feedback_terms(
-                                feedback_term_weights=feedback_term_weights,
-                                detail=detail,
-                                reason=sim.reason,
-                                similarity_score=sim.score,
-                                min_similarity=effective_min_similarity_threshold,
-                                feedback_min_score_floor=feedback_min_score_floor,
-                                feedback_score_margin=feedback_score_margin,
-                            )
-
-                            if sim.score < effective_min_similarity_threshold:
-                                continue
 
-                            # 命中 → 下载 PDF
-                            pdf = self._download_pdf_with_retry(
-                                source_client=source_client,
-                                session=session,
-                                detail=detail,
-                                task_id=str(task.id),
-                            )
-                            if pdf is None:
-                                skipped += 1
-                                continue
-
-                            matched += 1
-                            query_metric["matched"] += 1
-                            merged_metadata: dict[str, Any] | None = None
-                            if similarity_metadata or dual_review_metadata:
-                                merged_metadata = {}
-                                if similarity_metadata:
-                                    merged_metadata.update(similarity_metadata)
-                                if dual_review_metadata:
-                                    merged_metadata.update(dual_review_metadata)
-                            self._save_result(
-                                task=task,
-                                detail=detail,
-                                similarity=sim,
-                                rank=matched,
-                                pdf=pdf,
-                                coarse_score=coarse_score,
-                                coarse_reason=coarse_reason,
-                                extra_metadata=merged_metadata,
-                            )
+                            # 批量评分后更新反馈检索式
+                            if not single_search_mode:
+                                feedback_queries_added, feedback_query = self._maybe_append_feedback_query(
+                                    search_keywords=search_keywords,
+                                    search_query_set=search_query_set,
+                                    feedback_term_weights=feedback_term_weights,
+                                    keyword=task.keyword,
+                                    case_summary=task.case_summary,
+                                    feedback_queries_added=feedback_queries_added,
+                                    feedback_query_limit=feedback_query_limit,
+                                    feedback_min_terms=feedback_min_terms,
+                                )
+                                if feedback_query and feedback_query not in feedback_queries:
+                                    feedback_queries.append(feedback_query)
 
-                        # 批量评分后更新反馈检索式
-                        if not single_search_mode:
-                            feedback_queries_added, feedback_query = self._maybe_append_feedback_query(
-                                search_keywords=search_keywords,
-                                search_query_set=search_query_set,
-                                feedback_term_weights=feedback_term_weights,
-                                keyword=task.keyword,
-                                case_summary=task.case_summary,
-                                feedback_queries_added=feedback_queries_added,
-                                feedback_query_limit=feedback_query_limit,
-                                feedback_min_terms=feedback_min_terms,
-                            )
-                            if feedback_query and feedback_query not in feedback_queries:
-                                feedback_queries.append(feedback_query)
-
-                        self._update_progress(task=task, scanned=scanned, matched=matched, skipped=skipped)
-                        (
-                            effective_min_similarity_threshold,
-                            adaptive_checkpoint_scanned,
-                            adaptive_checkpoint_matched,
-                            threshold_lowered,
-                        ) = self._maybe_decay_min_similarity_threshold(
-                            current_threshold=effective_min_similarity_threshold,
-                            scanned=scanned,
-                            matched=matched,
-                            checkpoint_scanned=adaptive_checkpoint_scanned,
-                            checkpoint_matched=adaptive_checkpoint_matched,
-                            policy=adaptive_threshold_policy,
-                        )
-                        if threshold_lowered:
-                            lowest_min_similarity_threshold = min(
-                                lowest_min_similarity_threshold,
+                            self._update_progress(task=task, scanned=scanned, matched=matched, skipped=skipped)
+                            (
                                 effective_min_similarity_threshold,
+                                adaptive_checkpoint_scanned,
+                                adaptive_checkpoint_matched,
+                                threshold_lowered,
+                            ) = self._maybe_decay_min_similarity_threshold(
+                                current_threshold=effective_min_similarity_threshold,
+                                scanned=scanned,
+                                matched=matched,
+                                checkpoint_scanned=adaptive_checkpoint_scanned,
+                                checkpoint_matched=adaptive_checkpoint_matched,
+                                policy=adaptive_threshold_policy,
                             )
+                            if threshold_lowered:
+                                lowest_min_similarity_threshold = min(
+                                    lowest_min_similarity_threshold,
+                                    effective_min_similarity_threshold,
+                                )
 
                     if matched < task.target_count and deferred_candidates:
                         deferred_limit = self._deferred_rerank_budget(
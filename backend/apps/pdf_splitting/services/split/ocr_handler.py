@@ -6,6 +6,8 @@ import hashlib
 import json
 import logging
 import os
+import time
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
@@ -16,8 +18,10 @@ from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 
 from apps.automation.services.ocr.ocr_service import OCRService  # 保留直接构造：需要运行时 use_v5 参数控制精度/速度
+from apps.core.services.ocr_page_cache import SHARED_PROFILE, OcrPageCache, get_ocr_page_cache
 from apps.pdf_splitting.models import PdfSplitOcrProfile
 
+from .ocr_pool import get_ocr_process_pool, render_page_pixels
 from .split_models import OCRPageResult, OCRRuntimeProfile
 
 logger = logging.getLogger("apps.pdf_splitting")
@@ -34,13 +38,10 @@ def _ocr_pages_worker(
     ocr_service = OCRService(use_v5=use_v5)
     try:
         with fitz.open(pdf_path) as doc:
-            matrix = fitz.Matrix(dpi / 72, dpi / 72)
             for page_no in page_numbers:
+                started = time.perf_counter()
                 try:
-                    page = doc.load_page(page_no - 1)
-                    pix = page.get_pixmap(matrix=matrix)
-                    image_bytes = pix.tobytes("png")
-                    text = ocr_service.recognize_bytes(image_bytes)
+                    text = ocr_service.recognize_array(render_page_pixels(doc, page_no, dpi))
                     ocr_failed = not bool(text)
                 except Exception:
                     logger.exception("pdf_split_page_ocr_worker_failed", extra={"page_no": page_no})
@@ -52,6 +53,7 @@ def _ocr_pages_worker(
                         text=text,
                         source_method="ocr" if text else "ocr_failed",
                         ocr_failed=ocr_failed,
+                        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
                     )
                 )
     except Exception:
@@ -69,7 +71,16 @@ def _ocr_pages_worker(
 
 
 class OCRHandler:
-    """OCR 子系统的入口，封装并行识别、缓存、配置解析。"""
+    """OCR 子系统的入口，封装并行识别、缓存、配置解析。
+
+    识别结果写入跨子系统共享的 OCR 页面缓存（apps.core.services.ocr_page_cache）；
+    balanced 档位与文本提取、发票识别使用同一渲染参数与引擎，其余档位未命中自身条目时
+    也会读取共享参数下的结果。旧版按页 JSON 缓存仅作读取兜底，命中后迁移到共享缓存。
+    识别失败的页面不缓存。
+    """
+
+    def __init__(self, page_cache: OcrPageCache | None = None) -> None:
+        self._page_cache = page_cache
 
     def resolve_runtime_profile(self, profile_key: str) -> OCRRuntimeProfile:
         normalized = str(profile_key or "").strip().lower()
@@ -102,7 +113,13 @@ class OCRHandler:
         pdf_path: Path,
         page_numbers: list[int],
         runtime_profile: OCRRuntimeProfile,
+        on_page: Callable[[OCRPageResult], None] | None = None,
     ) -> dict[int, OCRPageResult]:  # pragma: no cover
+        """
+        识别指定页面；on_page 在主线程中按完成顺序逐页回调（用于进度与耗时统计）
+
+        并发数 > 1 时优先使用常驻 OCR 进程池，不可用时退回线程池。
+        """
         if not page_numbers:
             return {}
 
@@ -113,8 +130,47 @@ class OCRHandler:
                 use_v5=runtime_profile.use_v5,
                 dpi=runtime_profile.dpi,
             )
-            return {item.page_no: item for item in result_list}
+            return self._notify({item.page_no: item for item in result_list}, on_page)
+
+        pool = get_ocr_process_pool(runtime_profile)
+        if pool is not None:
+            results = pool.recognize_pages(
+                pdf_path=pdf_path,
+                page_numbers=page_numbers,
+                dpi=runtime_profile.dpi,
+                on_page=on_page,
+            )
+        else:
+            results = self._thread_pool_ocr(
+                pdf_path=pdf_path,
+                page_numbers=page_numbers,
+                runtime_profile=runtime_profile,
+                on_page=on_page,
+            )
+
+        if len(results) < len(page_numbers):
+            missing_pages = [page_no for page_no in page_numbers if page_no not in results]
+            logger.warning(
+                "pdf_split_parallel_ocr_missing_results",
+                extra={"missing_pages": len(missing_pages), "total_pages": len(page_numbers)},
+            )
+            missing = _ocr_pages_worker(
+                pdf_path=pdf_path.as_posix(),
+                page_numbers=missing_pages,
+                use_v5=runtime_profile.use_v5,
+                dpi=runtime_profile.dpi,
+            )
+            results.update(self._notify({item.page_no: item for item in missing}, on_page))
+        return results
 
+    def _thread_pool_ocr(
+        self,
+        *,
+        pdf_path: Path,
+        page_numbers: list[int],
+        runtime_profile: OCRRuntimeProfile,
+        on_page: Callable[[OCRPageResult], None] | None,
+    ) -> dict[int, OCRPageResult]:  # pragma: no cover
         results: dict[int, OCRPageResult] = {}
         chunks = self._chunk_pages(page_numbers=page_numbers, chunk_count=runtime_profile.workers)
         with ThreadPoolExecutor(max_workers=runtime_profile.workers) as executor:
@@ -132,31 +188,24 @@ class OCRHandler:
             for future in as_completed(future_map):
                 chunk = future_map[future]
                 try:
-                    for item in future.result():
-                        results[item.page_no] = item
+                    chunk_results = future.result()
                 except Exception:
                     logger.exception("pdf_split_parallel_ocr_failed_chunk", extra={"chunk_size": len(chunk)})
-                    for item in _ocr_pages_worker(
+                    chunk_results = _ocr_pages_worker(
                         pdf_path=pdf_path.as_posix(),
                         page_numbers=chunk,
                         use_v5=runtime_profile.use_v5,
                         dpi=runtime_profile.dpi,
-                    ):
-                        results[item.page_no] = item
+                    )
+                results.update(self._notify({item.page_no: item for item in chunk_results}, on_page))
+        return results
 
-        if len(results) < len(page_numbers):
-            missing_pages = [page_no for page_no in page_numbers if page_no not in results]
-            logger.warning(
-                "pdf_split_parallel_ocr_missing_results",
-                extra={"missing_pages": len(missing_pages), "total_pages": len(page_numbers)},
-            )
-            for item in _ocr_pages_worker(
-                pdf_path=pdf_path.as_posix(),
-                page_numbers=missing_pages,
-                use_v5=runtime_profile.use_v5,
-                dpi=runtime_profile.dpi,
-            ):
-                results[item.page_no] = item
+    def _notify(
+        self, results: dict[int, OCRPageResult], on_page: Callable[[OCRPageResult], None] | None
+    ) -> dict[int, OCRPageResult]:
+        if on_page is not None:
+            for item in results.values():
+                on_page(item)
         return results
 
     def sha256_file(self, file_path: Path) -> str:
@@ -169,7 +218,77 @@ class OCRHandler:
                 digest.update(chunk)
         return digest.hexdigest()
 
-    def read_ocr_cache(self, *, pdf_hash: str, profile_key: str, page_no: int) -> OCRPageResult | None:
+    def engine_version(self, runtime_profile: OCRRuntimeProfile) -> str:
+        """当前 OCR 引擎版本（每次分析任务取一次，作为共享缓存键的一部分）"""
+        return OCRService(use_v5=runtime_profile.use_v5).engine_version
+
+    def shared_engine_version(self) -> str:
+        """其他子系统（ServiceLocator 默认 OCR 服务）使用的引擎版本"""
+        return OCRService().engine_version
+
+    def read_ocr_cache(
+        self,
+        *,
+        pdf_hash: str,
+        profile_key: str,
+        page_no: int,
+        engine_version: str = "",
+        shared_engine_version: str = "",
+    ) -> OCRPageResult | None:
+        page_cache = self._shared_page_cache(engine_version)
+        if page_cache is not None:
+            keys = [(self._page_cache_profile(profile_key), engine_version)]
+            if shared_engine_version and (SHARED_PROFILE, shared_engine_version) not in keys:
+                keys.append((SHARED_PROFILE, shared_engine_version))
+            for profile, version in keys:
+                entry = page_cache.get(pdf_hash, page_no, profile=profile, engine_version=version)
+                if entry is not None:
+                    return OCRPageResult(
+                        page_no=page_no,
+                        text=entry.text,
+                        source_method="ocr_cache",
+                        ocr_failed=False,
+                    )
+
+        legacy = self._read_legacy_ocr_cache(pdf_hash=pdf_hash, profile_key=profile_key, page_no=page_no)
+        if legacy is not None and legacy.ocr_failed:
+            return None
+        if legacy is not None and page_cache is not None:
+            page_cache.put(
+                pdf_hash,
+                page_no,
+                profile=self._page_cache_profile(profile_key),
+                engine_version=engine_version,
+                text=legacy.text,
+                ocr_failed=legacy.ocr_failed,
+            )
+        return legacy
+
+    def write_ocr_cache(
+        self, *, pdf_hash: str, profile_key: str, result: OCRPageResult, engine_version: str = ""
+    ) -> None:  # pragma: no cover
+        if result.ocr_failed:
+            return
+        page_cache = self._shared_page_cache(engine_version)
+        if page_cache is not None:
+            page_cache.put(
+                pdf_hash,
+                result.page_no,
+                profile=self._page_cache_profile(profile_key),
+                engine_version=engine_version,
+                text=result.text,
+                ocr_failed=result.ocr_failed,
+            )
+            return
+        rel_path = self._ocr_cache_rel_path(pdf_hash=pdf_hash, profile_key=profile_key, page_no=result.page_no)
+        payload = {
+            "text": result.text,
+            "ocr_failed": result.ocr_failed,
+            "source_method": result.source_method,
+        }
+        default_storage.save(rel_path, ContentFile(json.dumps(payload, ensure_ascii=False).encode("utf-8")))
+
+    def _read_legacy_ocr_cache(self, *, pdf_hash: str, profile_key: str, page_no: int) -> OCRPageResult | None:
         rel_path = self._ocr_cache_rel_path(pdf_hash=pdf_hash, profile_key=profile_key, page_no=page_no)
         if not default_storage.exists(rel_path):
             return None
@@ -188,14 +307,16 @@ class OCRHandler:
             logger.exception("pdf_split_ocr_cache_read_failed", extra={"cache_file": rel_path})
             return None
 
-    def write_ocr_cache(self, *, pdf_hash: str, profile_key: str, result: OCRPageResult) -> None:  # pragma: no cover
-        rel_path = self._ocr_cache_rel_path(pdf_hash=pdf_hash, profile_key=profile_key, page_no=result.page_no)
-        payload = {
-            "text": result.text,
-            "ocr_failed": result.ocr_failed,
-            "source_method": result.source_method,
-        }
-        default_storage.save(rel_path, ContentFile(json.dumps(payload, ensure_ascii=False).encode("utf-8")))
+    def _shared_page_cache(self, engine_version: str) -> OcrPageCache | None:
+        if not engine_version:
+            return None
+        if self._page_cache is None:
+            self._page_cache = get_ocr_page_cache()
+        return self._page_cache
+
+    def _page_cache_profile(self, profile_key: str) -> str:
+        """共享缓存的 OCR 参数：以渲染 DPI 区分（模型档位已包含在引擎版本中）"""
+        return f"dpi={self.resolve_runtime_profile(profile_key).dpi}"
 
     @staticmethod
     def _ocr_cache_rel_path(*, pdf_hash: str, profile_key: str, page_no: int) -> str:
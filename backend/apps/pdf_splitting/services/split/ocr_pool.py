@@ -0,0 +1,210 @@
+"""OCR 进程池：每个工作进程常驻一个预热好的 OCR 引擎。
+
+线程池方案中 fitz 渲染与 ONNX 推理争抢 GIL，且每个分块都要重新构造 OCRService。
+这里改为：
+- 主进程用 fitz 渲染页面，得到 RGB 像素数组（不再编码为 PNG）；
+- 渲染结果提交到进程池的共享任务队列，空闲的工作进程自行领取；
+- 每个工作进程在生命周期内只初始化一次 OCRService 并预热本地引擎；
+- 在途页面数有上限（工作进程数 × 2），渲染不会远远跑在识别前面而占满内存；
+- 每页返回识别耗时，由调用方汇总到任务进度与摘要。
+
+工作进程异常退出时丢弃并重建进程池，未完成的页面由调用方兜底处理。
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from apps.core.process_pool import bootstrap_worker, can_start_worker_processes
+
+from .split_models import OCRPageResult, OCRRuntimeProfile
+
+logger = logging.getLogger("apps.pdf_splitting")
+
+DEFAULT_START_METHOD = "spawn"
+
+_worker_ocr: Any = None
+
+
+def _init_ocr_worker(use_v5: bool) -> None:
+    """工作进程初始化（经 bootstrap_worker 调用）：创建并预热进程内常驻的 OCRService。"""
+    global _worker_ocr
+
+    from apps.automation.services.ocr.ocr_service import OCRService
+
+    service = OCRService(use_v5=use_v5)
+    if service.provider != "paddleocr_api":
+        _ = service.ocr  # 加载本地模型
+    _worker_ocr = service
+
+
+def _recognize_page(page_no: int, pixels: np.ndarray) -> tuple[int, str, float]:
+    if _worker_ocr is None:
+        raise RuntimeError("OCR 工作进程未初始化")
+    started = time.perf_counter()
+    text = _worker_ocr.recognize_array(pixels)
+    return page_no, text, (time.perf_counter() - started) * 1000
+
+
+def render_page_pixels(doc: Any, page_no: int, dpi: int) -> np.ndarray:
+    """将页面渲染为 RGB 像素数组 [H, W, 3]"""
+    import fitz
+
+    page = doc.load_page(page_no - 1)
+    pix = page.get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72), colorspace=fitz.csRGB, alpha=False)
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n).copy()
+
+
+class OCRProcessPool:
+    """常驻 OCR 进程池（同一 OCR 模型配置共享）"""
+
+    def __init__(self, *, max_workers: int, use_v5: bool, start_method: str = DEFAULT_START_METHOD) -> None:
+        self._max_workers = max(1, max_workers)
+        self._use_v5 = use_v5
+        self._start_method = start_method
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def concurrency(self) -> int:
+        return self._max_workers
+
+    def recognize_pages(
+        self,
+        *,
+        pdf_path: Path,
+        page_numbers: list[int],
+        dpi: int,
+        on_page: Callable[[OCRPageResult], None] | None = None,
+        render: Callable[[Any, int, int], np.ndarray] = render_page_pixels,
+    ) -> dict[int, OCRPageResult]:
+        """
+        渲染并识别指定页面
+
+        Returns:
+            页码 → 识别结果；进程池崩溃时只包含已完成的页面
+        """
+        import fitz
+
+        executor = self._get_executor()
+        results: dict[int, OCRPageResult] = {}
+        in_flight: dict[Future[tuple[int, str, float]], int] = {}
+        max_in_flight = self._max_workers * 2
+
+        def collect(done: set[Future[tuple[int, str, float]]]) -> None:
+            for future in done:
+                page_no = in_flight.pop(future)
+                try:
+                    _, text, elapsed_ms = future.result()
+                    result = _page_result(page_no, text, elapsed_ms)
+                except BrokenProcessPool:
+                    raise
+                except Exception:
+                    logger.exception("pdf_split_page_ocr_worker_failed", extra={"page_no": page_no})
+                    result = _page_result(page_no, "", 0.0, failed=True)
+                results[page_no] = result
+                if on_page is not None:
+                    on_page(result)
+
+        try:
+            with fitz.open(pdf_path.as_posix()) as doc:
+                for page_no in page_numbers:
+                    if len(in_flight) >= max_in_flight:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    try:
+                        pixels = render(doc, page_no, dpi)
+                    except Exception:
+                        logger.exception("pdf_split_page_render_failed", extra={"page_no": page_no})
+                        results[page_no] = _page_result(page_no, "", 0.0, failed=True)
+                        if on_page is not None:
+                            on_page(results[page_no])
+                        continue
+                    in_flight[executor.submit(_recognize_page, page_no, pixels)] = page_no
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        except BrokenProcessPool:
+            logger.warning(
+                "pdf_split_ocr_pool_broken",
+                extra={"completed_pages": len(results), "total_pages": len(page_numbers)},
+            )
+            self._discard_executor(executor)
+        return results
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context(self._start_method),
+                    initializer=bootstrap_worker,
+                    initargs=(f"{__name__}._init_ocr_worker", self._use_v5),
+                )
+                logger.info(
+                    "pdf_split_ocr_pool_started",
+                    extra={"max_workers": self._max_workers, "use_v5": self._use_v5},
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _page_result(page_no: int, text: str, elapsed_ms: float, *, failed: bool = False) -> OCRPageResult:
+    return OCRPageResult(
+        page_no=page_no,
+        text=text,
+        source_method="ocr" if text else "ocr_failed",
+        ocr_failed=failed or not text,
+        elapsed_ms=round(elapsed_ms, 1),
+    )
+
+
+_pools: dict[tuple[bool, int], OCRProcessPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_ocr_process_pool(runtime_profile: OCRRuntimeProfile) -> OCRProcessPool | None:
+    """
+    获取进程内共享的 OCR 进程池（按模型与并发数区分）
+
+    Returns:
+        进程池；并发数 <= 1、被 settings.PDF_SPLIT_OCR_PROCESS_POOL 关闭或当前进程不能创建子进程时返回 None
+    """
+    from django.conf import settings
+
+    if runtime_profile.workers <= 1 or not getattr(settings, "PDF_SPLIT_OCR_PROCESS_POOL", True):
+        return None
+    if not can_start_worker_processes():
+        return None
+    key = (runtime_profile.use_v5, runtime_profile.workers)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = OCRProcessPool(
+                max_workers=runtime_profile.workers,
+                use_v5=runtime_profile.use_v5,
+                start_method=str(getattr(settings, "PDF_SPLIT_OCR_START_METHOD", DEFAULT_START_METHOD)),
+            )
+            _pools[key] = pool
+        return pool
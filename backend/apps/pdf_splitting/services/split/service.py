@@ -27,7 +27,7 @@ from apps.pdf_splitting.services.template_registry import get_default_filename,
 from .export_utils import ExportUtils
 from .ocr_handler import OCRHandler
 from .segment_detector import SegmentDetector
-from .split_models import PageDescriptor, SegmentDraft
+from .split_models import OCRPageResult, PageDescriptor, SegmentDraft
 
 logger = logging.getLogger("apps.pdf_splitting")
 
@@ -82,6 +82,8 @@ class PdfSplitService:
 
         runtime_profile = self._ocr_handler.resolve_runtime_profile(job.ocr_profile)
         pdf_hash = self._ocr_handler.sha256_file(storage.source_pdf_path)
+        engine_version = self._ocr_handler.engine_version(runtime_profile)
+        shared_engine_version = self._ocr_handler.shared_engine_version()
         resolved_pages = 0
         cache_hit_count = 0
 
@@ -116,7 +118,11 @@ class PdfSplitService:
                     continue
 
                 cached = self._ocr_handler.read_ocr_cache(
-                    pdf_hash=pdf_hash, profile_key=runtime_profile.key, page_no=page_no
+                    pdf_hash=pdf_hash,
+                    profile_key=runtime_profile.key,
+                    page_no=page_no,
+                    engine_version=engine_version,
+                    shared_engine_version=shared_engine_version,
                 )
                 if cached is not None:
                     descriptors[page_index] = self._build_descriptor(
@@ -133,11 +139,21 @@ class PdfSplitService:
 
                 pending_page_numbers.append(page_no)
 
+            ocr_page_ms: dict[int, float] = {}
             if pending_page_numbers:
+
+                def on_ocr_page(result: OCRPageResult) -> None:
+                    # OCR 逐页完成时即推进进度，并记录单页耗时
+                    nonlocal resolved_pages
+                    resolved_pages += 1
+                    ocr_page_ms[result.page_no] = result.elapsed_ms
+                    self._update_progress(job_id=job.id, resolved_pages=resolved_pages, total_pages=total_pages)
+
                 ocr_results = self._ocr_handler.parallel_ocr(
                     pdf_path=storage.source_pdf_path,
                     page_numbers=pending_page_numbers,
                     runtime_profile=runtime_profile,
+                    on_page=on_ocr_page,
                 )
                 for page_no in pending_page_numbers:
                     if self._should_check_cancel(page_no):
@@ -151,8 +167,6 @@ class PdfSplitService:
 
                     result = ocr_results.get(page_no)
                     if result is None:
-                        from .split_models import OCRPageResult
-
                         result = OCRPageResult(
                             page_no=page_no,
                             text="",
@@ -163,6 +177,7 @@ class PdfSplitService:
                         pdf_hash=pdf_hash,
                         profile_key=runtime_profile.key,
                         result=result,
+                        engine_version=engine_version,
                     )
                     descriptors[page_no - 1] = self._build_descriptor(
                         page_no=page_no,
@@ -171,8 +186,9 @@ class PdfSplitService:
                         ocr_failed=result.ocr_failed,
                         template_key=template.key,
                     )
-                    resolved_pages += 1
-                    self._update_progress(job_id=job.id, resolved_pages=resolved_pages, total_pages=total_pages)
+                    if page_no not in ocr_page_ms:
+                        resolved_pages += 1
+                        self._update_progress(job_id=job.id, resolved_pages=resolved_pages, total_pages=total_pages)
 
             final_descriptors = [item for item in descriptors if item is not None]
             drafts = self._segment_detector.detect_segments(final_descriptors, template_key=template.key)
@@ -184,6 +200,7 @@ class PdfSplitService:
                 runtime_profile=runtime_profile,
                 cache_hit_count=cache_hit_count,
                 pending_ocr_count=len(pending_page_numbers),
+                ocr_page_ms=list(ocr_page_ms.values()),
             )
 
     def export_job(self, job: PdfSplitJob) -> None:  # pragma: no cover
@@ -299,7 +316,9 @@ class PdfSplitService:
         runtime_profile: Any,
         cache_hit_count: int,
         pending_ocr_count: int,
+        ocr_page_ms: list[float] | None = None,
     ) -> None:  # pragma: no cover
+        ocr_page_ms = ocr_page_ms or []
         storage.write_json(storage.pages_json_path, [asdict(item) for item in descriptors])
         storage.write_json(storage.segments_json_path, [asdict(item) for item in drafts])
 
@@ -337,6 +356,8 @@ class PdfSplitService:
                 "ocr_workers": runtime_profile.workers,
                 "ocr_cache_hit_count": int(max(cache_hit_count, 0)),
                 "ocr_miss_count": int(max(pending_ocr_count, 0)),
+                "ocr_page_ms_avg": round(sum(ocr_page_ms) / len(ocr_page_ms), 1) if ocr_page_ms else 0,
+                "ocr_page_ms_max": round(max(ocr_page_ms), 1) if ocr_page_ms else 0,
                 "segment_count": len(drafts),
                 "recognized_count": len(
                     [item for item in drafts if item.segment_type != PdfSplitSegmentType.UNRECOGNIZED]
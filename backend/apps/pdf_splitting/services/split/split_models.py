@@ -64,3 +64,4 @@ class OCRPageResult:
     text: str
     source_method: str
     ocr_failed: bool
+    elapsed_ms: float = 0.0
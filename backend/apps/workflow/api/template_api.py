@@ -16,11 +16,24 @@ from ..schemas.workflow_schemas import (
     TemplateListOut,
     TemplateUpdateIn,
 )
+from ..temporal.step_graph import StepGraphError, resolve_dependencies
 from .step_registry import get_step_registry, get_flat_step_list
 
 router = Router(auth=JWTOrSessionAuth())
 
 
+def _validated_steps(payload_steps: list[Any]) -> list[dict[str, Any]]:
+    """序列化步骤并校验 depends_on（引用存在、无环），无效时返回 400"""
+    steps = [s.model_dump() for s in payload_steps]
+    try:
+        resolve_dependencies(steps)
+    except StepGraphError as exc:
+        from ninja.errors import HttpError
+
+        raise HttpError(400, str(exc)) from exc
+    return steps
+
+
 # ── 步骤注册表 ────────────────────────────────────────────────────────────────
 
 
@@ -87,7 +100,7 @@ async def create_template(request: Any, payload: TemplateCreateIn) -> dict[str,
         category=payload.category,
         description=payload.description,
         temporal_workflow_name=payload.temporal_workflow_name or "DynamicWorkflow",
-        steps_schema=[s.model_dump() for s in payload.steps] if payload.steps else [],
+        steps_schema=_validated_steps(payload.steps) if payload.steps else [],
         is_active=payload.is_active if payload.is_active is not None else True,
     )
 
@@ -133,7 +146,7 @@ async def update_template(request: Any, template_id: int, payload: TemplateUpdat
     if payload.temporal_workflow_name is not None:
         template.temporal_workflow_name = payload.temporal_workflow_name
     if payload.steps is not None:
-        template.steps_schema = [s.model_dump() for s in payload.steps]
+        template.steps_schema = _validated_steps(payload.steps)
     if payload.is_active is not None:
         template.is_active = payload.is_active
 
@@ -66,6 +66,8 @@ class StepConfigIn(Schema):
     retry_max: int = 3
     on_fail: str = "abort"
     signal_key: str = ""
+    # 依赖的步骤 ID；None 表示依赖上一个步骤（顺序执行），[] 表示无依赖可并行
+    depends_on: list[str] | None = None
     # 用于 condition 类型
     condition_field: str = ""
     condition_operator: str = ""
@@ -0,0 +1,135 @@
+"""DynamicWorkflow 步骤依赖图与调度。
+
+步骤通过 depends_on 声明依赖的步骤 ID：
+  - 未声明（None）时依赖列表中的上一个步骤，旧模板保持顺序执行；
+  - 声明为 [] 时没有依赖，可与其他就绪步骤并行。
+gate / wait / condition 是屏障：前面的步骤全部完成后才开始，完成前后面的步骤都不会开始。
+
+调度器按步骤下标工作（模板中步骤 ID 可能重复），只做纯计算，满足 workflow 的确定性约束。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+BARRIER_STEP_TYPES = frozenset({"gate", "wait", "condition"})
+DEFAULT_MAX_PARALLEL_STEPS = 4
+
+
+class StepGraphError(ValueError):
+    """步骤依赖声明无效（引用不存在的步骤、依赖自身或存在环）"""
+
+
+def _is_barrier(step: dict) -> bool:
+    return step.get("type", "activity") in BARRIER_STEP_TYPES
+
+
+def resolve_dependencies(steps: list[dict]) -> list[tuple[int, ...]]:
+    """把每个步骤的 depends_on 解析为所依赖步骤的下标"""
+    indices_by_id: dict[str, list[int]] = {}
+    for index, step in enumerate(steps):
+        indices_by_id.setdefault(str(step.get("id", "unknown")), []).append(index)
+
+    resolved: list[tuple[int, ...]] = []
+    for index, step in enumerate(steps):
+        depends_on = step.get("depends_on")
+        if depends_on is None:
+            resolved.append((index - 1,) if index else ())
+            continue
+        if isinstance(depends_on, str) or not isinstance(depends_on, Iterable):
+            raise StepGraphError(f"步骤 {step.get('id')} 的 depends_on 必须是步骤 ID 列表")
+        deps: list[int] = []
+        for dep_id in depends_on:
+            targets = indices_by_id.get(str(dep_id))
+            if not targets:
+                raise StepGraphError(f"步骤 {step.get('id')} 依赖的步骤 {dep_id} 不存在")
+            if index in targets:
+                raise StepGraphError(f"步骤 {step.get('id')} 不能依赖自身")
+            deps.extend(t for t in targets if t not in deps)
+        resolved.append(tuple(deps))
+    _check_acyclic(steps, resolved)
+    return resolved
+
+
+def _check_acyclic(steps: list[dict], deps: list[tuple[int, ...]]) -> None:
+    # 屏障也是隐式依赖：屏障依赖它之前的所有步骤，它之后的步骤都依赖它
+    edges = [set(d) for d in deps]
+    barrier: int | None = None
+    for index, step in enumerate(steps):
+        if _is_barrier(step):
+            edges[index].update(range(index))
+            barrier = index
+        elif barrier is not None:
+            edges[index].add(barrier)
+
+    remaining = {index: set(e) for index, e in enumerate(edges)}
+    while remaining:
+        ready = [index for index, e in remaining.items() if not e]
+        if not ready:
+            blocked = ", ".join(str(steps[index].get("id")) for index in sorted(remaining))
+            raise StepGraphError(f"步骤依赖存在环（或跨越了 gate/wait/condition 屏障）: {blocked}")
+        for index in ready:
+            del remaining[index]
+        for e in remaining.values():
+            e.difference_update(ready)
+
+
+class StepScheduler:
+    """按依赖与屏障挑选可以开始的步骤，同一时刻最多 max_parallel 个步骤在执行"""
+
+    def __init__(self, steps: list[dict], *, max_parallel: int = DEFAULT_MAX_PARALLEL_STEPS) -> None:
+        self.steps = steps
+        self.deps = resolve_dependencies(steps)
+        self.max_parallel = max(1, int(max_parallel))
+        self.started: set[int] = set()
+        self.finished: set[int] = set()
+
+    @property
+    def running(self) -> list[int]:
+        return sorted(self.started - self.finished)
+
+    @property
+    def all_finished(self) -> bool:
+        return len(self.finished) == len(self.steps)
+
+    def ready(self) -> list[int]:
+        """可以立即开始的步骤下标（按模板顺序），调用方负责随后 mark_started"""
+        capacity = self.max_parallel - len(self.running)
+        picked: list[int] = []
+        for index, step in enumerate(self.steps):
+            if capacity <= len(picked):
+                break
+            if index in self.started:
+                if _is_barrier(step) and index not in self.finished:
+                    break
+                continue
+            if _is_barrier(step):
+                # 屏障等前面的步骤全部完成后单独执行
+                if not picked and not self.running and all(i in self.finished for i in range(index)):
+                    picked.append(index)
+                break
+            if all(dep in self.finished for dep in self.deps[index]):
+                picked.append(index)
+        return picked
+
+    def mark_started(self, index: int) -> None:
+        self.started.add(index)
+
+    def mark_finished(self, index: int) -> None:
+        self.started.add(index)
+        self.finished.add(index)
+
+    def skip_after_condition(self, index: int, goto_step_id: str | None) -> list[int]:
+        """condition 不满足时跳过的步骤：跳到 goto_step_id 之前的步骤，未配置时只跳过下一个步骤"""
+        following = range(index + 1, len(self.steps))
+        if goto_step_id:
+            skipped: list[int] = []
+            for i in following:
+                if self.steps[i].get("id") == goto_step_id:
+                    break
+                skipped.append(i)
+        else:
+            skipped = list(following)[:1]
+        for i in skipped:
+            self.mark_finished(i)
+        return skipped
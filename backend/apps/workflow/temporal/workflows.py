@@ -8,6 +8,7 @@ Workflow 函数必须满足确定性约束：
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import timedelta
@@ -19,8 +20,13 @@ from temporalio.common import RetryPolicy
 with workflow.unsafe.imports_passed_through():
     from apps.workflow.temporal import activities as act
 
+from apps.workflow.temporal.step_graph import StepGraphError, StepScheduler
+
 logger = logging.getLogger(__name__)
 
+# DynamicWorkflow 由顺序执行改为按依赖调度的版本标记（workflow.patched）
+STEP_GRAPH_PATCH_ID = "dynamic-workflow-step-graph"
+
 
 @dataclass
 class SimpleWorkflowInput:
@@ -263,7 +269,7 @@ class SalesContractDisputeWorkflow:
 
 # ════════════════════════════════════════════════════════════════
 # DynamicWorkflow — 通用动态工作流引擎
-# 读取 WorkflowTemplate.steps_schema，按顺序执行各步骤。
+# 读取 WorkflowTemplate.steps_schema，按步骤依赖（depends_on）并行执行各步骤。
 # ════════════════════════════════════════════════════════════════
 
 
@@ -360,9 +366,13 @@ def _build_step_args(step: dict, context: dict, case_id: int, run_id: int) -> li
 class DynamicWorkflow:
     """通用动态工作流引擎。
 
-    根据 WorkflowTemplate.steps_schema 逐步执行，支持 8 种步骤类型：
+    根据 WorkflowTemplate.steps_schema 执行，支持 8 种步骤类型：
     activity, gate, wait, condition, delay, llm, http, code
 
+    步骤可用 depends_on 声明依赖，依赖均已完成的步骤作为 activity 并发执行，
+    同时执行的步骤数不超过 DEFAULT_MAX_PARALLEL_STEPS；
+    未声明 depends_on 的步骤依赖上一个步骤，gate / wait / condition 作为屏障，详见 step_graph。
+
     信号: 使用通用 gate_approved 信号，通过 data.step_id 路由到正确 gate。
     """
 
@@ -371,6 +381,10 @@ class DynamicWorkflow:
         self._pending_gates: dict[str, GateResult] = {}
         # 当前活跃的 gate step_id（用于 query）
         self._current_gate_step_id: str | None = None
+        # 正在执行的步骤 step_id（用于 query）
+        self._running_steps: list[str] = []
+        # 步骤下标 → 输出（previous_step 按依赖解析）
+        self._step_results: dict[int, dict] = {}
 
     @workflow.run
     async def run(self, inp: dict) -> dict[str, Any]:
@@ -396,7 +410,92 @@ class DynamicWorkflow:
             )
             return {"status": "completed", "message": "模板无步骤定义"}
 
-        # 2) 逐步执行
+        # 2) 按依赖并行调度各步骤；变更前启动的运行仍按原顺序逻辑重放，避免 non-determinism
+        if not workflow.patched(STEP_GRAPH_PATCH_ID):
+            return await self._run_sequential(steps, case_id, run_id)
+        try:
+            scheduler = StepScheduler(steps)
+        except StepGraphError as exc:
+            await workflow.execute_activity(
+                act.update_run_status,
+                args=(run_id, "failed", ""),
+                start_to_close_timeout=QUICK_TIMEOUT,
+            )
+            return {"status": "failed", "error": str(exc)}
+
+        context: dict[str, Any] = {
+            "case_id": case_id,
+            "run_id": run_id,
+            "step_outputs": {},  # step_id → output_data
+        }
+        in_flight: dict[int, asyncio.Task] = {}
+
+        while True:
+            for index in scheduler.ready():
+                scheduler.mark_started(index)
+                in_flight[index] = asyncio.create_task(
+                    self._execute_step_at(index, scheduler, case_id, run_id, context)
+                )
+            self._running_steps = [steps[i].get("id", "unknown") for i in in_flight]
+            if not in_flight:
+                break
+
+            await workflow.wait(list(in_flight.values()), return_when=asyncio.FIRST_COMPLETED)
+            # 按步骤顺序处理本轮完成的步骤，保证重放时结果一致
+            for index in sorted(i for i, task in in_flight.items() if task.done()):
+                task = in_flight.pop(index)
+                scheduler.mark_finished(index)
+                outcome = await self._handle_step_done(steps[index], index, task, scheduler, run_id, context)
+                if outcome is not None:
+                    for pending in in_flight.values():
+                        pending.cancel()
+                    self._running_steps = []
+                    return outcome
+
+        # 3) 完成
+        await workflow.execute_activity(
+            act.update_run_status,
+            args=(run_id, "completed", ""),
+            start_to_close_timeout=QUICK_TIMEOUT,
+        )
+        return {
+            "status": "completed",
+            "step_outputs": context["step_outputs"],
+        }
+
+    async def _execute_step_at(
+        self, index: int, scheduler: StepScheduler, case_id: int, run_id: int, context: dict
+    ) -> dict | None:
+        """以步骤开始时的上下文执行；previous_step 指向该步骤（显式或隐式）的最后一个依赖"""
+        step = scheduler.steps[index]
+        step_id: str = step.get("id", "unknown")
+        step_context = {key: value for key, value in context.items() if key != "_last_output"}
+        last_output = self._last_output_for(index, scheduler)
+        if last_output is not None:
+            step_context["_last_output"] = last_output
+        return await self._execute_step(
+            step=step,
+            step_id=step_id,
+            step_name=step.get("name", step_id),
+            step_type=step.get("type", "activity"),
+            mcp_tool=step.get("mcp_tool"),
+            case_id=case_id,
+            run_id=run_id,
+            context=step_context,
+            timeout_hours=step.get("config", {}).get("timeout_hours", 1),
+        )
+
+    def _last_output_for(self, index: int, scheduler: StepScheduler) -> dict | None:
+        """沿最后一个依赖向前找最近一个有输出的步骤（被跳过或无输出的步骤不覆盖 previous_step）"""
+        deps = scheduler.deps[index]
+        while deps:
+            if deps[-1] in self._step_results:
+                return self._step_results[deps[-1]]
+            deps = scheduler.deps[deps[-1]]
+        return None
+
+    async def _run_sequential(self, steps: list[dict], case_id: int, run_id: int) -> dict[str, Any]:
+        """按模板顺序逐步执行（引入依赖调度前的逻辑，供启动于变更前的运行重放）"""
         context: dict[str, Any] = {
             "case_id": case_id,
             "run_id": run_id,
@@ -492,7 +591,6 @@ class DynamicWorkflow:
             elif skip_to_step_id is not None:
                 context["_skip_until"] = skip_to_step_id
 
-        # 3) 完成
         await workflow.execute_activity(
             act.update_run_status,
             args=(run_id, "completed", ""),
@@ -503,6 +601,61 @@ class DynamicWorkflow:
             "step_outputs": context["step_outputs"],
         }
 
+    async def _handle_step_done(
+        self, step: dict, index: int, task: asyncio.Task, scheduler: StepScheduler, run_id: int, context: dict,
+    ) -> dict | None:
+        """记录已完成步骤的输出；需要结束整个流程（abort / gate 被拒绝）时返回流程结果"""
+        step_id: str = step.get("id", "unknown")
+        step_name: str = step.get("name", step_id)
+        step_type: str = step.get("type", "activity")
+        on_fail: str = step.get("config", {}).get("on_fail", "abort")
+
+        exc = task.exception()
+        if exc is not None:
+            logger.error("步骤 %s 执行失败", step_id, exc_info=exc)
+            await workflow.execute_activity(
+                act.record_step,
+                args=(run_id, step_id, step_name, step_type, "failed", None, str(exc)),
+                start_to_close_timeout=QUICK_TIMEOUT,
+                retry_policy=QUICK_RETRY,
+            )
+            if on_fail == "skip":
+                context["step_outputs"][step_id] = {"skipped": True, "error": str(exc)}
+                return None
+            # abort（默认）
+            await workflow.execute_activity(
+                act.update_run_status,
+                args=(run_id, "failed", step_id),
+                start_to_close_timeout=QUICK_TIMEOUT,
+            )
+            return {"status": "failed", "failed_step": step_id, "error": str(exc)}
+
+        result = task.result()
+
+        # gate 被拒绝
+        if step_type == "gate" and result is not None and not result.get("approved", True):
+            await workflow.execute_activity(
+                act.update_run_status,
+                args=(run_id, "failed", step_id),
+                start_to_close_timeout=QUICK_TIMEOUT,
+            )
+            return {"status": "rejected", "phase": step_id, "comment": result.get("comment", "")}
+
+        # 记录输出供依赖它的步骤的 {{previous_step.*}} 引用，并累积输出
+        if result is not None:
+            self._step_results[index] = result
+            context["step_outputs"][step_id] = result
+
+        # condition 结果为 False → 跳过到 goto_false 目标之前的步骤（未配置则跳过下一个步骤）
+        if step_type == "condition" and result is not None and not result.get("met", True):
+            goto_false = step.get("config", {}).get("goto_false")
+            reason = "condition_goto_false" if goto_false else "condition_false_skip"
+            for skipped in scheduler.skip_after_condition(index, goto_false):
+                skipped_id = scheduler.steps[skipped].get("id", "unknown")
+                context["step_outputs"][skipped_id] = {"skipped": True, "reason": reason}
+                logger.info("步骤 %s 被跳过（条件 %s 为 False）", skipped_id, step_id)
+        return None
+
     async def _execute_step(
         self,
         step: dict,
@@ -818,6 +971,7 @@ class DynamicWorkflow:
         return {
             "current_gate_step_id": self._current_gate_step_id,
             "pending_gates": {k: v.__dict__ for k, v in self._pending_gates.items()},
+            "running_steps": list(self._running_steps),
         }
 
 
@@ -1,6 +1,6 @@
 """python -m mcp_server 入口"""
 
-from mcp_server.server import mcp
+from mcp_server.lazy import load_server
 
 if __name__ == "__main__":
-    mcp.run()
+    load_server().run()
@@ -0,0 +1,99 @@
+"""按需注册模式 - 依据工具清单注册轻量占位工具，首次调用某个工具时才导入其模块
+
+完整导入 server.py 要加载全部工具模块，并为数百个工具逐一生成 pydantic 参数模型；
+按需模式下 tools/list 直接返回清单中的 schema，启动只剩 FastMCP 本身的导入开销。
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+from typing import TYPE_CHECKING, Any
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.server.fastmcp.tools import Tool
+from pydantic import PrivateAttr
+
+from mcp_server.manifest import EAGER_ENV, build_manifest, load_manifest, write_manifest
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import Context
+
+logger = logging.getLogger(__name__)
+
+
+class LazyTool(Tool):
+    """清单中的工具占位：列表直接用清单里的 schema，首次调用时导入模块并构建真实 Tool 再转发"""
+
+    module: str
+    attr: str
+    manifest_output_schema: dict[str, Any] | None = None
+    _resolved: Tool | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_manifest(cls, entry: dict[str, Any]) -> LazyTool:
+        # model_construct 跳过校验：fn / fn_metadata 在 resolve() 之前没有意义
+        return cls.model_construct(
+            fn=None,
+            name=entry["name"],
+            title=entry.get("title"),
+            description=entry.get("description") or "",
+            parameters=entry["parameters"],
+            fn_metadata=None,
+            is_async=False,
+            module=entry["module"],
+            attr=entry["attr"],
+            manifest_output_schema=entry.get("output_schema"),
+        )
+
+    @property
+    def output_schema(self) -> dict[str, Any] | None:
+        return self.manifest_output_schema
+
+    @property
+    def loaded(self) -> bool:
+        return self._resolved is not None
+
+    def resolve(self) -> Tool:
+        """导入工具模块并按完整模式相同的方式构建 Tool（只做一次）"""
+        if self._resolved is None:
+            fn = getattr(importlib.import_module(self.module), self.attr)
+            self._resolved = Tool.from_function(fn, name=self.name, title=self.title)
+        return self._resolved
+
+    async def run(
+        self,
+        arguments: dict[str, Any],
+        context: Context[Any, Any, Any] | None = None,
+        convert_result: bool = False,
+    ) -> Any:
+        try:
+            tool = self.resolve()
+        except Exception as exc:
+            raise ToolError(f"Error executing tool {self.name}: {exc}") from exc
+        return await tool.run(arguments, context=context, convert_result=convert_result)
+
+
+def create_lazy_server(manifest: dict[str, Any]) -> FastMCP:
+    tools: list[Tool] = [LazyTool.from_manifest(entry) for entry in manifest["tools"]]
+    return FastMCP(manifest["server_name"], tools=tools)
+
+
+def load_server() -> FastMCP:
+    """优先按清单注册占位工具；清单缺失或过期时完整导入 server.py，并顺带重建清单供下次启动使用"""
+    eager = os.getenv(EAGER_ENV, "").strip().lower() in ("1", "true", "yes")
+    if not eager:
+        manifest = load_manifest()
+        if manifest is not None:
+            return create_lazy_server(manifest)
+
+    from mcp_server.server import mcp
+
+    if not eager:
+        try:
+            write_manifest(build_manifest(mcp))
+        except OSError as exc:
+            logger.warning("MCP 工具清单写入失败（下次启动仍将完整导入）: %s", exc)
+    return mcp
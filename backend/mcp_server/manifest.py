@@ -0,0 +1,115 @@
+"""MCP tools 清单 - 预先计算工具名、参数 schema 与描述，供按需注册模式启动时使用
+
+清单由 ``python -m mcp_server.manifest`` 在构建阶段生成（完整导入一次 server.py），
+记录 mcp_server 源码与 mcp / pydantic 版本的指纹；指纹不一致时视为过期，启动时回退到完整导入。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+PACKAGE_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = PACKAGE_DIR.parent
+MANIFEST_PATH = PACKAGE_DIR / "tool_manifest.json"
+
+# 设为 1 时跳过清单，按原方式完整导入 server.py
+EAGER_ENV = "FACHUAN_MCP_EAGER"
+
+# 工具 schema 由 mcp（func_metadata）和 pydantic 生成，版本变化也要重建清单
+_SCHEMA_PACKAGES = ("mcp", "pydantic")
+
+
+def _module_source(module: str) -> Path:
+    return BACKEND_DIR.joinpath(*module.split(".")).with_suffix(".py")
+
+
+def source_fingerprint(modules: list[str] | tuple[str, ...] = ()) -> str:
+    """mcp_server 全部源码 + mcp_server 之外的工具模块（如 workflow_tools）+ schema 依赖版本的 sha256"""
+    sources = {path.relative_to(BACKEND_DIR).as_posix(): path for path in PACKAGE_DIR.rglob("*.py")}
+    sources.update({module: _module_source(module) for module in modules if not module.startswith("mcp_server.")})
+    digest = hashlib.sha256()
+    for package in _SCHEMA_PACKAGES:
+        try:
+            version = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            version = ""
+        digest.update(f"{package}=={version}\n".encode())
+    for label in sorted(sources):
+        path = sources[label]
+        digest.update(label.encode())
+        digest.update(path.read_bytes() if path.exists() else b"<missing>")
+    return digest.hexdigest()
+
+
+def build_manifest(server: FastMCP) -> dict[str, Any]:
+    """从已完整注册的 FastMCP 实例导出清单"""
+    tools: list[dict[str, Any]] = []
+    for tool in server._tool_manager.list_tools():
+        tools.append(
+            {
+                "name": tool.name,
+                "module": tool.fn.__module__,
+                "attr": tool.fn.__name__,
+                "title": tool.title,
+                "description": tool.description,
+                "parameters": tool.parameters,
+                "output_schema": tool.output_schema,
+            }
+        )
+    modules = sorted({entry["module"] for entry in tools})
+    return {
+        "version": MANIFEST_VERSION,
+        "server_name": server.name,
+        "fingerprint": source_fingerprint(modules),
+        "modules": modules,
+        "tools": tools,
+    }
+
+
+def write_manifest(manifest: dict[str, Any], path: Path = MANIFEST_PATH) -> None:
+    """原子写入：先写临时文件再替换，避免并发启动的进程读到半截 JSON"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict[str, Any] | None:
+    """读取清单；不存在、格式不对或指纹过期时返回 None"""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("MCP 工具清单读取失败，回退完整导入: %s", exc)
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    if manifest.get("fingerprint") != source_fingerprint(manifest.get("modules") or ()):
+        logger.info("MCP 工具清单已过期（源码或依赖版本变化），回退完整导入")
+        return None
+    return manifest
+
+
+def main() -> None:
+    from mcp_server.server import mcp
+
+    manifest = build_manifest(mcp)
+    write_manifest(manifest)
+    sys.stderr.write(f"已生成 MCP 工具清单: {MANIFEST_PATH}（{len(manifest['tools'])} 个工具）\n")
+
+
+if __name__ == "__main__":
+    main()
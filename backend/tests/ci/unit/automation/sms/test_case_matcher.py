@@ -48,7 +48,7 @@ class TestCaseMatcher:
     def test_match_by_case_number_exact_single_active(self) -> None:
         """案号精确匹配到唯一在办案件。"""
         case = _make_case(id=1, name="张三诉李四", status="active")
-        self.case_service.search_cases_by_case_number_internal.return_value = [case]
+        self.case_service.search_cases_by_case_numbers_internal.return_value = [case]
 
         sms = _make_sms(case_numbers=["（2025）粤0604民初12345号"])
         result = self.matcher.match(sms)
@@ -57,7 +57,7 @@ class TestCaseMatcher:
 
     def test_match_by_case_number_exact_no_match(self) -> None:
         """案号精确匹配无结果。"""
-        self.case_service.search_cases_by_case_number_internal.return_value = []
+        self.case_service.search_cases_by_case_numbers_internal.return_value = []
         self.party_matching_service.find_existing_clients_in_sms.return_value = []
         self.party_matching_service.debug_client_database.return_value = None
 
@@ -70,7 +70,7 @@ class TestCaseMatcher:
         from apps.core.models.enums import CaseStatus
 
         case = _make_case(id=1, name="张三诉李四", status=CaseStatus.CLOSED)
-        self.case_service.search_cases_by_case_number_internal.return_value = [case]
+        self.case_service.search_cases_by_case_numbers_internal.return_value = [case]
         self.party_matching_service.find_existing_clients_in_sms.return_value = []
         self.party_matching_service.debug_client_database.return_value = None
 
@@ -80,7 +80,7 @@ class TestCaseMatcher:
 
     def test_match_by_party_names_unique(self) -> None:
         """当事人匹配到唯一案件。"""
-        self.case_service.search_cases_by_case_number_internal.return_value = []
+        self.case_service.search_cases_by_case_numbers_internal.return_value = []
         case = _make_case(id=2, name="张三诉李四", status="active")
         # 必须返回所有当事人，因为 _find_all_matching_cases 做双向严格匹配
         matched_clients = [
@@ -98,7 +98,7 @@ class TestCaseMatcher:
             return []
 
         self.case_service.search_cases_by_party_internal.side_effect = search_by_party
-        self.case_service.get_case_party_names_internal.return_value = ["张三", "李四"]
+        self.case_service.get_case_party_names_by_case_ids_internal.return_value = {2: ["张三", "李四"]}
 
         sms = _make_sms(party_names=["张三", "李四"])
         result = self.matcher.match(sms)
@@ -217,3 +217,31 @@ class TestCaseMatcher:
         self.document_parser_service.get_all_document_paths.return_value = []
         result = self.matcher._extract_party_names(sms)
         assert result == []
+
+    def test_find_all_matching_cases_bulk_loads_parties(self) -> None:
+        """所有候选案件的当事人一次批量获取，在内存中做双向严格匹配。"""
+        cases = [_make_case(id=i, name=f"案件{i}") for i in range(1, 31)]
+        self.case_service.search_cases_by_party_internal.return_value = cases
+        party_map = {case.id: ["某某集团有限公司", f"被告{case.id}"] for case in cases}
+        party_map[7] = ["某某集团有限公司", " 张三 "]
+        party_map[9] = ["某某集团有限公司", "张三", "李四"]
+        self.case_service.get_case_party_names_by_case_ids_internal.return_value = party_map
+
+        clients = [SimpleNamespace(id=1, name="某某集团有限公司"), SimpleNamespace(id=2, name="张三")]
+        result = self.matcher._find_all_matching_cases(clients)
+
+        assert [c.id for c in result] == [7]
+        self.case_service.get_case_party_names_by_case_ids_internal.assert_called_once_with(list(range(1, 31)))
+        self.case_service.get_case_party_names_internal.assert_not_called()
+
+    def test_case_numbers_resolved_in_one_query(self) -> None:
+        """多个案号合并为一次查询，结果去重。"""
+        case = _make_case(id=3)
+        self.case_service.search_cases_by_case_numbers_internal.return_value = [case, case]
+
+        result = self.matcher._get_all_cases_by_numbers(["（2025）粤0604民初1号", "（2025）粤0604执1号"])
+
+        assert [c.id for c in result] == [3]
+        self.case_service.search_cases_by_case_numbers_internal.assert_called_once()
+        assert len(self.case_service.search_cases_by_case_numbers_internal.call_args.args[0]) == 2
+        self.case_service.search_cases_by_case_number_internal.assert_not_called()
@@ -0,0 +1,205 @@
+"""客户名称索引测试。"""
+
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from apps.automation.services.sms.matching import client_name_index
+from apps.automation.services.sms.matching.client_name_index import ClientNameIndex, normalize_name
+
+
+def _client(client_id: int, name: str) -> SimpleNamespace:
+    return SimpleNamespace(id=client_id, name=name)
+
+
+def _brute_force(clients: list[Any], party_names: list[str], lawyer_names: list[str]) -> list[int]:
+    """原先的逐客户 × 逐当事人子串比较"""
+    matched: list[int] = []
+    for client in clients:
+        client_name = client.name.strip()
+        if client_name in lawyer_names:
+            continue
+        for party_name in party_names:
+            party_name = party_name.strip()
+            if party_name in lawyer_names:
+                continue
+            if client_name == party_name or (
+                (len(client_name) >= 2 and client_name in party_name)
+                or (len(party_name) >= 2 and party_name in client_name)
+            ):
+                matched.append(client.id)
+                break
+    return matched
+
+
+class TestMatchPartyNames:
+    def test_exact_and_containment(self) -> None:
+        clients = [_client(1, "张三"), _client(2, "广州某某科技有限公司"), _client(3, "李"), _client(4, "王五")]
+        index = ClientNameIndex(lambda: clients)
+
+        result = index.match_party_names(["张三丰", "某某科技", "李"])
+
+        assert [c.id for c in result] == [1, 2, 3]
+
+    def test_single_char_names_only_match_exactly(self) -> None:
+        index = ClientNameIndex(lambda: [_client(1, "李"), _client(2, "张三")])
+
+        assert index.match_party_names(["李四"]) == []
+        assert index.match_party_names(["张"]) == []
+
+    def test_excluded_lawyer_names(self) -> None:
+        clients = [_client(1, "张律师"), _client(2, "张三")]
+        index = ClientNameIndex(lambda: clients)
+
+        assert [c.id for c in index.match_party_names(["张律师", "张三"], exclude=["张律师"])] == [2]
+        assert index.match_party_names(["张律师事务所"], exclude=["张律师"]) == []
+
+    def test_normalizes_full_width_characters(self) -> None:
+        index = ClientNameIndex(lambda: [_client(1, "某某(广州)有限公司 ")])
+
+        assert normalize_name("某某（广州）有限公司") == "某某(广州)有限公司"
+        assert [c.id for c in index.match_party_names(["原告某某（广州）有限公司"])] == [1]
+
+    def test_same_result_as_pairwise_comparison(self) -> None:
+        rng = random.Random(7)
+        alphabet = "张三李四王五公司有限甲乙"
+
+        def rand_name(low: int, high: int) -> str:
+            return "".join(rng.choice(alphabet) for _ in range(rng.randint(low, high)))
+
+        for _ in range(200):
+            clients = [_client(i, rand_name(1, 6)) for i in range(30)]
+            party_names = [rand_name(0, 8) for _ in range(4)]
+            lawyer_names = [rand_name(1, 3) for _ in range(2)]
+            index = ClientNameIndex(lambda clients=clients: clients)
+
+            result = index.match_party_names(party_names, exclude=lawyer_names)
+
+            assert [c.id for c in result] == _brute_force(clients, party_names, lawyer_names)
+
+    def test_loads_once(self) -> None:
+        loader = MagicMock(return_value=[_client(1, "张三")])
+        index = ClientNameIndex(loader)
+
+        index.match_party_names(["张三"])
+        index.match_party_names(["李四"])
+
+        loader.assert_called_once()
+
+
+class TestIncrementalUpdates:
+    def test_upsert_and_remove(self) -> None:
+        index = ClientNameIndex(lambda: [_client(1, "张三"), _client(2, "李四")])
+        assert index.size == 2
+
+        index.upsert(_client(3, "王五"))
+        index.upsert(_client(1, "张三丰"))
+        index.remove(2)
+
+        assert [c.id for c in index.match_party_names(["张三丰", "李四", "王五"])] == [1, 3]
+        assert index.match_party_names(["张三"])[0].name == "张三丰"
+        assert index.match_party_names(["李四"]) == []
+
+    def test_updates_before_first_load_are_ignored(self) -> None:
+        index = ClientNameIndex(lambda: [_client(1, "张三")])
+        index.upsert(_client(2, "李四"))
+
+        assert index.match_party_names(["李四"]) == []
+
+    def test_refresh_client_fetches_or_removes(self) -> None:
+        store = {1: _client(1, "张三"), 2: _client(2, "李四")}
+        index = ClientNameIndex(lambda: list(store.values()), fetch_one=store.get)
+        assert index.size == 2
+
+        store[1] = _client(1, "赵六")
+        del store[2]
+        index.refresh_client(1)
+        index.refresh_client(2)
+
+        assert [c.name for c in index.match_party_names(["赵六", "李四", "张三"])] == ["赵六"]
+
+    def test_version_change_triggers_rebuild(self) -> None:
+        version = {"value": 1}
+        loader = MagicMock(return_value=[_client(1, "张三")])
+        index = ClientNameIndex(loader, version_source=lambda: version["value"])
+
+        index.match_party_names(["张三"])
+        version["value"] = 2
+        index.match_party_names(["张三"])
+
+        assert loader.call_count == 2
+
+    def test_refresh_with_next_version_skips_rebuild(self) -> None:
+        version = {"value": 1}
+        loader = MagicMock(return_value=[_client(1, "张三")])
+        index = ClientNameIndex(
+            loader, fetch_one=lambda cid: _client(cid, "李四"), version_source=lambda: version["value"]
+        )
+        index.match_party_names(["张三"])
+
+        version["value"] = 2
+        index.refresh_client(2, version=2)
+
+        assert [c.id for c in index.match_party_names(["李四"])] == [2]
+        loader.assert_called_once()
+
+    def test_max_age_triggers_rebuild(self) -> None:
+        loader = MagicMock(return_value=[_client(1, "张三")])
+        index = ClientNameIndex(loader, max_age=0)
+
+        index.match_party_names(["张三"])
+        index.match_party_names(["张三"])
+
+        assert loader.call_count == 2
+
+    def test_version_source_error_keeps_index(self) -> None:
+        loader = MagicMock(return_value=[_client(1, "张三")])
+        index = ClientNameIndex(loader, version_source=MagicMock(side_effect=ConnectionError("redis down")))
+
+        assert len(index.match_party_names(["张三"])) == 1
+        assert len(index.match_party_names(["张三"])) == 1
+        loader.assert_called_once()
+
+
+class TestSimilarNames:
+    def test_both_directions(self) -> None:
+        index = ClientNameIndex(lambda: [_client(1, "张三"), _client(2, "张三丰"), _client(3, "李"), _client(4, "王五")])
+
+        assert index.similar_names("张三") == ["张三", "张三丰"]
+        assert index.similar_names("李某") == ["李"]
+        assert index.similar_names("") == []
+
+
+class TestOnClientChanged:
+    def test_refreshes_shared_index(self) -> None:
+        index = MagicMock()
+        with (
+            patch.object(client_name_index, "_shared_index", index),
+            patch.object(client_name_index, "bump_index_version", return_value=5),
+        ):
+            client_name_index.on_client_changed(7)
+
+        index.refresh_client.assert_called_once_with(7, version=5)
+
+    def test_refresh_failure_invalidates(self) -> None:
+        index = MagicMock()
+        index.refresh_client.side_effect = RuntimeError("db gone")
+        with (
+            patch.object(client_name_index, "_shared_index", index),
+            patch.object(client_name_index, "bump_index_version", return_value=None),
+        ):
+            client_name_index.on_client_changed(7)
+
+        index.invalidate.assert_called_once()
+
+    def test_without_shared_index_only_bumps_version(self) -> None:
+        with (
+            patch.object(client_name_index, "_shared_index", None),
+            patch.object(client_name_index, "bump_index_version", return_value=3) as bump,
+        ):
+            client_name_index.on_client_changed(7)
+
+        bump.assert_called_once()
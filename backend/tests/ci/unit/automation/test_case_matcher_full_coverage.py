@@ -531,7 +531,7 @@ class TestGetAllCasesByNumbers(_HelpersMixin):
         from apps.automation.services.sms.case_matcher import CaseMatcher
         matcher = CaseMatcher(case_service=MagicMock())
         c1 = self._make_case(case_id=1)
-        matcher.case_service.search_cases_by_case_number_internal.return_value = [c1, c1]
+        matcher.case_service.search_cases_by_case_numbers_internal.return_value = [c1, c1]
         with patch("apps.automation.utils.text_utils.TextUtils.normalize_case_number", side_effect=lambda x: x):
             result = matcher._get_all_cases_by_numbers(["123"])
         assert len(result) == 1
@@ -539,7 +539,7 @@ class TestGetAllCasesByNumbers(_HelpersMixin):
     def test_exception_swallowed(self):
         from apps.automation.services.sms.case_matcher import CaseMatcher
         matcher = CaseMatcher(case_service=MagicMock())
-        matcher.case_service.search_cases_by_case_number_internal.side_effect = Exception("boom")
+        matcher.case_service.search_cases_by_case_numbers_internal.side_effect = Exception("boom")
         with patch("apps.automation.utils.text_utils.TextUtils.normalize_case_number", side_effect=lambda x: x):
             result = matcher._get_all_cases_by_numbers(["123"])
         assert result == []
@@ -601,7 +601,7 @@ class TestFindAllMatchingCases(_HelpersMixin):
         c1 = MagicMock()
         c1.id = 1
         matcher.case_service.search_cases_by_party_internal.return_value = [c1]
-        matcher.case_service.get_case_party_names_internal.return_value = ["张三", "李四"]
+        matcher.case_service.get_case_party_names_by_case_ids_internal.return_value = {1: ["张三", "李四"]}
 
         client1 = MagicMock()
         client1.name = "张三"
@@ -619,7 +619,7 @@ class TestFindAllMatchingCases(_HelpersMixin):
         c1.id = 1
         matcher.case_service.search_cases_by_party_internal.return_value = [c1]
         # Case has parties that SMS doesn't have
-        matcher.case_service.get_case_party_names_internal.return_value = ["张三", "李四", "王五"]
+        matcher.case_service.get_case_party_names_by_case_ids_internal.return_value = {1: ["张三", "李四", "王五"]}
 
         client1 = MagicMock()
         client1.name = "张三"
@@ -688,7 +688,7 @@ class TestCheckAndLogClosedCases(_HelpersMixin):
         from apps.automation.services.sms.case_matcher import CaseMatcher
         matcher = CaseMatcher(case_service=MagicMock(), party_matching_service=MagicMock())
         c = self._make_case(status="closed")
-        matcher.case_service.search_cases_by_case_number_internal.return_value = [c]
+        matcher.case_service.search_cases_by_case_numbers_internal.return_value = [c]
         sms = self._make_sms(case_numbers=["123"])
         sms.party_names = []
         with patch("apps.automation.utils.text_utils.TextUtils.normalize_case_number", side_effect=lambda x: x):
@@ -698,7 +698,7 @@ class TestCheckAndLogClosedCases(_HelpersMixin):
         from apps.automation.services.sms.case_matcher import CaseMatcher
         matcher = CaseMatcher(case_service=MagicMock(), party_matching_service=MagicMock())
         c = self._make_case(status="closed")
-        matcher.case_service.search_cases_by_case_number_internal.return_value = []
+        matcher.case_service.search_cases_by_case_numbers_internal.return_value = []
         matcher.case_service.search_cases_by_party_internal.return_value = [c]
         client = MagicMock()
         client.name = "张三"
@@ -172,7 +172,7 @@ class TestCheckAndLogClosedCasesDedup(_HelpersMixin):
         c = self._make_case(case_id=1, status=CaseStatus.CLOSED)
 
         # Both paths return the same case
-        matcher.case_service.search_cases_by_case_number_internal.return_value = [c]
+        matcher.case_service.search_cases_by_case_numbers_internal.return_value = [c]
         matcher.case_service.search_cases_by_party_internal.return_value = [c]
 
         client = MagicMock()
@@ -300,7 +300,7 @@ class TestFindAllMatchingCases(_HelpersMixin):
         matcher = CaseMatcher(case_service=MagicMock())
         c1 = self._make_case(case_id=1)
         matcher.case_service.search_cases_by_party_internal.return_value = [c1]
-        matcher.case_service.get_case_party_names_internal.return_value = ["张三", "李四"]
+        matcher.case_service.get_case_party_names_by_case_ids_internal.return_value = {1: ["张三", "李四"]}
 
         client1 = MagicMock()
         client1.name = "张三"
@@ -316,7 +316,7 @@ class TestFindAllMatchingCases(_HelpersMixin):
         matcher = CaseMatcher(case_service=MagicMock())
         c1 = self._make_case(case_id=1)
         matcher.case_service.search_cases_by_party_internal.return_value = [c1]
-        matcher.case_service.get_case_party_names_internal.return_value = ["张三", "李四", "王五"]
+        matcher.case_service.get_case_party_names_by_case_ids_internal.return_value = {1: ["张三", "李四", "王五"]}
 
         client1 = MagicMock()
         client1.name = "张三"
@@ -351,7 +351,7 @@ class TestGetAllCasesByNumbers(_HelpersMixin):
 
         matcher = CaseMatcher(case_service=MagicMock())
         c1 = self._make_case(case_id=1)
-        matcher.case_service.search_cases_by_case_number_internal.return_value = [c1, c1]
+        matcher.case_service.search_cases_by_case_numbers_internal.return_value = [c1, c1]
 
         result = matcher._get_all_cases_by_numbers(["123"])
         assert len(result) == 1
@@ -248,3 +248,41 @@ class TestCaseQueryOrchestrator:
         )
         result = orch.search_cases_by_case_number("2024-123")
         assert result == []
+
+    def test_get_case_party_names_by_case_ids(self):
+        mock_party_orch = MagicMock()
+        mock_party_orch.get_case_party_names_by_case_ids.return_value = {1: ["原告A"], 2: []}
+        orch = CaseQueryOrchestrator(case_party_orchestrator=mock_party_orch)
+        assert orch.get_case_party_names_by_case_ids([1, 2]) == {1: ["原告A"], 2: []}
+        mock_party_orch.get_case_party_names_by_case_ids.assert_called_once_with([1, 2])
+
+    def test_search_cases_by_case_numbers(self):
+        case = MagicMock(id=7)
+        mock_number_orch = MagicMock()
+        mock_number_orch.search_cases_by_case_numbers.return_value = [case]
+        mock_number_orch.get_primary_case_numbers_by_case_ids.return_value = {7: "CN7"}
+        mock_assembler = MagicMock()
+        mock_assembler.to_dtos.return_value = ["dto"]
+        orch = CaseQueryOrchestrator(case_number_orchestrator=mock_number_orch, assembler=mock_assembler)
+        assert orch.search_cases_by_case_numbers(["CN7", "CN8"]) == ["dto"]
+        mock_number_orch.search_cases_by_case_numbers.assert_called_once_with(["CN7", "CN8"])
+        mock_assembler.to_dtos.assert_called_once_with([case], {7: "CN7"})
+
+
+class TestCasePartyAggregationBulk:
+    def test_groups_names_by_case(self):
+        from apps.cases.services.case.case_party_aggregation_service import CasePartyAggregationService
+
+        mock_repo = MagicMock()
+        mock_repo.list_party_names_by_case_ids.return_value = [(1, "张三"), (1, None), (1, "李四"), (2, "")]
+        service = CasePartyAggregationService(case_party_repo=mock_repo)
+
+        assert service.get_case_party_names_by_case_ids([1, 2, 3]) == {1: ["张三", "李四"], 2: [], 3: []}
+        mock_repo.list_party_names_by_case_ids.assert_called_once_with([1, 2, 3])
+
+    def test_empty_ids_skip_query(self):
+        from apps.cases.services.case.case_party_aggregation_service import CasePartyAggregationService
+
+        mock_repo = MagicMock()
+        assert CasePartyAggregationService(case_party_repo=mock_repo).get_case_party_names_by_case_ids([]) == {}
+        mock_repo.list_party_names_by_case_ids.assert_not_called()
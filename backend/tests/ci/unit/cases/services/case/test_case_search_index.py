@@ -0,0 +1,198 @@
+"""案件检索索引测试（SQLite FTS5 部分直接在内存库上执行迁移中的建表与触发器）。"""
+
+from __future__ import annotations
+
+import importlib
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import DatabaseError
+
+from apps.cases.services.case import case_search_service
+from apps.cases.services.case.case_search_service import CaseSearchService
+from apps.cases.services.case.repo import case_search_index
+from apps.cases.services.case.repo.case_search_index import CaseSearchIndex, _like_pattern, _pg_rank_sql
+
+search_migration = importlib.import_module("apps.cases.migrations.0030_case_search_trigram_indexes")
+
+
+class _Cursor:
+    def __init__(self, cursor: sqlite3.Cursor) -> None:
+        self._cursor = cursor
+
+    def execute(self, sql: str, params: list[Any] | None = None) -> None:
+        try:
+            self._cursor.execute(sql.replace("%s", "?"), params or [])
+        except sqlite3.Error as exc:
+            raise DatabaseError(str(exc)) from exc
+
+    def fetchall(self) -> list[Any]:
+        return self._cursor.fetchall()
+
+
+class _SqliteConnection:
+    vendor = "sqlite"
+
+    def __init__(self) -> None:
+        self.db = sqlite3.connect(":memory:")
+
+    @contextmanager
+    def cursor(self) -> Iterator[_Cursor]:
+        yield _Cursor(self.db.cursor())
+
+
+_SCHEMA = """
+CREATE TABLE cases_case (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE cases_casenumber (id INTEGER PRIMARY KEY, case_id INTEGER, number TEXT);
+CREATE TABLE cases_client (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE cases_caseparty (id INTEGER PRIMARY KEY, case_id INTEGER, client_id INTEGER);
+INSERT INTO cases_case VALUES (1, '广州某某科技买卖合同纠纷'), (2, '民间借贷纠纷'), (3, '某某科技股权转让纠纷');
+INSERT INTO cases_casenumber VALUES (1, 2, '（2024）粤0106民初123号');
+INSERT INTO cases_client VALUES (1, '广州某某科技有限公司'), (2, '张三丰');
+INSERT INTO cases_caseparty VALUES (1, 1, 1), (2, 2, 2);
+"""
+
+
+@pytest.fixture
+def sqlite_connection() -> Iterator[_SqliteConnection]:
+    conn = _SqliteConnection()
+    conn.db.executescript(_SCHEMA)
+    with conn.cursor() as cursor:
+        search_migration._create_sqlite(cursor)
+    with (
+        patch.object(case_search_index, "connection", conn),
+        patch.object(case_search_index.transaction, "atomic", nullcontext),
+    ):
+        yield conn
+
+
+def _matched(conn: _SqliteConnection, terms: dict[str, list[str]]) -> list[int] | None:
+    """执行 match_case_ids 返回的 id 子查询"""
+    subquery = CaseSearchIndex().match_case_ids(terms)
+    if subquery is None:
+        return None
+    return sorted(row[0] for row in conn.db.execute(subquery.sql.replace("%s", "?"), subquery.params))
+
+
+class TestSqliteIndex:
+    def test_rank_prefers_case_number_hits(self, sqlite_connection: _SqliteConnection) -> None:
+        index = CaseSearchIndex()
+
+        assert index.rank_case_ids("某某科技", limit=10)[:2] == [1, 3]  # type: ignore[index]
+        assert index.rank_case_ids("张三丰", "0106民初", limit=10) == [2]
+        assert index.rank_case_ids("张三丰", "0106民初", limit=0) == []
+
+    def test_triggers_keep_index_in_sync(self, sqlite_connection: _SqliteConnection) -> None:
+        db = sqlite_connection.db
+        db.execute("INSERT INTO cases_case VALUES (4, '新案件')")
+        db.execute("INSERT INTO cases_casenumber VALUES (2, 4, '（2025）京01民终9号')")
+        db.execute("INSERT INTO cases_caseparty VALUES (3, 4, 2)")
+        db.execute("UPDATE cases_client SET name = '李四海' WHERE id = 2")
+        db.execute("DELETE FROM cases_case WHERE id = 1")
+
+        assert _matched(sqlite_connection, {"numbers": ["京01民终"]}) == [4]
+        assert _matched(sqlite_connection, {"parties": ["李四海"]}) == [2, 4]
+        assert _matched(sqlite_connection, {"parties": ["张三丰"]}) == []
+        assert _matched(sqlite_connection, {"name": ["买卖合同"]}) == []
+
+    def test_match_is_case_insensitive_substring(self, sqlite_connection: _SqliteConnection) -> None:
+        sqlite_connection.db.execute("UPDATE cases_case SET name = 'Alpha \"引号\" 案' WHERE id = 2")
+
+        assert _matched(sqlite_connection, {"name": ["alpha"]}) == [2]
+        assert _matched(sqlite_connection, {"name": ['"引号"']}) == [2]
+
+    def test_short_terms_fall_back(self, sqlite_connection: _SqliteConnection) -> None:
+        index = CaseSearchIndex()
+
+        assert index.rank_case_ids("张三", limit=10) is None
+        assert index.rank_case_ids("张三丰", "12", limit=10) is None
+        assert index.match_case_ids({"parties": ["张三丰", "李四"]}) is None
+        assert index.match_case_ids({"parties": ["", "  "]}) is None
+
+    def test_missing_table_falls_back(self, sqlite_connection: _SqliteConnection) -> None:
+        sqlite_connection.db.execute(f"DROP TABLE {search_migration.FTS_TABLE}")
+
+        assert CaseSearchIndex().rank_case_ids("某某科技", limit=10) is None
+        assert CaseSearchIndex().match_case_ids({"parties": ["某某科技"]}) is None
+
+    def test_unknown_column_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            CaseSearchIndex().match_case_ids({"title": ["某某科技"]})
+
+
+class TestOtherVendors:
+    def test_postgresql_match_defers_to_icontains(self) -> None:
+        with patch.object(case_search_index, "connection", MagicMock(vendor="postgresql")):
+            assert CaseSearchIndex().match_case_ids({"parties": ["某某科技"]}) is None
+
+    def test_mysql_not_supported(self) -> None:
+        with patch.object(case_search_index, "connection", MagicMock(vendor="mysql")):
+            assert CaseSearchIndex().rank_case_ids("某某科技", limit=10) is None
+            assert CaseSearchIndex().match_case_ids({"parties": ["某某科技"]}) is None
+
+    def test_pg_rank_sql_params(self) -> None:
+        sql, params = _pg_rank_sql("某某科技", "0106民初", 20)
+
+        assert sql.count("%s") == len(params) == 7
+        assert params[-1] == 20
+        assert "cases_casenumber" in sql
+        assert "cases_casenumber" not in _pg_rank_sql("某某科技", "", 20)[0]
+
+    def test_like_pattern_escapes_wildcards(self) -> None:
+        assert _like_pattern("50%_a\\b") == "%50\\%\\_a\\\\b%"
+
+
+def _service(ranked: list[int] | None, visible: list[int]) -> tuple[CaseSearchService, MagicMock]:
+    search_index = MagicMock()
+    search_index.rank_case_ids.return_value = ranked
+    access_policy = MagicMock()
+    access_policy.filter_queryset.return_value.values_list.return_value = visible
+    return CaseSearchService(access_policy=access_policy, search_index=search_index), search_index
+
+
+class TestSearchCasesRanked:
+    def test_keeps_rank_order_of_visible_cases(self) -> None:
+        svc, search_index = _service([3, 1, 2, 5], visible=[1, 2, 3])
+        cases = {i: MagicMock(id=i) for i in (1, 3)}
+
+        with (
+            patch.object(case_search_service, "Case"),
+            patch.object(case_search_service, "get_case_queryset") as get_qs,
+        ):
+            get_qs.return_value.in_bulk.return_value = cases
+            result = svc.search_cases("某某科技", limit=2, perm_open_access=True)
+
+        assert result == [cases[3], cases[1]]
+        get_qs.return_value.in_bulk.assert_called_once_with([3, 1])
+        assert search_index.rank_case_ids.call_args.kwargs["limit"] == 200
+
+    def test_truncated_candidates_fall_back_to_icontains(self) -> None:
+        svc, _ = _service(list(range(200)), visible=[])
+
+        with (
+            patch.object(case_search_service, "Case"),
+            patch.object(case_search_service, "CaseNumber"),
+            patch.object(case_search_service, "get_case_queryset") as get_qs,
+        ):
+            svc.access_policy.filter_queryset.return_value.__getitem__.return_value = ["fallback"]
+            result = svc.search_cases("某某科技", limit=2, perm_open_access=True)
+
+        assert result == ["fallback"]
+        get_qs.return_value.filter.assert_called_once()
+
+    def test_search_by_case_number_uses_index_ids(self) -> None:
+        svc, search_index = _service(None, visible=[])
+        search_index.match_case_ids.return_value = [7]
+
+        with (
+            patch.object(case_search_service, "CaseNumber") as case_number,
+            patch.object(case_search_service, "get_case_queryset") as get_qs,
+        ):
+            svc.search_by_case_number("（2024）粤0106民初123号", perm_open_access=True)
+
+        get_qs.return_value.filter.assert_called_once_with(id__in=[7])
+        case_number.objects.filter.assert_not_called()
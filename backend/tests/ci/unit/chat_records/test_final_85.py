@@ -160,68 +160,6 @@ class TestCropForOcrBytesWithRange:
         assert isinstance(y_start, int)
 
 
-# ===================================================================
-# FrameProcessingService: is_dhash_duplicate
-# ===================================================================
-class TestFrameProcessingIsDhashDuplicate:
-    def test_no_duplicate(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        sel_svc = Mock()
-        sel_svc.hamming_distance_hex.return_value = 50  # large distance
-        result = svc.is_dhash_duplicate(sel_svc, "abc", ["def"], window=3, threshold=10)
-        assert result is False
-
-    def test_duplicate_found(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        sel_svc = Mock()
-        sel_svc.hamming_distance_hex.return_value = 2  # small distance
-        result = svc.is_dhash_duplicate(sel_svc, "abc", ["def"], window=3, threshold=10)
-        assert result is True
-
-    def test_empty_kept_hashes(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        sel_svc = Mock()
-        result = svc.is_dhash_duplicate(sel_svc, "abc", [], window=3, threshold=10)
-        assert result is False
-
-
-# ===================================================================
-# FrameProcessingService: is_pixel_duplicate
-# ===================================================================
-class TestFrameProcessingIsPixelDuplicate:
-    def test_no_duplicate(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        sel_svc = Mock()
-        sel_svc.mean_abs_diff.return_value = 50.0
-        result = svc.is_pixel_duplicate(sel_svc, b"thumb", [b"prev"], window=3, threshold=5.0)
-        assert result is False
-
-    def test_duplicate_found(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        sel_svc = Mock()
-        sel_svc.mean_abs_diff.return_value = 1.0
-        result = svc.is_pixel_duplicate(sel_svc, b"thumb", [b"prev"], window=3, threshold=5.0)
-        assert result is True
-
-    def test_empty_kept_thumbs(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        sel_svc = Mock()
-        result = svc.is_pixel_duplicate(sel_svc, b"thumb", [], window=3, threshold=5.0)
-        assert result is False
-
-
 # ===================================================================
 # FrameProcessingService: check_ocr_similarity
 # ===================================================================
@@ -115,42 +115,6 @@ class TestExtractHelpers:
 
 
 class TestFrameProcessingService:
-    def test_is_dhash_duplicate_no_match(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        mock_sel = Mock()
-        mock_sel.hamming_distance_hex.return_value = 10  # high distance
-        result = svc.is_dhash_duplicate(mock_sel, "abc", ["def"], window=5, threshold=3)
-        assert result is False
-
-    def test_is_dhash_duplicate_match(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        mock_sel = Mock()
-        mock_sel.hamming_distance_hex.return_value = 1  # low distance
-        result = svc.is_dhash_duplicate(mock_sel, "abc", ["def"], window=5, threshold=3)
-        assert result is True
-
-    def test_is_pixel_duplicate_no_match(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        mock_sel = Mock()
-        mock_sel.mean_abs_diff.return_value = 0.5  # high diff
-        result = svc.is_pixel_duplicate(mock_sel, b"thumb", [b"prev"], window=5, threshold=0.1)
-        assert result is False
-
-    def test_is_pixel_duplicate_match(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        mock_sel = Mock()
-        mock_sel.mean_abs_diff.return_value = 0.01  # low diff
-        result = svc.is_pixel_duplicate(mock_sel, b"thumb", [b"prev"], window=5, threshold=0.1)
-        assert result is True
-
     def test_check_ocr_similarity_empty_text(self):
         from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
         from apps.chat_records.services.extraction.extract_helpers import DedupState
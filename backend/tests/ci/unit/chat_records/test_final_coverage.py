@@ -200,7 +200,7 @@ class TestDedupState:
         state = DedupState()
         assert state.existing_sha256 == set()
         assert state.seen_sha256 == set()
-        assert state.kept_dhashes == []
+        assert state.history.hash_count == 0
         assert state.created_count == 0
         assert state.ocr_disabled is False
 
@@ -211,74 +211,6 @@ class TestDedupState:
         assert state.ocr_calls == 3
 
 
-# ============================================================================
-# FrameProcessingService is_dhash_duplicate tests
-# ============================================================================
-
-
-class TestFrameProcessingIsDhashDuplicate:
-    def setup_method(self):
-        self.service = FrameProcessingService()
-        self.selection = MagicMock()
-
-    def test_no_previous_hashes(self):
-        self.selection.hamming_distance_hex.return_value = 0
-        result = self.service.is_dhash_duplicate(self.selection, "abc", [], 5, 8)
-        assert result is False
-
-    def test_duplicate_found(self):
-        self.selection.hamming_distance_hex.return_value = 2
-        result = self.service.is_dhash_duplicate(self.selection, "abc", ["def"], 5, 8)
-        assert result is True
-
-    def test_not_duplicate(self):
-        self.selection.hamming_distance_hex.return_value = 20
-        result = self.service.is_dhash_duplicate(self.selection, "abc", ["def"], 5, 8)
-        assert result is False
-
-    def test_none_distance(self):
-        self.selection.hamming_distance_hex.return_value = None
-        result = self.service.is_dhash_duplicate(self.selection, "abc", ["def"], 5, 8)
-        assert result is False
-
-    def test_window_limits_search(self):
-        self.selection.hamming_distance_hex.return_value = 2
-        hashes = ["a", "b", "c", "d", "e"]
-        # window=2 should only check last 2
-        result = self.service.is_dhash_duplicate(self.selection, "new", hashes, 2, 8)
-        assert result is True
-
-
-# ============================================================================
-# FrameProcessingService is_pixel_duplicate tests
-# ============================================================================
-
-
-class TestFrameProcessingIsPixelDuplicate:
-    def setup_method(self):
-        self.service = FrameProcessingService()
-        self.selection = MagicMock()
-
-    def test_no_previous_thumbs(self):
-        result = self.service.is_pixel_duplicate(self.selection, b"thumb", [], 5, 0.1)
-        assert result is False
-
-    def test_duplicate_found(self):
-        self.selection.mean_abs_diff.return_value = 0.05
-        result = self.service.is_pixel_duplicate(self.selection, b"thumb", [b"prev"], 5, 0.1)
-        assert result is True
-
-    def test_not_duplicate(self):
-        self.selection.mean_abs_diff.return_value = 0.5
-        result = self.service.is_pixel_duplicate(self.selection, b"thumb", [b"prev"], 5, 0.1)
-        assert result is False
-
-    def test_none_diff(self):
-        self.selection.mean_abs_diff.return_value = None
-        result = self.service.is_pixel_duplicate(self.selection, b"thumb", [b"prev"], 5, 0.1)
-        assert result is False
-
-
 # ============================================================================
 # FrameProcessingService check_ocr_similarity tests
 # ============================================================================
@@ -0,0 +1,254 @@
+"""帧去重向量化内核测试。"""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from apps.chat_records.services.extraction import frame_processing_service
+from apps.chat_records.services.extraction.extract_helpers import DedupState, ExtractParams
+from apps.chat_records.services.extraction.frame_hash_kernels import (
+    FrameHistory,
+    dhash_batch,
+    fingerprint_batch,
+    hamming_distances,
+    pack_hashes,
+    parse_hash_hex,
+    resize_gray,
+    thumb_batch,
+    to_gray,
+)
+from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
+from apps.chat_records.services.extraction.frame_selection_service import FrameSelectionService
+from apps.chat_records.services.extraction.video_frame_extract_service import RawFrame
+
+_LANCZOS: Any = getattr(Image, "Resampling", Image).LANCZOS
+
+
+def _frames(count: int, *, width: int = 80, height: int = 60, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(count, height, width, 3), dtype=np.uint8)
+
+
+def _legacy_dhash(pixels: np.ndarray) -> int:
+    """原逐像素循环实现"""
+    values = list(Image.fromarray(pixels).convert("L").resize((9, 8), _LANCZOS).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            if values[row * 9 + col] > values[row * 9 + col + 1]:
+                bits |= 1 << (row * 8 + col)
+    return bits
+
+
+class TestPillowParity:
+    @pytest.mark.parametrize(("width", "height"), [(9, 8), (48, 48), (5, 3), (120, 90)])
+    def test_resize_gray_matches_pil(self, width: int, height: int) -> None:
+        gray = to_gray(_frames(3, width=67, height=41))
+        result = resize_gray(gray, width, height)
+
+        for frame, resized in zip(gray, result, strict=True):
+            expected = np.asarray(Image.fromarray(frame).resize((width, height), _LANCZOS))
+            assert np.array_equal(resized, expected)
+
+    @pytest.mark.parametrize(
+        ("in_size", "out_size"),
+        [
+            ((1, 1), (9, 8)),
+            ((3, 2), (48, 48)),
+            ((9, 8), (9, 8)),
+            ((9, 41), (9, 8)),
+            ((480, 7), (63, 7)),
+            ((131, 97), (1, 1)),
+            ((2, 131), (200, 77)),
+        ],
+    )
+    def test_resize_gray_matches_pil_edge_sizes(self, in_size: tuple[int, int], out_size: tuple[int, int]) -> None:
+        """上采样、单轴尺寸不变、1 像素输入/输出与大倍率缩小"""
+        gray = to_gray(_frames(2, width=in_size[0], height=in_size[1], seed=11))
+        result = resize_gray(gray, *out_size)
+
+        for frame, resized in zip(gray, result, strict=True):
+            expected = np.asarray(Image.fromarray(frame).resize(out_size, _LANCZOS))
+            assert np.array_equal(resized, expected)
+
+    def test_to_gray_matches_pil_and_passes_through_gray(self) -> None:
+        frames = _frames(2)
+        gray = to_gray(frames)
+
+        assert np.array_equal(gray[1], np.asarray(Image.fromarray(frames[1]).convert("L")))
+        assert to_gray(gray) is gray
+
+    def test_dhash_batch_matches_legacy_loop(self) -> None:
+        frames = _frames(6, width=97, height=131, seed=3)
+
+        assert dhash_batch(frames).tolist() == [_legacy_dhash(frame) for frame in frames]
+
+    def test_thumb_batch_matches_selection_service(self) -> None:
+        frames = _frames(2, width=96, height=160, seed=5)
+        svc = FrameSelectionService()
+
+        thumbs = thumb_batch(frames)
+
+        assert [row.tobytes() for row in thumbs] == [svc.calc_thumb_array(frame) for frame in frames]
+
+    def test_fingerprint_batch_matches_separate_kernels(self) -> None:
+        frames = _frames(4, seed=9)
+
+        hashes, thumbs = fingerprint_batch(frames)
+
+        assert hashes.dtype == np.uint64
+        assert np.array_equal(hashes, dhash_batch(frames))
+        assert np.array_equal(thumbs, thumb_batch(frames))
+
+
+class TestHashHelpers:
+    def test_pack_hashes_bit_order(self) -> None:
+        bits = np.zeros((2, 64), dtype=bool)
+        bits[0, 0] = True
+        bits[1, 63] = True
+
+        assert pack_hashes(bits).tolist() == [1, 1 << 63]
+
+    def test_pack_hashes_rejects_more_than_64_bits(self) -> None:
+        with pytest.raises(ValueError):
+            pack_hashes(np.zeros((1, 65), dtype=bool))
+
+    def test_hamming_distances(self) -> None:
+        hashes = np.array([0, 0xFF, (1 << 64) - 1], dtype=np.uint64)
+
+        assert hamming_distances(0x0F, hashes).tolist() == [4, 4, 60]
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("00ff", 255), ("ffffffffffffffff", (1 << 64) - 1), ("1" + "0" * 16, None), ("", None), ("xyz", None)],
+    )
+    def test_parse_hash_hex(self, value: str, expected: int | None) -> None:
+        assert parse_hash_hex(value) == expected
+
+
+class TestFrameHistory:
+    def test_min_distance_covers_full_history_after_growth(self) -> None:
+        history = FrameHistory(capacity=2)
+        for value in (0xF0F0, 0x1, 0x2, 0x4, 0x8):
+            history.add_hash(value)
+
+        assert history.hash_count == 5
+        assert history.min_hash_distance(0xF0F1) == 1
+        assert FrameHistory().min_hash_distance(0) is None
+
+    def test_novel_mask(self) -> None:
+        history = FrameHistory()
+        history.add_hash(0)
+
+        mask = history.novel_mask(np.array([0b1, 0b11, 0b111], dtype=np.uint64), 2)
+
+        assert mask.tolist() == [False, False, True]
+        assert FrameHistory().novel_mask(np.array([5], dtype=np.uint64), 2).tolist() == [True]
+
+    def test_thumb_window_and_mismatched_length(self) -> None:
+        history = FrameHistory(capacity=1)
+        history.add_thumb(bytes([0] * 4))
+        history.add_thumb(np.full(4, 100, dtype=np.uint8))
+        history.add_thumb(b"\x00\x00")
+
+        assert history.thumb_count == 2
+        assert history.has_similar_thumb(bytes([1] * 4), 1.0, window=2)
+        assert not history.has_similar_thumb(bytes([1] * 4), 1.0, window=1)
+        assert not history.has_similar_thumb(b"\x00", 1.0, window=2)
+        assert not FrameHistory().has_similar_thumb(b"\x00", 1.0, window=2)
+
+
+class TestProcessStreamBatch:
+    def _run(self, frames: list[RawFrame], state: DedupState, creator: MagicMock, threshold: int) -> None:
+        FrameProcessingService().process_stream_batch(
+            frames,
+            1,
+            ExtractParams(dedup_threshold=threshold),
+            state,
+            FrameSelectionService(),
+            None,
+            float("inf"),
+            0,
+            6,
+            2.8,
+            creator,
+            MagicMock(),
+        )
+
+    def test_repeat_of_old_frame_is_skipped(self) -> None:
+        pixels = _frames(3, width=64, height=48, seed=11)
+        state = DedupState()
+        creator = MagicMock()
+
+        self._run([RawFrame(i + 1, None, pixels[i]) for i in range(3)], state, creator, 8)
+        # 回到第一帧的画面：窗口之外也能识别为重复
+        self._run([RawFrame(4, None, pixels[0].copy())], state, creator, 8)
+
+        assert state.processed_count == 4
+        assert creator.create_screenshot.call_count == 3
+        assert state.history.hash_count == 3
+        assert state.history.thumb_count == 3
+        assert [c.kwargs["dhash"] for c in creator.create_screenshot.call_args_list] == [
+            f"{_legacy_dhash(frame):016x}" for frame in pixels
+        ]
+
+    def test_thumbs_only_for_hash_candidates(self) -> None:
+        pixels = _frames(1, width=64, height=48, seed=2)[0]
+        state = DedupState()
+        self._run([RawFrame(1, None, pixels)], state, MagicMock(), 8)
+
+        with patch.object(frame_processing_service, "thumb_batch", wraps=frame_processing_service.thumb_batch) as spy:
+            self._run([RawFrame(2, None, pixels.copy()), RawFrame(3, None, pixels.copy())], state, MagicMock(), 8)
+
+        spy.assert_not_called()
+        assert state.processed_count == 3
+
+
+class TestBenchmarkCommand:
+    def test_vectorized_lookup_agrees_with_hex_loop(self) -> None:
+        from apps.chat_records.management.commands.benchmark_chat_records_dedup import Command
+
+        history_hashes, queries = Command._synthetic_hashes(np.random.default_rng(1), 200, 100)
+        history = FrameHistory()
+        for value in history_hashes.tolist():
+            history.add_hash(value)
+
+        history_hex = [f"{value:016x}" for value in history_hashes.tolist()]
+        query_hex = [f"{value:016x}" for value in queries.tolist()]
+
+        _, legacy_hits = Command._legacy_lookup(history_hex, query_hex, 8)
+        _, vectorized_hits = Command._vectorized_lookup(history, queries, 8)
+
+        assert legacy_hits == vectorized_hits > 0
+
+    def test_pipelines_agree_on_hashes(self) -> None:
+        from apps.chat_records.management.commands.benchmark_chat_records_dedup import Command
+
+        frames = Command._synthetic_frames(np.random.default_rng(2), 20, 64, 48)
+
+        legacy_hashes, legacy_kept = Command._legacy(frames, 8, 2.8, 12)
+        vectorized_hashes, vectorized_kept = Command._vectorized(frames, 8, 2.8, 12)
+
+        assert legacy_hashes == vectorized_hashes
+        assert 0 < vectorized_kept <= legacy_kept
+
+    def test_build_report(self) -> None:
+        from apps.chat_records.management.commands.benchmark_chat_records_dedup import Command
+
+        report = Command._build_report(
+            frames=100,
+            repeat=1,
+            legacy_seconds=2.0,
+            vectorized_seconds=0.5,
+            hash_mismatches=0,
+            legacy_kept=10,
+            vectorized_kept=8,
+        )
+
+        assert report["speedup"] == 4.0
+        assert report["vectorized_fps"] == 200.0
@@ -10,58 +10,6 @@ from apps.chat_records.services.extraction.frame_processing_service import Frame
 from apps.chat_records.services.extraction.extract_helpers import DedupState, ExtractParams
 
 
-class TestIsDhashDuplicate:
-    def test_duplicate_found(self):
-        svc = FrameProcessingService()
-        mock_selection = MagicMock()
-        mock_selection.hamming_distance_hex.return_value = 3
-        result = svc.is_dhash_duplicate(mock_selection, "abc", ["def", "ghi"], window=5, threshold=5)
-        assert result is True
-
-    def test_no_duplicate(self):
-        svc = FrameProcessingService()
-        mock_selection = MagicMock()
-        mock_selection.hamming_distance_hex.return_value = 20
-        result = svc.is_dhash_duplicate(mock_selection, "abc", ["def"], window=5, threshold=5)
-        assert result is False
-
-    def test_none_distance(self):
-        svc = FrameProcessingService()
-        mock_selection = MagicMock()
-        mock_selection.hamming_distance_hex.return_value = None
-        result = svc.is_dhash_duplicate(mock_selection, "abc", ["def"], window=5, threshold=5)
-        assert result is False
-
-    def test_empty_kept_list(self):
-        svc = FrameProcessingService()
-        mock_selection = MagicMock()
-        result = svc.is_dhash_duplicate(mock_selection, "abc", [], window=5, threshold=5)
-        assert result is False
-
-
-class TestIsPixelDuplicate:
-    def test_duplicate_found(self):
-        svc = FrameProcessingService()
-        mock_selection = MagicMock()
-        mock_selection.mean_abs_diff.return_value = 0.05
-        result = svc.is_pixel_duplicate(mock_selection, b"thumb", [b"prev"], window=5, threshold=0.1)
-        assert result is True
-
-    def test_no_duplicate(self):
-        svc = FrameProcessingService()
-        mock_selection = MagicMock()
-        mock_selection.mean_abs_diff.return_value = 0.5
-        result = svc.is_pixel_duplicate(mock_selection, b"thumb", [b"prev"], window=5, threshold=0.1)
-        assert result is False
-
-    def test_none_diff(self):
-        svc = FrameProcessingService()
-        mock_selection = MagicMock()
-        mock_selection.mean_abs_diff.return_value = None
-        result = svc.is_pixel_duplicate(mock_selection, b"thumb", [b"prev"], window=5, threshold=0.1)
-        assert result is False
-
-
 class TestCheckOcrSimilarity:
     def test_empty_ocr_text(self):
         svc = FrameProcessingService()
@@ -170,12 +118,12 @@ class TestUpdateDedupState:
         svc = FrameProcessingService()
         state = DedupState()
         svc.update_dedup_state(
-            state, "digest1", "dhash1", b"thumb", "ocr text",
+            state, "digest1", "0f1e", b"thumb", "ocr text",
             MagicMock(), 0.1, MagicMock(), b"content"
         )
         assert state.created_count == 1
         assert "digest1" in state.seen_sha256
-        assert "dhash1" in state.kept_dhashes
+        assert state.history.hash_count == 1
 
     def test_update_without_ocr(self):
         svc = FrameProcessingService()
@@ -196,7 +144,7 @@ class TestUpdateDedupState:
             state, "digest1", "dhash1", b"", "",
             None, 0.1, mock_sel, b"content"
         )
-        assert len(state.kept_thumbs) == 1
+        assert state.history.thumb_count == 1
 
 
 class TestIsFrameDuplicate:
@@ -223,23 +171,33 @@ class TestIsFrameDuplicate:
     def test_dhash_duplicate(self):
         svc = FrameProcessingService()
         state = DedupState()
-        state.kept_dhashes = ["prev_dhash"]
-        mock_sel = MagicMock()
-        mock_sel.hamming_distance_hex.return_value = 2
+        state.history.add_hash(0x00FF)
         params = ExtractParams(dedup_threshold=5)
         is_dup, thumb = svc.is_frame_duplicate(
-            b"content", "new_digest", "new_dhash", state,
-            params, mock_sel, 5, 0.0
+            b"content", "new_digest", "00000000000000fc", state,
+            params, MagicMock(), 5, 0.0
+        )
+        assert is_dup is True
+
+    def test_dhash_duplicate_against_full_history(self):
+        svc = FrameProcessingService()
+        state = DedupState()
+        state.history.add_hash(0x00FF)
+        for i in range(1, 20):
+            state.history.add_hash(0xFFFF << (i * 2))
+        params = ExtractParams(dedup_threshold=5)
+        is_dup, _ = svc.is_frame_duplicate(
+            b"content", "new_digest", "00000000000000ff", state,
+            params, MagicMock(), 5, 0.0
         )
         assert is_dup is True
 
     def test_pixel_duplicate(self):
         svc = FrameProcessingService()
         state = DedupState()
-        state.kept_thumbs = [b"prev_thumb"]
+        state.history.add_thumb(b"prev_thumb")
         mock_sel = MagicMock()
-        mock_sel.calc_thumb_bytes.return_value = b"new_thumb"
-        mock_sel.mean_abs_diff.return_value = 0.01
+        mock_sel.calc_thumb_bytes.return_value = b"prev_thumc"
         params = ExtractParams(dedup_threshold=0)
         is_dup, thumb = svc.is_frame_duplicate(
             b"content", "new_digest", "dhash", state,
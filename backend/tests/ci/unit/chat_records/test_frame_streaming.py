@@ -0,0 +1,286 @@
+"""流式抽帧（ffmpeg 原始帧管道）测试。"""
+
+from __future__ import annotations
+
+import io
+from hashlib import sha256
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from apps.chat_records.services.extraction.extract_helpers import DedupState, ExtractParams
+from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
+from apps.chat_records.services.extraction.frame_selection_service import FrameSelectionService
+from apps.chat_records.services.extraction.video_frame_extract_service import (
+    FFProbeInfo,
+    RawFrame,
+    RawFramePipe,
+    VideoFrameExtractService,
+)
+from apps.core.exceptions import ValidationException
+
+
+def _frame(seed: int, *, width: int = 64, height: int = 48) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+def _png(pixels: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _fake_proc(stdout: bytes, stderr: bytes = b"") -> SimpleNamespace:
+    return SimpleNamespace(stdout=io.BytesIO(stdout), stderr=io.BytesIO(stderr))
+
+
+class TestRawFramePipe:
+    def test_splits_frames_and_pairs_pts(self) -> None:
+        frames = [_frame(i, width=4, height=2) for i in range(3)]
+        stderr = (
+            b"[Parsed_showinfo_2 @ 0x1] n:   0 pts:      0 pts_time:0       duration:1\n"
+            b"Input #0, mov,mp4 from 'a.mp4':\n"
+            b"[Parsed_showinfo_2 @ 0x1] n:   1 pts:   1500 pts_time:1.5     duration:1\n"
+            b"[Parsed_showinfo_2 @ 0x1] n:   2 pts:   3000 pts_time:3       duration:1\n"
+        )
+        # 末尾不足一帧的残余数据应被丢弃
+        pipe = RawFramePipe(
+            _fake_proc(b"".join(f.tobytes() for f in frames) + b"\x00" * 5, stderr),  # type: ignore[arg-type]
+            width=4,
+            height=2,
+            parse_pts=True,
+        )
+
+        received = []
+        while (data := pipe.next_frame(timeout=1.0)) is not None:
+            received.append((pipe.pts_for(len(received)), pipe.to_array(data)))
+        pipe.join()
+
+        assert [pts for pts, _ in received] == [0.0, 1.5, 3.0]
+        for (_, pixels), expected in zip(received, frames, strict=True):
+            assert np.array_equal(pixels, expected)
+        assert pipe.stderr_tail == "Input #0, mov,mp4 from 'a.mp4':"
+
+    def test_without_pts(self) -> None:
+        pipe = RawFramePipe(_fake_proc(bytes(12)), width=2, height=2, parse_pts=False)  # type: ignore[arg-type]
+
+        assert pipe.next_frame(timeout=1.0) is not None
+        assert pipe.pts_for(0) is None
+        assert pipe.next_frame(timeout=1.0) is None
+
+    def test_missing_pts_fails_instead_of_shifting(self) -> None:
+        stderr = (
+            b"[Parsed_showinfo_2 @ 0x1] n:   0 pts:      0 pts_time:0       duration:1\n"
+            b"[Parsed_showinfo_2 @ 0x1] n:   2 pts:   3000 pts_time:3       duration:1\n"
+        )
+        pipe = RawFramePipe(_fake_proc(bytes(12 * 3), stderr), width=2, height=2, parse_pts=True)  # type: ignore[arg-type]
+
+        assert pipe.pts_for(0) == 0.0
+        with pytest.raises(ValidationException):
+            pipe.pts_for(1)
+        assert pipe.pts_for(2) == 3.0
+        pipe.join()
+
+    def test_join_drains_unconsumed_frames(self) -> None:
+        proc = _fake_proc(bytes(12 * 10))
+        pipe = RawFramePipe(proc, width=2, height=2, parse_pts=False, queue_size=1)  # type: ignore[arg-type]
+
+        pipe.join(timeout=2.0)
+
+        assert not any(thread.is_alive() for thread in pipe._threads)
+
+
+class TestIterRawFrames:
+    def test_timeout_excludes_consumer_time(self) -> None:
+        proc = _fake_proc(bytes(4 * 2 * 3 * 3))
+        proc.wait = MagicMock(return_value=0)
+        svc = VideoFrameExtractService()
+
+        with (
+            patch.object(svc, "_find_tool", return_value="/usr/bin/ffmpeg"),
+            patch("apps.chat_records.services.extraction.video_frame_extract_service.SubprocessRunner") as runner,
+            patch("apps.chat_records.services.extraction.video_frame_extract_service.time.monotonic") as clock,
+        ):
+            runner.return_value.popen.return_value = proc
+            now = [0.0]
+            clock.side_effect = lambda: now[0]
+            received = []
+            for frame in svc.iter_raw_frames(
+                video_path="/tmp/video.mp4", width=4, height=2, interval_seconds=1.0, timeout_seconds=30
+            ):
+                received.append(frame.index)
+                now[0] += 600.0  # 调用方处理（如 OCR）耗时不计入 ffmpeg 超时
+
+        assert received == [1, 2, 3]
+
+
+class TestRawFrameArgs:
+    def test_raw_frame_size_caps_long_side(self) -> None:
+        svc = VideoFrameExtractService()
+        assert svc.raw_frame_size(1920, 1080) == (1280, 720)
+        assert svc.raw_frame_size(1080, 2340) == (590, 1280)
+        assert svc.raw_frame_size(641, 479) == (640, 480)
+        assert svc.raw_frame_size(0, 720) == (0, 0)
+
+    def test_interval_strategy(self) -> None:
+        input_args, vf, extra, parse_pts = VideoFrameExtractService()._build_raw_frame_args(
+            "interval", 2.0, 0.25, 1280, 720
+        )
+        assert input_args == []
+        assert vf == "fps=0.5,scale=1280:720,mpdecimate"
+        assert extra == ["-vsync", "vfr"]
+        assert parse_pts is False
+
+    def test_scene_strategy_logs_pts(self) -> None:
+        _, vf, _, parse_pts = VideoFrameExtractService()._build_raw_frame_args("scene", 2.0, 0.3, 640, 360)
+        assert vf == "select='gt(scene,0.3)',scale=640:360,mpdecimate,showinfo"
+        assert parse_pts is True
+
+
+class TestArrayKernels:
+    def test_dhash_matches_encoded_image(self) -> None:
+        svc = FrameSelectionService()
+        for seed in range(5):
+            pixels = _frame(seed)
+            assert svc.calc_dhash_hex_array(pixels) == svc.calc_dhash_hex(_png(pixels))
+
+    def test_thumb_matches_encoded_image(self) -> None:
+        svc = FrameSelectionService()
+        pixels = _frame(3, width=96, height=160)
+        assert svc.calc_thumb_array(pixels) == svc.calc_thumb_bytes(_png(pixels))
+
+    def test_mean_abs_diff(self) -> None:
+        svc = FrameSelectionService()
+        a, b = _frame(1).tobytes(), _frame(2).tobytes()
+        expected = sum(abs(x - y) for x, y in zip(a, b, strict=True)) / len(a)
+
+        assert svc.mean_abs_diff(a, b) == pytest.approx(expected)
+        assert svc.mean_abs_diff(a, a) == 0.0
+        assert svc.mean_abs_diff(a, b[:-1]) is None
+
+    def test_encode_jpeg_round_trip(self) -> None:
+        content = FrameSelectionService().encode_jpeg(_frame(0))
+        assert Image.open(io.BytesIO(content)).size == (64, 48)
+
+    def test_empty_array(self) -> None:
+        svc = FrameSelectionService()
+        empty = np.zeros((0, 0, 3), dtype=np.uint8)
+        assert svc.calc_dhash_hex_array(empty) == ""
+        assert svc.calc_thumb_array(empty) == b""
+
+
+def _process(fps: FrameProcessingService, frame: RawFrame, state: DedupState, creator: MagicMock, **kwargs) -> bool:
+    params = kwargs.pop("params", ExtractParams(dedup_threshold=8))
+    return fps.process_stream_frame(
+        frame,
+        1,
+        params,
+        state,
+        kwargs.pop("selection_service", FrameSelectionService()),
+        None,
+        float("inf"),
+        10,
+        6,
+        kwargs.pop("pixel_diff_threshold", 0.0),
+        creator,
+        MagicMock(),
+    )
+
+
+class TestProcessStreamFrame:
+    def test_creates_screenshot_for_new_frame(self) -> None:
+        state = DedupState()
+        creator = MagicMock()
+
+        assert _process(FrameProcessingService(), RawFrame(3, None, _frame(0)), state, creator) is True
+
+        kwargs = creator.create_screenshot.call_args.kwargs
+        assert kwargs["ordering"] == 11
+        assert kwargs["capture_time_seconds"] == 2.0
+        assert kwargs["image_name"] == "frame_000003.jpg"
+        assert kwargs["sha256"] in state.seen_sha256
+        assert state.created_count == 1
+
+    def test_near_duplicate_is_not_encoded(self) -> None:
+        selection = FrameSelectionService()
+        state = DedupState()
+        creator = MagicMock()
+        pixels = _frame(0)
+        fps = FrameProcessingService()
+        _process(fps, RawFrame(1, None, pixels), state, creator, selection_service=selection)
+
+        with patch.object(selection, "encode_jpeg", wraps=selection.encode_jpeg) as encode:
+            created = _process(fps, RawFrame(2, None, pixels.copy()), state, creator, selection_service=selection)
+
+        assert created is False
+        encode.assert_not_called()
+        assert creator.create_screenshot.call_count == 1
+
+    def test_pixel_duplicate_is_skipped(self) -> None:
+        state = DedupState()
+        creator = MagicMock()
+        fps = FrameProcessingService()
+        params = ExtractParams(dedup_threshold=0)
+        pixels = _frame(0)
+        _process(fps, RawFrame(1, None, pixels), state, creator, params=params, pixel_diff_threshold=2.8)
+
+        assert state.history.thumb_count == 1
+        assert not _process(fps, RawFrame(2, None, pixels), state, creator, params=params, pixel_diff_threshold=2.8)
+
+    def test_existing_sha256_is_skipped(self) -> None:
+        pixels = _frame(0)
+        state = DedupState(existing_sha256={sha256(FrameSelectionService().encode_jpeg(pixels)).hexdigest()})
+        creator = MagicMock()
+
+        assert _process(FrameProcessingService(), RawFrame(1, None, pixels), state, creator) is False
+        creator.create_screenshot.assert_not_called()
+
+    def test_capture_time_uses_pts_for_vfr_strategies(self) -> None:
+        fps = FrameProcessingService()
+        params = ExtractParams(strategy="scene", interval_based=False)
+
+        assert fps.calc_stream_capture_time(RawFrame(5, 12.5, _frame(0)), params) == 12.5
+        assert fps.calc_stream_capture_time(RawFrame(5, None, _frame(0)), params) == 4.0
+
+
+class TestRunStreamingPhase:
+    def test_processes_frames_as_they_arrive(self) -> None:
+        frames = [RawFrame(i, None, _frame(i)) for i in range(1, 5)]
+        service = MagicMock()
+        service.estimate_total_frames.return_value = 10
+        service.iter_raw_frames.return_value = iter(frames)
+        reporter = MagicMock()
+        creator = MagicMock()
+        state = DedupState()
+        info = FFProbeInfo(duration_seconds=10.0, width=64, height=48)
+
+        FrameProcessingService().run_streaming_phase(
+            service,
+            "/tmp/video.mp4",
+            1,
+            info,
+            ExtractParams(dedup_threshold=0),
+            state,
+            FrameSelectionService(),
+            None,
+            MagicMock(),
+            reporter,
+            MagicMock(),
+            float("inf"),
+            0,
+            6,
+            0.0,
+            creator,
+        )
+
+        call = service.iter_raw_frames.call_args.kwargs
+        assert (call["width"], call["height"]) == (64, 48)
+        assert state.processed_count == 4
+        assert creator.create_screenshot.call_count == 4
+        last = reporter.report_extra.call_args.kwargs
+        assert last["progress"] == 30
+        assert last["current"] == 4
@@ -0,0 +1,190 @@
+"""Tests for clause-chunked contract review."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.contract_review.services.review.clause_chunker import (
+    ClauseChunk,
+    clause_starts,
+    preamble_context,
+    split_into_clause_chunks,
+)
+from apps.contract_review.services.review.contract_reviewer import (
+    ContractReviewer,
+    ReviewResult,
+    merge_chunk_results,
+)
+
+_CONTRACT = [
+    "买卖合同",
+    "甲方：广州某某科技有限公司",
+    "乙方：深圳某某贸易有限公司",
+    "第一条 标的物",
+    "乙方向甲方供应服务器十台。",
+    "第二条 价款",
+    "总价款为人民币壹佰万元。",
+    "二、付款方式",
+    "甲方收货后三十日内付款。",
+    "附件1：设备清单",
+    "服务器 10 台",
+]
+
+
+def _chunk_of(prompt: str) -> list[int]:
+    return [int(n) for n in re.findall(r"\[段落(\d+)\]", prompt)]
+
+
+class TestSplitIntoClauseChunks:
+    def test_clause_starts(self):
+        assert clause_starts(_CONTRACT) == [3, 5, 7, 9]
+
+    def test_short_contract_single_chunk(self):
+        chunks = split_into_clause_chunks(_CONTRACT, max_chars=10_000)
+
+        assert chunks == [ClauseChunk(0, _CONTRACT)]
+
+    def test_splits_on_clause_boundaries(self):
+        chunks = split_into_clause_chunks(_CONTRACT, max_chars=20)
+
+        # 合同首部超过上限按段落切分，其余每个条款一块
+        assert [(c.start, c.end) for c in chunks] == [(0, 2), (2, 3), (3, 5), (5, 7), (7, 9), (9, 11)]
+        assert [p for c in chunks for p in c.paragraphs] == _CONTRACT
+
+    def test_merges_adjacent_clauses_up_to_limit(self):
+        chunks = split_into_clause_chunks(_CONTRACT, max_chars=40)
+
+        assert [c.start for c in chunks] == [0, 3, 7]
+
+    def test_oversized_clause_split_by_paragraph(self):
+        paragraphs = ["第一条 定义", "甲" * 30, "乙" * 30, "丙" * 30, "第二条 其他", "丁"]
+
+        chunks = split_into_clause_chunks(paragraphs, max_chars=50)
+
+        assert [(c.start, c.end) for c in chunks] == [(0, 2), (2, 3), (3, 6)]
+
+    def test_without_headings_split_by_size(self):
+        paragraphs = ["段" * 20] * 5
+
+        chunks = split_into_clause_chunks(paragraphs, max_chars=45)
+
+        assert [(c.start, c.end) for c in chunks] == [(0, 2), (2, 4), (4, 5)]
+
+    def test_empty(self):
+        assert split_into_clause_chunks([]) == []
+
+    def test_numbered_text_uses_global_indices(self):
+        assert ClauseChunk(5, ["a", "b"]).numbered_text() == "[段落5] a\n[段落6] b"
+
+    def test_preamble_context(self):
+        assert preamble_context(_CONTRACT) == "买卖合同\n甲方：广州某某科技有限公司\n乙方：深圳某某贸易有限公司"
+        assert preamble_context(_CONTRACT, max_chars=4) == "买卖合同"
+        assert preamble_context(["无标题段落"]) == ""
+
+
+class TestMergeChunkResults:
+    def test_corrects_indices_and_dedupes(self):
+        chunks = [ClauseChunk(0, ["甲方：A"]), ClauseChunk(1, ["第一条 价款", "总价款为壹佰万元。"])]
+        results_by_start = {
+            0: [ReviewResult("甲方：A", "甲方：A公司", "r", 0)],
+            1: [
+                ReviewResult("壹佰万元", "壹佰万元整", "全文编号", 2),
+                ReviewResult("壹佰万元", "壹佰万元（含税）", "重复", 2),
+                ReviewResult("第一条", "第一条 价格", "分块内编号", 0),
+                ReviewResult("总价款", "价款", "编号错误", 9),
+                ReviewResult("不存在的原文", "x", "找不到", 7),
+                ReviewResult("  ", "x", "空原文", 1),
+            ],
+        }
+
+        merged = merge_chunk_results(chunks, results_by_start)
+
+        assert [(r.paragraph_index, r.reason) for r in merged] == [
+            (0, "r"),
+            (2, "全文编号"),
+            (1, "分块内编号"),
+            (2, "编号错误"),
+            (1, "找不到"),
+        ]
+
+
+class TestChunkedReview:
+    def _llm(self, respond):
+        llm = MagicMock()
+        llm.complete.side_effect = lambda prompt, **kwargs: MagicMock(content=respond(prompt, kwargs))
+        return llm
+
+    def test_short_contract_keeps_single_call(self):
+        llm = self._llm(lambda prompt, kwargs: "[]")
+
+        ContractReviewer(llm).review_contract(_CONTRACT, "party_a", "A", "B")
+
+        assert llm.complete.call_count == 1
+        assert llm.complete.call_args.kwargs["max_tokens"] == 32768
+
+    def test_reviews_chunks_concurrently_and_merges(self):
+        barrier = threading.Barrier(4, timeout=5)
+        prompts: list[str] = []
+
+        def respond(prompt: str, kwargs: dict) -> str:
+            prompts.append(prompt)
+            barrier.wait()  # 四个分块同时在途才会全部放行
+            indices = _chunk_of(prompt)
+            if indices[0] == 5:
+                raise RuntimeError("timeout")
+            original = _CONTRACT[indices[-1]][:4]
+            return json.dumps([{"original": original, "suggested": "改", "reason": "r", "paragraph_index": 1}])
+
+        llm = self._llm(respond)
+        reviewer = ContractReviewer(llm, chunk_chars=30)
+
+        results = reviewer.review_contract(_CONTRACT[:9], "party_b", "A", "B")
+
+        assert llm.complete.call_count == 4
+        assert all(call.kwargs["max_tokens"] == 8192 for call in llm.complete.call_args_list)
+        # 分块 5-6 失败被跳过；其余按分块顺序，编号校正到原文所在段落
+        assert [r.paragraph_index for r in results] == [2, 4, 8]
+        later = next(p for p in prompts if _chunk_of(p)[0] == 3)
+        assert "合同首部" in later and "深圳某某贸易有限公司" in later
+        first = next(p for p in prompts if _chunk_of(p)[0] == 0)
+        assert "合同首部" not in first and "部分条款" in first
+
+    def test_report_chunks_with_summary(self):
+        def respond(prompt: str, kwargs: dict) -> str:
+            if kwargs["max_tokens"] == 4096:
+                assert "段落 0-4" in prompt
+                return "总体风险较高"
+            return f"分析{_chunk_of(prompt)[0]}"
+
+        llm = self._llm(respond)
+
+        report = ContractReviewer(llm, chunk_chars=60).generate_report(_CONTRACT, "party_a", "A", "B")
+
+        assert report.index("分析0") < report.index("分析5")
+        assert report.endswith("## 总体评估\n\n总体风险较高")
+        assert "最严重的三个问题" not in llm.complete.call_args_list[0].kwargs["prompt"]
+
+    def test_report_without_summary_keeps_findings(self):
+        def respond(prompt: str, kwargs: dict) -> str:
+            if kwargs["max_tokens"] == 4096:
+                raise RuntimeError("down")
+            return "分析"
+
+        report = ContractReviewer(self._llm(respond), chunk_chars=60).generate_report(_CONTRACT, "party_a", "A", "B")
+
+        assert report.count("分析") == 2
+        assert "总体评估" not in report
+
+    @pytest.mark.parametrize("method", ["review_contract", "generate_report"])
+    def test_all_chunks_failing(self, method: str):
+        llm = MagicMock()
+        llm.complete.side_effect = RuntimeError("down")
+
+        result = getattr(ContractReviewer(llm, chunk_chars=40), method)(_CONTRACT, "party_a", "A", "B")
+
+        assert not result
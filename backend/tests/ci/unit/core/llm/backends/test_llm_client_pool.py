@@ -0,0 +1,164 @@
+"""LLM 客户端池测试。"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from apps.core.llm.backends.base import BackendConfig
+from apps.core.llm.backends.client_pool import LLMClientKey, LLMClientPool, resolve_timeout_class
+
+
+def _key(**kwargs: object) -> LLMClientKey:
+    defaults: dict[str, object] = {"base_url": "https://api.test/v1", "api_key": "sk-test", "timeout_seconds": 30}
+    defaults.update(kwargs)
+    return LLMClientKey.build(**defaults)  # type: ignore[arg-type]
+
+
+class TestTimeoutClass:
+    def test_rounds_up_to_bucket(self) -> None:
+        assert resolve_timeout_class(10) == 30
+        assert resolve_timeout_class(30) == 30
+        assert resolve_timeout_class(31) == 60
+        assert resolve_timeout_class(250) == 300
+
+    def test_beyond_largest_bucket(self) -> None:
+        assert resolve_timeout_class(900) == 900
+        assert resolve_timeout_class(900.5) == 901
+
+    def test_none_uses_smallest_bucket(self) -> None:
+        assert resolve_timeout_class(None) == 30
+
+
+class TestLLMClientKey:
+    def test_same_timeout_class_shares_key(self) -> None:
+        assert _key(timeout_seconds=40) == _key(timeout_seconds=55)
+
+    def test_trailing_slash_normalized(self) -> None:
+        assert _key(base_url="https://api.test/v1/") == _key()
+
+    @patch.dict("os.environ", {"LLM_SSL_VERIFY": "false"})
+    def test_ssl_verify_from_env(self) -> None:
+        assert _key().ssl_verify is False
+
+
+class TestSyncPool:
+    def test_reuses_client_for_same_key(self) -> None:
+        pool = LLMClientPool()
+        first = pool.get_openai_client(_key())
+        second = pool.get_openai_client(_key())
+        assert first is second
+        stats = pool.stats()
+        assert stats["clients"] == 1
+        assert stats["acquires"] == 2
+        assert stats["reuses"] == 1
+        assert stats["reuse_ratio"] == 0.5
+        pool.close()
+
+    def test_different_keys_get_different_clients(self) -> None:
+        pool = LLMClientPool()
+        a = pool.get_sync_http_client(_key(api_key="a"))
+        b = pool.get_sync_http_client(_key(api_key="b"))
+        assert a is not b
+        assert pool.stats()["clients"] == 2
+        pool.close()
+
+    def test_close_closes_http_clients(self) -> None:
+        pool = LLMClientPool()
+        client = pool.get_sync_http_client(_key())
+        pool.close()
+        assert client.is_closed
+        assert pool.stats()["clients"] == 0
+
+    def test_recreates_closed_client(self) -> None:
+        pool = LLMClientPool()
+        client = pool.get_sync_http_client(_key())
+        client.close()
+        assert pool.get_sync_http_client(_key()) is not client
+        pool.close()
+
+    @patch.dict("os.environ", {"DJANGO_HTTPX_METRICS": "true"})
+    def test_follows_redirects_and_installs_metrics_hooks(self) -> None:
+        pool = LLMClientPool()
+        client = pool.get_sync_http_client(_key())
+        assert client.follow_redirects is True
+        assert client.event_hooks["request"] and client.event_hooks["response"]
+        pool.close()
+
+
+class TestAsyncPool:
+    @pytest.mark.asyncio
+    async def test_reuses_async_client_within_loop(self) -> None:
+        pool = LLMClientPool()
+        first = pool.get_async_openai_client(_key())
+        second = pool.get_async_openai_client(_key())
+        assert first is second
+        http_client = pool.get_async_http_client(_key())
+        await pool.aclose()
+        assert http_client.is_closed
+
+    @pytest.mark.asyncio
+    @patch.dict("os.environ", {"DJANGO_HTTPX_METRICS": "true"})
+    async def test_async_metrics_hooks_are_awaitable(self) -> None:
+        pool = LLMClientPool()
+        client = pool.get_async_http_client(_key())
+        assert client.follow_redirects is True
+        request = client.build_request("GET", "https://api.test/v1/models")
+        for hook in client.event_hooks["request"]:
+            await hook(request)
+        assert "metrics_started_at" in request.extensions
+        await pool.aclose()
+
+
+    def test_closes_clients_on_owning_loop_when_it_exits(self) -> None:
+        pool = LLMClientPool()
+
+        async def _acquire() -> tuple[httpx.AsyncClient, object]:
+            pool.get_async_openai_client(_key())
+            return pool.get_async_http_client(_key()), asyncio.get_running_loop()
+
+        first, first_loop = asyncio.run(_acquire())
+        assert first.is_closed
+        assert pool.stats()["clients"] == 0
+
+        second, second_loop = asyncio.run(_acquire())
+        assert second is not first
+        assert second.is_closed
+        assert first_loop is not second_loop
+
+
+class TestBackendUsesPool:
+    def test_build_sync_client_reuses_http_client(self) -> None:
+        from apps.core.llm.backends.openai_compatible import OpenAICompatibleBackend
+
+        pool = LLMClientPool()
+        config = BackendConfig(
+            name="oai", enabled=True, priority=1, default_model="gpt-4o",
+            base_url="https://api.test/v1", api_key="sk-test", timeout=30,
+        )
+        backend = OpenAICompatibleBackend(config=config)
+        with patch("apps.core.llm.backends.openai_compatible.get_llm_client_pool", return_value=pool):
+            first = backend._build_sync_client(timeout_seconds=20)
+            second = backend._build_sync_client(timeout_seconds=25)
+
+        assert first._client is second._client
+        assert first.timeout == 20
+        assert second.timeout == 25
+        pool.close()
+
+
+class TestPoolMetrics:
+    def test_performance_monitor_reports_llm_pool(self) -> None:
+        from apps.core.infrastructure.monitoring import PerformanceMonitor
+
+        pool = LLMClientPool()
+        pool.get_sync_http_client(_key())
+        pool.get_sync_http_client(_key())
+        with patch("apps.core.llm.backends.client_pool._pool", pool):
+            metrics = PerformanceMonitor.get_connection_pool_metrics()
+        assert metrics["llm"]["clients"] == 1
+        assert metrics["llm"]["reuses"] == 1
+        pool.close()
@@ -0,0 +1,75 @@
+"""benchmark_mcp_startup 管理命令 — 子进程输出解析与报告汇总"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from io import StringIO
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from django.core.management.base import CommandError
+
+from apps.core.management.commands.benchmark_mcp_startup import Command
+from mcp_server.manifest import EAGER_ENV
+
+_MODULE = "apps.core.management.commands.benchmark_mcp_startup"
+
+
+def _completed(payload: dict[str, Any], *, returncode: int = 0, stderr: str = "") -> subprocess.CompletedProcess:
+    stdout = "启动日志\n" + json.dumps(payload) + "\n"
+    return subprocess.CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+def _fake_run(cmd: list[str], *, env: dict[str, str], **kwargs: Any) -> subprocess.CompletedProcess:
+    lazy = env[EAGER_ENV] == "0"
+    return _completed(
+        {"lazy": lazy, "tools": 360, "ready_ms": 600.0 if lazy else 1600.0, "first_call_ms": 120.0 if lazy else 0.0}
+    )
+
+
+class TestStart:
+    def test_parses_last_stdout_line_and_sets_mode(self):
+        with patch(f"{_MODULE}.subprocess.run", side_effect=_fake_run) as run:
+            result = Command()._start(lazy=True, tool="get_case", timeout=10)
+
+        assert result["lazy"] is True and result["tools"] == 360
+        assert result["wall_ms"] >= 0
+        assert run.call_args.args[0][-1] == "get_case"
+        assert run.call_args.kwargs["env"][EAGER_ENV] == "0"
+
+    def test_failed_start_raises_command_error(self):
+        failed = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="ModuleNotFoundError: bs4")
+        with patch(f"{_MODULE}.subprocess.run", return_value=failed):
+            with pytest.raises(CommandError, match="bs4"):
+                Command()._start(lazy=False, tool="get_case", timeout=10)
+
+
+class TestHandle:
+    def test_report_compares_both_modes(self, tmp_path):
+        output = tmp_path / "report.json"
+        command = Command(stdout=StringIO())
+        with patch(f"{_MODULE}.subprocess.run", side_effect=_fake_run) as run:
+            command.handle(repeat=3, tool="get_case", timeout=10.0, output_json=str(output))
+
+        # 1 次预热 + 每种模式 3 次
+        assert run.call_count == 7
+        report = json.loads(output.read_text(encoding="utf-8"))
+        assert report["eager_ready_ms"] == 1600.0
+        assert report["lazy_ready_ms"] == 600.0
+        assert report["lazy_first_call_ms"] == 120.0
+        assert report["eager_tools"] == report["lazy_tools"] == 360
+        assert "冷启动加速比" in command.stdout.getvalue()
+
+    def test_lazy_mode_without_manifest_is_an_error(self):
+        def always_eager(cmd: list[str], *, env: dict[str, str], **kwargs: Any) -> subprocess.CompletedProcess:
+            return _completed({"lazy": False, "tools": 360, "ready_ms": 1.0, "first_call_ms": 0.0})
+
+        with patch(f"{_MODULE}.subprocess.run", side_effect=always_eager):
+            with pytest.raises(CommandError, match="清单"):
+                Command(stdout=StringIO()).handle(repeat=1, tool="get_case", timeout=10.0, output_json="")
+
+    def test_invalid_arguments(self):
+        with pytest.raises(CommandError):
+            Command(stdout=StringIO()).handle(repeat=0, tool="get_case", timeout=10.0, output_json="")
@@ -162,6 +162,14 @@ class TestResolveQCluster:
         result = resolve_q_cluster()
         assert "orm" in result
 
+    @patch.dict(os.environ, {}, clear=True)
+    def test_workers_not_daemonized_by_default(self) -> None:
+        assert resolve_q_cluster()["daemonize_workers"] is False
+
+    @patch.dict(os.environ, {"DJANGO_Q_DAEMONIZE_WORKERS": "true"})
+    def test_workers_daemonized_by_env(self) -> None:
+        assert resolve_q_cluster()["daemonize_workers"] is True
+
 
 class TestResolvePermOpenAccess:
     @patch.dict(os.environ, {"PERM_OPEN_ACCESS": "true"})
@@ -9,6 +9,7 @@ Covers:
 from __future__ import annotations
 
 import io
+import tempfile
 import zipfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -106,6 +107,16 @@ class TestExtractZipBytes:
         assert (tmp_path / "hello.txt").read_text() == "hello world"
         assert (tmp_path / "dir" / "nested.txt").exists()
 
+    def test_extract_from_file_object(self, tmp_path):
+        svc = FolderFilesystemService()
+        spool = tempfile.SpooledTemporaryFile(max_size=16)
+        with zipfile.ZipFile(spool, "w") as zf:
+            zf.writestr("dir/nested.txt", "nested content")
+        spool.seek(0)
+
+        svc.extract_zip_bytes(str(tmp_path), spool)
+        assert (tmp_path / "dir" / "nested.txt").read_text() == "nested content"
+
     def test_extract_invalid_zip_raises(self, tmp_path):
         svc = FolderFilesystemService()
         with pytest.raises(Exception):
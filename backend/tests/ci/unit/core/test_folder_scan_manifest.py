@@ -0,0 +1,198 @@
+"""
+Unit tests for core/services/folder_scan_manifest.py and incremental scanning
+in BoundFolderScanService.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+from apps.core.services.bound_folder_scan_service import BoundFolderScanService
+from apps.core.services.folder_scan_manifest import FolderScanManifest, file_sha256, manifest_file_path
+
+
+def _extraction(text: str) -> SimpleNamespace:
+    return SimpleNamespace(success=True, extraction_method="pdf_text", text=text)
+
+
+def _make_service(manifest_dir: Path) -> BoundFolderScanService:
+    extractor = MagicMock()
+    extractor.extract_text.side_effect = lambda path: _extraction(f"text of {Path(path).name}")
+    classifier = MagicMock()
+    classifier.classify_case_material.return_value = {"category": "party", "confidence": 0.5}
+    return BoundFolderScanService(
+        text_extraction_service=extractor,
+        classification_service=classifier,
+        manifest_dir=manifest_dir,
+    )
+
+
+def _scan(svc: BoundFolderScanService, folder: Path) -> dict[str, Any]:
+    return svc.scan_folder(folder_path=str(folder), domain="case", manifest_key="case-binding-1")
+
+
+class TestFolderScanManifest:
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        path = tmp_path / "m.json"
+        manifest = FolderScanManifest(path, extractor_signature="sig")
+        manifest.record(
+            path="/a.pdf", size=3, mtime=1.5, content_hash="h", extraction_method="ocr", text_excerpt="摘录"
+        )
+        manifest.save()
+
+        loaded = FolderScanManifest.load(path, extractor_signature="sig")
+        entry = loaded.lookup("/a.pdf", size=3, mtime=1.5)
+        assert entry is not None
+        assert entry.text_excerpt == "摘录"
+        assert loaded.lookup("/a.pdf", size=4, mtime=1.5) is None
+
+    def test_signature_change_discards_entries(self, tmp_path: Path) -> None:
+        path = tmp_path / "m.json"
+        manifest = FolderScanManifest(path, extractor_signature="old")
+        manifest.record(path="/a.pdf", size=1, mtime=1.0, content_hash="h", extraction_method="x", text_excerpt="t")
+        manifest.save()
+        assert len(FolderScanManifest.load(path, extractor_signature="new")) == 0
+
+    def test_corrupt_file_yields_empty_manifest(self, tmp_path: Path) -> None:
+        path = tmp_path / "m.json"
+        path.write_text("{not json", encoding="utf-8")
+        assert len(FolderScanManifest.load(path)) == 0
+
+    def test_prune_only_touches_prefix(self) -> None:
+        manifest = FolderScanManifest()
+        for path in ("/root/a.pdf", "/root/sub/b.pdf", "/other/c.pdf"):
+            manifest.record(path=path, size=1, mtime=1.0, content_hash=path, extraction_method="x", text_excerpt="t")
+        assert manifest.prune(prefix="/root", seen={"/root/a.pdf"}) == 1
+        assert manifest.lookup("/other/c.pdf", size=1, mtime=1.0) is not None
+        assert manifest.lookup_hash("/new.pdf", size=1, mtime=2.0, content_hash="/root/sub/b.pdf") is None
+
+    def test_failed_or_empty_extractions_are_not_cached(self) -> None:
+        manifest = FolderScanManifest()
+        manifest.record(path="/a.pdf", size=1, mtime=1.0, content_hash="a", extraction_method="none", text_excerpt="")
+        manifest.record(path="/b.pdf", size=1, mtime=1.0, content_hash="b", extraction_method="ocr", text_excerpt=" ")
+        assert manifest.extracted == 2
+        assert len(manifest) == 0
+        assert manifest.lookup_hash("/c.pdf", size=1, mtime=2.0, content_hash="a") is None
+
+    def test_manifest_file_path_is_sanitized(self, tmp_path: Path) -> None:
+        assert manifest_file_path(tmp_path, "../case binding/1").parent == tmp_path
+
+
+class TestIncrementalScan:
+    def test_unchanged_files_are_not_extracted_again(self, tmp_path: Path) -> None:
+        folder = tmp_path / "case"
+        folder.mkdir()
+        for name in ("起诉状.pdf", "证据一.pdf"):
+            (folder / name).write_bytes(name.encode())
+        svc = _make_service(tmp_path / "manifests")
+
+        first = _scan(svc, folder)
+        assert svc._text_extraction_service.extract_text.call_count == 2
+
+        second = _scan(svc, folder)
+        assert svc._text_extraction_service.extract_text.call_count == 2
+        excerpts = [c["text_excerpt"] for c in second["candidates"]]
+        assert excerpts == [c["text_excerpt"] for c in first["candidates"]]
+        assert sorted(excerpts) == ["text of 证据一.pdf", "text of 起诉状.pdf"]
+
+    def test_failed_extraction_is_retried(self, tmp_path: Path) -> None:
+        folder = tmp_path / "case"
+        folder.mkdir()
+        (folder / "扫描件.pdf").write_bytes(b"scan")
+        svc = _make_service(tmp_path / "manifests")
+        extractor = svc._text_extraction_service
+        extractor.extract_text.side_effect = [
+            SimpleNamespace(success=False, extraction_method="ocr", text=""),
+            _extraction("识别结果"),
+        ]
+
+        assert _scan(svc, folder)["candidates"][0]["text_excerpt"] == ""
+        assert _scan(svc, folder)["candidates"][0]["text_excerpt"] == "识别结果"
+        assert extractor.extract_text.call_count == 2
+
+    def test_changed_file_is_extracted(self, tmp_path: Path) -> None:
+        folder = tmp_path / "case"
+        folder.mkdir()
+        target = folder / "证据.pdf"
+        target.write_bytes(b"v1")
+        svc = _make_service(tmp_path / "manifests")
+        _scan(svc, folder)
+
+        target.write_bytes(b"version 2")
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        _scan(svc, folder)
+        assert svc._text_extraction_service.extract_text.call_count == 2
+
+    def test_renamed_file_reuses_excerpt_by_hash(self, tmp_path: Path) -> None:
+        folder = tmp_path / "case"
+        folder.mkdir()
+        (folder / "旧名.pdf").write_bytes(b"same content")
+        svc = _make_service(tmp_path / "manifests")
+        _scan(svc, folder)
+
+        (folder / "旧名.pdf").rename(folder / "新名.pdf")
+        result = _scan(svc, folder)
+        assert svc._text_extraction_service.extract_text.call_count == 1
+        assert result["candidates"][0]["text_excerpt"] == "text of 旧名.pdf"
+
+        manifest = svc._load_manifest("case-binding-1")
+        assert len(manifest) == 1
+        new_path = (folder / "新名.pdf").as_posix()
+        assert manifest.lookup_hash(new_path, size=12, mtime=1.0, content_hash=file_sha256(folder / "新名.pdf"))
+
+    def test_without_manifest_key_extracts_every_time(self, tmp_path: Path) -> None:
+        folder = tmp_path / "case"
+        folder.mkdir()
+        (folder / "a.pdf").write_bytes(b"a")
+        svc = _make_service(tmp_path / "manifests")
+        svc.scan_folder(folder_path=str(folder), domain="case")
+        svc.scan_folder(folder_path=str(folder), domain="case")
+        assert svc._text_extraction_service.extract_text.call_count == 2
+        assert not (tmp_path / "manifests").exists()
+
+
+class _ConcurrentExtractor:
+    """模拟进程池：声明并发度，提取耗时与文件名相关，使完成顺序不同于提交顺序。"""
+
+    concurrency = 3
+
+    def extract_text(self, file_path: str) -> SimpleNamespace:
+        import time
+
+        name = Path(file_path).stem
+        time.sleep(0.02 * (5 - int(name[-1])))
+        return _extraction(f"text of {name}")
+
+
+class TestConcurrentExtraction:
+    def test_results_keep_scan_order_and_progress_follows_completion(self, tmp_path: Path) -> None:
+        folder = tmp_path / "case"
+        folder.mkdir()
+        for i in range(1, 5):
+            (folder / f"file{i}.pdf").write_bytes(f"content {i}".encode())
+        classifier = MagicMock()
+        classifier.classify_case_material.return_value = {"category": "party", "confidence": 0.5}
+        svc = BoundFolderScanService(
+            text_extraction_service=_ConcurrentExtractor(),  # type: ignore[arg-type]
+            classification_service=classifier,
+            manifest_dir=tmp_path / "manifests",
+        )
+        events: list[tuple[str, int, str | None]] = []
+
+        result = svc.scan_folder(
+            folder_path=str(folder),
+            domain="case",
+            progress_callback=lambda status, progress, name: events.append((status, progress, name)),
+        )
+
+        assert [c["text_excerpt"] for c in result["candidates"]] == [f"text of file{i}" for i in range(1, 5)]
+        extracting = [name for status, _, name in events if status == "extracting"]
+        assert sorted(extracting) == [f"file{i}.pdf" for i in range(1, 5)]
+        assert extracting[0] == "file4.pdf"
+        progress = [value for _, value, _ in events]
+        assert progress == sorted(progress)
@@ -0,0 +1,210 @@
+"""core.telemetry.metrics 进程内聚合与批量刷写测试"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+from apps.core.telemetry import metrics
+from apps.core.telemetry.metrics import (
+    _cached_suffix,
+    _stable_hash,
+    _start_flusher,
+    flush_metrics,
+    record_cache_result,
+    record_httpx,
+    record_request,
+    snapshot,
+)
+
+MINUTE = "202603151030"
+
+
+@pytest.fixture(autouse=True)
+def isolated_queue() -> Iterator[None]:
+    """不启动后台刷写线程，每个用例从空队列开始"""
+    metrics._pending.clear()
+    with (
+        patch.object(metrics, "_start_flusher"),
+        patch.object(metrics, "_minute_id", return_value=MINUTE),
+    ):
+        yield
+    metrics._pending.clear()
+
+
+@pytest.fixture
+def mock_cache() -> Iterator[MagicMock]:
+    with patch.object(metrics, "cache") as cache:
+        cache.get.return_value = None
+        cache.incr.return_value = 1
+        cache.make_key.side_effect = lambda key: f":1:{key}"
+        yield cache
+
+
+@pytest.fixture
+def redis_pipe(mock_cache: MagicMock) -> Iterator[MagicMock]:
+    client = MagicMock()
+    with patch.object(metrics, "_redis_client", return_value=client):
+        yield client.get_client.return_value.pipeline.return_value
+
+
+def _req_suffix(method: str = "GET", status: str = "2xx", group: str = "/api/cases") -> str:
+    return _stable_hash({"kind": "req", "method": method, "status": status, "group": group})
+
+
+class TestRecording:
+    def test_record_only_enqueues(self, mock_cache: MagicMock) -> None:
+        record_request(method="GET", path="/api/cases", status_code=200, duration_ms=20)
+        record_httpx(host="example.com", method="GET", status_code=200, duration_ms=30)
+
+        assert len(metrics._pending) == 2
+        mock_cache.incr.assert_not_called()
+        mock_cache.add.assert_not_called()
+        mock_cache.get.assert_not_called()
+
+    def test_cached_suffix_matches_stable_hash(self) -> None:
+        labels = (("kind", "req"), ("method", "GET"), ("status", "2xx"), ("group", "/api/cases"))
+
+        assert _cached_suffix(labels) == _req_suffix()
+
+    def test_flush_empty_queue_is_noop(self, mock_cache: MagicMock) -> None:
+        assert flush_metrics() == 0
+        mock_cache.incr.assert_not_called()
+
+
+class TestCacheFallbackFlush:
+    def test_aggregates_deltas_per_key(self, mock_cache: MagicMock) -> None:
+        for duration in (20, 30, 600):
+            record_request(method="GET", path="/api/cases/1", status_code=200, duration_ms=duration)
+
+        assert flush_metrics() == 3
+
+        suffix = _req_suffix(group="/api/cases/:id")
+        prefix = f"metrics:req:{MINUTE}:{suffix}"
+        incr = {c.args[0]: c.args[1] for c in mock_cache.incr.call_args_list}
+        assert incr == {
+            f"{prefix}:count": 3,
+            f"{prefix}:sum_ms": 650,
+            f"{prefix}:bucket:25": 1,
+            f"{prefix}:bucket:50": 1,
+            f"{prefix}:bucket:1000": 1,
+        }
+        # 索引与元数据每批次每个 suffix 只写一次
+        mock_cache.set.assert_called_once_with(f"metrics:index:req:{MINUTE}", json.dumps([suffix]), timeout=900)
+        assert mock_cache.add.call_args_list[0] == call(
+            f"metrics:meta:req:{suffix}",
+            json.dumps({"method": "GET", "status": "2xx", "group": "/api/cases/:id"}, separators=(",", ":")),
+            timeout=900,
+        )
+
+    def test_longest_ttl_wins(self, mock_cache: MagicMock) -> None:
+        record_cache_result(cache_kind="redis", name="token", result="hit", window_minutes=1)
+        record_cache_result(cache_kind="redis", name="token", result="hit", window_minutes=20)
+        flush_metrics()
+
+        mock_cache.add.assert_any_call(mock_cache.incr.call_args.args[0], 0, timeout=1800)
+        assert mock_cache.incr.call_args.args[1] == 2
+
+    def test_write_error_drops_batch(self, mock_cache: MagicMock) -> None:
+        mock_cache.incr.side_effect = ValueError("missing")
+        record_request(method="GET", path="/api/cases", status_code=200, duration_ms=20)
+
+        assert flush_metrics() == 1
+        assert not metrics._pending
+
+    def test_snapshot_flushes_pending_events(self, mock_cache: MagicMock) -> None:
+        record_request(method="GET", path="/api/cases", status_code=200, duration_ms=20)
+        snapshot(window_minutes=1)
+
+        assert not metrics._pending
+        mock_cache.incr.assert_called()
+
+
+class TestRedisFlush:
+    def test_single_pipeline_per_flush(self, mock_cache: MagicMock, redis_pipe: MagicMock) -> None:
+        record_request(method="GET", path="/api/cases", status_code=500, duration_ms=20)
+        record_request(method="GET", path="/api/cases", status_code=503, duration_ms=20)
+        flush_metrics()
+
+        suffix = _req_suffix(status="5xx")
+        prefix = f":1:metrics:req:{MINUTE}:{suffix}"
+        redis_pipe.incrby.assert_has_calls(
+            [call(f"{prefix}:count", 2), call(f"{prefix}:sum_ms", 40), call(f"{prefix}:errors_5xx", 2)],
+            any_order=True,
+        )
+        redis_pipe.expire.assert_any_call(f"{prefix}:count", 900)
+        redis_pipe.sadd.assert_called_once_with(f":1:metrics:index_set:req:{MINUTE}", suffix)
+        meta_key, payload = redis_pipe.set.call_args.args
+        assert meta_key == f":1:metrics:meta_json:req:{suffix}"
+        assert json.loads(payload)["status"] == "5xx"
+        assert redis_pipe.set.call_args.kwargs == {"nx": True, "ex": 900}
+        redis_pipe.execute.assert_called_once_with()
+        mock_cache.incr.assert_not_called()
+        mock_cache.set.assert_not_called()
+
+    def test_reads_index_from_redis_set(self, mock_cache: MagicMock) -> None:
+        client = MagicMock()
+        client.get_client.return_value.smembers.return_value = {b"bbb", b"aaa"}
+        with patch.object(metrics, "_redis_client", return_value=client):
+            assert metrics._index_suffixes("req", MINUTE) == ["aaa", "bbb"]
+        client.get_client.return_value.smembers.assert_called_once_with(f":1:metrics:index_set:req:{MINUTE}")
+
+    def test_reads_meta_json_from_redis(self, mock_cache: MagicMock) -> None:
+        client = MagicMock()
+        client.get_client.return_value.get.return_value = b'{"status":"5xx"}'
+        with patch.object(metrics, "_redis_client", return_value=client):
+            assert metrics._get_meta(kind="req", suffix="abc") == {"status": "5xx"}
+        client.get_client.return_value.get.assert_called_once_with(":1:metrics:meta_json:req:abc")
+        mock_cache.get.assert_not_called()
+
+    def test_pipeline_error_is_logged(self, mock_cache: MagicMock, redis_pipe: MagicMock) -> None:
+        redis_pipe.execute.side_effect = RuntimeError("connection reset")
+        record_httpx(host="example.com", method="GET", status_code=None, duration_ms=30)
+
+        with patch.object(metrics.logger, "warning") as warning:
+            assert flush_metrics() == 1
+        warning.assert_called_once()
+
+
+class TestFlusherLifecycle:
+    def test_reset_after_fork_drops_parent_events(self, mock_cache: MagicMock) -> None:
+        record_request(method="GET", path="/api/cases", status_code=200, duration_ms=20)
+        with patch.object(metrics, "_flusher", MagicMock()):
+            metrics._reset_after_fork()
+            assert metrics._flusher is None
+
+        assert not metrics._pending
+
+    def test_flusher_started_once(self) -> None:
+        with (
+            patch.object(metrics, "_flusher", None),
+            patch.object(metrics.threading, "Thread") as thread_cls,
+        ):
+            _start_flusher()
+            _start_flusher()
+
+        thread_cls.assert_called_once_with(target=metrics._flush_loop, name="metrics-flush", daemon=True)
+        thread_cls.return_value.start.assert_called_once_with()
+
+
+class TestCacheHitResults:
+    def test_stale_and_coalesced_count_as_hits(self) -> None:
+        metas = {
+            "s1": {"cache_kind": "enterprise_data", "name": "profile", "result": "hit"},
+            "s2": {"cache_kind": "enterprise_data", "name": "profile", "result": "stale"},
+            "s3": {"cache_kind": "enterprise_data", "name": "profile", "result": "coalesced"},
+            "s4": {"cache_kind": "enterprise_data", "name": "profile", "result": "miss"},
+        }
+        with (
+            patch.object(metrics, "_index_suffixes", return_value=list(metas)),
+            patch.object(metrics, "_load_counter", return_value=2),
+            patch.object(metrics, "_get_meta", side_effect=lambda kind, suffix: metas[suffix]),
+        ):
+            data = metrics._collect_cache_data([MINUTE])
+
+        [entry] = data["enterprise_data"]["by_name"]
+        assert (entry["name"], entry["hits"], entry["misses"]) == ("profile", 6, 2)
+        assert entry["hit_rate"] == 0.75
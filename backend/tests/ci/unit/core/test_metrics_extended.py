@@ -19,6 +19,7 @@ from apps.core.telemetry.metrics import (
     _minute_id,
     _status_class,
     _stable_hash,
+    flush_metrics,
     normalize_path_group,
     record_cache_access,
     record_cache_result,
@@ -118,6 +119,7 @@ class TestRecordRequest:
         mock_cache.set.return_value = None
 
         record_request(method="GET", path="/api/v1/cases", status_code=200, duration_ms=50)
+        flush_metrics()
         # Should have called incr for count and sum_ms
         assert mock_cache.incr.call_count >= 2
 
@@ -130,6 +132,7 @@ class TestRecordRequest:
         mock_cache.set.return_value = None
 
         record_request(method="POST", path="/api/v1/cases", status_code=500, duration_ms=100)
+        flush_metrics()
         # 5xx error counter should be incremented
         calls = [str(c) for c in mock_cache.incr.call_args_list]
         assert any("errors_5xx" in c for c in calls)
@@ -145,6 +148,7 @@ class TestRecordHttpx:
         mock_cache.set.return_value = None
 
         record_httpx(host="example.com", method="GET", status_code=200, duration_ms=30)
+        flush_metrics()
         assert mock_cache.incr.call_count >= 2
 
     @patch("apps.core.telemetry.metrics.cache")
@@ -156,6 +160,7 @@ class TestRecordHttpx:
         mock_cache.set.return_value = None
 
         record_httpx(host="api.openai.com", method="POST", status_code=500, duration_ms=200)
+        flush_metrics()
         calls = [str(c) for c in mock_cache.incr.call_args_list]
         assert any("errors_5xx" in c for c in calls)
 
@@ -168,6 +173,7 @@ class TestRecordHttpx:
         mock_cache.set.return_value = None
 
         record_httpx(host="api.openai.com", method="GET", status_code=None, duration_ms=5000)
+        flush_metrics()
         calls = [str(c) for c in mock_cache.incr.call_args_list]
         assert any("errors_5xx" in c for c in calls)
 
@@ -182,6 +188,7 @@ class TestRecordCacheResult:
         mock_cache.set.return_value = None
 
         record_cache_result(cache_kind="redis", name="user_profile", result="hit")
+        flush_metrics()
         assert mock_cache.incr.call_count >= 1
 
     @patch("apps.core.telemetry.metrics.cache")
@@ -193,6 +200,7 @@ class TestRecordCacheResult:
         mock_cache.set.return_value = None
 
         record_cache_result(cache_kind="redis", name="user_profile", result="miss")
+        flush_metrics()
         assert mock_cache.incr.call_count >= 1
 
 
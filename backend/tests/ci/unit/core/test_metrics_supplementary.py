@@ -38,6 +38,7 @@ from apps.core.telemetry.metrics import (
     _status_class,
     _top_errors,
     _top_slowest,
+    flush_metrics,
     normalize_path_group,
     record_cache_access,
     record_cache_result,
@@ -206,6 +207,7 @@ class TestRecordRequest:
         mock_cache.get.return_value = None
         mock_cache.incr.return_value = 1
         record_request(method="POST", path="/api/fail", status_code=500, duration_ms=100)
+        flush_metrics()
         calls = mock_cache.incr.call_args_list
         error_keys = [c[0][0] for c in calls if "errors_5xx" in c[0][0]]
         assert len(error_keys) >= 1
@@ -216,6 +218,7 @@ class TestRecordRequest:
         mock_cache.incr.return_value = 1
         # 75ms should fall into 100ms bucket (DEFAULT_BUCKETS_MS: 5,10,25,50,100,...)
         record_request(method="GET", path="/api/test", status_code=200, duration_ms=75)
+        flush_metrics()
         calls = mock_cache.incr.call_args_list
         bucket_keys = [c[0][0] for c in calls if "bucket:" in c[0][0]]
         assert len(bucket_keys) >= 1
@@ -225,6 +228,7 @@ class TestRecordRequest:
         mock_cache.get.return_value = None
         mock_cache.incr.return_value = 1
         record_request(method="GET", path="/api/test", status_code=200, duration_ms=0)
+        flush_metrics()
 
 
 # ===========================================================================
@@ -238,6 +242,7 @@ class TestRecordHttpx:
         mock_cache.get.return_value = None
         mock_cache.incr.return_value = 1
         record_httpx(host="example.com", method="GET", status_code=None, duration_ms=30)
+        flush_metrics()
         calls = mock_cache.incr.call_args_list
         error_keys = [c[0][0] for c in calls if "errors_5xx" in c[0][0]]
         assert len(error_keys) >= 1
@@ -247,6 +252,7 @@ class TestRecordHttpx:
         mock_cache.get.return_value = None
         mock_cache.incr.return_value = 1
         record_httpx(host="api.example.com:443", method="GET", status_code=200, duration_ms=30)
+        flush_metrics()
         # Should have processed without error
 
 
@@ -261,18 +267,21 @@ class TestRecordCache:
         mock_cache.get.return_value = None
         mock_cache.incr.return_value = 1
         record_cache_access(cache_kind="redis", name="token", hit=True)
+        flush_metrics()
 
     @patch("apps.core.telemetry.metrics.cache")
     def test_record_cache_access_miss(self, mock_cache) -> None:
         mock_cache.get.return_value = None
         mock_cache.incr.return_value = 1
         record_cache_access(cache_kind="redis", name="token", hit=False)
+        flush_metrics()
 
     @patch("apps.core.telemetry.metrics.cache")
     def test_record_cache_result_custom(self, mock_cache) -> None:
         mock_cache.get.return_value = None
         mock_cache.incr.return_value = 1
         record_cache_result(cache_kind="local", name="config", result="evict")
+        flush_metrics()
 
 
 # ===========================================================================
@@ -0,0 +1,127 @@
+"""OCR 页面缓存测试。"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.core.services import ocr_page_cache
+from apps.core.services.ocr_page_cache import OcrPageCache, OcrPageEntry, engine_version_of
+
+_KEY: dict[str, Any] = {"profile": "dpi=150", "engine_version": "rapidocr-1.4-v4_default"}
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    page_cache = OcrPageCache(tmp_path / "ocr" / "pages.sqlite3")
+    yield page_cache
+    page_cache.close()
+
+
+class TestOcrPageCache:
+    def test_round_trip(self, cache: OcrPageCache) -> None:
+        assert cache.get("abc", 1, **_KEY) is None
+        cache.put("abc", 1, text="第一页", **_KEY)
+        cache.put("abc", 2, text="空白页外的文字", **_KEY)
+
+        assert cache.get("abc", 1, **_KEY) == OcrPageEntry(text="第一页", ocr_failed=False)
+        assert cache.get("abc", 2, **_KEY) == OcrPageEntry(text="空白页外的文字", ocr_failed=False)
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_failures_are_not_cached(self, cache: OcrPageCache) -> None:
+        cache.put("abc", 1, text="", ocr_failed=True, **_KEY)
+
+        assert cache.get("abc", 1, **_KEY) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_key_isolation(self, cache: OcrPageCache) -> None:
+        cache.put("abc", 1, text="x", **_KEY)
+
+        assert cache.get("abd", 1, **_KEY) is None
+        assert cache.get("abc", 2, **_KEY) is None
+        assert cache.get("abc", 1, profile="dpi=72", engine_version=_KEY["engine_version"]) is None
+        assert cache.get("abc", 1, profile=_KEY["profile"], engine_version="paddleocr_api") is None
+
+    def test_put_overwrites_existing_entry(self, cache: OcrPageCache) -> None:
+        cache.put("abc", 1, text="old", **_KEY)
+        cache.put("abc", 1, text="new", **_KEY)
+
+        assert cache.get("abc", 1, **_KEY) == OcrPageEntry(text="new", ocr_failed=False)
+        assert cache.stats()["entries"] == 1
+
+    def test_shared_between_instances(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "pages.sqlite3"
+        writer = OcrPageCache(db_path)
+        reader = OcrPageCache(db_path)
+        try:
+            writer.put("abc", 1, text="shared", **_KEY)
+            assert reader.get("abc", 1, **_KEY) == OcrPageEntry(text="shared", ocr_failed=False)
+        finally:
+            writer.close()
+            reader.close()
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = OcrPageCache(tmp_path / "pages.sqlite3", max_bytes=35)
+        clock = iter(range(100, 200))
+        try:
+            with patch.object(ocr_page_cache.time, "time", side_effect=lambda: float(next(clock))):
+                cache.put("f", 1, text="a" * 10, **_KEY)
+                cache.put("f", 2, text="b" * 10, **_KEY)
+                assert cache.get("f", 1, **_KEY) is not None  # 第 1 页变为最近访问
+                cache.put("f", 3, text="c" * 10, **_KEY)
+                cache.put("f", 4, text="d" * 10, **_KEY)
+
+            assert cache.get("f", 2, **_KEY) is None
+            assert cache.get("f", 1, **_KEY) is not None
+            assert cache.get("f", 4, **_KEY) is not None
+            assert cache.stats()["bytes"] <= 31
+        finally:
+            cache.close()
+
+    def test_clear(self, cache: OcrPageCache) -> None:
+        cache.put("abc", 1, text="x", **_KEY)
+        cache.clear()
+
+        assert cache.get("abc", 1, **_KEY) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_sqlite_error_is_a_miss(self, cache: OcrPageCache) -> None:
+        broken = MagicMock()
+        broken.execute.side_effect = sqlite3.OperationalError("database is locked")
+        with patch.object(cache, "_connection", return_value=broken):
+            assert cache.get("abc", 1, **_KEY) is None
+            cache.put("abc", 1, text="x", **_KEY)
+
+
+class TestEngineVersionOf:
+    def test_reads_string_attribute(self) -> None:
+        service = MagicMock()
+        service.engine_version = "rapidocr-1.4-v5_server"
+        assert engine_version_of(service) == "rapidocr-1.4-v5_server"
+
+    def test_unknown_service_disables_cache(self) -> None:
+        assert engine_version_of(object()) == ""
+        assert engine_version_of(MagicMock()) == ""
+
+
+class TestGetOcrPageCache:
+    def test_disabled_by_setting(self, settings) -> None:
+        settings.OCR_PAGE_CACHE_ENABLED = False
+        assert ocr_page_cache.get_ocr_page_cache() is None
+
+    def test_singleton_uses_configured_path(self, settings, tmp_path: Path) -> None:
+        settings.OCR_PAGE_CACHE_ENABLED = True
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.OCR_PAGE_CACHE_PATH = str(tmp_path / "pages.sqlite3")
+        with patch.object(ocr_page_cache, "_cache", None):
+            first = ocr_page_cache.get_ocr_page_cache()
+            assert first is ocr_page_cache.get_ocr_page_cache()
+            assert first is not None
+            assert first._db_path == tmp_path / "pages.sqlite3"
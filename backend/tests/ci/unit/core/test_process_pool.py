@@ -0,0 +1,38 @@
+"""进程池工作进程引导测试。"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from apps.core import process_pool
+from apps.core.process_pool import bootstrap_worker, can_start_worker_processes
+
+_calls: list[tuple[object, ...]] = []
+
+
+def _record(*args: object) -> None:
+    _calls.append(args)
+
+
+def test_bootstrap_worker_calls_initializer_by_path() -> None:
+    _calls.clear()
+    bootstrap_worker(f"{__name__}._record", 1, "a")
+    assert _calls == [(1, "a")]
+
+
+def test_bootstrap_worker_sets_up_django_when_not_ready() -> None:
+    _calls.clear()
+    with (
+        patch("django.apps.apps.ready", False),
+        patch("django.setup") as setup,
+    ):
+        bootstrap_worker(f"{__name__}._record")
+    setup.assert_called_once_with()
+    assert _calls == [()]
+
+
+def test_can_start_worker_processes() -> None:
+    assert can_start_worker_processes() is True
+    with patch.object(process_pool.multiprocessing, "current_process", return_value=SimpleNamespace(daemon=True)):
+        assert can_start_worker_processes() is False
@@ -308,32 +308,6 @@ class TestFrameProcessingService:
         result = svc.calc_capture_time("frame_no_number.jpg", 1, params, info)
         assert result is None
 
-    def test_is_dhash_duplicate(self):
-        svc = self._get_service()
-        mock_selection = MagicMock()
-        mock_selection.hamming_distance_hex.return_value = 3
-        kept = ["abc", "def", "ghi"]
-        assert svc.is_dhash_duplicate(mock_selection, "xyz", kept, window=10, threshold=5) is True
-
-    def test_is_dhash_not_duplicate(self):
-        svc = self._get_service()
-        mock_selection = MagicMock()
-        mock_selection.hamming_distance_hex.return_value = 10
-        kept = ["abc"]
-        assert svc.is_dhash_duplicate(mock_selection, "xyz", kept, window=10, threshold=5) is False
-
-    def test_is_pixel_duplicate(self):
-        svc = self._get_service()
-        mock_selection = MagicMock()
-        mock_selection.mean_abs_diff.return_value = 0.01
-        assert svc.is_pixel_duplicate(mock_selection, b"thumb", [b"prev"], window=5, threshold=0.05) is True
-
-    def test_is_pixel_not_duplicate(self):
-        svc = self._get_service()
-        mock_selection = MagicMock()
-        mock_selection.mean_abs_diff.return_value = 0.5
-        assert svc.is_pixel_duplicate(mock_selection, b"thumb", [b"prev"], window=5, threshold=0.05) is False
-
     def test_check_ocr_similarity_empty_text(self):
         svc = self._get_service()
         from apps.chat_records.services.extraction.extract_helpers import DedupState
@@ -0,0 +1,46 @@
+"""文本提取进程池测试。"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from apps.document_recognition.services.text_extraction_pool import TextExtractionPool, get_text_extraction_pool
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork start method not available")
+def test_extracts_text_in_worker_process(tmp_path: Path) -> None:
+    fitz = pytest.importorskip("fitz")
+    pdf_path = tmp_path / "contract.pdf"
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), "Contract Text")
+        doc.save(str(pdf_path))
+
+    pool = TextExtractionPool(max_workers=2, text_limit=100, max_pages=1, start_method="fork")
+    try:
+        first = pool.extract_text(str(pdf_path))
+        second = pool.extract_text(str(pdf_path))
+    finally:
+        pool.shutdown()
+
+    assert first.success is True
+    assert first.extraction_method == "pdf_direct"
+    assert "ContractText" in first.text
+    assert second == first
+    assert pool.concurrency == 2
+
+
+def test_pool_disabled_with_single_worker(settings) -> None:
+    settings.FOLDER_SCAN_EXTRACTION_WORKERS = 1
+    assert get_text_extraction_pool(text_limit=10, max_pages=1) is None
+
+
+def test_pool_shared_per_extraction_parameters(settings) -> None:
+    settings.FOLDER_SCAN_EXTRACTION_WORKERS = 3
+    pool = get_text_extraction_pool(text_limit=11, max_pages=2)
+    assert pool is not None
+    assert pool is get_text_extraction_pool(text_limit=11, max_pages=2)
+    assert pool is not get_text_extraction_pool(text_limit=12, max_pages=2)
+    assert pool.concurrency == 3
@@ -0,0 +1,105 @@
+"""DOCX 模板编译缓存测试。"""
+
+from __future__ import annotations
+
+import os
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from docx import Document
+from docxtpl import DocxTemplate
+
+from apps.documents.services.generation.pipeline.template_cache import CachedDocxTemplate, DocxTemplateCache
+
+
+def _make_template(path: Path, text: str = "甲方：{{ party_a }}，乙方：{{ party_b }}") -> Path:
+    document = Document()
+    document.add_paragraph(text)
+    document.save(str(path))
+    return path
+
+
+def _render(doc: DocxTemplate, context: dict[str, str]) -> str:
+    doc.render(context)
+    output = BytesIO()
+    doc.save(output)
+    return "\n".join(p.text for p in Document(BytesIO(output.getvalue())).paragraphs)
+
+
+class TestDocxTemplateCache:
+    def test_second_get_is_hit(self, tmp_path: Path) -> None:
+        template = _make_template(tmp_path / "t.docx")
+        cache = DocxTemplateCache()
+        first = cache.get(str(template))
+        second = cache.get(str(template))
+        assert first is second
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_render_matches_uncached(self, tmp_path: Path) -> None:
+        template = _make_template(tmp_path / "t.docx")
+        cache = DocxTemplateCache()
+        context = {"party_a": "张三", "party_b": "李四"}
+        expected = _render(DocxTemplate(str(template)), context)
+        assert _render(cache.render_template(str(template)), context) == expected
+        # 再次渲染不受上一次渲染影响
+        assert _render(cache.render_template(str(template)), {"party_a": "王五", "party_b": "赵六"}) == (
+            "甲方：王五，乙方：赵六"
+        )
+
+    def test_modified_file_invalidates_entry(self, tmp_path: Path) -> None:
+        template = _make_template(tmp_path / "t.docx")
+        cache = DocxTemplateCache()
+        cache.get(str(template))
+        _make_template(template, "新模板：{{ party_a }}")
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        rendered = _render(cache.render_template(str(template)), {"party_a": "张三"})
+        assert rendered == "新模板：张三"
+        assert cache.stats()["misses"] == 2
+        assert cache.stats()["entries"] == 1
+
+    def test_lru_eviction_by_entry_count(self, tmp_path: Path) -> None:
+        cache = DocxTemplateCache(max_entries=2)
+        paths = [_make_template(tmp_path / f"t{i}.docx") for i in range(3)]
+        for path in paths:
+            cache.get(str(path))
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        cache.get(str(paths[0]))
+        assert cache.stats()["misses"] == 4
+
+    def test_oversized_template_not_cached(self, tmp_path: Path) -> None:
+        template = _make_template(tmp_path / "t.docx")
+        cache = DocxTemplateCache(max_bytes=10)
+        cache.get(str(template))
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_missing_file_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            DocxTemplateCache().get(str(tmp_path / "missing.docx"))
+
+    def test_same_file_via_symlink_shares_entry(self, tmp_path: Path) -> None:
+        template = _make_template(tmp_path / "t.docx")
+        link = tmp_path / "link.docx"
+        try:
+            link.symlink_to(template)
+        except OSError:
+            pytest.skip("symlink not supported")
+        cache = DocxTemplateCache()
+        cache.get(str(template))
+        cache.get(str(link))
+        assert cache.stats()["hits"] == 1
+
+
+class TestCachedDocxTemplate:
+    def test_undeclared_variables_computed_once(self, tmp_path: Path) -> None:
+        template = _make_template(tmp_path / "t.docx")
+        compiled = DocxTemplateCache().get(str(template))
+        doc = compiled.instantiate()
+        assert isinstance(doc, CachedDocxTemplate)
+        assert doc.get_undeclared_template_variables(context={"party_a": "x"}) == {"party_b"}
+        assert compiled.instantiate().get_undeclared_template_variables() == {"party_a", "party_b"}
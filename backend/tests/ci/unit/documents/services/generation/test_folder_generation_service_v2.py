@@ -12,7 +12,7 @@ Covers:
   - create_zip_package
   - generate_folder_with_documents (contract not found, no template, success, zip fail)
   - generate_folder_with_documents_result
-  - generate_case_folder_with_documents (basic, wrap_folder_name)
+  - stream_folder_with_documents (unbound stream, local write, cloud extract, fallbacks)
   - _find_special_folder_paths (identity, attorney, execution, nested)
   - _extract_to_bound_folder_if_exists (no binding, success, exception)
   - _create_folders_in_zip (basic, empty, no name)
@@ -34,6 +34,7 @@ from apps.core.exceptions import NotFoundError, ValidationException
 from apps.documents.services.generation.folder_generation_service import (
     DocumentPlacement,
     FolderGenerationService,
+    FolderPackage,
 )
 
 
@@ -351,6 +352,101 @@ class TestGenerateFolderWithDocumentsResult:
         assert extract_path == "/bound/path"
 
 
+class TestStreamFolderWithDocuments:
+    def _package(self, *, bound: bool) -> FolderPackage:
+        return FolderPackage(
+            folder_structure={"name": "root", "children": []},
+            documents=[("", lambda: b"lazy", "a.docx")],
+            filename="root.zip",
+            has_bound_folder=bound,
+        )
+
+    def test_unbound_returns_chunk_iterator(self) -> None:
+        svc = _make_service()
+        with patch.object(svc, "build_folder_package", return_value=self._package(bound=False)):
+            chunks, filename, extract_path = svc.stream_folder_with_documents(1)
+        assert filename == "root.zip"
+        assert extract_path is None
+        with zipfile.ZipFile(BytesIO(b"".join(chunks))) as zf:
+            assert zf.read("root/a.docx") == b"lazy"
+        svc._folder_binding_service.extract_zip_to_bound_folder.assert_not_called()
+
+    def test_unbound_render_error_raises_before_streaming(self) -> None:
+        svc = _make_service()
+
+        def _broken() -> bytes:
+            raise RuntimeError("template error")
+
+        package = FolderPackage(folder_structure={"name": "root"}, documents=[("", _broken, "a.docx")], filename="root.zip")
+        with patch.object(svc, "build_folder_package", return_value=package):
+            with pytest.raises(ValidationException):
+                svc.stream_folder_with_documents(1)
+
+    def test_bound_local_writes_directly_without_zip(self, tmp_path: Path) -> None:
+        svc = _make_service()
+        svc._folder_binding_service.get_binding_for_contract.return_value = MagicMock(
+            storage_type="local", resolved_folder_path=str(tmp_path)
+        )
+        (tmp_path / "root").mkdir()
+        (tmp_path / "root" / "a.docx").write_bytes(b"old")
+        with patch.object(svc, "build_folder_package", return_value=self._package(bound=True)):
+            chunks, _, extract_path = svc.stream_folder_with_documents(1)
+        assert chunks is None
+        assert extract_path == str(tmp_path)
+        assert (tmp_path / "root" / "a.docx").read_bytes() == b"old"
+        assert (tmp_path / "root" / "a_1.docx").read_bytes() == b"lazy"
+        svc._folder_binding_service.extract_zip_to_bound_folder.assert_not_called()
+
+    def test_bound_local_write_failure_falls_back_to_download(self, tmp_path: Path) -> None:
+        svc = _make_service()
+        blocker = tmp_path / "file"
+        blocker.write_bytes(b"")
+        svc._folder_binding_service.get_binding_for_contract.return_value = MagicMock(
+            storage_type="local", resolved_folder_path=str(blocker)
+        )
+        with patch.object(svc, "build_folder_package", return_value=self._package(bound=True)):
+            chunks, _, extract_path = svc.stream_folder_with_documents(1)
+        assert extract_path is None
+        with zipfile.ZipFile(BytesIO(b"".join(chunks))) as zf:
+            assert zf.read("root/a.docx") == b"lazy"
+
+    def test_binding_missing_streams_download(self) -> None:
+        svc = _make_service()
+        svc._folder_binding_service.get_binding_for_contract.return_value = None
+        with patch.object(svc, "build_folder_package", return_value=self._package(bound=True)):
+            chunks, _, extract_path = svc.stream_folder_with_documents(1)
+        assert extract_path is None
+        assert chunks is not None
+        svc._folder_binding_service.extract_zip_to_bound_folder.assert_not_called()
+
+    def test_bound_cloud_extracts_from_spooled_file(self) -> None:
+        svc = _make_service()
+        svc._folder_binding_service.get_binding_for_contract.return_value = MagicMock(storage_type="webdav")
+        seen: list[bytes] = []
+
+        def _extract(*, contract_id: int, zip_content: Any) -> str:
+            seen.append(zip_content.read())
+            return "/bound"
+
+        svc._folder_binding_service.extract_zip_to_bound_folder.side_effect = _extract
+        with patch.object(svc, "build_folder_package", return_value=self._package(bound=True)):
+            chunks, _, extract_path = svc.stream_folder_with_documents(1)
+        assert chunks is None
+        assert extract_path == "/bound"
+        with zipfile.ZipFile(BytesIO(seen[0])) as zf:
+            assert zf.read("root/a.docx") == b"lazy"
+
+    def test_bound_cloud_extract_failure_falls_back_to_download(self) -> None:
+        svc = _make_service()
+        svc._folder_binding_service.get_binding_for_contract.return_value = MagicMock(storage_type="webdav")
+        svc._folder_binding_service.extract_zip_to_bound_folder.return_value = None
+        with patch.object(svc, "build_folder_package", return_value=self._package(bound=True)):
+            chunks, _, extract_path = svc.stream_folder_with_documents(1)
+        assert extract_path is None
+        with zipfile.ZipFile(BytesIO(b"".join(chunks))) as zf:
+            assert zf.read("root/a.docx") == b"lazy"
+
+
 class TestExtractToBoundFolderIfExists:
     def test_no_binding_service(self) -> None:
         svc = FolderGenerationService(contract_service=MagicMock(), folder_binding_service=None)
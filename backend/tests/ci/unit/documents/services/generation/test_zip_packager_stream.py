@@ -0,0 +1,117 @@
+"""ZipPackager 流式打包测试。"""
+
+from __future__ import annotations
+
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from apps.documents.services.generation.pipeline.packager import ZipPackager
+
+STRUCTURE = {"name": "root", "children": [{"name": "证据", "children": [{"name": "身份证明"}]}]}
+
+
+def _read_zip(data: bytes) -> dict[str, bytes]:
+    with zipfile.ZipFile(BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        return {name: zf.read(name) for name in zf.namelist() if not name.endswith("/")}
+
+
+class TestZipPackagerStream:
+    def test_stream_produces_same_entries_as_create(self) -> None:
+        documents = [("", b"readme", "readme.txt"), ("证据", b"docx", "起诉状.docx")]
+        streamed = b"".join(ZipPackager().stream(STRUCTURE, documents))
+        assert _read_zip(streamed) == _read_zip(ZipPackager().create(STRUCTURE, documents))
+        with zipfile.ZipFile(BytesIO(streamed)) as zf:
+            assert "root/证据/身份证明/" in zf.namelist()
+
+    def test_lazy_entries_render_one_at_a_time(self) -> None:
+        rendered: list[str] = []
+
+        def render(name: str) -> bytes:
+            rendered.append(name)
+            return name.encode()
+
+        documents = [("证据", lambda: render("a"), "a.docx"), ("证据", lambda: render("b"), "b.docx")]
+        chunks = ZipPackager().stream(STRUCTURE, documents)
+        head = next(chunks)
+        assert rendered == []
+        data = head + b"".join(chunks)
+        assert rendered == ["a", "b"]
+        assert _read_zip(data)["root/证据/b.docx"] == b"b"
+
+    def test_lazy_entry_returning_none_is_skipped(self) -> None:
+        documents = [("", lambda: None, "broken.docx"), ("", b"ok", "ok.docx")]
+        assert list(_read_zip(ZipPackager().create(STRUCTURE, documents))) == ["root/ok.docx"]
+
+    def test_path_entry_is_streamed_from_disk(self, tmp_path: Path) -> None:
+        source = tmp_path / "license.pdf"
+        source.write_bytes(b"%PDF" + bytes(range(256)) * 8192)
+        chunks = list(ZipPackager().stream(STRUCTURE, [("证据/身份证明", source, "执业证.pdf")]))
+        assert len(chunks) > 2
+        assert _read_zip(b"".join(chunks))["root/证据/身份证明/执业证.pdf"] == source.read_bytes()
+
+    def test_prerender_renders_lazy_entries_and_keeps_paths(self, tmp_path: Path) -> None:
+        source = tmp_path / "a.pdf"
+        documents = [("", lambda: b"a", "a.docx"), ("", lambda: None, "skip.docx"), ("证据", source, "a.pdf")]
+        assert ZipPackager().prerender(documents) == [("", b"a", "a.docx"), ("证据", source, "a.pdf")]
+
+    def test_missing_path_entry_is_skipped(self, tmp_path: Path) -> None:
+        documents = [("", tmp_path / "gone.pdf", "gone.pdf"), ("", b"ok", "ok.docx")]
+        assert list(_read_zip(b"".join(ZipPackager().stream(STRUCTURE, documents)))) == ["root/ok.docx"]
+
+    def test_write_to_file_object(self, tmp_path: Path) -> None:
+        target = tmp_path / "out.zip"
+        with open(target, "wb") as handle:
+            ZipPackager().write_to(handle, STRUCTURE, [("", b"x", "x.txt")])
+        assert _read_zip(target.read_bytes()) == {"root/x.txt": b"x"}
+
+
+class TestZipPackagerExtractTo:
+    def test_matches_extractall(self, tmp_path: Path) -> None:
+        source = tmp_path / "src.pdf"
+        source.write_bytes(b"pdf")
+        documents = [("证据", b"docx", "a.docx"), ("证据/身份证明", source, "id.pdf"), ("", lambda: None, "skip")]
+        direct = tmp_path / "direct"
+        root = ZipPackager().extract_to(direct, STRUCTURE, documents)
+        with zipfile.ZipFile(BytesIO(ZipPackager().create(STRUCTURE, documents))) as zf:
+            zf.extractall(tmp_path / "via_zip")
+
+        def listing(base: Path) -> dict[str, bytes | None]:
+            return {
+                str(p.relative_to(base)): (p.read_bytes() if p.is_file() else None) for p in sorted(base.rglob("*"))
+            }
+
+        assert root == direct / "root"
+        assert listing(direct) == listing(tmp_path / "via_zip")
+
+    def test_parent_references_stay_inside_target(self, tmp_path: Path) -> None:
+        target = tmp_path / "target"
+        ZipPackager().extract_to(target, {"name": "root"}, [("../..", b"x", "../escape.txt")])
+        assert not (tmp_path / "escape.txt").exists()
+        assert (target / "root" / "escape.txt").read_bytes() == b"x"
+
+
+    def test_missing_path_entry_is_skipped(self, tmp_path: Path) -> None:
+        target = tmp_path / "target"
+        ZipPackager().extract_to(target, {"name": "root"}, [("", tmp_path / "gone.pdf", "gone.pdf"), ("", b"x", "x")])
+        assert sorted(p.name for p in (target / "root").iterdir()) == ["x"]
+
+    def test_keep_existing_writes_numbered_copy(self, tmp_path: Path) -> None:
+        target = tmp_path / "target"
+        ZipPackager().extract_to(target, {"name": "root"}, [("", b"old", "a.docx")])
+        ZipPackager().extract_to(target, {"name": "root"}, [("", b"new", "a.docx")], keep_existing=True)
+        assert (target / "root" / "a.docx").read_bytes() == b"old"
+        assert (target / "root" / "a_1.docx").read_bytes() == b"new"
+
+
+class TestFolderGenerationStreaming:
+    def test_collect_single_file_registers_path(self, tmp_path: Path) -> None:
+        from apps.documents.services.generation.folder_generation_service import _collect_single_file
+
+        source = tmp_path / "证件.jpg"
+        source.write_bytes(b"jpg")
+        documents: list = []
+        _collect_single_file("身份证明", str(source), None, documents, "张三_身份证", MagicMock(), "证件材料")
+        assert documents == [("身份证明", source, "张三_身份证.jpg")]
@@ -0,0 +1,228 @@
+"""mcp_session_pool — MCP 会话复用、健康检查、空闲回收与重连。"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.shared.exceptions import McpError
+
+from apps.enterprise_data.services.clients import mcp_session_pool
+from apps.enterprise_data.services.clients.mcp_session_pool import McpSessionPool, get_session_pool
+from apps.enterprise_data.services.clients.mcp_tool_client import McpToolClient
+
+KEY = ("tianyancha", "streamable_http", "https://mcp.example.com", "fp-1")
+
+
+class _FakeTransport:
+    """记录握手与关闭次数的 _open_session 替身。"""
+
+    def __init__(self, *, fail_open: Exception | None = None, handshake_delay: float = 0.0) -> None:
+        self.fail_open = fail_open
+        self.handshake_delay = handshake_delay
+        self.opened = 0
+        self.closed = 0
+        self.sessions: list[AsyncMock] = []
+
+    @asynccontextmanager
+    async def open(self) -> Any:
+        self.opened += 1
+        await asyncio.sleep(self.handshake_delay)
+        if self.fail_open is not None:
+            raise self.fail_open
+        session = AsyncMock(name=f"session-{self.opened}")
+        session.call_tool.return_value = MagicMock(isError=False, structuredContent={"ok": True}, content=[])
+        self.sessions.append(session)
+        try:
+            yield session
+        finally:
+            self.closed += 1
+
+
+async def _call(pool: McpSessionPool, transport: _FakeTransport, key: tuple = KEY) -> Any:
+    return await pool.run(key, transport.open, lambda session: session.call_tool(name="t", arguments={}))
+
+
+class TestReuse:
+    @pytest.mark.asyncio
+    async def test_repeated_calls_share_one_handshake(self):
+        pool, transport = McpSessionPool(), _FakeTransport()
+
+        for _ in range(4):
+            await _call(pool, transport)
+
+        assert transport.opened == 1
+        assert transport.sessions[0].call_tool.await_count == 4
+        await pool.aclose()
+        assert transport.closed == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_calls_wait_for_single_handshake(self):
+        pool, transport = McpSessionPool(), _FakeTransport(handshake_delay=0.02)
+
+        await asyncio.gather(*(_call(pool, transport) for _ in range(5)))
+
+        assert transport.opened == 1
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_keyed_by_api_key(self):
+        pool, transport = McpSessionPool(), _FakeTransport()
+
+        await _call(pool, transport)
+        await _call(pool, transport, key=(*KEY[:3], "fp-2"))
+
+        assert transport.opened == 2
+        assert pool.size == 2
+        await pool.aclose()
+
+
+class TestFailures:
+    @pytest.mark.asyncio
+    async def test_handshake_failure_propagates_and_is_not_cached(self):
+        pool, transport = McpSessionPool(), _FakeTransport(fail_open=RuntimeError("401"))
+
+        with pytest.raises(RuntimeError, match="401"):
+            await _call(pool, transport)
+        assert pool.size == 0
+
+        transport.fail_open = None
+        await _call(pool, transport)
+        assert transport.opened == 2
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_broken_warm_session_reconnects_once(self):
+        pool, transport = McpSessionPool(), _FakeTransport()
+        await _call(pool, transport)
+        transport.sessions[0].call_tool.side_effect = ConnectionResetError("reset")
+
+        await _call(pool, transport)
+
+        assert transport.opened == 2
+        transport.sessions[1].call_tool.assert_awaited_once()
+        await asyncio.sleep(0.01)
+        assert transport.closed == 1
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_fresh_session_failure_is_not_retried(self):
+        pool, transport = McpSessionPool(), _FakeTransport()
+
+        async def boom(session: Any) -> Any:
+            raise ConnectionResetError("reset")
+
+        with pytest.raises(ConnectionResetError):
+            await pool.run(KEY, transport.open, boom)
+        assert transport.opened == 1
+        assert pool.size == 0
+
+    @pytest.mark.asyncio
+    async def test_protocol_error_keeps_session(self):
+        pool, transport = McpSessionPool(), _FakeTransport()
+        await _call(pool, transport)
+        transport.sessions[0].call_tool.side_effect = McpError(MagicMock(message="unknown tool"))
+
+        with pytest.raises(McpError):
+            await _call(pool, transport)
+
+        assert transport.opened == 1
+        assert pool.size == 1
+        await pool.aclose()
+
+
+class TestHealthAndEviction:
+    @pytest.mark.asyncio
+    async def test_idle_session_is_pinged_before_reuse(self):
+        pool, transport = McpSessionPool(ping_after_idle_seconds=0), _FakeTransport()
+        await _call(pool, transport)
+
+        await _call(pool, transport)
+
+        transport.sessions[0].send_ping.assert_awaited_once()
+        assert transport.opened == 1
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_ping_reconnects(self):
+        pool, transport = McpSessionPool(ping_after_idle_seconds=0), _FakeTransport()
+        await _call(pool, transport)
+        transport.sessions[0].send_ping.side_effect = ConnectionResetError("gone")
+
+        await _call(pool, transport)
+
+        assert transport.opened == 2
+        transport.sessions[0].call_tool.assert_awaited_once()
+        transport.sessions[1].call_tool.assert_awaited_once()
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_idle_session_is_closed(self):
+        pool, transport = McpSessionPool(idle_ttl_seconds=0.02), _FakeTransport()
+        await _call(pool, transport)
+
+        await asyncio.sleep(0.1)
+
+        assert transport.closed == 1
+        assert pool.size == 0
+        await _call(pool, transport)
+        assert transport.opened == 2
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_busy_session_is_not_evicted(self):
+        pool, transport = McpSessionPool(idle_ttl_seconds=0.02), _FakeTransport()
+
+        async def slow(session: Any) -> str:
+            await asyncio.sleep(0.08)
+            return "done"
+
+        assert await pool.run(KEY, transport.open, slow) == "done"
+        assert transport.closed == 0
+        await pool.aclose()
+
+
+class TestPoolRegistry:
+    def test_one_pool_per_event_loop(self):
+        async def current() -> McpSessionPool:
+            return get_session_pool()
+
+        loop = asyncio.new_event_loop()
+        try:
+            first = loop.run_until_complete(current())
+            assert loop.run_until_complete(current()) is first
+        finally:
+            loop.close()
+
+        assert asyncio.run(current()) is not first
+        assert loop not in mcp_session_pool._pools
+
+
+class TestMcpToolClientIntegration:
+    @pytest.mark.asyncio
+    async def test_tool_calls_reuse_session(self):
+        client = McpToolClient(
+            provider_name="tianyancha",
+            transport="streamable_http",
+            base_url="https://mcp.example.com",
+            sse_url="",
+            api_key="key-1",  # pragma: allowlist secret
+        )
+        transport = _FakeTransport()
+        pool = McpSessionPool()
+
+        with (
+            patch.object(client, "_open_session", side_effect=lambda **kwargs: transport.open()),
+            patch("apps.enterprise_data.services.clients.mcp_tool_client.get_session_pool", return_value=pool),
+        ):
+            for tool in ("get_company_profile", "get_risks", "get_shareholders", "get_personnel"):
+                await client._call_tool_async(
+                    transport="streamable_http", tool_name=tool, arguments={}, api_key="key-1"
+                )
+
+        assert transport.opened == 1
+        assert transport.sessions[0].call_tool.await_count == 4
+        await pool.aclose()
@@ -435,12 +435,19 @@ class TestMcpToolClientExtended:
 
 
 # ============================================================
-# EnterpriseDataService._execute stale cache fallback 测试
+# EnterpriseDataService._execute 过期缓存（stale-while-revalidate）测试
 # ============================================================
 
 
+class _InlineExecutor:
+    """同步执行后台刷新任务的线程池替身"""
+
+    def submit(self, fn):
+        fn()
+
+
 class TestExecuteStaleCacheFallback:
-    """_execute 中 MCP 调用失败时的过期缓存回退"""
+    """_execute 先返回过期缓存，后台刷新失败时继续沿用过期结果"""
 
     def _make_service(self):
         from apps.enterprise_data.services.enterprise_data_service import EnterpriseDataService
@@ -451,17 +458,20 @@ class TestExecuteStaleCacheFallback:
         provider.transport = "streamable_http"
         registry.get_provider.return_value = provider
         registry.get_cache_ttl_seconds.return_value = 300
+        registry.get_stale_cache_ttl_seconds.return_value = 3600
         metrics = MagicMock()
         return EnterpriseDataService(registry=registry, metrics_service=metrics), provider, metrics
 
+    def _stale_entry(self, payload):
+        return {"payload": payload, "fresh_until": 0}
+
+    @patch("apps.enterprise_data.services.enterprise_data_service._refresh_executor", _InlineExecutor())
     @patch("apps.enterprise_data.services.enterprise_data_service.cache")
     def test_stale_cache_returned_on_exception(self, mock_cache):
-        """MCP 调用失败时，若存在过期缓存，应返回 stale 结果而非抛异常"""
+        """后台刷新时 MCP 调用失败，调用方拿到的仍是 stale 结果而非异常"""
         service, provider, metrics = self._make_service()
         stale_payload = {"data": {"name": "cached"}, "meta": {"provider": "tianyancha"}, "raw": None}
-        # First call (line 262): cache miss -> returns None
-        # Second call (line 278): stale fallback -> returns stale_payload
-        mock_cache.get.side_effect = [None, stale_payload]
+        mock_cache.get.return_value = self._stale_entry(stale_payload)
 
         provider.search_companies.side_effect = ConnectionError("MCP down")
 
@@ -470,6 +480,8 @@ class TestExecuteStaleCacheFallback:
         assert result["data"] == {"name": "cached"}
         assert result["meta"]["cached"] is True
         assert result["meta"]["stale"] is True
+        provider.search_companies.assert_called_once()
+        mock_cache.set.assert_not_called()
         metrics.record.assert_called_once()
         call_kwargs = metrics.record.call_args[1]
         assert call_kwargs["success"] is False
@@ -491,25 +503,28 @@ class TestExecuteStaleCacheFallback:
         assert call_kwargs["success"] is False
         assert call_kwargs["fallback_used"] is False
 
+    @patch("apps.enterprise_data.services.enterprise_data_service._refresh_executor", _InlineExecutor())
     @patch("apps.enterprise_data.services.enterprise_data_service.cache")
     def test_stale_cache_strips_raw_when_not_requested(self, mock_cache):
-        """stale 回退时，若 include_raw=False，应清除 raw 字段"""
+        """返回 stale 结果时，若 include_raw=False，应清除 raw 字段"""
         service, provider, metrics = self._make_service()
         stale_payload = {"data": {"name": "cached"}, "meta": {}, "raw": {"some": "data"}}
-        mock_cache.get.side_effect = [None, stale_payload]
+        mock_cache.get.return_value = self._stale_entry(stale_payload)
 
         provider.search_companies.side_effect = RuntimeError("timeout")
 
         result = service.search_companies(keyword="test", include_raw=False)
 
         assert result["raw"] is None
+        assert stale_payload["raw"] == {"some": "data"}
 
+    @patch("apps.enterprise_data.services.enterprise_data_service._refresh_executor", _InlineExecutor())
     @patch("apps.enterprise_data.services.enterprise_data_service.cache")
     def test_stale_cache_preserves_raw_when_requested(self, mock_cache):
-        """stale 回退时，若 include_raw=True，应保留 raw 字段"""
+        """返回 stale 结果时，若 include_raw=True，应保留 raw 字段"""
         service, provider, metrics = self._make_service()
         stale_payload = {"data": {"name": "cached"}, "meta": {}, "raw": {"some": "data"}}
-        mock_cache.get.side_effect = [None, stale_payload]
+        mock_cache.get.return_value = self._stale_entry(stale_payload)
 
         provider.search_companies.side_effect = RuntimeError("timeout")
 
@@ -0,0 +1,281 @@
+"""EnterpriseDataService 两级缓存（新鲜 / 过期）与 single-flight 合并请求测试"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.enterprise_data.services import enterprise_data_service as module
+from apps.enterprise_data.services.enterprise_data_service import EnterpriseDataService
+from apps.enterprise_data.services.single_flight import SingleFlight
+from apps.enterprise_data.services.types import ProviderResponse
+
+
+class _DictCache:
+    """记录写入超时的内存缓存替身"""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.timeouts: dict[str, int] = {}
+
+    def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    def set(self, key: str, value: Any, timeout: int) -> None:
+        self.data[key] = value
+        self.timeouts[key] = timeout
+
+    async def aget(self, key: str) -> Any:
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, timeout: int) -> None:
+        self.set(key, value, timeout)
+
+
+class _DeferredExecutor:
+    """只登记后台刷新任务，由用例决定何时执行"""
+
+    def __init__(self) -> None:
+        self.jobs: list[Any] = []
+
+    def submit(self, fn: Any) -> None:
+        self.jobs.append(fn)
+
+
+def _response(name: str = "新公司") -> ProviderResponse:
+    return ProviderResponse(data={"name": name}, raw={"source": name}, tool="get_company", meta={"duration_ms": 5})
+
+
+@pytest.fixture
+def fake_cache() -> Any:
+    cache = _DictCache()
+    with patch.object(module, "cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def cache_results() -> Any:
+    with patch.object(module, "record_cache_result") as record:
+        yield record
+
+
+@pytest.fixture
+def refresh_executor() -> Any:
+    executor = _DeferredExecutor()
+    with patch.object(module, "_refresh_executor", executor):
+        yield executor
+
+
+def _make_service(provider: Any | None = None) -> tuple[EnterpriseDataService, MagicMock]:
+    registry = MagicMock()
+    provider = provider or MagicMock()
+    provider.name = "tianyancha"
+    provider.transport = "streamable_http"
+    registry.get_provider.return_value = provider
+    registry.get_cache_ttl_seconds.return_value = 300
+    registry.get_stale_cache_ttl_seconds.return_value = 3600
+    return EnterpriseDataService(registry=registry, metrics_service=MagicMock()), provider
+
+
+def _cache_key(company_id: str = "123") -> str:
+    return EnterpriseDataService._build_cache_key(
+        provider="tianyancha", capability="get_company_profile", query={"company_id": company_id}
+    )
+
+
+def _results(record: MagicMock) -> list[str]:
+    return [c.kwargs["result"] for c in record.call_args_list]
+
+
+class TestTwoTierCache:
+    def test_miss_stores_envelope_with_stale_window(self, fake_cache, cache_results):
+        service, provider = _make_service()
+        provider.get_company_profile.return_value = _response()
+
+        result = service.get_company_profile(company_id="123")
+
+        assert result["data"] == {"name": "新公司"}
+        assert result["raw"] is None
+        entry = fake_cache.data[_cache_key()]
+        assert entry["payload"]["raw"] == {"source": "新公司"}
+        assert entry["fresh_until"] == pytest.approx(time.time() + 300, abs=5)
+        assert fake_cache.timeouts[_cache_key()] == 300 + 3600
+        assert _results(cache_results) == ["miss"]
+
+    def test_fresh_hit_skips_provider(self, fake_cache, cache_results):
+        service, provider = _make_service()
+        provider.get_company_profile.return_value = _response()
+        service.get_company_profile(company_id="123")
+
+        result = service.get_company_profile(company_id="123", include_raw=True)
+
+        provider.get_company_profile.assert_called_once()
+        assert result["meta"]["cached"] is True
+        assert "stale" not in result["meta"]
+        assert result["raw"] == {"source": "新公司"}
+        assert _results(cache_results) == ["miss", "hit"]
+
+    def test_stale_is_served_while_one_refresh_runs(self, fake_cache, cache_results, refresh_executor):
+        service, provider = _make_service()
+        old = {"query": {}, "data": {"name": "旧公司"}, "meta": {"cached": False}, "raw": None}
+        fake_cache.data[_cache_key()] = {"payload": old, "fresh_until": time.time() - 1}
+        provider.get_company_profile.return_value = _response()
+
+        first = service.get_company_profile(company_id="123")
+        second = service.get_company_profile(company_id="123")
+
+        assert first["data"] == second["data"] == {"name": "旧公司"}
+        assert first["meta"]["stale"] is True
+        assert len(refresh_executor.jobs) == 1
+        provider.get_company_profile.assert_not_called()
+
+        refresh_executor.jobs[0]()
+
+        assert service.get_company_profile(company_id="123")["data"] == {"name": "新公司"}
+        assert _results(cache_results) == ["stale", "stale", "hit"]
+        assert not module._single_flight.is_running(_cache_key())
+
+    def test_legacy_cache_entry_is_a_miss(self, fake_cache, cache_results):
+        service, provider = _make_service()
+        fake_cache.data[_cache_key()] = {"data": {"name": "旧格式"}, "meta": {}, "raw": None}
+        provider.get_company_profile.return_value = _response()
+
+        result = service.get_company_profile(company_id="123")
+
+        assert result["data"] == {"name": "新公司"}
+        provider.get_company_profile.assert_called_once()
+
+
+class TestSingleFlight:
+    def test_concurrent_misses_share_one_provider_call(self, fake_cache, cache_results):
+        release = threading.Event()
+        calls: list[str] = []
+
+        def slow_profile(*, company_id: str) -> ProviderResponse:
+            calls.append(company_id)
+            release.wait(timeout=5)
+            return _response()
+
+        service, provider = _make_service()
+        provider.get_company_profile.side_effect = slow_profile
+        results: list[dict[str, Any]] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(service.get_company_profile(company_id="123")))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        while not calls:
+            time.sleep(0.001)
+        for thread in threads[1:]:
+            thread.start()
+        while cache_results.call_count < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert calls == ["123"]
+        assert len(results) == 5
+        assert {r["data"]["name"] for r in results} == {"新公司"}
+        assert sum(bool(r["meta"].get("coalesced")) for r in results) == 4
+        assert sorted(_results(cache_results)) == ["coalesced"] * 4 + ["miss"]
+
+    def test_leader_failure_reaches_waiters(self):
+        flight = SingleFlight()
+        future, leader = flight.claim("k")
+        waiter, waiter_leader = flight.claim("k")
+
+        flight.resolve("k", future, error=ConnectionError("MCP down"))
+
+        assert leader and not waiter_leader and waiter is future
+        with pytest.raises(ConnectionError):
+            waiter.result()
+        assert not flight.is_running("k")
+        assert flight.claim("k")[1] is True
+
+
+    def test_sync_waiter_times_out_and_fetches_directly(self, fake_cache, cache_results):
+        service, provider = _make_service()
+        provider.get_company_profile.return_value = _response()
+        stuck, _ = module._single_flight.claim(_cache_key())
+        try:
+            with patch.object(EnterpriseDataService, "_coalesce_timeout", return_value=0.01):
+                result = service.get_company_profile(company_id="123")
+        finally:
+            module._single_flight.resolve(_cache_key(), stuck, result=None)
+
+        assert result["data"] == {"name": "新公司"}
+        assert not result["meta"].get("coalesced")
+        provider.get_company_profile.assert_called_once()
+
+
+class TestAsyncExecute:
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_waiters(self, fake_cache, cache_results):
+        calls: list[str] = []
+        started = asyncio.Event()
+
+        async def aprofile(*, company_id: str) -> ProviderResponse:
+            calls.append(company_id)
+            if len(calls) == 1:
+                started.set()
+                await asyncio.sleep(10)
+            return _response()
+
+        service, provider = _make_service()
+        provider.aget_company_profile.side_effect = aprofile
+
+        leader = asyncio.create_task(service.aget_company_profile(company_id="123"))
+        await started.wait()
+        waiter = asyncio.create_task(service.aget_company_profile(company_id="123"))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        result = await asyncio.wait_for(waiter, timeout=5)
+
+        assert leader.cancelled()
+        assert result["data"] == {"name": "新公司"}
+        assert calls == ["123", "123"]
+        assert _results(cache_results) == ["miss", "coalesced", "miss"]
+        assert not module._single_flight.is_running(_cache_key())
+
+    @pytest.mark.asyncio
+    async def test_concurrent_async_misses_are_coalesced(self, fake_cache, cache_results):
+        calls: list[str] = []
+
+        async def aprofile(*, company_id: str) -> ProviderResponse:
+            calls.append(company_id)
+            await asyncio.sleep(0.02)
+            return _response()
+
+        service, provider = _make_service()
+        provider.aget_company_profile.side_effect = aprofile
+
+        results = await asyncio.gather(*(service.aget_company_profile(company_id="123") for _ in range(3)))
+
+        assert calls == ["123"]
+        assert [bool(r["meta"].get("coalesced")) for r in results].count(True) == 2
+        assert sorted(_results(cache_results)) == ["coalesced", "coalesced", "miss"]
+
+    @pytest.mark.asyncio
+    async def test_async_stale_refreshes_in_background(self, fake_cache, cache_results):
+        service, provider = _make_service()
+        old = {"query": {}, "data": {"name": "旧公司"}, "meta": {}, "raw": None}
+        fake_cache.data[_cache_key()] = {"payload": old, "fresh_until": time.time() - 1}
+
+        async def aprofile(*, company_id: str) -> ProviderResponse:
+            return _response()
+
+        provider.aget_company_profile.side_effect = aprofile
+
+        stale = await service.aget_company_profile(company_id="123")
+        await asyncio.gather(*module._background_refreshes)
+
+        assert stale["meta"]["stale"] is True
+        assert fake_cache.data[_cache_key()]["payload"]["data"] == {"name": "新公司"}
+        assert (await service.aget_company_profile(company_id="123"))["meta"]["cached"] is True
@@ -0,0 +1,119 @@
+"""证据清单链页码批量重算测试。"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.evidence.services.core import page_range_calculator
+from apps.evidence.services.core.page_range_calculator import EvidencePageRangeCalculator
+
+
+def _list(list_id: int, order: int, previous: int | None, total_pages: int = 0) -> SimpleNamespace:
+    return SimpleNamespace(id=list_id, order=order, previous_list_id=previous, total_pages=total_pages, updated_at=None)
+
+
+def _item(list_id: int, order: int, page_count: int) -> SimpleNamespace:
+    return SimpleNamespace(evidence_list_id=list_id, order=order, page_count=page_count, page_start=None, page_end=None)
+
+
+@pytest.fixture
+def models():
+    with (
+        patch.object(page_range_calculator, "EvidenceList") as evidence_list,
+        patch.object(page_range_calculator, "EvidenceItem") as evidence_item,
+    ):
+        yield evidence_list, evidence_item
+
+
+def _setup(models, lists, items) -> None:
+    evidence_list, evidence_item = models
+    evidence_list.objects.filter.return_value.order_by.return_value = lists
+    evidence_item.objects.filter.return_value.order_by.return_value = items
+
+
+class TestUpdateSubsequentListsPages:
+    def test_running_offsets_across_chain(self, models) -> None:
+        lists = [_list(1, 1, None, total_pages=10), _list(2, 2, 1), _list(3, 3, 2)]
+        items = [_item(2, 1, 3), _item(2, 2, 0), _item(2, 3, 2), _item(3, 1, 4)]
+        _setup(models, lists, items)
+
+        EvidencePageRangeCalculator().update_subsequent_lists_pages(case_id=9, start_order=2)
+
+        assert [(i.page_start, i.page_end) for i in items] == [(11, 13), (None, None), (14, 15), (16, 19)]
+        assert [lst.total_pages for lst in lists] == [10, 5, 4]
+        evidence_list, evidence_item = models
+        evidence_item.objects.filter.assert_called_once_with(evidence_list_id__in=[2, 3], file__isnull=False)
+        evidence_item.objects.bulk_update.assert_called_once_with(
+            [items[0], items[2], items[3]], ["page_start", "page_end"]
+        )
+        evidence_list.objects.bulk_update.assert_called_once_with(lists[1:], ["total_pages", "updated_at"])
+        assert lists[1].updated_at is not None and lists[0].updated_at is None
+
+    def test_list_without_items_resets_total(self, models) -> None:
+        lists = [_list(1, 1, None, total_pages=7)]
+        _setup(models, lists, [])
+
+        EvidencePageRangeCalculator().update_subsequent_lists_pages(case_id=9, start_order=1)
+
+        assert lists[0].total_pages == 0
+        models[1].objects.bulk_update.assert_not_called()
+
+    def test_no_lists_skips_queries(self, models) -> None:
+        _setup(models, [], [])
+
+        EvidencePageRangeCalculator().update_subsequent_lists_pages(case_id=9, start_order=1)
+
+        models[1].objects.filter.assert_not_called()
+        models[0].objects.bulk_update.assert_not_called()
+
+
+class TestRecalculateForChain:
+    def test_recalculates_list_and_later_lists(self, models) -> None:
+        lists = [_list(1, 1, None, total_pages=4), _list(2, 2, 1, total_pages=99), _list(3, 3, 2)]
+        items = [_item(2, 1, 1), _item(3, 1, 5)]
+        _setup(models, lists, items)
+        models[0].objects.get.return_value = SimpleNamespace(id=2, order=2, case_id=9)
+        recalculate = EvidencePageRangeCalculator.recalculate_page_ranges_for_chain
+
+        # 绕过 @transaction.atomic
+        recalculate.__wrapped__(EvidencePageRangeCalculator(), list_id=2)  # type: ignore[attr-defined]
+
+        # 清单 1 不重算，沿用已有的 4 页
+        assert [(i.page_start, i.page_end) for i in items] == [(5, 5), (6, 10)]
+        assert [lst.total_pages for lst in lists] == [4, 1, 5]
+        models[1].objects.filter.assert_called_once_with(evidence_list_id__in=[2, 3], file__isnull=False)
+
+
+class TestStartPage:
+    def test_cycle_returns_one(self) -> None:
+        lists = {1: _list(1, 1, 2, total_pages=3), 2: _list(2, 2, 1, total_pages=4)}
+
+        assert EvidencePageRangeCalculator()._start_page(lists[1], lists) == 1  # type: ignore[arg-type]
+
+    def test_fetches_list_outside_case(self, models) -> None:
+        outside = _list(7, 1, None, total_pages=6)
+        models[0].objects.filter.return_value.first.return_value = outside
+        lists = {2: _list(2, 2, 7)}
+
+        assert EvidencePageRangeCalculator()._start_page(lists[2], lists) == 7  # type: ignore[arg-type]
+        assert lists[7] is outside
+
+    def test_dangling_previous_list_ends_chain(self, models) -> None:
+        models[0].objects.filter.return_value.first.return_value = None
+        lists = {2: _list(2, 2, 7)}
+
+        assert EvidencePageRangeCalculator()._start_page(lists[2], lists) == 1  # type: ignore[arg-type]
+
+    def test_matches_single_list_calculation(self) -> None:
+        calculator = EvidencePageRangeCalculator()
+        evidence_list = MagicMock(start_page=3)
+        items = [_item(1, 1, 2), _item(1, 2, 3)]
+        evidence_list.items.filter.return_value.order_by.return_value = items
+
+        with patch.object(page_range_calculator, "EvidenceItem"):
+            calculator.calculate_page_ranges(evidence_list=evidence_list)
+
+        assert [(i.page_start, i.page_end) for i in items] == [(3, 4), (5, 7)]
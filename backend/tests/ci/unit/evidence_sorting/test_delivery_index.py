@@ -0,0 +1,137 @@
+"""出库单索引测试。"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from apps.evidence_sorting.services.delivery_index import DeliveryIndex
+from apps.evidence_sorting.services.reconciler import DeliveryNote, LineItem, ReconcilerService
+
+
+def _linear_take(svc: ReconcilerService, notes: list[DeliveryNote], used: set[int], li: LineItem) -> int | None:
+    """原先的逐一比较"""
+    for i, dn in enumerate(notes):
+        if i not in used and svc._match_delivery(li, dn):
+            used.add(i)
+            return i
+    return None
+
+
+class TestTake:
+    def test_same_date_matches_regardless_of_amount(self) -> None:
+        svc = ReconcilerService()
+        notes = [
+            DeliveryNote(filename="a", date="20220801", amount="100"),
+            DeliveryNote(filename="b", date="20220802", amount="500"),
+            DeliveryNote(filename="c", date="20220802", amount="9999"),
+        ]
+        index = DeliveryIndex(notes, svc._match_delivery)
+
+        assert index.take(LineItem(date="20220802", amount=1.0)) == 1
+        assert index.take(LineItem(date="20220802", amount=1.0)) == 2
+        assert index.take(LineItem(date="20220802", amount=1.0)) is None
+
+    def test_missing_date_falls_back_to_amount_tolerance(self) -> None:
+        svc = ReconcilerService()
+        notes = [
+            DeliveryNote(filename="a", date=None, amount="1000"),
+            DeliveryNote(filename="b", date="20220801", amount="1009.5"),
+            DeliveryNote(filename="c", date="20220801", amount="1011"),
+        ]
+        index = DeliveryIndex(notes, svc._match_delivery)
+
+        # 明细有日期：只能通过金额匹配无日期的出库单
+        assert index.take(LineItem(date="20220805", amount=1005.0)) == 0
+        # 明细无日期：金额容差为 max(1%, 1 元)
+        assert index.take(LineItem(date=None, amount=1000.0)) == 1
+        assert index.take(LineItem(date=None, amount=1000.0)) is None
+
+    def test_picks_lowest_index_across_date_and_amount_candidates(self) -> None:
+        svc = ReconcilerService()
+        notes = [
+            DeliveryNote(filename="undated", date=None, amount="200"),
+            DeliveryNote(filename="dated", date="20220801", amount="1"),
+        ]
+        index = DeliveryIndex(notes, svc._match_delivery)
+
+        assert index.take(LineItem(date="20220801", amount=200.0)) == 0
+
+    def test_unparseable_amount_only_matches_by_date(self) -> None:
+        svc = ReconcilerService()
+        notes = [DeliveryNote(filename="a", date=None, amount="识别失败")]
+        index = DeliveryIndex(notes, svc._match_delivery)
+
+        assert index.take(LineItem(date="20220801", amount=100.0)) is None
+        assert index.unused() == [0]
+
+
+class TestTakeMonth:
+    def test_takes_unused_deliveries_of_month_in_order(self) -> None:
+        svc = ReconcilerService()
+        notes = [
+            DeliveryNote(filename="a", date="20220815"),
+            DeliveryNote(filename="b", date="20220901"),
+            DeliveryNote(filename="c", date="20220802"),
+            DeliveryNote(filename="d", date=None),
+        ]
+        index = DeliveryIndex(notes, svc._match_delivery)
+        index.take(LineItem(date="20220815"))
+
+        assert index.take_month("202208") == [2]
+        assert index.take_month("202208") == []
+        assert index.unused() == [1, 3]
+
+
+class TestEquivalence:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_same_assignment_as_linear_scan(self, seed: int) -> None:
+        rng = random.Random(seed)
+        svc = ReconcilerService()
+        dates = [None, "20220801", "20220802", "20220803", "2022-08-03"]
+        amounts = [None, "abc", "nan", "inf", "1,000", "100", "100.5", "101", "99", "150", "1000", "1010", "0"]
+        notes = [
+            DeliveryNote(filename=str(i), date=rng.choice(dates), amount=rng.choice(amounts)) for i in range(60)
+        ]
+        items = [
+            LineItem(
+                date=rng.choice(dates),
+                amount=rng.choice([None, 100.0, 100.9, 1005.0, 0.5, float("inf"), float("nan"), rng.uniform(0, 1200)]),
+            )
+            for _ in range(80)
+        ]
+        index = DeliveryIndex(notes, svc._match_delivery)
+        used: set[int] = set()
+
+        for li in items:
+            assert index.take(li) == _linear_take(svc, notes, used, li)
+        assert set(index.unused()) == set(range(len(notes))) - used
+
+
+class TestBenchmarkCommand:
+    def test_indexed_outcome_matches_legacy(self) -> None:
+        from apps.evidence_sorting.management.commands.benchmark_evidence_reconcile import Command, _legacy_assign
+
+        statements, deliveries = Command._synthetic_data(random.Random(1), 300, 3)
+
+        outcome = Command._indexed(statements, deliveries)
+
+        assert outcome == _legacy_assign(ReconcilerService(), statements, deliveries)
+        assert len(outcome[0]) == 3
+
+    def test_build_report(self) -> None:
+        from apps.evidence_sorting.management.commands.benchmark_evidence_reconcile import Command
+
+        report = Command._build_report(
+            deliveries=100,
+            line_items=80,
+            repeat=1,
+            legacy_seconds=1.0,
+            indexed_seconds=0.25,
+            identical=True,
+            matched=70,
+        )
+
+        assert report["speedup"] == 4.0
+        assert report["identical"] is True
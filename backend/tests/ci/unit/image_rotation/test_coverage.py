@@ -18,6 +18,12 @@ def _make_test_image(width: int = 100, height: int = 100, color: str = "white")
     return buf.getvalue()
 
 
+def _unavailable_onnx_service() -> MagicMock:
+    onnx = MagicMock()
+    onnx.detect_orientation_batch.side_effect = lambda images: [{"method": "onnx_unavailable"} for _ in images]
+    return onnx
+
+
 def _make_test_jpeg() -> bytes:
     img = Image.new("RGB", (100, 100), "red")
     buf = io.BytesIO()
@@ -202,7 +208,7 @@ class TestOrientationDetectionService:
     def test_detect_batch(self) -> None:
         from apps.image_rotation.services.orientation.service import OrientationDetectionService
 
-        svc = OrientationDetectionService()
+        svc = OrientationDetectionService(onnx_service=_unavailable_onnx_service())
         svc._ocr_service = None
         with patch.object(type(svc), "ocr_service", new_callable=lambda: property(lambda self: None)):
             img_b64 = base64.b64encode(_make_test_image()).decode()
@@ -213,7 +219,7 @@ class TestOrientationDetectionService:
     def test_detect_batch_with_data_url_prefix(self) -> None:
         from apps.image_rotation.services.orientation.service import OrientationDetectionService
 
-        svc = OrientationDetectionService()
+        svc = OrientationDetectionService(onnx_service=_unavailable_onnx_service())
         svc._ocr_service = None
         with patch.object(type(svc), "ocr_service", new_callable=lambda: property(lambda self: None)):
             img_b64 = "data:image/png;base64," + base64.b64encode(_make_test_image()).decode()
@@ -139,16 +139,24 @@ class TestDetectOrientation:
 
         img_data = base64.b64encode(b"fakeimg").decode()
         req = MagicMock()
-        req.body = json.dumps({"images": [{"data": img_data, "filename": "a.jpg"}], "method": "onnx"}).encode()
-        with patch("apps.image_rotation.services.orientation.onnx_service.get_onnx_orientation_service") as mock_onnx:
-            mock_onnx.return_value.detect_orientation.return_value = {
-                "rotation": 180,
-                "confidence": 0.9,
-                "ocr_text": "",
+        req.body = json.dumps(
+            {
+                "images": [{"data": img_data, "filename": "a.jpg"}, {"data": img_data, "filename": "b.jpg"}],
+                "method": "onnx",
             }
+        ).encode()
+        with patch("apps.image_rotation.services.orientation.service.OrientationDetectionService") as mock_od:
+            mock_od.return_value.detect_batch.return_value = [
+                {"filename": "a.jpg", "rotation": 180, "confidence": 0.9},
+                {"filename": "b.jpg", "rotation": 0, "confidence": 0.9},
+            ]
             result = await detect_orientation(req)
             assert result["success"] is True
             assert result["results"][0]["rotation"] == 180
+            assert result["results"][0]["ocr_text"] == ""
+            assert "elapsed_ms" in result["results"][1]
+            mock_od.return_value.detect_batch.assert_called_once()
+            assert mock_od.return_value.detect_batch.call_args.kwargs == {"with_text": False}
 
     @pytest.mark.asyncio
     async def test_ocr_voting_method(self) -> None:
@@ -163,11 +171,13 @@ class TestDetectOrientation:
             }
         ).encode()
         with patch("apps.image_rotation.services.orientation.service.OrientationDetectionService") as mock_od:
-            mock_od.return_value.detect_orientation_with_text.return_value = {
-                "rotation": 0,
-                "confidence": 0.8,
-                "ocr_text": "text",
-            }
+            mock_od.return_value.detect_batch_bytes.return_value = [
+                {
+                    "rotation": 0,
+                    "confidence": 0.8,
+                    "ocr_text": "text",
+                }
+            ]
             result = await detect_orientation(req)
             assert result["success"] is True
 
@@ -11,6 +11,12 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 
+def _unavailable_onnx_service() -> MagicMock:
+    onnx = MagicMock()
+    onnx.detect_orientation_batch.side_effect = lambda images: [{"method": "onnx_unavailable"} for _ in images]
+    return onnx
+
+
 # ============================================================
 # OrientationDetectionService 测试
 # ============================================================
@@ -62,7 +68,7 @@ class TestOrientationDetectionService:
     def test_detect_batch_with_data(self) -> None:
         from apps.image_rotation.services.orientation.service import OrientationDetectionService
 
-        svc = OrientationDetectionService()
+        svc = OrientationDetectionService(onnx_service=_unavailable_onnx_service())
         svc._ocr_service = None
         with patch.object(type(svc), 'ocr_service', new_callable=lambda: property(lambda self: None)):
             fake_img = base64.b64encode(b"fake_data").decode()
@@ -0,0 +1,204 @@
+"""ONNX 批量方向检测测试。"""
+
+from __future__ import annotations
+
+import base64
+import io
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+from apps.image_rotation.services.orientation import onnx_service
+from apps.image_rotation.services.orientation.onnx_service import ONNXOrientationService
+from apps.image_rotation.services.orientation.service import OrientationDetectionService
+
+# 类别 → 旋转角度: 0→0°, 1→180°, 2→-90°, 3→-270°
+_CONFIDENT = {
+    0: [10.0, 0.0, 0.0, 0.0],
+    1: [0.0, 10.0, 0.0, 0.0],
+    2: [0.0, 0.0, 10.0, 0.0],
+}
+_UNSURE = [1.0, 0.9, 0.8, 0.7]
+
+
+def _image(shade: int) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), color=(shade, shade, shade)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _session_by_shade(logits_for_shade: dict[int, list[float]]) -> MagicMock:
+    """按图片灰度返回 logits，便于验证批量推理后结果顺序不乱"""
+    session = MagicMock()
+
+    def run(_outputs, feeds):
+        batch = feeds["pixel_values"]
+        rows = []
+        for tensor in batch:
+            pixel = tensor[0, 0, 0] * 0.229 + 0.485
+            rows.append(logits_for_shade[round(float(pixel) * 255)])
+        return [np.array(rows, dtype=np.float32)]
+
+    session.run.side_effect = run
+    return session
+
+
+class TestDetectOrientationBatch:
+    def test_one_run_per_batch_and_order_preserved(self) -> None:
+        svc = ONNXOrientationService()
+        shades = [10, 20, 30, 10, 20]
+        svc._session = _session_by_shade({10: _CONFIDENT[0], 20: _CONFIDENT[1], 30: _CONFIDENT[2]})
+
+        results = svc.detect_orientation_batch([_image(s) for s in shades], batch_size=2, workers=2)
+
+        assert [r["rotation"] for r in results] == [0, 180, -90, 0, 180]
+        assert all(r["method"] == "onnx_classifier" for r in results)
+        assert svc._session.run.call_count == 3
+        assert [c.args[1]["pixel_values"].shape for c in svc._session.run.call_args_list] == [
+            (2, 3, 384, 384),
+            (2, 3, 384, 384),
+            (1, 3, 384, 384),
+        ]
+
+    def test_batch_matches_single_image_path(self) -> None:
+        svc = ONNXOrientationService()
+        svc._session = _session_by_shade({10: _UNSURE, 20: _CONFIDENT[1]})
+        images = [_image(10), _image(20)]
+
+        batched = svc.detect_orientation_batch(images, batch_size=8, workers=2)
+
+        assert batched == [svc.detect_orientation(image) for image in images]
+
+    def test_fixed_batch_model_falls_back_to_single_runs(self) -> None:
+        svc = ONNXOrientationService()
+        inner = _session_by_shade({10: _CONFIDENT[0], 20: _CONFIDENT[1]})
+        session = MagicMock()
+
+        def run(outputs, feeds):
+            if len(feeds["pixel_values"]) != 1:
+                raise RuntimeError("Got invalid dimensions for input: pixel_values")
+            return inner.run(outputs, feeds)
+
+        session.run.side_effect = run
+        svc._session = session
+
+        results = svc.detect_orientation_batch([_image(10), _image(20), _image(20)], batch_size=3, workers=1)
+
+        assert [r["rotation"] for r in results] == [0, 180, 180]
+        assert svc._batch_unsupported is True
+
+        session.run.reset_mock()
+        svc.detect_orientation_batch([_image(10), _image(20)], batch_size=2, workers=1)
+        # 已知不支持批量后不再尝试整批推理
+        assert session.run.call_count == 2
+
+    def test_undecodable_image_only_fails_itself(self) -> None:
+        svc = ONNXOrientationService()
+        svc._session = _session_by_shade({10: _CONFIDENT[2]})
+
+        results = svc.detect_orientation_batch([b"not an image", _image(10)], batch_size=4, workers=2)
+
+        assert results[0]["method"] == "onnx_error"
+        assert results[0]["rotation"] == 0
+        assert results[1]["rotation"] == -90
+        assert svc._session.run.call_args.args[1]["pixel_values"].shape == (1, 3, 384, 384)
+
+    def test_inference_error_marks_whole_batch(self) -> None:
+        svc = ONNXOrientationService()
+        svc._session = MagicMock()
+        svc._session.run.side_effect = RuntimeError("boom")
+
+        results = svc.detect_orientation_batch([_image(10)], batch_size=4, workers=1)
+
+        assert results == [{"rotation": 0, "confidence": 0, "method": "onnx_error", "error": "boom"}]
+
+    def test_session_unavailable(self) -> None:
+        svc = ONNXOrientationService(model_path="/nonexistent/model.onnx")
+        svc._download_from_hub = MagicMock()
+
+        results = svc.detect_orientation_batch([_image(10), _image(20)], batch_size=4, workers=1)
+
+        assert [r["method"] for r in results] == ["onnx_unavailable", "onnx_unavailable"]
+
+    def test_empty_input(self) -> None:
+        assert ONNXOrientationService().detect_orientation_batch([]) == []
+
+
+class TestDetectBatchOcrFallback:
+    def test_ocr_only_for_low_confidence_items(self) -> None:
+        onnx = ONNXOrientationService()
+        onnx._session = _session_by_shade({10: _CONFIDENT[1], 20: _UNSURE})
+        ocr = MagicMock()
+        ocr.recognize_raw.return_value = SimpleNamespace(txts=["第一行", "第二行"])
+        svc = OrientationDetectionService(ocr_service=ocr, onnx_service=onnx)
+        svc.detect_orientation_with_text = MagicMock(  # type: ignore[method-assign]
+            return_value={"rotation": 90, "confidence": 0.8, "method": "ocr_voting", "ocr_text": "正文"}
+        )
+        payload = [
+            {"filename": "a.png", "data": base64.b64encode(_image(10)).decode()},
+            {"filename": "b.png", "data": "data:image/png;base64," + base64.b64encode(_image(20)).decode()},
+            {"filename": "c.png", "data": "!!!invalid!!!"},
+        ]
+
+        with (
+            patch.object(onnx_service, "configured_batch_size", return_value=8),
+            patch.object(onnx_service, "configured_preprocess_workers", return_value=2),
+        ):
+            results = svc.detect_batch(payload)
+
+        assert [r["filename"] for r in results] == ["a.png", "b.png", "c.png"]
+        assert results[0]["method"] == "onnx_classifier"
+        assert results[0]["rotation"] == 180
+        assert results[0]["ocr_text"] == "第一行\n第二行"
+        ocr.recognize_raw.assert_called_once()
+        assert results[1]["method"] == "ocr_voting"
+        # OCR 投票的逆时针 90° 统一为 ONNX 约定的 -90°
+        assert results[1]["rotation"] == -90
+        assert results[1]["can_auto_rotate"] is True
+        assert "error" in results[2]
+        svc.detect_orientation_with_text.assert_called_once_with(_image(20))
+
+    def test_without_text_skips_ocr(self) -> None:
+        onnx = ONNXOrientationService()
+        onnx._session = _session_by_shade({10: _CONFIDENT[1], 20: _UNSURE})
+        ocr = MagicMock()
+        svc = OrientationDetectionService(ocr_service=ocr, onnx_service=onnx)
+
+        results = svc.detect_batch_bytes([_image(10), _image(20)], with_text=False)
+
+        assert [r["rotation"] for r in results] == [180, 0]
+        assert [r["method"] for r in results] == ["onnx_classifier", "onnx_classifier"]
+        ocr.recognize_raw.assert_not_called()
+
+    def test_ocr_voting_runs_on_exif_transposed_pixels(self) -> None:
+        buf = io.BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6  # 需顺时针旋转 90° 显示
+        Image.new("RGB", (64, 48), color=(20, 20, 20)).save(buf, format="JPEG", exif=exif)
+        onnx = MagicMock()
+        onnx.detect_orientation_batch.return_value = [{"rotation": 0, "confidence": 0.3, "method": "onnx_classifier"}]
+        svc = OrientationDetectionService(ocr_service=MagicMock(), onnx_service=onnx)
+        svc.detect_orientation_with_text = MagicMock(  # type: ignore[method-assign]
+            return_value={"rotation": 270, "confidence": 0.8, "method": "ocr_voting", "ocr_text": ""}
+        )
+
+        results = svc.detect_batch_bytes([buf.getvalue()])
+
+        voted = Image.open(io.BytesIO(svc.detect_orientation_with_text.call_args.args[0]))
+        assert voted.size == (48, 64)
+        assert results[0]["rotation"] == -270
+
+    def test_onnx_failure_falls_back_to_ocr(self) -> None:
+        onnx = MagicMock()
+        onnx.detect_orientation_batch.side_effect = RuntimeError("onnx broken")
+        svc = OrientationDetectionService(ocr_service=MagicMock(), onnx_service=onnx)
+        svc.detect_orientation_with_text = MagicMock(  # type: ignore[method-assign]
+            return_value={"rotation": 0, "confidence": 0, "method": "ocr_voting_low_score", "ocr_text": ""}
+        )
+
+        results = svc.detect_batch([{"filename": "a.png", "data": base64.b64encode(_image(10)).decode()}])
+
+        assert results[0]["method"] == "ocr_voting_low_score"
+        assert results[0]["filename"] == "a.png"
@@ -14,7 +14,9 @@ from apps.image_rotation.services.pdf_extraction_service import PDFExtractionSer
 @pytest.fixture
 def service() -> PDFExtractionService:
     mock_orientation = MagicMock()
-    mock_orientation.detect_orientation.return_value = {"rotation": 0, "confidence": 0.9, "method": "onnx"}
+    mock_orientation.detect_batch_bytes.side_effect = lambda images, **_: [
+        {"rotation": 0, "confidence": 0.9, "method": "onnx"} for _ in images
+    ]
     return PDFExtractionService(orientation_service=mock_orientation)
 
 
@@ -85,24 +87,19 @@ class TestDetectSinglePageOrientation:
 class TestDetectPageOrientation:
     def test_onnx_success(self) -> None:
         mock_svc = MagicMock()
-        mock_svc.detect_orientation.return_value = {"rotation": 90, "confidence": 0.85, "method": "onnx"}
-        svc = PDFExtractionService()
-        with patch(
-            "apps.image_rotation.services.orientation.onnx_service.get_onnx_orientation_service",
-            return_value=mock_svc,
-        ):
-            result = svc._detect_page_orientation(b"image_data")
-            assert result["rotation"] == 90
+        mock_svc.detect_batch_bytes.return_value = [{"rotation": -90, "confidence": 0.85, "method": "onnx"}]
+        svc = PDFExtractionService(orientation_service=mock_svc)
+        result = svc._detect_page_orientation(b"image_data")
+        assert result["rotation"] == -90
+        mock_svc.detect_batch_bytes.assert_called_once_with([b"image_data"], with_text=False)
 
     def test_onnx_exception(self) -> None:
-        svc = PDFExtractionService()
-        with patch(
-            "apps.image_rotation.services.orientation.onnx_service.get_onnx_orientation_service",
-            side_effect=Exception("onnx error"),
-        ):
-            result = svc._detect_page_orientation(b"data")
-            assert result["rotation"] == 0
-            assert result["method"] == "default"
+        mock_svc = MagicMock()
+        mock_svc.detect_batch_bytes.side_effect = Exception("onnx error")
+        svc = PDFExtractionService(orientation_service=mock_svc)
+        result = svc._detect_page_orientation(b"data")
+        assert result["rotation"] == 0
+        assert result["method"] == "default"
 
 
 # ── _open_pdf_document error paths ────────────────────────────────────
@@ -163,6 +160,17 @@ class TestExtractWithDetection:
             result = service._extract_all_pages_with_detection(doc, "test.pdf", 1)
             assert len(result) == 1
 
+    def test_pages_detected_in_one_batch(self, service: PDFExtractionService) -> None:
+        page = MagicMock()
+        page.rect = SimpleNamespace(width=595, height=842)
+        doc = [page, page, page]
+        with patch.object(service, "_extract_page_image", side_effect=[b"p1", b"p2", b"p3"]):
+            result = service._extract_all_pages_with_detection(doc, "test.pdf", 3)
+        service.orientation_service.detect_batch_bytes.assert_called_once_with(  # type: ignore[attr-defined]
+            [b"p1", b"p2", b"p3"], with_text=False
+        )
+        assert [p["page_number"] for p in result] == [1, 2, 3]
+
     def test_page_exception_logged(self, service: PDFExtractionService) -> None:
         bad_page = MagicMock()
         bad_page.__getitem__ = MagicMock(side_effect=Exception("page error"))
@@ -21,6 +21,12 @@ def _make_test_image(width: int = 100, height: int = 100, color: str = "white",
     return buf.getvalue()
 
 
+def _unavailable_onnx_service() -> MagicMock:
+    onnx = MagicMock()
+    onnx.detect_orientation_batch.side_effect = lambda images: [{"method": "onnx_unavailable"} for _ in images]
+    return onnx
+
+
 def _make_jpeg_image() -> bytes:
     return _make_test_image(fmt="JPEG")
 
@@ -755,7 +761,7 @@ class TestOrientationDetectionServiceFull:
     def test_detect_batch_multiple(self, _mock_ocr_prop):
         from apps.image_rotation.services.orientation.service import OrientationDetectionService
         import base64
-        svc = OrientationDetectionService()
+        svc = OrientationDetectionService(onnx_service=_unavailable_onnx_service())
         img_b64 = base64.b64encode(_make_test_image()).decode()
         results = svc.detect_batch([
             {"filename": "a.png", "data": img_b64},
@@ -107,13 +107,11 @@ class TestProcessPdf:
         result = svc._process_pdf(Path("/fake/file.pdf"))
         assert result == "PDF text content"
 
-    @patch("shutil.rmtree")
-    def test_fallback_to_ocr(self, mock_rmtree):
+    def test_fallback_to_ocr(self):
         mock_extractor = MagicMock()
         mock_extractor.extract.return_value = None
-        mock_extractor.pdf_to_images.return_value = [Path("/tmp/img1.png"), Path("/tmp/img2.png")], "/tmp/dir"
+        mock_extractor.ocr_pages.return_value = "page1 text\npage2 text"
         mock_ocr = MagicMock()
-        mock_ocr.recognize.side_effect = ["page1 text", "page2 text"]
         svc = InvoiceRecognitionService(
             ocr_service=mock_ocr,
             pdf_extractor=mock_extractor,
@@ -122,6 +120,7 @@ class TestProcessPdf:
         result = svc._process_pdf(Path("/fake/file.pdf"))
         assert "page1 text" in result
         assert "page2 text" in result
+        mock_extractor.ocr_pages.assert_called_once_with(Path("/fake/file.pdf"), mock_ocr)
 
 
 # ============================================================================
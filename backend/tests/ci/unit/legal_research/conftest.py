@@ -0,0 +1,18 @@
+"""legal_research 单元测试公共 fixtures。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from apps.legal_research.services.similarity import corpus_index, vector_store
+
+
+@pytest.fixture(autouse=True)
+def _isolate_legal_research_media(tmp_path: Path, settings: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    """语料索引与向量库写入临时 MEDIA_ROOT，避免测试污染仓库内的 media 目录。"""
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    monkeypatch.setattr(corpus_index, "_default_index", None)
+    monkeypatch.setattr(vector_store, "_stores", {})
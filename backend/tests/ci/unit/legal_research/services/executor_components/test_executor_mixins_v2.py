@@ -125,6 +125,27 @@ class TestCacheMixin:
 
         assert ExecutorCacheMixin._deserialize_case_detail_payload({"title": "x"}) is None
 
+    def test_index_case_details_submits_batch_in_background(self) -> None:
+        from apps.legal_research.services.executor_components import cache_mixin
+
+        details = [SimpleNamespace(doc_id_unquoted="d1"), SimpleNamespace(doc_id_unquoted="d2")]
+        index = MagicMock()
+        with patch.object(cache_mixin, "get_case_corpus_index", return_value=index):
+            cache_mixin.ExecutorCacheMixin._index_case_details(
+                source="weike", details=details, tuning=SimpleNamespace(corpus_index_enabled=True)
+            )
+            cache_mixin._CORPUS_INDEX_EXECUTOR.submit(lambda: None).result(timeout=5)
+        index.add_documents.assert_called_once_with(source="weike", details=details)
+
+    def test_index_case_details_disabled(self) -> None:
+        from apps.legal_research.services.executor_components import cache_mixin
+
+        with patch.object(cache_mixin._CORPUS_INDEX_EXECUTOR, "submit") as submit:
+            cache_mixin.ExecutorCacheMixin._index_case_details(
+                source="weike", details=[SimpleNamespace()], tuning=SimpleNamespace(corpus_index_enabled=False)
+            )
+        submit.assert_not_called()
+
 
 # ── result_persistence ─────────────────────────────────────────────────────
 
@@ -0,0 +1,181 @@
+"""Tests for legal_research executor pipeline stages."""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import closing
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.legal_research.services.executor_components.pipeline import CandidateScoringStage, DetailPrefetcher
+from apps.legal_research.services.executor_components.source_gateway import ExecutorSourceGatewayMixin
+from apps.legal_research.services.similarity.tuning_config import LegalResearchTuningConfig
+
+
+class TestDetailPrefetcher:
+    def test_serial_mode_preserves_order(self) -> None:
+        prefetcher = DetailPrefetcher(fetch=lambda item: f"detail-{item}", concurrency=1)
+        assert list(prefetcher.iter_details([1, 2, 3])) == [(1, "detail-1"), (2, "detail-2"), (3, "detail-3")]
+
+    def test_concurrent_mode_preserves_input_order(self) -> None:
+        def _fetch(item: int) -> str:
+            time.sleep(0.01 * (5 - item))
+            return f"detail-{item}"
+
+        prefetcher = DetailPrefetcher(fetch=_fetch, concurrency=4)
+        results = list(prefetcher.iter_details(range(5)))
+        assert [item for item, _ in results] == [0, 1, 2, 3, 4]
+        assert results[4] == (4, "detail-4")
+
+    def test_concurrent_mode_overlaps_fetches(self) -> None:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def _fetch(item: int) -> int:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return item
+
+        prefetcher = DetailPrefetcher(fetch=_fetch, concurrency=3)
+        list(prefetcher.iter_details(range(9)))
+        assert 1 < peak <= 3
+
+    def test_fetch_error_yields_none(self) -> None:
+        def _fetch(item: int) -> str:
+            if item == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        prefetcher = DetailPrefetcher(fetch=_fetch, concurrency=2)
+        assert list(prefetcher.iter_details([0, 1, 2])) == [(0, "ok"), (1, None), (2, "ok")]
+
+    def test_early_exit_stops_prefetching(self) -> None:
+        fetched: list[int] = []
+
+        def _fetch(item: int) -> int:
+            fetched.append(item)
+            return item
+
+        prefetcher = DetailPrefetcher(fetch=_fetch, concurrency=2)
+        with closing(prefetcher.iter_details(range(100))) as stream:
+            for item, _ in stream:
+                if item == 1:
+                    break
+        assert len(fetched) < 100
+
+    def test_batches_collect_ready_details(self) -> None:
+        def _fetch(item: int) -> int:
+            if item == 0:
+                time.sleep(0.05)
+            return item
+
+        prefetcher = DetailPrefetcher(fetch=_fetch, concurrency=4)
+        batches = list(prefetcher.iter_detail_batches(range(4), max_batch_size=8))
+        assert batches[0] == [(0, 0), (1, 1), (2, 2), (3, 3)]
+
+    def test_batches_respect_size_and_order(self) -> None:
+        prefetcher = DetailPrefetcher(fetch=lambda item: item, concurrency=3)
+        batches = list(prefetcher.iter_detail_batches(range(10), max_batch_size=2))
+        assert all(1 <= len(batch) <= 2 for batch in batches)
+        assert [item for batch in batches for item, _ in batch] == list(range(10))
+
+    def test_serial_batches_hold_one_detail(self) -> None:
+        prefetcher = DetailPrefetcher(fetch=lambda item: item, concurrency=1)
+        assert list(prefetcher.iter_detail_batches([1, 2], max_batch_size=8)) == [[(1, 1)], [(2, 2)]]
+
+
+class TestCandidateScoringStage:
+    def test_drain_returns_submission_order_and_skips_none(self) -> None:
+        scores = {"a": 0.9, "b": None, "c": 0.4}
+        stage = CandidateScoringStage(score_one=lambda detail: scores[detail], concurrency=2, task_id="t-1")
+        for detail in ("a", "b", "c"):
+            stage.submit((detail, 0.5, "coarse"))
+        assert len(stage) == 3
+        results = stage.drain()
+        assert [(detail, sim) for detail, sim, _, _ in results] == [("a", 0.9), ("c", 0.4)]
+
+    def test_drain_skips_failed_scores(self) -> None:
+        def _score(detail: str) -> Any:
+            raise RuntimeError("llm down")
+
+        stage = CandidateScoringStage(score_one=_score, concurrency=1, task_id="t-1")
+        stage.submit(("a", 0.5, "coarse"))
+        assert stage.drain() == []
+
+    def test_close_is_idempotent(self) -> None:
+        stage = CandidateScoringStage(score_one=lambda detail: 1.0, concurrency=1, task_id="t-1")
+        stage.submit(("a", 0.5, "coarse"))
+        stage.close()
+        stage.close()
+        assert len(stage) == 0
+
+    def test_context_exit_shuts_pool_on_error(self) -> None:
+        stage = CandidateScoringStage(score_one=lambda detail: 1.0, concurrency=1, task_id="t-1")
+        with pytest.raises(RuntimeError), stage:
+            stage.submit(("a", 0.5, "coarse"))
+            raise RuntimeError("detail loop failed")
+        assert len(stage) == 0
+        assert stage._pool._shutdown
+
+
+class TestFetchCandidateBatch:
+    def test_slices_window_when_source_has_no_offset(self) -> None:
+        class _Source:
+            def search_cases(self, *, session: Any, keyword: str, max_candidates: int, max_pages: int) -> list[int]:
+                return list(range(max_candidates))
+
+        class _Gateway(ExecutorSourceGatewayMixin):
+            PAGE_SIZE_HINT = 20
+            MAX_PAGE_WINDOW = 50
+
+        items = _Gateway._fetch_candidate_batch(
+            source_client=_Source(), session=None, keyword="买卖", offset=5, batch_size=3
+        )
+        assert items == [5, 6, 7]
+
+
+class TestDetailFetchConcurrency:
+    def test_weike_uses_tuning_limit(self) -> None:
+        tuning = LegalResearchTuningConfig(weike_detail_fetch_concurrency=6)
+        assert tuning.detail_fetch_concurrency_for("weike") == 6
+        assert tuning.detail_fetch_concurrency_for("other") == 1
+
+    def test_serial_when_session_not_thread_safe(self) -> None:
+        source_client = MagicMock()
+        source_client.supports_concurrent_detail_fetch.return_value = False
+        result = ExecutorSourceGatewayMixin._resolve_detail_fetch_concurrency(
+            source_client=source_client,
+            session=MagicMock(),
+            source="weike",
+            tuning=LegalResearchTuningConfig(weike_detail_fetch_concurrency=6),
+        )
+        assert result == 1
+
+    def test_concurrent_when_supported(self) -> None:
+        source_client = MagicMock()
+        source_client.supports_concurrent_detail_fetch.return_value = True
+        result = ExecutorSourceGatewayMixin._resolve_detail_fetch_concurrency(
+            source_client=source_client,
+            session=MagicMock(),
+            source="weike",
+            tuning=LegalResearchTuningConfig(weike_detail_fetch_concurrency=6),
+        )
+        assert result == 6
+
+    def test_serial_without_capability_hook(self) -> None:
+        result = ExecutorSourceGatewayMixin._resolve_detail_fetch_concurrency(
+            source_client=object(),
+            session=MagicMock(),
+            source="weike",
+            tuning=LegalResearchTuningConfig(),
+        )
+        assert result == 1
@@ -102,6 +102,34 @@ class TestCoarseRecall:
         assert score == 0.0
 
 
+class TestCoarseRecallBatch:
+
+    def test_uses_batch_scorer(self) -> None:
+        similarity = MagicMock()
+        similarity.coarse_recall_scores.return_value = [
+            SimilarityResult(score=0.4, reason="a", model="coarse"),
+            SimilarityResult(score=1.4, reason="b", model="coarse"),
+        ]
+        details = [_make_detail(title="甲"), _make_detail(title="乙")]
+        results = ExecutorScoringMixin._coarse_recall_batch(
+            similarity=similarity, keyword="违约", case_summary="纠纷", details=details, source="weike",
+        )
+        assert results == [(0.4, "a"), (1.0, "b")]
+        documents = similarity.coarse_recall_scores.call_args.kwargs["documents"]
+        assert [document.title for document in documents] == ["甲", "乙"]
+        similarity.coarse_recall_score.assert_not_called()
+
+    def test_falls_back_per_detail_on_error(self) -> None:
+        similarity = MagicMock()
+        similarity.coarse_recall_scores.side_effect = RuntimeError("boom")
+        similarity.coarse_recall_score.return_value = SimilarityResult(score=0.3, reason="单条", model="coarse")
+        details = [_make_detail(), _make_detail()]
+        results = ExecutorScoringMixin._coarse_recall_batch(
+            similarity=similarity, keyword="违约", case_summary="纠纷", details=details,
+        )
+        assert results == [(0.3, "单条"), (0.3, "单条")]
+
+
 class TestCoarseRerankBudget:
 
     def test_basic_budget(self) -> None:
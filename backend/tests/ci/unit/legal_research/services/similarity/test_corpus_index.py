@@ -0,0 +1,119 @@
+"""Tests for the legal_research corpus index and corpus-backed BM25."""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from apps.legal_research.services.similarity import scorers
+from apps.legal_research.services.similarity.corpus_index import CaseCorpusIndex
+
+
+def _detail(doc_id: str, text: str, *, title: str = "") -> SimpleNamespace:
+    return SimpleNamespace(
+        doc_id_raw=doc_id,
+        doc_id_unquoted=doc_id,
+        detail_url=f"https://example.test/{doc_id}",
+        search_id="s-1",
+        module="case",
+        title=title or f"案例{doc_id}",
+        case_digest="",
+        content_text=text,
+    )
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> CaseCorpusIndex:
+    corpus = CaseCorpusIndex(tmp_path / "corpus.sqlite3")
+    for i in range(CaseCorpusIndex.MIN_DOCUMENTS_FOR_STATS):
+        corpus.add_document(source="weike", detail=_detail(f"filler-{i}", "合同 纠纷 借款 利息 逾期 还款"))
+    corpus.add_document(source="weike", detail=_detail("target", "商品房 买卖 合同 逾期 交房 违约金 调减"))
+    return corpus
+
+
+class TestCaseCorpusIndex:
+    def test_add_document_is_idempotent(self, tmp_path: Path) -> None:
+        corpus = CaseCorpusIndex(tmp_path / "corpus.sqlite3")
+        assert corpus.add_document(source="weike", detail=_detail("d1", "借款 合同 纠纷")) is True
+        assert corpus.add_document(source="weike", detail=_detail("d1", "借款 合同 纠纷")) is False
+        assert corpus.document_count() == 1
+
+    def test_add_documents_writes_batch_once(self, tmp_path: Path) -> None:
+        corpus = CaseCorpusIndex(tmp_path / "corpus.sqlite3")
+        corpus.add_document(source="weike", detail=_detail("d1", "借款 合同 纠纷"))
+        details = [_detail("d1", "借款 合同 纠纷"), _detail("d2", "买卖 合同"), _detail("", "租赁 合同")]
+        assert corpus.add_documents(source="weike", details=details) == 1
+        assert corpus.document_count() == 2
+        fresh = CaseCorpusIndex(tmp_path / "corpus.sqlite3")
+        assert fresh.document_count() == 2
+
+    def test_skips_documents_without_id(self, tmp_path: Path) -> None:
+        corpus = CaseCorpusIndex(tmp_path / "corpus.sqlite3")
+        assert corpus.add_document(source="weike", detail=_detail("", "借款 合同")) is False
+
+    def test_statistics_none_below_min_documents(self, tmp_path: Path) -> None:
+        corpus = CaseCorpusIndex(tmp_path / "corpus.sqlite3")
+        corpus.add_document(source="weike", detail=_detail("d1", "借款 合同 纠纷"))
+        assert corpus.statistics_for("借款") is None
+
+    def test_statistics_reflect_document_frequencies(self, index: CaseCorpusIndex) -> None:
+        stats = index.statistics_for("违约金 借款")
+        assert stats is not None
+        assert stats.doc_count == CaseCorpusIndex.MIN_DOCUMENTS_FOR_STATS + 1
+        assert stats.avg_doc_length > 0
+        assert stats.idf("违约金") > stats.idf("借款")
+
+    def test_document_term_frequencies(self, index: CaseCorpusIndex) -> None:
+        entry = index.document_term_frequencies(source="WEIKE", doc_id="target")
+        assert entry is not None
+        term_freqs, length = entry
+        assert length == sum(term_freqs.values())
+        assert index.document_term_frequencies(source="weike", doc_id="missing") is None
+
+    def test_search_ranks_rare_term_match_first(self, index: CaseCorpusIndex) -> None:
+        hits = index.search(source="weike", query_text="逾期交房 违约金", top_k=5)
+        assert hits
+        assert hits[0].doc_id_unquoted == "target"
+        assert hits[0].detail_url == "https://example.test/target"
+        assert 0.0 < hits[0].score <= 1.0
+
+    def test_search_filters_by_source(self, index: CaseCorpusIndex) -> None:
+        assert index.search(source="other", query_text="违约金", top_k=5) == []
+
+
+class TestCorpusBm25:
+    def test_idf_matches_bm25_formula(self) -> None:
+        stats = scorers.CorpusStatistics(doc_count=100, avg_doc_length=50.0, document_frequencies={"合同": 10})
+        assert stats.idf("合同") == pytest.approx(math.log(1 + (100 - 10 + 0.5) / (10 + 0.5)))
+
+    def test_corpus_stats_change_score(self, index: CaseCorpusIndex) -> None:
+        document_text = "商品房 买卖 合同 逾期 交房 违约金 调减"
+        stats = index.statistics_for("违约金 借款")
+        heuristic = scorers.bm25_proxy_score(query_text="违约金 借款", document_text=document_text)
+        corpus = scorers.bm25_proxy_score(
+            query_text="违约金 借款",
+            document_text=document_text,
+            corpus_stats=stats,
+        )
+        assert 0.0 <= corpus <= 1.0
+        assert corpus != heuristic
+
+    def test_corpus_stats_keep_heuristic_scale(self) -> None:
+        document_text = "逾期 交房 违约金 调减"
+        stats = scorers.CorpusStatistics(
+            doc_count=500,
+            avg_doc_length=scorers.BM25_HEURISTIC_AVG_DL,
+            document_frequencies={"违约金": 40, "借款": 3},
+        )
+        heuristic = scorers.bm25_proxy_score(query_text="违约金 借款", document_text=document_text)
+        corpus = scorers.bm25_proxy_score(query_text="违约金 借款", document_text=document_text, corpus_stats=stats)
+        # 只有一个查询词命中时 IDF 权重约去，两种口径分值相同
+        assert corpus == pytest.approx(heuristic)
+        assert corpus > 0.3
+
+    def test_empty_query_scores_zero_with_stats(self, index: CaseCorpusIndex) -> None:
+        stats = index.statistics_for("")
+        assert scorers.bm25_proxy_score(query_text="", document_text="合同", corpus_stats=stats) == 0.0
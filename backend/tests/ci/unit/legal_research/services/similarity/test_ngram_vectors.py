@@ -0,0 +1,113 @@
+"""Tests for the hashed n-gram sparse vector engine."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from apps.legal_research.management.commands.benchmark_legal_research_ngram import Command, _counter_cosine
+from apps.legal_research.services.similarity import ngram_vectors
+from apps.legal_research.services.similarity.ngram_vectors import (
+    HashedNgramMatrix,
+    HashedNgramVector,
+    cosine_similarity,
+    cosine_similarity_batch,
+    hashed_ngram_indices,
+)
+from apps.legal_research.services.similarity.scorers import char_ngrams, lexical_vector_similarity_scores
+
+
+class TestHashedNgramIndices:
+    def test_matches_counter_gram_count(self) -> None:
+        text = "买卖合同 纠纷 违约金"
+        assert hashed_ngram_indices(text).size == sum(char_ngrams(text).values())
+
+    def test_short_text_is_empty(self) -> None:
+        assert hashed_ngram_indices("").size == 0
+        assert hashed_ngram_indices("a").size == 0
+
+    def test_order_sensitive(self) -> None:
+        assert set(hashed_ngram_indices("ab").tolist()) != set(hashed_ngram_indices("ba").tolist())
+
+    def test_indices_within_dimension(self) -> None:
+        indices = hashed_ngram_indices("借款合同纠纷" * 50)
+        assert indices.min() >= 0
+        assert indices.max() < ngram_vectors.NGRAM_HASH_DIM
+
+
+class TestHashedNgramVector:
+    def test_norm_matches_counter(self) -> None:
+        text = "原告要求被告支付违约金"
+        vector = HashedNgramVector.from_text(text)
+        expected = math.sqrt(sum(v * v for v in char_ngrams(text).values()))
+        assert vector.norm == pytest.approx(expected)
+
+    def test_arrays_are_read_only(self) -> None:
+        vector = HashedNgramVector.from_text("买卖合同")
+        with pytest.raises(ValueError):
+            vector.data[0] = 5.0
+
+
+class TestHashedNgramMatrix:
+    def test_csr_layout(self) -> None:
+        matrix = HashedNgramMatrix.from_texts(["买卖合同", "", "借款合同纠纷"])
+        assert matrix.row_count == 3
+        assert matrix.indptr.tolist()[0] == 0
+        assert matrix.indptr[2] == matrix.indptr[1]
+        assert matrix.indptr[-1] == matrix.indices.size
+
+    def test_all_empty_rows(self) -> None:
+        matrix = HashedNgramMatrix.from_texts(["", "a"])
+        assert matrix.cosine(HashedNgramVector.from_text("买卖合同")).tolist() == [0.0, 0.0]
+
+
+class TestCosineSimilarity:
+    def test_matches_counter_implementation(self) -> None:
+        query = "商品房买卖合同逾期交房违约金调减"
+        texts = [
+            "原告与被告签订商品房买卖合同，被告逾期交房，原告主张违约金。",
+            "借款合同纠纷，原告要求被告归还本金及利息。",
+            "本院认为，违约金过高的，可以请求人民法院予以调减。",
+        ]
+        scores = cosine_similarity_batch(query, texts)
+        for text, score in zip(texts, scores, strict=True):
+            assert score == pytest.approx(_counter_cosine(query, text), abs=1e-6)
+
+    def test_identical_text(self) -> None:
+        assert cosine_similarity("买卖合同纠纷", "买卖合同纠纷") == pytest.approx(1.0)
+
+    def test_empty_inputs(self) -> None:
+        assert cosine_similarity("", "买卖合同") == 0.0
+        assert cosine_similarity("买卖合同", "") == 0.0
+        assert cosine_similarity_batch("买卖合同", []) == []
+
+    def test_query_vector_cached(self) -> None:
+        ngram_vectors.query_vector.cache_clear()
+        cosine_similarity_batch("违约金调减", ["违约金过高"])
+        cosine_similarity_batch("违约金调减", ["违约金调减"])
+        assert ngram_vectors.query_vector.cache_info().hits == 1
+
+    def test_scorers_batch_api(self) -> None:
+        assert lexical_vector_similarity_scores("买卖合同", ["买卖合同", "刑事犯罪"]) == [
+            pytest.approx(1.0),
+            0.0,
+        ]
+
+
+class TestNgramBenchmarkCommand:
+    def test_random_text_is_deterministic(self) -> None:
+        import random
+
+        assert Command._random_text(random.Random(1), 50) == Command._random_text(random.Random(1), 50)
+
+    def test_build_report(self) -> None:
+        report = Command._build_report(
+            candidates=100,
+            repeat=3,
+            baseline_seconds=0.2,
+            vectorized_seconds=0.05,
+            max_abs_diff=0.0,
+        )
+        assert report["speedup"] == pytest.approx(4.0)
+        assert report["baseline_pairs_per_sec"] == pytest.approx(500.0)
@@ -0,0 +1,127 @@
+"""Tests for the on-disk semantic vector store."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from apps.legal_research.services.similarity.corpus_index import CaseCorpusIndex
+from apps.legal_research.services.similarity.vector_store import SemanticVectorStore, model_directory_name
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SemanticVectorStore:
+    return SemanticVectorStore(tmp_path / "model")
+
+
+class TestSemanticVectorStore:
+    def test_get_returns_unit_vector(self, store: SemanticVectorStore) -> None:
+        assert store.add("k1", [3.0, 4.0]) is True
+        assert store.get("k1") == pytest.approx([0.6, 0.8], abs=1e-3)
+        assert store.get("missing") is None
+
+    def test_add_is_idempotent_and_backfills_doc(self, store: SemanticVectorStore) -> None:
+        store.add("k1", [1.0, 0.0])
+        assert store.search([1.0, 0.0], top_k=5) == []
+        assert store.add("k1", [1.0, 0.0], source="weike", doc_id="d1") is False
+        hits = store.search([1.0, 0.0], top_k=5)
+        assert [(hit.source, hit.doc_id) for hit in hits] == [("weike", "d1")]
+        assert store.count() == 1
+
+    def test_rejects_dimension_mismatch_and_zero_vector(self, store: SemanticVectorStore) -> None:
+        store.add("k1", [1.0, 0.0])
+        assert store.add("k2", [1.0, 0.0, 0.0]) is False
+        assert store.add("k3", [0.0, 0.0]) is False
+
+    def test_search_orders_by_cosine_and_filters_source(self, store: SemanticVectorStore) -> None:
+        store.add("a", [1.0, 0.0, 0.0], source="weike", doc_id="near")
+        store.add("b", [0.0, 1.0, 0.0], source="weike", doc_id="far")
+        store.add("c", [1.0, 0.0, 0.0], source="other", doc_id="other")
+        hits = store.search([0.9, 0.1, 0.0], top_k=2, source="weike")
+        assert [hit.doc_id for hit in hits] == ["near", "far"]
+        assert hits[0].score > hits[1].score
+
+    def test_persists_across_instances(self, tmp_path: Path) -> None:
+        SemanticVectorStore(tmp_path / "model").add("k1", [0.0, 1.0], source="weike", doc_id="d1")
+        reopened = SemanticVectorStore(tmp_path / "model")
+        assert reopened.get("k1") == pytest.approx([0.0, 1.0], abs=1e-3)
+
+    def test_grows_beyond_initial_capacity(self, store: SemanticVectorStore) -> None:
+        store.INITIAL_CAPACITY = 4
+        for i in range(10):
+            store.add(f"k{i}", [float(i + 1), 1.0])
+        assert store.get("k9") == pytest.approx(list(np.array([10.0, 1.0]) / np.hypot(10.0, 1.0)), abs=1e-3)
+
+    def test_ivf_index_probes_nearest_clusters(self, store: SemanticVectorStore) -> None:
+        store.IVF_MIN_ROWS = 200
+        rng = np.random.default_rng(7)
+        centers = rng.normal(size=(6, 16))
+        for i in range(300):
+            vector = centers[i % 6] + 0.05 * rng.normal(size=16)
+            store.add(f"k{i}", vector.tolist(), source="weike", doc_id=f"d{i}")
+        assert store._train_thread is not None
+        store._train_thread.join(timeout=30)
+        assert store._load_centroids() is not None
+        hits = store.search(centers[2].tolist(), top_k=5, source="weike")
+        assert len(hits) == 5
+        assert all(int(hit.doc_id[1:]) % 6 == 2 for hit in hits)
+
+    def test_training_runs_off_the_write_path_once(self, store: SemanticVectorStore) -> None:
+        store.IVF_MIN_ROWS = 4
+        for i in range(3):
+            store.add(f"k{i}", [float(i + 1), 1.0])
+        assert store._train_lock.acquire(blocking=False)
+        try:
+            store.add("k3", [4.0, 1.0])
+            assert store._train_thread is None
+        finally:
+            store._train_lock.release()
+        assert store._load_centroids() is None
+        assert store.train_ivf() is True
+        assert store.train_ivf() is False
+        assert store._load_centroids() is not None
+
+    def test_existing_key_does_not_take_write_lock(self, store: SemanticVectorStore) -> None:
+        import sqlite3
+
+        store.add("k1", [1.0, 0.0], source="weike", doc_id="d1")
+        blocker = sqlite3.connect(str(store.directory / "store.sqlite3"), timeout=0.1, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        try:
+            assert store.add("k1", [1.0, 0.0], source="weike", doc_id="d1") is False
+        finally:
+            blocker.execute("ROLLBACK")
+            blocker.close()
+
+
+class TestModelDirectoryName:
+    def test_sanitizes_and_disambiguates(self) -> None:
+        name = model_directory_name("BAAI/bge-m3")
+        assert name.startswith("BAAI_bge-m3-")
+        assert model_directory_name("BAAI/bge-m3") != model_directory_name("BAAI_bge-m3")
+
+
+class TestCorpusHitsFor:
+    def test_restores_items_in_input_order(self, tmp_path: Path) -> None:
+        from types import SimpleNamespace
+
+        index = CaseCorpusIndex(tmp_path / "corpus.sqlite3")
+        for doc_id in ("d1", "d2"):
+            index.add_document(
+                source="weike",
+                detail=SimpleNamespace(
+                    doc_id_raw=doc_id,
+                    doc_id_unquoted=doc_id,
+                    detail_url=f"https://example.test/{doc_id}",
+                    search_id="",
+                    module="",
+                    title=f"案例{doc_id}",
+                    case_digest="",
+                    content_text="买卖合同纠纷",
+                ),
+            )
+        hits = index.hits_for(source="weike", scored_doc_ids=[("d2", 0.9), ("missing", 0.8), ("d1", 0.7)])
+        assert [hit.doc_id_unquoted for hit in hits] == ["d2", "d1"]
+        assert hits[0].score == pytest.approx(0.9)
@@ -177,7 +177,9 @@ class TestExecutorRunSuccessSingleItem:
         p["_should_rerank"] = patch.object(executor, "_should_rerank", return_value=True)
         p["_title_prefilter"] = patch.object(executor, "_title_prefilter", return_value=True)
         p["_fetch_case_detail_with_cache"] = patch.object(executor, "_fetch_case_detail_with_cache", return_value=detail)
-        p["_coarse_recall"] = patch.object(executor, "_coarse_recall", return_value=(0.5, "coarse"))
+        p["_coarse_recall_batch"] = patch.object(
+            executor, "_coarse_recall_batch", side_effect=lambda **kw: [(0.5, "coarse")] * len(kw["details"])
+        )
         p["_batch_rerank_candidates"] = patch.object(executor, "_batch_rerank_candidates", return_value=[(detail, sim_result, 0.5, "coarse")])
         p["_extract_similarity_metadata"] = patch.object(executor, "_extract_similarity_metadata", return_value={})
         p["_merge_dual_review_scores"] = patch.object(executor, "_merge_dual_review_scores", return_value=(0.85, "merged", "m", {}))
@@ -414,7 +416,9 @@ class TestExecutorRunTargetReached:
         p["_should_rerank"] = patch.object(executor, "_should_rerank", return_value=True)
         p["_title_prefilter"] = patch.object(executor, "_title_prefilter", return_value=True)
         p["_fetch_case_detail_with_cache"] = patch.object(executor, "_fetch_case_detail_with_cache", return_value=detail)
-        p["_coarse_recall"] = patch.object(executor, "_coarse_recall", return_value=(0.6, "coarse"))
+        p["_coarse_recall_batch"] = patch.object(
+            executor, "_coarse_recall_batch", side_effect=lambda **kw: [(0.6, "coarse")] * len(kw["details"])
+        )
         p["_batch_rerank_candidates"] = patch.object(executor, "_batch_rerank_candidates", return_value=[(detail, sim_result, 0.6, "coarse")])
         p["_extract_similarity_metadata"] = patch.object(executor, "_extract_similarity_metadata", return_value={})
         p["_update_feedback_terms"] = patch.object(executor, "_update_feedback_terms")
@@ -7,7 +7,11 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from apps.legal_research.services.similarity.service import CaseSimilarityService, SimilarityResult
+from apps.legal_research.services.similarity.service import (
+    CaseSimilarityService,
+    RecallDocument,
+    SimilarityResult,
+)
 
 
 class TestSimilarityResult:
@@ -125,6 +129,29 @@ class TestCaseSimilarityServiceCoarseRecall:
         )
         assert isinstance(result, SimilarityResult)
 
+    @patch("apps.core.interfaces.ServiceLocator.get_llm_service")
+    def test_batch_matches_single_scores(self, mock_llm_factory):
+        mock_llm_factory.return_value = MagicMock()
+        svc = CaseSimilarityService()
+        documents = [
+            RecallDocument(title="买卖合同纠纷一案判决书", case_digest="被告未按时交货", content_text="本案系买卖合同纠纷"),
+            RecallDocument(title="劳动争议", case_digest="解除劳动合同", content_text="经济补偿金"),
+        ]
+
+        batch = svc.coarse_recall_scores(keyword="买卖合同 纠纷", case_summary="被告未交货", documents=documents)
+        single = [
+            svc.coarse_recall_score(
+                keyword="买卖合同 纠纷",
+                case_summary="被告未交货",
+                title=document.title,
+                case_digest=document.case_digest,
+                content_text=document.content_text,
+            )
+            for document in documents
+        ]
+        assert [(r.score, r.reason) for r in batch] == [(r.score, r.reason) for r in single]
+        assert svc.coarse_recall_scores(keyword="k", case_summary="s", documents=[]) == []
+
 
 class TestSemanticVector:
     """Semantic vector similarity tests."""
@@ -0,0 +1,184 @@
+"""mcp_server.manifest / mcp_server.lazy — 工具清单生成与按需注册"""
+
+from __future__ import annotations
+
+import sys
+import textwrap
+import types
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+from mcp_server import lazy, manifest
+from mcp_server.lazy import LazyTool, create_lazy_server, load_server
+
+_DEMO_MODULE = "lazy_demo_tools"
+_DEMO_SOURCE = '''
+from __future__ import annotations
+
+from typing import Any
+
+
+def add_numbers(a: int, b: int = 1) -> int:
+    """两数相加。"""
+    return a + b
+
+
+def describe_case(case_id: int, fields: list[str] | None = None) -> dict[str, Any]:
+    """查询案件摘要。"""
+    return {"case_id": case_id, "fields": fields or []}
+'''
+
+
+@pytest.fixture
+def demo_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> types.ModuleType:
+    (tmp_path / f"{_DEMO_MODULE}.py").write_text(textwrap.dedent(_DEMO_SOURCE), encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, _DEMO_MODULE, raising=False)
+    module = __import__(_DEMO_MODULE)
+    yield module
+    sys.modules.pop(_DEMO_MODULE, None)
+
+
+@pytest.fixture
+def eager_server(demo_module: types.ModuleType) -> FastMCP:
+    server = FastMCP("测试服务")
+    server.tool()(demo_module.add_numbers)
+    server.tool()(demo_module.describe_case)
+    return server
+
+
+class TestBuildManifest:
+    def test_entries_record_module_and_schema(self, eager_server: FastMCP):
+        data = manifest.build_manifest(eager_server)
+
+        assert data["server_name"] == "测试服务"
+        assert data["modules"] == [_DEMO_MODULE]
+        entry = {e["name"]: e for e in data["tools"]}["add_numbers"]
+        assert entry["module"] == _DEMO_MODULE
+        assert entry["attr"] == "add_numbers"
+        assert entry["description"] == "两数相加。"
+        assert entry["parameters"]["required"] == ["a"]
+
+    def test_round_trip_through_file(self, eager_server: FastMCP, tmp_path: Path):
+        path = tmp_path / "tool_manifest.json"
+        data = manifest.build_manifest(eager_server)
+
+        manifest.write_manifest(data, path)
+
+        assert manifest.load_manifest(path) == data
+        assert list(tmp_path.glob(".*.tmp")) == []
+
+    def test_stale_fingerprint_is_rejected(self, eager_server: FastMCP, tmp_path: Path):
+        path = tmp_path / "tool_manifest.json"
+        data = manifest.build_manifest(eager_server)
+        manifest.write_manifest({**data, "fingerprint": "outdated"}, path)
+
+        assert manifest.load_manifest(path) is None
+
+    def test_missing_or_corrupt_manifest_returns_none(self, tmp_path: Path):
+        path = tmp_path / "tool_manifest.json"
+        assert manifest.load_manifest(path) is None
+
+        path.write_text("{not json", encoding="utf-8")
+        assert manifest.load_manifest(path) is None
+
+    def test_fingerprint_tracks_external_tool_modules(self, tmp_path: Path):
+        external = tmp_path / "workflow_tools.py"
+        external.write_text("VERSION = 1\n", encoding="utf-8")
+        with mock.patch.object(manifest, "_module_source", return_value=external):
+            before = manifest.source_fingerprint(["apps.workflow.mcp.workflow_tools"])
+            external.write_text("VERSION = 2\n", encoding="utf-8")
+            after = manifest.source_fingerprint(["apps.workflow.mcp.workflow_tools"])
+
+        assert before != after
+        # mcp_server 内的模块已包含在全量源码中
+        assert manifest.source_fingerprint(["mcp_server.tools.cases.cases"]) == manifest.source_fingerprint()
+
+
+class TestLazyServer:
+    @pytest.mark.asyncio
+    async def test_list_tools_matches_eager_without_import(self, eager_server: FastMCP):
+        data = manifest.build_manifest(eager_server)
+        expected = [tool.model_dump() for tool in await eager_server.list_tools()]
+        sys.modules.pop(_DEMO_MODULE)
+
+        server = create_lazy_server(data)
+
+        assert [tool.model_dump() for tool in await server.list_tools()] == expected
+        assert _DEMO_MODULE not in sys.modules
+
+    @pytest.mark.asyncio
+    async def test_first_call_imports_module_once(self, eager_server: FastMCP):
+        data = manifest.build_manifest(eager_server)
+        expected = await eager_server.call_tool("describe_case", {"case_id": 7, "fields": ["cause"]})
+        sys.modules.pop(_DEMO_MODULE)
+        server = create_lazy_server(data)
+
+        result = await server.call_tool("describe_case", {"case_id": 7, "fields": ["cause"]})
+
+        assert result == expected
+        assert _DEMO_MODULE in sys.modules
+        tool = server._tool_manager.get_tool("describe_case")
+        assert isinstance(tool, LazyTool) and tool.loaded
+        assert not server._tool_manager.get_tool("add_numbers").loaded
+        resolved = tool.resolve()
+        await server.call_tool("describe_case", {"case_id": 8})
+        assert tool.resolve() is resolved
+
+    @pytest.mark.asyncio
+    async def test_argument_validation_matches_eager(self, eager_server: FastMCP):
+        server = create_lazy_server(manifest.build_manifest(eager_server))
+
+        with pytest.raises(ToolError):
+            await server.call_tool("add_numbers", {"a": "not-a-number"})
+        assert (await server.call_tool("add_numbers", {"a": 2, "b": 3}))[1] == {"result": 5}
+
+    @pytest.mark.asyncio
+    async def test_missing_module_surfaces_as_tool_error(self, eager_server: FastMCP):
+        data = manifest.build_manifest(eager_server)
+        for entry in data["tools"]:
+            entry["module"] = "lazy_demo_tools_removed"
+        server = create_lazy_server(data)
+
+        with pytest.raises(ToolError, match="add_numbers"):
+            await server.call_tool("add_numbers", {"a": 1})
+        assert not server._tool_manager.get_tool("add_numbers").loaded
+
+
+class TestLoadServer:
+    def test_uses_manifest_when_valid(self, eager_server: FastMCP, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv(manifest.EAGER_ENV, raising=False)
+        with mock.patch.object(lazy, "load_manifest", return_value=manifest.build_manifest(eager_server)):
+            server = load_server()
+
+        assert all(isinstance(tool, LazyTool) for tool in server._tool_manager.list_tools())
+
+    def test_falls_back_to_eager_and_rebuilds_manifest(
+        self, eager_server: FastMCP, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.delenv(manifest.EAGER_ENV, raising=False)
+        monkeypatch.setitem(sys.modules, "mcp_server.server", types.SimpleNamespace(mcp=eager_server))
+        with (
+            mock.patch.object(lazy, "load_manifest", return_value=None),
+            mock.patch.object(lazy, "write_manifest") as write,
+        ):
+            server = load_server()
+
+        assert server is eager_server
+        assert write.call_args.args[0]["server_name"] == "测试服务"
+
+    def test_eager_env_skips_manifest(self, eager_server: FastMCP, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv(manifest.EAGER_ENV, "1")
+        monkeypatch.setitem(sys.modules, "mcp_server.server", types.SimpleNamespace(mcp=eager_server))
+        with (
+            mock.patch.object(lazy, "load_manifest") as load,
+            mock.patch.object(lazy, "write_manifest") as write,
+        ):
+            assert load_server() is eager_server
+
+        load.assert_not_called()
+        write.assert_not_called()
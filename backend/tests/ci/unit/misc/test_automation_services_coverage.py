@@ -70,58 +70,6 @@ class TestFrameProcessingService:
         from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
         assert FrameProcessingService is not None
 
-    def test_is_dhash_duplicate_empty_window(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        selection = MagicMock()
-        result = svc.is_dhash_duplicate(selection, "abc123", [], window=5, threshold=10)
-        assert result is False
-
-    def test_is_dhash_duplicate_match(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        selection = MagicMock()
-        selection.hamming_distance_hex.return_value = 2
-        result = svc.is_dhash_duplicate(selection, "abc123", ["abc124"], window=5, threshold=10)
-        assert result is True
-
-    def test_is_dhash_duplicate_no_match(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        selection = MagicMock()
-        selection.hamming_distance_hex.return_value = 50
-        result = svc.is_dhash_duplicate(selection, "abc123", ["def456"], window=5, threshold=10)
-        assert result is False
-
-    def test_is_pixel_duplicate_empty(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        selection = MagicMock()
-        result = svc.is_pixel_duplicate(selection, b"thumb", [], window=5, threshold=0.1)
-        assert result is False
-
-    def test_is_pixel_duplicate_match(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        selection = MagicMock()
-        selection.mean_abs_diff.return_value = 0.01
-        result = svc.is_pixel_duplicate(selection, b"thumb", [b"prev"], window=5, threshold=0.1)
-        assert result is True
-
-    def test_is_pixel_duplicate_no_match(self):
-        from apps.chat_records.services.extraction.frame_processing_service import FrameProcessingService
-
-        svc = FrameProcessingService()
-        selection = MagicMock()
-        selection.mean_abs_diff.return_value = 0.5
-        result = svc.is_pixel_duplicate(selection, b"thumb", [b"prev"], window=5, threshold=0.1)
-        assert result is False
-
 
 # ── VideoFrameExtractService ──────────────────────────────────────
 
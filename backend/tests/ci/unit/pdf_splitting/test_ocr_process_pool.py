@@ -0,0 +1,180 @@
+"""OCR 进程池测试。"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from apps.pdf_splitting.services.split import ocr_pool
+from apps.pdf_splitting.services.split.ocr_handler import OCRHandler
+from apps.pdf_splitting.services.split.ocr_pool import OCRProcessPool, get_ocr_process_pool, render_page_pixels
+from apps.pdf_splitting.services.split.split_models import OCRPageResult, OCRRuntimeProfile
+
+fitz = pytest.importorskip("fitz")
+
+
+class _FakeOCR:
+    """按页面灰度返回文本，并带上工作进程 PID 与初始化次数"""
+
+    init_count = 0
+
+    def recognize_array(self, pixels: np.ndarray) -> str:
+        assert pixels.dtype == np.uint8 and pixels.ndim == 3 and pixels.shape[2] == 3
+        if int(pixels[0, 0, 0]) == 0:
+            raise RuntimeError("ocr failed")
+        return f"shade={int(pixels[0, 0, 0])} pid={os.getpid()} init={_FakeOCR.init_count}"
+
+
+def _fake_init(use_v5: bool) -> None:
+    _FakeOCR.init_count += 1
+    ocr_pool._worker_ocr = _FakeOCR()
+
+
+def _make_pdf(path: Path, shades: list[int]) -> Path:
+    with fitz.open() as doc:
+        for shade in shades:
+            page = doc.new_page(width=72, height=72)
+            page.draw_rect(page.rect, color=None, fill=(shade / 255,) * 3)
+        doc.save(str(path))
+    return path
+
+
+def _profile(workers: int, use_v5: bool = False) -> OCRRuntimeProfile:
+    return OCRRuntimeProfile(key="fast", use_v5=use_v5, dpi=72, workers=workers)
+
+
+class TestRenderPagePixels:
+    def test_renders_rgb_array(self, tmp_path: Path) -> None:
+        pdf_path = _make_pdf(tmp_path / "a.pdf", [128])
+        with fitz.open(str(pdf_path)) as doc:
+            pixels = render_page_pixels(doc, 1, 144)
+        assert pixels.shape == (144, 144, 3)
+        assert pixels.dtype == np.uint8
+        assert int(pixels[0, 0, 0]) == 128
+        assert pixels.flags.writeable
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork start method not available")
+class TestOCRProcessPool:
+    def test_recognizes_pages_with_warm_workers(self, tmp_path: Path) -> None:
+        pdf_path = _make_pdf(tmp_path / "scan.pdf", [10, 20, 30, 40, 50])
+        seen: list[OCRPageResult] = []
+        pool = OCRProcessPool(max_workers=2, use_v5=False, start_method="fork")
+        with patch.object(ocr_pool, "_init_ocr_worker", _fake_init):
+            try:
+                results = pool.recognize_pages(pdf_path=pdf_path, page_numbers=[1, 2, 3, 4, 5], dpi=72, on_page=seen.append)
+                again = pool.recognize_pages(pdf_path=pdf_path, page_numbers=[2], dpi=72)
+            finally:
+                pool.shutdown()
+
+        assert sorted(results) == [1, 2, 3, 4, 5]
+        assert [results[n].text.split()[0] for n in range(1, 6)] == [f"shade={s}" for s in (10, 20, 30, 40, 50)]
+        assert all(r.source_method == "ocr" and not r.ocr_failed for r in results.values())
+        assert all(r.elapsed_ms >= 0 for r in results.values())
+        assert sorted(r.page_no for r in seen) == [1, 2, 3, 4, 5]
+        # 每个工作进程只初始化一次，后续页面复用同一引擎
+        assert {r.text.split()[2] for r in [*results.values(), *again.values()]} == {"init=1"}
+        assert {r.text.split()[1] for r in results.values()} != {f"pid={os.getpid()}"}
+
+    def test_worker_error_only_fails_that_page(self, tmp_path: Path) -> None:
+        pdf_path = _make_pdf(tmp_path / "scan.pdf", [10, 0, 30])
+        pool = OCRProcessPool(max_workers=2, use_v5=False, start_method="fork")
+        with patch.object(ocr_pool, "_init_ocr_worker", _fake_init):
+            try:
+                results = pool.recognize_pages(pdf_path=pdf_path, page_numbers=[1, 2, 3], dpi=72)
+            finally:
+                pool.shutdown()
+
+        assert results[2].ocr_failed is True
+        assert results[2].source_method == "ocr_failed"
+        assert results[1].text.startswith("shade=10")
+        assert results[3].text.startswith("shade=30")
+
+    def test_render_error_reported_without_submitting(self, tmp_path: Path) -> None:
+        pdf_path = _make_pdf(tmp_path / "scan.pdf", [10])
+        seen: list[OCRPageResult] = []
+
+        def broken_render(doc: Any, page_no: int, dpi: int) -> np.ndarray:
+            raise ValueError("bad page")
+
+        pool = OCRProcessPool(max_workers=2, use_v5=False, start_method="fork")
+        pool._get_executor = MagicMock()  # type: ignore[method-assign]
+        results = pool.recognize_pages(
+            pdf_path=pdf_path, page_numbers=[1], dpi=72, on_page=seen.append, render=broken_render
+        )
+
+        assert results[1].ocr_failed is True
+        assert seen == [results[1]]
+        pool._get_executor.return_value.submit.assert_not_called()
+
+
+class TestGetOcrProcessPool:
+    def test_single_worker_profile_has_no_pool(self, settings) -> None:
+        assert get_ocr_process_pool(_profile(1)) is None
+
+    def test_disabled_by_setting(self, settings) -> None:
+        settings.PDF_SPLIT_OCR_PROCESS_POOL = False
+        assert get_ocr_process_pool(_profile(3)) is None
+
+    def test_daemon_process_has_no_pool(self, settings) -> None:
+        with patch.object(ocr_pool, "can_start_worker_processes", return_value=False):
+            assert get_ocr_process_pool(_profile(3)) is None
+
+    def test_pool_shared_per_model_and_workers(self, settings) -> None:
+        settings.PDF_SPLIT_OCR_PROCESS_POOL = True
+        pool = get_ocr_process_pool(_profile(3))
+        assert pool is not None
+        assert pool is get_ocr_process_pool(_profile(3))
+        assert pool is not get_ocr_process_pool(_profile(3, use_v5=True))
+        assert pool.concurrency == 3
+
+
+class TestParallelOcrRouting:
+    def test_uses_process_pool_and_fills_missing_pages(self, tmp_path: Path) -> None:
+        pool = MagicMock()
+        pool.recognize_pages.return_value = {
+            1: OCRPageResult(page_no=1, text="a", source_method="ocr", ocr_failed=False, elapsed_ms=12.0)
+        }
+        fallback = [OCRPageResult(page_no=2, text="b", source_method="ocr", ocr_failed=False, elapsed_ms=8.0)]
+        seen: list[int] = []
+        with (
+            patch("apps.pdf_splitting.services.split.ocr_handler.get_ocr_process_pool", return_value=pool),
+            patch("apps.pdf_splitting.services.split.ocr_handler._ocr_pages_worker", return_value=fallback) as worker,
+        ):
+            results = OCRHandler().parallel_ocr(
+                pdf_path=tmp_path / "x.pdf",
+                page_numbers=[1, 2],
+                runtime_profile=_profile(2),
+                on_page=lambda r: seen.append(r.page_no),
+            )
+
+        assert sorted(results) == [1, 2]
+        assert pool.recognize_pages.call_args.kwargs["page_numbers"] == [1, 2]
+        assert worker.call_args.kwargs["page_numbers"] == [2]
+        # 进程池内的页面由进程池自行回调，这里只回调兜底识别的页面
+        assert seen == [2]
+
+    def test_falls_back_to_threads_without_pool(self, tmp_path: Path) -> None:
+        def fake_worker(*, pdf_path: str, page_numbers: list[int], use_v5: bool, dpi: int) -> list[OCRPageResult]:
+            return [OCRPageResult(page_no=n, text=str(n), source_method="ocr", ocr_failed=False) for n in page_numbers]
+
+        seen: list[int] = []
+        with (
+            patch("apps.pdf_splitting.services.split.ocr_handler.get_ocr_process_pool", return_value=None),
+            patch("apps.pdf_splitting.services.split.ocr_handler._ocr_pages_worker", side_effect=fake_worker),
+        ):
+            results = OCRHandler().parallel_ocr(
+                pdf_path=tmp_path / "x.pdf",
+                page_numbers=[1, 2, 3, 4],
+                runtime_profile=_profile(2),
+                on_page=lambda r: seen.append(r.page_no),
+            )
+
+        assert sorted(results) == [1, 2, 3, 4]
+        assert sorted(seen) == [1, 2, 3, 4]
@@ -0,0 +1,138 @@
+"""PDF 拆分与发票识别接入共享 OCR 页面缓存的测试。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.automation.services.ocr.pdf_text_extractor import PDFTextExtractor
+from apps.core.services.folder_scan_manifest import file_sha256
+from apps.core.services.ocr_page_cache import SHARED_PROFILE, OcrPageCache, OcrPageEntry
+from apps.pdf_splitting.services.split.ocr_handler import OCRHandler
+from apps.pdf_splitting.services.split.split_models import OCRPageResult
+
+fitz = pytest.importorskip("fitz")
+
+_ENGINE = "rapidocr-1.4-v4_default"
+
+
+@pytest.fixture
+def page_cache(tmp_path: Path):
+    cache = OcrPageCache(tmp_path / "pages.sqlite3")
+    yield cache
+    cache.close()
+
+
+def _make_pdf(path: Path, pages: int) -> Path:
+    with fitz.open() as doc:
+        for _ in range(pages):
+            doc.new_page(width=72, height=72)
+        doc.save(str(path))
+    return path
+
+
+class TestOCRHandlerSharedCache:
+    def test_write_then_read_from_shared_cache(self, page_cache: OcrPageCache) -> None:
+        handler = OCRHandler(page_cache=page_cache)
+        result = OCRPageResult(page_no=3, text="判决书", source_method="ocr", ocr_failed=False)
+
+        with patch("apps.pdf_splitting.services.split.ocr_handler.default_storage") as storage:
+            handler.write_ocr_cache(pdf_hash="abc", profile_key="fast", result=result, engine_version=_ENGINE)
+            cached = handler.read_ocr_cache(pdf_hash="abc", profile_key="fast", page_no=3, engine_version=_ENGINE)
+
+        storage.save.assert_not_called()
+        assert cached is not None
+        assert cached.text == "判决书"
+        assert cached.source_method == "ocr_cache"
+        dpi = handler.resolve_runtime_profile("fast").dpi
+        assert page_cache.get("abc", 3, profile=f"dpi={dpi}", engine_version=_ENGINE) is not None
+
+    def test_legacy_hit_is_promoted(self, page_cache: OcrPageCache) -> None:
+        handler = OCRHandler(page_cache=page_cache)
+        legacy = OCRPageResult(page_no=1, text="旧缓存", source_method="ocr_cache", ocr_failed=False)
+
+        with patch.object(handler, "_read_legacy_ocr_cache", return_value=legacy) as read_legacy:
+            first = handler.read_ocr_cache(pdf_hash="abc", profile_key="fast", page_no=1, engine_version=_ENGINE)
+            second = handler.read_ocr_cache(pdf_hash="abc", profile_key="fast", page_no=1, engine_version=_ENGINE)
+
+        assert first is legacy
+        assert second is not None and second.text == "旧缓存"
+        read_legacy.assert_called_once()
+
+    def test_engine_version_change_misses(self, page_cache: OcrPageCache) -> None:
+        handler = OCRHandler(page_cache=page_cache)
+        result = OCRPageResult(page_no=1, text="x", source_method="ocr", ocr_failed=False)
+        handler.write_ocr_cache(pdf_hash="abc", profile_key="fast", result=result, engine_version=_ENGINE)
+
+        with patch.object(handler, "_read_legacy_ocr_cache", return_value=None):
+            cached = handler.read_ocr_cache(
+                pdf_hash="abc", profile_key="fast", page_no=1, engine_version="rapidocr-1.5-v4_default"
+            )
+
+        assert cached is None
+
+    def test_other_profile_reads_shared_entry(self, page_cache: OcrPageCache) -> None:
+        handler = OCRHandler(page_cache=page_cache)
+        shared_engine = "rapidocr-1.4-v5_server"
+        page_cache.put("abc", 2, profile=SHARED_PROFILE, engine_version=shared_engine, text="文本提取识别过")
+
+        with patch.object(handler, "_read_legacy_ocr_cache", return_value=None):
+            cached = handler.read_ocr_cache(
+                pdf_hash="abc",
+                profile_key="fast",
+                page_no=2,
+                engine_version=_ENGINE,
+                shared_engine_version=shared_engine,
+            )
+
+        assert cached is not None
+        assert cached.text == "文本提取识别过"
+
+    def test_failed_results_are_not_cached(self, page_cache: OcrPageCache) -> None:
+        handler = OCRHandler(page_cache=page_cache)
+        failed = OCRPageResult(page_no=1, text="", source_method="ocr_failed", ocr_failed=True)
+
+        with patch("apps.pdf_splitting.services.split.ocr_handler.default_storage") as storage:
+            handler.write_ocr_cache(pdf_hash="abc", profile_key="fast", result=failed, engine_version=_ENGINE)
+        with patch.object(handler, "_read_legacy_ocr_cache", return_value=failed):
+            cached = handler.read_ocr_cache(pdf_hash="abc", profile_key="fast", page_no=1, engine_version=_ENGINE)
+
+        storage.save.assert_not_called()
+        assert cached is None
+        assert page_cache.stats()["entries"] == 0
+
+
+class TestPDFTextExtractorOcrPages:
+    def test_only_cache_misses_are_recognized(self, tmp_path: Path, page_cache: OcrPageCache) -> None:
+        pdf_path = _make_pdf(tmp_path / "invoice.pdf", 3)
+        page_cache.put(file_sha256(pdf_path), 2, profile=SHARED_PROFILE, engine_version=_ENGINE, text="缓存页")
+        ocr = MagicMock()
+        ocr.engine_version = _ENGINE
+        ocr.recognize.side_effect = ["第一页", "第三页"]
+
+        with patch("apps.core.services.ocr_page_cache.get_ocr_page_cache", return_value=page_cache):
+            text = PDFTextExtractor().ocr_pages(pdf_path, ocr)
+
+        assert text == "第一页\n缓存页\n第三页"
+        assert ocr.recognize.call_count == 2
+        assert page_cache.get(file_sha256(pdf_path), 3, profile=SHARED_PROFILE, engine_version=_ENGINE) == OcrPageEntry(
+            text="第三页", ocr_failed=False
+        )
+
+    def test_unknown_engine_skips_cache(self, tmp_path: Path) -> None:
+        pdf_path = _make_pdf(tmp_path / "invoice.pdf", 2)
+        ocr = MagicMock()
+        ocr.recognize.return_value = "文本"
+
+        with patch("apps.core.services.ocr_page_cache.get_ocr_page_cache") as get_cache:
+            text = PDFTextExtractor().ocr_pages(pdf_path, ocr)
+
+        get_cache.assert_not_called()
+        assert text == "文本\n文本"
+
+    def test_unreadable_pdf_returns_empty(self, tmp_path: Path) -> None:
+        bad = tmp_path / "bad.pdf"
+        bad.write_bytes(b"not a pdf")
+        assert PDFTextExtractor().ocr_pages(bad, MagicMock()) == ""
@@ -172,6 +172,30 @@ class TestUpdateTemplateAllFields:
         assert mock_t.is_active is False
         mock_t.asave.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_rejects_cyclic_depends_on(self):
+        from ninja.errors import HttpError
+
+        from apps.workflow.api.template_api import update_template
+
+        steps = []
+        for step_id, dep in (("a", "b"), ("b", "a")):
+            step = MagicMock()
+            step.model_dump.return_value = {"id": step_id, "type": "activity", "depends_on": [dep]}
+            steps.append(step)
+        payload = MagicMock()
+        payload.steps = steps
+
+        mock_t = MagicMock()
+        mock_t.asave = AsyncMock()
+
+        with patch("apps.workflow.api.template_api.WorkflowTemplate") as MockModel:
+            MockModel.objects.aget = AsyncMock(return_value=mock_t)
+            with pytest.raises(HttpError):
+                await update_template(MagicMock(), template_id=1, payload=payload)
+
+        mock_t.asave.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # delete_template
@@ -0,0 +1,211 @@
+"""DynamicWorkflow.run — 按依赖并行调度（patch 掉 Temporal 的 activity 调用与等待）"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from apps.workflow.temporal import workflows
+from apps.workflow.temporal.step_graph import DEFAULT_MAX_PARALLEL_STEPS
+from apps.workflow.temporal.workflows import DynamicWorkflow, GateResult
+
+act = workflows.act
+
+
+class _FakeTemporal:
+    """记录 activity 调用顺序与 MCP 工具的最大并发数"""
+
+    def __init__(self, wf: DynamicWorkflow, steps: Any, *, fail: str = "") -> None:
+        self.wf = wf
+        self.steps = steps
+        self.fail = fail
+        self.events: list[str] = []
+        self.running = 0
+        self.max_running = 0
+        self.running_snapshots: list[list[str]] = []
+
+    async def execute_activity(self, activity: Any, args: tuple = (), **kwargs: Any) -> Any:
+        if activity is act.fetch_template_schema:
+            return {"steps_schema": self.steps}
+        if activity is act.record_step:
+            self.events.append(f"{args[1]}:{args[4]}")
+            return None
+        if activity is act.execute_mcp_tool:
+            tool = args[0]
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(0.05 if tool.startswith("slow") else 0.01)
+                self.running_snapshots.append(self.wf.current_state()["running_steps"])
+                if tool == self.fail:
+                    raise RuntimeError(f"{tool} 失败")
+                return {"tool": tool}
+            finally:
+                self.running -= 1
+        return None
+
+    async def wait_condition(self, condition: Any, timeout: Any = None) -> None:
+        step_id = self.wf._current_gate_step_id
+        self.events.append(f"{step_id}:signal")
+        self.wf._pending_gates[step_id] = GateResult(approved=True, comment="ok")
+        assert condition()
+
+
+def _mcp(step_id: str, depends_on: list[str] | None = None, **extra: Any) -> dict:
+    step = {"id": step_id, "name": step_id, "type": "activity", "mcp_tool": step_id, **extra}
+    if depends_on is not None:
+        step["depends_on"] = depends_on
+    return step
+
+
+async def _run(steps: Any, *, fail: str = "", patched: bool = True) -> tuple[dict, _FakeTemporal]:
+    wf = DynamicWorkflow()
+    fake = _FakeTemporal(wf, steps, fail=fail)
+    with (
+        patch.object(workflows.workflow, "execute_activity", fake.execute_activity),
+        patch.object(workflows.workflow, "wait_condition", fake.wait_condition),
+        patch.object(workflows.workflow, "wait", asyncio.wait),
+        patch.object(workflows.workflow, "patched", lambda patch_id: patched),
+    ):
+        result = await wf.run({"case_id": 1, "run_id": 2, "template_id": 3})
+    assert wf.current_state()["running_steps"] == []
+    return result, fake
+
+
+MULTI_BRANCH = [
+    _mcp("get_case"),
+    _mcp("generate_complaint", depends_on=["get_case"]),
+    _mcp("calculate_litigation_fee", depends_on=["get_case"]),
+    _mcp("search_companies", depends_on=["get_case"]),
+    _mcp("create_case_log", depends_on=["generate_complaint", "calculate_litigation_fee", "search_companies"]),
+]
+
+
+class TestParallelBranches:
+    @pytest.mark.asyncio
+    async def test_independent_branches_run_concurrently(self):
+        result, fake = await _run(MULTI_BRANCH)
+
+        assert result["status"] == "completed"
+        assert set(result["step_outputs"]) == {s["id"] for s in MULTI_BRANCH}
+        assert fake.max_running == 3
+        assert ["generate_complaint", "calculate_litigation_fee", "search_companies"] in fake.running_snapshots
+        # 汇总步骤在三个分支都完成后才开始
+        last_branch = max(
+            fake.events.index(f"{s}:success")
+            for s in ("generate_complaint", "calculate_litigation_fee", "search_companies")
+        )
+        assert fake.events.index("create_case_log:running") > last_branch
+
+    @pytest.mark.asyncio
+    async def test_max_parallel_bounds_concurrency(self):
+        steps = [_mcp(f"tool_{i}", depends_on=[]) for i in range(DEFAULT_MAX_PARALLEL_STEPS + 2)]
+        result, fake = await _run(steps)
+
+        assert result["status"] == "completed"
+        assert fake.max_running == DEFAULT_MAX_PARALLEL_STEPS
+
+    @pytest.mark.asyncio
+    async def test_legacy_template_stays_sequential(self):
+        result, fake = await _run([_mcp("a"), _mcp("b"), _mcp("c")])
+
+        assert result["status"] == "completed"
+        assert fake.max_running == 1
+
+    @pytest.mark.asyncio
+    async def test_previous_step_points_to_declared_dependency(self):
+        steps = [
+            _mcp("a", depends_on=[]),
+            _mcp("b", depends_on=[]),
+            _mcp("c", depends_on=["a"], config={"source": "{{previous_step.tool}}"}),
+        ]
+        with patch.object(workflows, "_build_mcp_kwargs", wraps=workflows._build_mcp_kwargs) as build:
+            await _run(steps)
+
+        c_call = next(c for c in build.call_args_list if c.args[0]["id"] == "c")
+        assert c_call.args[1]["_last_output"] == {"tool": "a"}
+
+    @pytest.mark.asyncio
+    async def test_previous_step_follows_implicit_dependency(self):
+        # a2 隐式依赖 a1；b1 与 a 分支并行且更晚完成，不能成为 a2 的 previous_step
+        steps = [
+            _mcp("a1", depends_on=[]),
+            _mcp("a2", config={"source": "{{previous_step.tool}}"}),
+            _mcp("slow_b1", depends_on=[]),
+        ]
+        with patch.object(workflows, "_build_mcp_kwargs", wraps=workflows._build_mcp_kwargs) as build:
+            await _run(steps)
+
+        first_call = next(c for c in build.call_args_list if c.args[0]["id"] == "a1")
+        assert "_last_output" not in first_call.args[1]
+        a2_call = next(c for c in build.call_args_list if c.args[0]["id"] == "a2")
+        assert a2_call.args[1]["_last_output"] == {"tool": "a1"}
+
+    @pytest.mark.asyncio
+    async def test_runs_started_before_patch_replay_sequentially(self):
+        result, fake = await _run(MULTI_BRANCH, patched=False)
+
+        assert result["status"] == "completed"
+        assert fake.max_running == 1
+        assert [e for e in fake.events if e.endswith(":success")] == [f"{s['id']}:success" for s in MULTI_BRANCH]
+
+
+class TestBarriers:
+    @pytest.mark.asyncio
+    async def test_gate_waits_for_running_branches_and_blocks_later_steps(self):
+        steps = [
+            _mcp("a", depends_on=[]),
+            _mcp("b", depends_on=[]),
+            {"id": "approve", "name": "审批", "type": "gate"},
+            _mcp("c", depends_on=[]),
+        ]
+        result, fake = await _run(steps)
+
+        assert result["status"] == "completed"
+        branches_done = max(fake.events.index("a:success"), fake.events.index("b:success"))
+        assert fake.events.index("approve:waiting") > branches_done
+        assert fake.events.index("c:running") > fake.events.index("approve:success")
+
+    @pytest.mark.asyncio
+    async def test_condition_false_skips_next_step(self):
+        steps = [
+            _mcp("a"),
+            {"id": "check", "type": "condition", "config": {"field": "missing", "operator": "exists"}},
+            _mcp("skipped"),
+            _mcp("after"),
+        ]
+        result, fake = await _run(steps)
+
+        assert result["step_outputs"]["skipped"] == {"skipped": True, "reason": "condition_false_skip"}
+        assert "skipped:running" not in fake.events
+        assert "after:success" in fake.events
+
+
+class TestFailures:
+    @pytest.mark.asyncio
+    async def test_abort_cancels_other_branches(self):
+        steps = [_mcp("boom", depends_on=[]), _mcp("slow", depends_on=[]), _mcp("after", depends_on=["slow"])]
+        result, fake = await _run(steps, fail="boom")
+
+        assert result == {"status": "failed", "failed_step": "boom", "error": "boom 失败"}
+        assert "after:running" not in fake.events
+
+    @pytest.mark.asyncio
+    async def test_skip_on_fail_unblocks_dependents(self):
+        steps = [_mcp("boom", depends_on=[], config={"on_fail": "skip"}), _mcp("after", depends_on=["boom"])]
+        result, fake = await _run(steps, fail="boom")
+
+        assert result["status"] == "completed"
+        assert result["step_outputs"]["boom"] == {"skipped": True, "error": "boom 失败"}
+        assert "after:success" in fake.events
+
+    @pytest.mark.asyncio
+    async def test_invalid_dependencies_fail_the_run(self):
+        result, fake = await _run([_mcp("a", depends_on=["missing"])])
+
+        assert result["status"] == "failed"
+        assert "missing" in result["error"]
+        assert fake.events == []
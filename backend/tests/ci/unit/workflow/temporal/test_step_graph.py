@@ -0,0 +1,99 @@
+"""step_graph — 步骤依赖解析与调度"""
+
+from __future__ import annotations
+
+import pytest
+
+from apps.workflow.temporal.step_graph import StepGraphError, StepScheduler, resolve_dependencies
+
+
+def _step(step_id: str, step_type: str = "activity", depends_on: list[str] | None = None) -> dict:
+    step: dict = {"id": step_id, "type": step_type}
+    if depends_on is not None:
+        step["depends_on"] = depends_on
+    return step
+
+
+class TestResolveDependencies:
+    def test_default_is_previous_step(self):
+        steps = [_step("a"), _step("b"), _step("c")]
+        assert resolve_dependencies(steps) == [(), (0,), (1,)]
+
+    def test_explicit_dependencies(self):
+        steps = [_step("a"), _step("b", depends_on=[]), _step("c", depends_on=["a", "b"])]
+        assert resolve_dependencies(steps) == [(), (), (0, 1)]
+
+    def test_duplicate_ids_depend_on_all_occurrences(self):
+        steps = [_step("llm"), _step("llm", depends_on=[]), _step("c", depends_on=["llm"])]
+        assert resolve_dependencies(steps)[2] == (0, 1)
+
+    @pytest.mark.parametrize(
+        "steps",
+        [
+            [_step("a", depends_on=["missing"])],
+            [_step("a", depends_on=["a"])],
+            [_step("a", depends_on=["b"]), _step("b", depends_on=["a"])],
+            [_step("a", depends_on="b"), _step("b")],  # type: ignore[arg-type]
+        ],
+    )
+    def test_invalid_declarations(self, steps):
+        with pytest.raises(StepGraphError):
+            resolve_dependencies(steps)
+
+    def test_dependency_across_barrier_is_rejected(self):
+        # a 必须在 gate 之前完成，却依赖 gate 之后的 c
+        steps = [_step("a", depends_on=["c"]), _step("g", "gate"), _step("c", depends_on=[])]
+        with pytest.raises(StepGraphError, match="屏障"):
+            resolve_dependencies(steps)
+
+
+class TestStepScheduler:
+    def test_legacy_template_runs_sequentially(self):
+        scheduler = StepScheduler([_step("a"), _step("b")])
+        assert scheduler.ready() == [0]
+        scheduler.mark_started(0)
+        assert scheduler.ready() == []
+        scheduler.mark_finished(0)
+        assert scheduler.ready() == [1]
+
+    def test_ready_respects_max_parallel(self):
+        steps = [_step(f"s{i}", depends_on=[]) for i in range(5)]
+        scheduler = StepScheduler(steps, max_parallel=2)
+        assert scheduler.ready() == [0, 1]
+        scheduler.mark_started(0)
+        scheduler.mark_started(1)
+        assert scheduler.ready() == []
+        scheduler.mark_finished(1)
+        assert scheduler.ready() == [2]
+        assert scheduler.running == [0]
+
+    def test_barrier_waits_for_earlier_steps_and_blocks_later_ones(self):
+        steps = [_step("a", depends_on=[]), _step("b", depends_on=[]), _step("g", "gate"), _step("c", depends_on=[])]
+        scheduler = StepScheduler(steps)
+        assert scheduler.ready() == [0, 1]
+        scheduler.mark_started(0)
+        scheduler.mark_started(1)
+        scheduler.mark_finished(0)
+        assert scheduler.ready() == []
+        scheduler.mark_finished(1)
+        assert scheduler.ready() == [2]
+        scheduler.mark_started(2)
+        assert scheduler.ready() == []
+        scheduler.mark_finished(2)
+        assert scheduler.ready() == [3]
+
+    def test_skip_after_condition_goto(self):
+        steps = [_step("cond", "condition"), _step("x"), _step("y"), _step("target"), _step("z")]
+        scheduler = StepScheduler(steps)
+        scheduler.mark_finished(0)
+        assert scheduler.skip_after_condition(0, "target") == [1, 2]
+        assert scheduler.ready() == [3]
+
+    def test_skip_after_condition_next_only(self):
+        steps = [_step("cond", "condition"), _step("x"), _step("y", depends_on=[])]
+        scheduler = StepScheduler(steps)
+        scheduler.mark_finished(0)
+        assert scheduler.skip_after_condition(0, None) == [1]
+        assert scheduler.ready() == [2]
+        scheduler.mark_finished(2)
+        assert scheduler.all_finished